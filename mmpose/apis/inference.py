@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import warnings
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Sequence, Union
 
 import numpy as np
 import torch
@@ -14,6 +14,7 @@ from mmengine.runner import load_checkpoint
 from PIL import Image
 
 from mmpose.datasets.datasets.utils import parse_pose_metainfo
+from mmpose.datasets.transforms import TopdownAffine
 from mmpose.models.builder import build_pose_estimator
 from mmpose.structures import PoseDataSample
 from mmpose.structures.bbox import bbox_xywh2xyxy
@@ -131,6 +132,88 @@ def init_model(config: Union[str, Path, Config],
     return model
 
 
+def pipeline_topdown_instances(pipeline: Compose,
+                               data_info: dict) -> List[dict]:
+    """Apply a top-down test pipeline to an image with multiple instances.
+
+    The transforms before :class:`TopdownAffine` (e.g. image loading) are
+    applied only once to the whole image. :class:`TopdownAffine` then crops
+    all the instances in one pass, and the following transforms (e.g.
+    packing) are applied to each instance. If the pipeline contains no
+    :class:`TopdownAffine`, the whole pipeline is applied to each instance
+    separately.
+
+    Args:
+        pipeline (Compose): The top-down test pipeline
+        data_info (dict): The input data info, where ``'bbox'`` is in shape
+            (N, 4) and ``'bbox_score'`` is in shape (N, )
+
+    Returns:
+        List[dict]: The processed data of each instance.
+    """
+    transforms = pipeline.transforms
+    affine_idx = None
+    for i, t in enumerate(transforms):
+        if isinstance(t, TopdownAffine):
+            affine_idx = i
+            break
+
+    data_list = []
+    if affine_idx is None:
+        for i in range(len(data_info['bbox'])):
+            inst = data_info.copy()
+            inst['bbox'] = data_info['bbox'][i:i + 1]
+            inst['bbox_score'] = data_info['bbox_score'][i:i + 1]
+            data = pipeline(inst)
+            if data is not None:
+                data_list.append(data)
+        return data_list
+
+    results = Compose(transforms[:affine_idx])(data_info.copy())
+    if results is None:
+        return data_list
+
+    post_pipeline = Compose(transforms[affine_idx + 1:])
+    for inst in transforms[affine_idx].transform_instances(results):
+        data = post_pipeline(inst)
+        if data is not None:
+            data_list.append(data)
+
+    return data_list
+
+
+def _get_topdown_data_info(img: Union[np.ndarray, str],
+                           bboxes: Optional[Union[List, np.ndarray]] = None,
+                           bbox_format: str = 'xyxy') -> dict:
+    """Get the data info of an image and its bboxes for top-down
+    inference."""
+    if bboxes is None or len(bboxes) == 0:
+        # get bbox from the image size
+        if isinstance(img, str):
+            w, h = Image.open(img).size
+        else:
+            h, w = img.shape[:2]
+
+        bboxes = np.array([[0, 0, w, h]], dtype=np.float32)
+    else:
+        if isinstance(bboxes, list):
+            bboxes = np.array(bboxes)
+
+        assert bbox_format in {'xyxy', 'xywh'}, \
+            f'Invalid bbox_format "{bbox_format}".'
+
+        if bbox_format == 'xywh':
+            bboxes = bbox_xywh2xyxy(bboxes)
+
+    if isinstance(img, str):
+        data_info = dict(img_path=img)
+    else:
+        data_info = dict(img=img)
+    data_info['bbox'] = bboxes  # shape (N, 4)
+    data_info['bbox_score'] = np.ones(len(bboxes), dtype=np.float32)
+    return data_info
+
+
 def inference_topdown(model: nn.Module,
                       img: Union[np.ndarray, str],
                       bboxes: Optional[Union[List, np.ndarray]] = None,
@@ -157,35 +240,10 @@ def inference_topdown(model: nn.Module,
         init_default_scope(scope)
     pipeline = Compose(model.cfg.test_dataloader.dataset.pipeline)
 
-    if bboxes is None or len(bboxes) == 0:
-        # get bbox from the image size
-        if isinstance(img, str):
-            w, h = Image.open(img).size
-        else:
-            h, w = img.shape[:2]
-
-        bboxes = np.array([[0, 0, w, h]], dtype=np.float32)
-    else:
-        if isinstance(bboxes, list):
-            bboxes = np.array(bboxes)
-
-        assert bbox_format in {'xyxy', 'xywh'}, \
-            f'Invalid bbox_format "{bbox_format}".'
-
-        if bbox_format == 'xywh':
-            bboxes = bbox_xywh2xyxy(bboxes)
-
     # construct batch data samples
-    data_list = []
-    for bbox in bboxes:
-        if isinstance(img, str):
-            data_info = dict(img_path=img)
-        else:
-            data_info = dict(img=img)
-        data_info['bbox'] = bbox[None]  # shape (1, 4)
-        data_info['bbox_score'] = np.ones(1, dtype=np.float32)  # shape (1,)
-        data_info.update(model.dataset_meta)
-        data_list.append(pipeline(data_info))
+    data_info = _get_topdown_data_info(img, bboxes, bbox_format)
+    data_info.update(model.dataset_meta)
+    data_list = pipeline_topdown_instances(pipeline, data_info)
 
     if data_list:
         # collate data list into a batch, which is a dict with following keys:
@@ -200,6 +258,79 @@ def inference_topdown(model: nn.Module,
     return results
 
 
+def inference_topdown_batch(
+        model: nn.Module,
+        imgs: Sequence[Union[np.ndarray, str]],
+        bboxes: Optional[Sequence[Optional[Union[List, np.ndarray]]]] = None,
+        bbox_format: str = 'xyxy',
+        batch_size: int = 32) -> List[List[PoseDataSample]]:
+    """Inference multiple images with a top-down pose estimator in batches.
+
+    The instances of all the images are packed into micro-batches of
+    ``batch_size`` instances regardless of the image they belong to, and the
+    results are gathered back for each image. The images are processed in
+    order, so only the instances of one micro-batch are held in memory at a
+    time.
+
+    Args:
+        model (nn.Module): The top-down pose estimator
+        imgs (Sequence[np.ndarray | str]): The loaded images or image files
+            to inference
+        bboxes (Sequence[np.ndarray], optional): The bboxes of each image,
+            each in shape (N, 4). If not given, or the bboxes of an image are
+            ``None`` or empty, the entire image will be regarded as a single
+            bbox area. Defaults to ``None``
+        bbox_format (str): The bbox format indicator. Options are ``'xywh'``
+            and ``'xyxy'``. Defaults to ``'xyxy'``
+        batch_size (int): The number of instances in a micro-batch.
+            Defaults to 32
+
+    Returns:
+        List[List[:obj:`PoseDataSample`]]: The inference results of each
+        image, which are the same as the results of
+        :func:`inference_topdown` on the image.
+    """
+    if bboxes is None:
+        bboxes = [None] * len(imgs)
+    if len(bboxes) != len(imgs):
+        raise ValueError(f'Got {len(imgs)} images but {len(bboxes)} groups '
+                         'of bboxes.')
+    if batch_size < 1:
+        raise ValueError(f'Invalid batch_size {batch_size}.')
+
+    scope = model.cfg.get('default_scope', 'mmpose')
+    if scope is not None:
+        init_default_scope(scope)
+    pipeline = Compose(model.cfg.test_dataloader.dataset.pipeline)
+
+    results = [[] for _ in imgs]
+    # the processed instances and the index of their images
+    data_list, img_indices = [], []
+
+    def _run_batch(num_instances):
+        batch = pseudo_collate(data_list[:num_instances])
+        with torch.no_grad():
+            batch_results = model.test_step(batch)
+        for img_idx, result in zip(img_indices, batch_results):
+            results[img_idx].append(result)
+        del data_list[:num_instances], img_indices[:num_instances]
+
+    for img_idx, (img, _bboxes) in enumerate(zip(imgs, bboxes)):
+        data_info = _get_topdown_data_info(img, _bboxes, bbox_format)
+        data_info.update(model.dataset_meta)
+        instances = pipeline_topdown_instances(pipeline, data_info)
+        data_list.extend(instances)
+        img_indices.extend([img_idx] * len(instances))
+
+        while len(data_list) >= batch_size:
+            _run_batch(batch_size)
+
+    if data_list:
+        _run_batch(len(data_list))
+
+    return results
+
+
 def inference_bottomup(model: nn.Module, img: Union[np.ndarray, str]):
     """Inference image with a bottom-up pose estimator.
 
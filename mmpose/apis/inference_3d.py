@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from typing import Sequence
+
 import numpy as np
 import torch
 from mmengine.dataset import Compose, pseudo_collate
@@ -226,6 +228,184 @@ def collate_pose_sequence(pose_results_2d,
     return pose_sequences
 
 
+class PoseSequenceBuffer:
+    """Assemble the 2D pose sequences of the tracked instances in a video for
+    pose lifting.
+
+    The keypoints of the last frames are stored in a ring buffer of shape
+    (tracks, T, K, C) which is preallocated and grows with the number of
+    tracks. Adding a frame writes the keypoints of its instances into the
+    slots of their tracks, and the sequences of all the instances are
+    gathered from the buffer at once. This is equivalent to
+    :func:`extract_pose_sequence` followed by :func:`collate_pose_sequence`
+    with the current frame as the last frame of the video, but the cost per
+    frame does not grow with the length of the video.
+
+    As in :func:`collate_pose_sequence`, if the track of an instance is
+    missing in a frame of its sequence, the keypoints of the earliest frame
+    after it are replicated to the start of the sequence. The instances with
+    negative track ids are not tracked, and their sequences only contain
+    their keypoints in the current frame.
+
+    Note:
+        - The number of the person instances: N
+        - The number of the keypoints: K
+        - The channel number of each keypoint: C
+
+    Args:
+        seq_len (int): The number of frames in the input sequence.
+        causal (bool): If True, the target frame is the last frame in
+            a sequence. Otherwise, the target frame is in the middle of
+            a sequence and the sequence is padded with the current frame.
+            Defaults to ``False``
+        step (int): Step size to extract frames from the video.
+            Defaults to 1
+        num_tracks (int): The number of tracks to preallocate the buffer
+            for. Defaults to 8
+
+    Example:
+        >>> buffer = PoseSequenceBuffer(seq_len=27, causal=True)
+        >>> for keypoints, track_ids in video:
+        >>>     # (N, T, K, C)
+        >>>     sequences = buffer.update(keypoints, track_ids)
+    """
+
+    def __init__(self,
+                 seq_len: int,
+                 causal: bool = False,
+                 step: int = 1,
+                 num_tracks: int = 8):
+        if causal:
+            self.frames_left = seq_len - 1
+            self.frames_right = 0
+        else:
+            self.frames_left = (seq_len - 1) // 2
+            self.frames_right = self.frames_left
+        self.seq_len = seq_len
+        self.causal = causal
+        self.step = step
+        self.num_tracks = num_tracks
+        # the frames which can be in the sequence of the current frame
+        self.history_len = self.frames_left * step + 1
+        self.reset()
+
+    def reset(self):
+        """Remove all the frames and tracks."""
+        self._frame_idx = -1
+        self._keypoints = None
+        self._present = None
+        self._last_seen = None
+        self._slots = {}
+        self._free_slots = []
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _allocate(self, num_keypoints: int, num_channels: int):
+        """Allocate the buffers for ``num_tracks`` tracks."""
+        self._keypoints = np.zeros(
+            (self.num_tracks, self.history_len, num_keypoints, num_channels),
+            dtype=np.float32)
+        self._present = np.zeros((self.num_tracks, self.history_len),
+                                 dtype=bool)
+        self._last_seen = np.full(self.num_tracks, -1, dtype=np.int64)
+        self._slots = {}
+        self._free_slots = list(range(self.num_tracks - 1, -1, -1))
+
+    def _get_slot(self, track_id: int) -> int:
+        """Get the slot of a track, and assign a free slot to a new track."""
+        slot = self._slots.get(track_id)
+        if slot is not None:
+            return slot
+
+        if not self._free_slots:
+            # double the capacity
+            num_tracks = len(self._last_seen)
+            self._keypoints = np.concatenate(
+                [self._keypoints,
+                 np.zeros_like(self._keypoints)], axis=0)
+            self._present = np.concatenate(
+                [self._present, np.zeros_like(self._present)], axis=0)
+            self._last_seen = np.concatenate(
+                [self._last_seen,
+                 np.full_like(self._last_seen, -1)], axis=0)
+            self._free_slots = list(
+                range(2 * num_tracks - 1, num_tracks - 1, -1))
+
+        slot = self._free_slots.pop()
+        # clear the frames of the previous track in the slot
+        self._present[slot] = False
+        self._slots[track_id] = slot
+        return slot
+
+    def update(self, keypoints: np.ndarray,
+               track_ids: Sequence[int]) -> np.ndarray:
+        """Add a frame and get the pose sequences of its instances.
+
+        Args:
+            keypoints (np.ndarray): The keypoints of the instances in the
+                frame in shape (N, K, C)
+            track_ids (Sequence[int]): The track ids of the instances
+
+        Returns:
+            np.ndarray: The pose sequences of the instances in shape
+            (N, T, K, C), where T is the length of the sequence.
+        """
+        keypoints = np.asarray(keypoints, dtype=np.float32)
+        track_ids = np.asarray(track_ids, dtype=np.int64).reshape(-1)
+        assert keypoints.ndim == 3 and len(keypoints) == len(track_ids), (
+            'The keypoints should be in shape (N, K, C) and match the track '
+            f'ids, but got {keypoints.shape} and {len(track_ids)} track ids')
+
+        kpt_shape = keypoints.shape[1:]
+        if self._keypoints is None:
+            self._allocate(*kpt_shape)
+        elif len(keypoints) and self._keypoints.shape[2:] != kpt_shape:
+            # reset the tracks if the definition of the keypoints changes
+            self._allocate(*kpt_shape)
+
+        self._frame_idx += 1
+        frame_idx = self._frame_idx
+        cur = frame_idx % self.history_len
+        self._present[:, cur] = False
+
+        # release the slots of the tracks which are out of the history
+        expired = [
+            track_id for track_id, slot in self._slots.items()
+            if self._last_seen[slot] <= frame_idx - self.history_len
+        ]
+        for track_id in expired:
+            self._free_slots.append(self._slots.pop(track_id))
+
+        tracked = track_ids >= 0
+        slots = np.array([self._get_slot(i) for i in track_ids[tracked]],
+                         dtype=np.int64)
+        self._keypoints[slots, cur] = keypoints[tracked]
+        self._present[slots, cur] = True
+        self._last_seen[slots] = frame_idx
+
+        # the frames of the sequence, where the frames before the start of
+        # the video are padded with the first frame, and the frames after
+        # the current frame are padded with the current frame
+        frames = frame_idx - np.arange(self.frames_left, -1, -1) * self.step
+        frames = np.maximum(frames, 0) % self.history_len
+        frames = np.concatenate(
+            [frames, np.full(self.frames_right, cur, dtype=np.int64)])
+
+        # replicate the earliest frame after the last missing frame before
+        # the target frame, which is the current frame
+        missing = ~self._present[slots[:, None], frames[:self.frames_left]]
+        positions = np.arange(1, self.frames_left + 1)
+        start = (missing * positions).max(axis=1, initial=0)
+        src = np.maximum(np.arange(len(frames)), start[:, None])
+
+        shape = (len(track_ids), len(frames)) + keypoints.shape[1:]
+        sequences = np.empty(shape, dtype=np.float32)
+        sequences[tracked] = self._keypoints[slots[:, None], frames[src]]
+        sequences[~tracked] = keypoints[~tracked, None]
+        return sequences
+
+
 def inference_pose_lifter_model(model,
                                 pose_results_2d,
                                 with_track_id=True,
@@ -1,9 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import warnings
+from typing import List, Optional
 
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
-from mmpose.evaluation.functional.nms import oks_iou
+from mmpose.evaluation.functional.nms import oks_iou, oks_iou_matrix
+from mmpose.structures import PoseDataSample
 
 
 def _compute_iou(bboxA, bboxB):
@@ -101,3 +104,226 @@ def _track_by_oks(res, results_last, thr, sigmas=None):
         track_id = -1
 
     return track_id, results_last, match_result
+
+
+def _compute_iou_matrix(bboxes_a: np.ndarray,
+                        bboxes_b: np.ndarray) -> np.ndarray:
+    """Compute the IoU between every pair of boxes in two sets, which is the
+    vectorized version of :func:`_compute_iou`.
+
+    Args:
+        bboxes_a (np.ndarray): The first set of boxes in shape (N, 4) or
+            (N, 5), in (left, top, right, bottom[, score]) format
+        bboxes_b (np.ndarray): The second set of boxes in shape (M, 4) or
+            (M, 5), in (left, top, right, bottom[, score]) format
+
+    Returns:
+        np.ndarray: The IoU values in shape (N, M).
+    """
+    bboxes_a = np.asarray(bboxes_a, dtype=np.float64)[:, None, :4]
+    bboxes_b = np.asarray(bboxes_b, dtype=np.float64)[None, :, :4]
+
+    lt = np.maximum(bboxes_a[..., :2], bboxes_b[..., :2])
+    rb = np.minimum(bboxes_a[..., 2:], bboxes_b[..., 2:])
+    inter_area = np.clip(rb - lt, 0, None).prod(axis=-1)
+
+    areas_a = (bboxes_a[..., 2:] - bboxes_a[..., :2]).prod(axis=-1)
+    areas_b = (bboxes_b[..., 2:] - bboxes_b[..., :2]).prod(axis=-1)
+    union_area = areas_a + areas_b - inter_area
+    union_area[union_area == 0] = 1e-5
+
+    return inter_area / union_area
+
+
+class PoseTracker:
+    """Track the instances across the frames of a video.
+
+    In each frame, the similarity between every instance and every track is
+    computed at once as a matrix (the bbox IoU or the keypoint OKS), and the
+    instances are assigned to the tracks globally by the Hungarian algorithm
+    to maximize the total similarity, instead of greedily one by one. An
+    instance is only assigned to a track if their similarity is above
+    ``tracking_thr``. The unassigned instances start new tracks, unless they
+    have too few detected keypoints.
+
+    The state of the tracks is kept in arrays, and a track is removed if it
+    has not been matched in ``max_age`` frames.
+
+    Args:
+        use_oks (bool): Whether to use the OKS as the similarity instead of
+            the bbox IoU. Defaults to ``False``
+        tracking_thr (float): The similarity threshold for tracking.
+            Defaults to 0.3
+        max_age (int): The number of frames that a track can be matched
+            after it is last seen. The default value 1 only matches the
+            instances to the ones in the last frame. Defaults to 1
+        min_keypoints (int): The minimal number of detected keypoints (with
+            non-zero y coordinates) of an instance to start a new track.
+            Defaults to 3
+        sigmas (np.ndarray, optional): The keypoint sigmas used to compute
+            the OKS. If not given, use the sigmas on COCO dataset.
+            Defaults to ``None``
+
+    Example:
+        >>> tracker = PoseTracker(use_oks=True)
+        >>> for frame in video:
+        >>>     results = inference_topdown(model, frame, bboxes)
+        >>>     track_ids = tracker.update(results)
+    """
+
+    def __init__(self,
+                 use_oks: bool = False,
+                 tracking_thr: float = 0.3,
+                 max_age: int = 1,
+                 min_keypoints: int = 3,
+                 sigmas: Optional[np.ndarray] = None) -> None:
+        if max_age < 1:
+            raise ValueError(f'`max_age` should be at least 1, but got '
+                             f'{max_age}.')
+
+        self.use_oks = use_oks
+        self.tracking_thr = tracking_thr
+        self.max_age = max_age
+        self.min_keypoints = min_keypoints
+        self.sigmas = sigmas
+        self.reset()
+
+    def reset(self) -> None:
+        """Remove all tracks and restart the track ids from 0."""
+        self.next_id = 0
+        self.track_ids = np.zeros((0, ), dtype=np.int64)
+        self.ages = np.zeros((0, ), dtype=np.int64)
+        self.bboxes = np.zeros((0, 4), dtype=np.float32)
+        self.keypoints = np.zeros((0, 0, 3), dtype=np.float32)
+        self.areas = np.zeros((0, ), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def _similarity(self, bboxes: np.ndarray, keypoints: np.ndarray,
+                    areas: np.ndarray) -> np.ndarray:
+        """Compute the similarity between the instances and the tracks."""
+        if self.use_oks:
+            return oks_iou_matrix(
+                keypoints,
+                self.keypoints,
+                areas,
+                self.areas,
+                sigmas=self.sigmas)
+        return _compute_iou_matrix(bboxes, self.bboxes)
+
+    def update_instances(self,
+                         bboxes: np.ndarray,
+                         keypoints: np.ndarray,
+                         keypoint_scores: np.ndarray,
+                         areas: Optional[np.ndarray] = None) -> np.ndarray:
+        """Assign the instances of a new frame to the tracks.
+
+        Args:
+            bboxes (np.ndarray): The bboxes of the instances in shape (N, 4)
+                in (left, top, right, bottom) format
+            keypoints (np.ndarray): The keypoints of the instances in shape
+                (N, K, 2)
+            keypoint_scores (np.ndarray): The keypoint scores of the
+                instances in shape (N, K)
+            areas (np.ndarray, optional): The areas of the instances in shape
+                (N, ), which are used to compute the OKS. If not given, use
+                the bbox areas. Defaults to ``None``
+
+        Returns:
+            np.ndarray: The track id of each instance in shape (N, ), which is
+            -1 for the instances that are neither assigned to a track nor
+            start a new track.
+        """
+        bboxes = np.asarray(bboxes, dtype=np.float32)[..., :4].reshape(-1, 4)
+        keypoints = np.concatenate(
+            (np.asarray(keypoints), np.asarray(keypoint_scores)[..., None]),
+            axis=-1)
+        if areas is None:
+            areas = (bboxes[:, 2:] - bboxes[:, :2]).prod(axis=1)
+        areas = np.asarray(areas, dtype=np.float32).reshape(-1)
+        if len(self) == 0:
+            # the number of keypoints is only known from the instances
+            self.keypoints = np.zeros(
+                (0, ) + keypoints.shape[1:], dtype=np.float32)
+
+        num_instances = len(bboxes)
+        track_inds = np.full(num_instances, -1, dtype=np.int64)
+        if num_instances > 0 and len(self) > 0:
+            similarity = self._similarity(bboxes, keypoints, areas)
+            valid = similarity > self.tracking_thr
+            # only the pairs above the threshold contribute to the total
+            # similarity, so that they are not traded for invalid pairs
+            rows, cols = linear_sum_assignment(
+                np.where(valid, similarity, 0.), maximize=True)
+            keep = valid[rows, cols]
+            track_inds[rows[keep]] = cols[keep]
+
+        matched = track_inds >= 0
+        track_ids = np.full(num_instances, -1, dtype=np.int64)
+        track_ids[matched] = self.track_ids[track_inds[matched]]
+
+        # start new tracks from the unmatched instances with enough keypoints
+        num_detected = np.count_nonzero(keypoints[..., 1], axis=1)
+        new = ~matched & (num_detected >= self.min_keypoints)
+        track_ids[new] = self.next_id + np.arange(np.count_nonzero(new))
+        self.next_id += int(np.count_nonzero(new))
+
+        # update the matched tracks, age the others and remove the old ones
+        self.ages += 1
+        if matched.any():
+            inds = track_inds[matched]
+            self.ages[inds] = 0
+            self.bboxes[inds] = bboxes[matched]
+            self.keypoints[inds] = keypoints[matched]
+            self.areas[inds] = areas[matched]
+
+        alive = self.ages < self.max_age
+        self.track_ids = self.track_ids[alive]
+        self.ages = self.ages[alive]
+        self.bboxes = self.bboxes[alive]
+        self.keypoints = self.keypoints[alive]
+        self.areas = self.areas[alive]
+        if new.any():
+            self.track_ids = np.concatenate((self.track_ids, track_ids[new]))
+            self.ages = np.concatenate(
+                (self.ages, np.zeros(np.count_nonzero(new), np.int64)))
+            self.bboxes = np.concatenate((self.bboxes, bboxes[new]))
+            self.keypoints = np.concatenate((self.keypoints, keypoints[new]))
+            self.areas = np.concatenate((self.areas, areas[new]))
+
+        return track_ids
+
+    def update(self, frame_results: List[PoseDataSample]) -> np.ndarray:
+        """Assign the pose estimation results of a new frame to the tracks,
+        and set the ``track_id`` of each result.
+
+        Args:
+            frame_results (List[PoseDataSample]): The pose estimation results
+                of the frame, each containing one instance, e.g. the results
+                of :func:`mmpose.apis.inference_topdown`
+
+        Returns:
+            np.ndarray: The track id of each result, which is -1 for the
+            results that are neither assigned to a track nor start a new
+            track.
+        """
+        if len(frame_results) == 0:
+            return self.update_instances(
+                np.zeros((0, 4)), np.zeros((0, 0, 2)), np.zeros((0, 0)))
+
+        pred_instances = [res.pred_instances for res in frame_results]
+        areas = None
+        if all('areas' in inst for inst in pred_instances):
+            areas = np.concatenate([
+                np.asarray(inst.areas).reshape(-1) for inst in pred_instances
+            ])
+        track_ids = self.update_instances(
+            np.concatenate([inst.bboxes for inst in pred_instances]),
+            np.concatenate([inst.keypoints for inst in pred_instances]),
+            np.concatenate([inst.keypoint_scores for inst in pred_instances]),
+            areas=areas)
+
+        for res, track_id in zip(frame_results, track_ids):
+            res.set_field(int(track_id), 'track_id')
+        return track_ids
@@ -4,7 +4,7 @@ import logging
 import mimetypes
 import os
 from collections import defaultdict
-from typing import (Callable, Dict, Generator, Iterable, List, Optional,
+from typing import (Any, Callable, Dict, Generator, Iterable, List, Optional,
                     Sequence, Tuple, Union)
 
 import cv2
@@ -27,7 +27,8 @@ from rich.progress import track
 from mmpose.apis.inference import dataset_meta_from_config
 from mmpose.registry import DATASETS
 from mmpose.structures import PoseDataSample, split_instances
-from .utils import default_det_models
+from mmpose.utils import ImageCache, profile_stage
+from .utils import PredictionWriter, default_det_models, threaded_map
 
 try:
     from mmdet.apis.det_inferencer import DetInferencer
@@ -53,7 +54,22 @@ class BaseMMPoseInferencer(BaseInferencer):
         'return_vis', 'show', 'wait_time', 'draw_bbox', 'radius', 'thickness',
         'kpt_thr', 'vis_out_dir', 'black_background'
     }
-    postprocess_kwargs: set = {'pred_out_dir', 'return_datasample'}
+    postprocess_kwargs: set = {
+        'pred_out_dir', 'pred_out_format', 'return_datasample'
+    }
+
+    # whether the data samples of multiple inputs can be processed in one
+    # batch. If ``True``, the data samples of each input are marked by the
+    # ``input_index`` in the metainfo, and :meth:`forward` should return one
+    # data sample for each input in the batch
+    support_batch_inference: bool = False
+
+    # whether the stages of the inference can run concurrently in the
+    # pipelined mode, which requires that the stages do not share states
+    # through the inferencer, e.g. ``self._buffer``
+    support_pipelined_inference: bool = False
+    # the maximum number of items waiting between two pipelined stages
+    pipelined_queue_size: int = 4
 
     def __init__(self,
                  model: Union[ModelType, str, None] = None,
@@ -200,7 +216,7 @@ class BaseMMPoseInferencer(BaseInferencer):
                         writer=None,
                         width=video.width,
                         height=video.height,
-                        predictions=[])
+                        pred_writer=None)
                     inputs = video
                 elif input_type == 'image':
                     inputs = [inputs]
@@ -272,7 +288,7 @@ class BaseMMPoseInferencer(BaseInferencer):
             writer=None,
             width=width,
             height=height,
-            predictions=[])
+            pred_writer=None)
 
         def _webcam_reader() -> Generator:
             while True:
@@ -321,7 +337,12 @@ class BaseMMPoseInferencer(BaseInferencer):
 
         Args:
             inputs (InputsType): Inputs given by user.
-            batch_size (int): batch size. Defaults to 1.
+            batch_size (int): The number of data samples in a batch. The
+                data samples of multiple inputs are gathered into a batch
+                until it reaches ``batch_size``, and the data samples of an
+                input are never split into different batches. It only takes
+                effect if ``support_batch_inference`` is ``True``.
+                Defaults to 1.
             bbox_thr (float): threshold for bounding box detection.
                 Defaults to 0.3.
             nms_thr (float): IoU threshold for bounding box NMS.
@@ -344,6 +365,10 @@ class BaseMMPoseInferencer(BaseInferencer):
                 test_cfg['nms_thr'] = nms_thr
             self.model.test_cfg = test_cfg
 
+        if not self.support_batch_inference:
+            batch_size = 1
+
+        data_list, ori_inputs, img_paths = [], [], []
         for i, input in enumerate(inputs):
             bbox = bboxes[i] if bboxes else []
             data_infos = self.preprocess_single(
@@ -353,8 +378,43 @@ class BaseMMPoseInferencer(BaseInferencer):
                 bbox_thr=bbox_thr,
                 nms_thr=nms_thr,
                 **kwargs)
-            # only supports inference with batch size 1
-            yield self.collate_fn(data_infos), [input]
+
+            if self.support_batch_inference:
+                for data_info in data_infos:
+                    data_info['data_samples'].set_metainfo(
+                        dict(input_index=len(ori_inputs)))
+                if data_infos:
+                    img_paths.append(data_infos[0]['data_samples'].img_path)
+                elif isinstance(input, str):
+                    img_paths.append(input)
+                else:
+                    # the same image path as given by `preprocess_single`
+                    img_paths.append(f'{i}.jpg'.rjust(10, '0'))
+            data_list.extend(data_infos)
+            ori_inputs.append(input)
+
+            if len(data_list) >= batch_size:
+                yield self._collate(data_list, img_paths), ori_inputs
+                data_list, ori_inputs, img_paths = [], [], []
+
+        if ori_inputs:
+            yield self._collate(data_list, img_paths), ori_inputs
+
+    def _collate(self,
+                 data_list: list,
+                 img_paths: Optional[List[str]] = None) -> Any:
+        """Collate the processed data samples into a batch.
+
+        The image paths of all the inputs in the batch are kept in the
+        metainfo of each data sample as ``batch_img_paths``, so that the
+        inputs without any data sample can be recovered in ``forward``.
+        """
+        if img_paths:
+            for data_info in data_list:
+                data_info['data_samples'].set_metainfo(
+                    dict(batch_img_paths=img_paths))
+        with profile_stage('collate'):
+            return self.collate_fn(data_list)
 
     def __call__(
         self,
@@ -362,6 +422,7 @@ class BaseMMPoseInferencer(BaseInferencer):
         return_datasamples: bool = False,
         batch_size: int = 1,
         out_dir: Optional[str] = None,
+        pipelined: bool = False,
         **kwargs,
     ) -> dict:
         """Call the inferencer.
@@ -374,6 +435,10 @@ class BaseMMPoseInferencer(BaseInferencer):
             out_dir (str, optional): directory to save visualization
                 results and predictions. Will be overoden if vis_out_dir or
                 pred_out_dir are given. Defaults to None
+            pipelined (bool): Whether to run the stages of the inference,
+                i.e. decoding, preprocessing, forwarding and visualization,
+                concurrently in worker threads. See :meth:`_process_inputs`
+                for details. Defaults to False
             **kwargs: Key words arguments passed to :meth:`preprocess`,
                 :meth:`forward`, :meth:`visualize` and :meth:`postprocess`.
                 Each key in kwargs should be in the corresponding set of
@@ -423,23 +488,16 @@ class BaseMMPoseInferencer(BaseInferencer):
 
         if 'bbox_thr' in self.forward_kwargs:
             forward_kwargs['bbox_thr'] = preprocess_kwargs.get('bbox_thr', -1)
-        inputs = self.preprocess(
-            inputs, batch_size=batch_size, **preprocess_kwargs)
-
-        preds = []
 
-        for proc_inputs, ori_inputs in (track(inputs, description='Inference')
-                                        if self.show_progress else inputs):
-            preds = self.forward(proc_inputs, **forward_kwargs)
-
-            visualization = self.visualize(ori_inputs, preds,
-                                           **visualize_kwargs)
-            results = self.postprocess(
-                preds,
-                visualization,
-                return_datasamples=return_datasamples,
-                **postprocess_kwargs)
-            yield results
+        yield from self._process_inputs(
+            inputs,
+            batch_size=batch_size,
+            return_datasamples=return_datasamples,
+            pipelined=pipelined,
+            preprocess_kwargs=preprocess_kwargs,
+            forward_kwargs=forward_kwargs,
+            visualize_kwargs=visualize_kwargs,
+            postprocess_kwargs=postprocess_kwargs)
 
         if self._video_input:
             self._finalize_video_processing(
@@ -452,6 +510,114 @@ class BaseMMPoseInferencer(BaseInferencer):
         if hasattr(self, '_buffer'):
             self._buffer.clear()
 
+    def _process_inputs(self, inputs: Iterable, batch_size: int,
+                        return_datasamples: bool, pipelined: bool,
+                        preprocess_kwargs: dict, forward_kwargs: dict,
+                        visualize_kwargs: dict,
+                        postprocess_kwargs: dict) -> Generator:
+        """Run :meth:`preprocess`, :meth:`forward`, :meth:`visualize` and
+        :meth:`postprocess` on the inputs.
+
+        In the pipelined mode, the image decoding, the preprocessing (with
+        the detector), the forwarding and the visualization run in their own
+        worker threads, connected by bounded queues. The stages work on
+        different batches at the same time, e.g. the next frames are decoded
+        and the current predictions are drawn while the model is running.
+        The results are still yielded in the order of the inputs. The
+        visualization stays in the calling thread if the results are shown
+        in a window.
+
+        Args:
+            inputs (Iterable): The inputs converted by
+                :meth:`_inputs_to_list`
+            batch_size (int): Batch size
+            return_datasamples (bool): Whether to return results as
+                :obj:`BaseDataElement`
+            pipelined (bool): Whether to run the stages concurrently. It is
+                ignored if ``support_pipelined_inference`` is ``False``
+            preprocess_kwargs (dict): The arguments of :meth:`preprocess`
+            forward_kwargs (dict): The arguments of :meth:`forward`
+            visualize_kwargs (dict): The arguments of :meth:`visualize`
+            postprocess_kwargs (dict): The arguments of :meth:`postprocess`
+
+        Yields:
+            dict: Inference and visualization results of each batch.
+        """
+        if pipelined and not self.support_pipelined_inference:
+            print_log(
+                f'{self.__class__.__name__} does not support the pipelined '
+                'mode. The inference will run serially.',
+                logger='current',
+                level=logging.WARNING)
+            pipelined = False
+        if self._requires_sequential_inference(preprocess_kwargs) and (
+                batch_size > 1 or pipelined):
+            print_log(
+                'The preprocessing of each input depends on the predictions '
+                'of the last input. The inputs will be processed one by one '
+                'serially.',
+                logger='current',
+                level=logging.WARNING)
+            batch_size, pipelined = 1, False
+
+        def _decode(input):
+            if isinstance(input, str):
+                # decode the image in advance into the shared image cache
+                ImageCache.get_default().load(input)
+            return input
+
+        def _forward(batch):
+            proc_inputs, ori_inputs = batch
+            return self.forward(proc_inputs, **forward_kwargs), ori_inputs
+
+        def _visualize(batch):
+            preds, ori_inputs = batch
+            with profile_stage('visualization'):
+                visualization = self.visualize(ori_inputs, preds,
+                                               **visualize_kwargs)
+            return preds, visualization
+
+        if pipelined:
+            queue_size = self.pipelined_queue_size
+            inputs = threaded_map(_decode, inputs, queue_size)
+            batches = threaded_map(
+                None,
+                self.preprocess(
+                    inputs, batch_size=batch_size, **preprocess_kwargs),
+                queue_size)
+            batches = threaded_map(_forward, batches, queue_size)
+            if visualize_kwargs.get('show', False):
+                # the window can only be updated in the main thread
+                batches = map(_visualize, batches)
+            else:
+                batches = threaded_map(_visualize, batches, queue_size)
+        else:
+            batches = self.preprocess(
+                inputs, batch_size=batch_size, **preprocess_kwargs)
+            batches = map(_visualize, map(_forward, batches))
+
+        for preds, visualization in (track(batches, description='Inference')
+                                     if self.show_progress else batches):
+            results = self.postprocess(
+                preds,
+                visualization,
+                return_datasamples=return_datasamples,
+                **postprocess_kwargs)
+            yield results
+
+    def _requires_sequential_inference(self, preprocess_kwargs: dict) -> bool:
+        """Whether the preprocessing of each input depends on the
+        predictions of the last input, in which case the inputs can only be
+        processed one by one, without batching or pipelining.
+
+        Args:
+            preprocess_kwargs (dict): The arguments of :meth:`preprocess`
+
+        Returns:
+            bool: Whether the inputs should be processed sequentially.
+        """
+        return False
+
     def visualize(self,
                   inputs: list,
                   preds: List[PoseDataSample],
@@ -505,7 +671,8 @@ class BaseMMPoseInferencer(BaseInferencer):
 
         for single_input, pred in zip(inputs, preds):
             if isinstance(single_input, str):
-                img = mmcv.imread(single_input, channel_order='rgb')
+                img = ImageCache.get_default().load(single_input)
+                img = mmcv.bgr2rgb(img)
             elif isinstance(single_input, np.ndarray):
                 img = mmcv.bgr2rgb(single_input)
             else:
@@ -588,6 +755,7 @@ class BaseMMPoseInferencer(BaseInferencer):
         return_datasample=None,
         return_datasamples=False,
         pred_out_dir: str = '',
+        pred_out_format: str = 'json',
     ) -> dict:
         """Process the predictions and visualization results from ``forward``
         and ``visualize``.
@@ -606,6 +774,10 @@ class BaseMMPoseInferencer(BaseInferencer):
             pred_out_dir (str): Directory to save the inference results w/o
                 visualization. If left as empty, no file will be saved.
                 Defaults to ''.
+            pred_out_format (str): The format of the prediction file of a
+                video, which is written frame by frame by
+                :class:`PredictionWriter`. Options are ``'json'`` and
+                ``'jsonl'``. Defaults to ``'json'``.
 
         Returns:
             dict: Inference and visualization results with key ``predictions``
@@ -639,11 +811,19 @@ class BaseMMPoseInferencer(BaseInferencer):
         if pred_out_dir != '':
             for pred, data_sample in zip(result_dict['predictions'], preds):
                 if self._video_input:
-                    # For video or webcam input, predictions for each frame
-                    # are gathered in the 'predictions' key of 'video_info'
-                    # dictionary. All frame predictions are then stored into
-                    # a single file after processing all frames.
-                    self.video_info['predictions'].append(pred)
+                    # For video input, predictions for each frame are
+                    # appended to a single file as soon as they are ready,
+                    # so that they are not accumulated in memory.
+                    if self.video_info['pred_writer'] is None:
+                        fname = os.path.splitext(
+                            os.path.basename(self.video_info['name']))[0]
+                        self.video_info['pred_writer'] = PredictionWriter(
+                            join_path(pred_out_dir,
+                                      f'{fname}.{pred_out_format}'),
+                            format=pred_out_format)
+                    if isinstance(pred, PoseDataSample):
+                        pred = split_instances(pred.pred_instances)
+                    self.video_info['pred_writer'].write(pred)
                 else:
                     # For non-video inputs, predictions are stored in separate
                     # JSON files. The filename is determined by the basename
@@ -661,12 +841,11 @@ class BaseMMPoseInferencer(BaseInferencer):
         self,
         pred_out_dir: str = '',
     ):
-        """Finalize video processing by releasing the video writer and saving
-        predictions to a file.
+        """Finalize video processing by releasing the video writer and closing
+        the prediction file.
 
         This method should be called after completing the video processing. It
-        releases the video writer, if it exists, and saves the predictions to a
-        JSON file if a prediction output directory is provided.
+        releases the video writer and the prediction writer, if they exist.
         """
 
         # Release the video writer if it exists
@@ -678,14 +857,12 @@ class BaseMMPoseInferencer(BaseInferencer):
                 level=logging.INFO)
             self.video_info['writer'].release()
 
-        # Save predictions
-        if pred_out_dir:
-            fname = os.path.splitext(
-                os.path.basename(self.video_info['name']))[0] + '.json'
-            predictions = [
-                dict(frame_id=i, instances=pred)
-                for i, pred in enumerate(self.video_info['predictions'])
-            ]
-
-            mmengine.dump(
-                predictions, join_path(pred_out_dir, fname), indent='  ')
+        # Close the prediction file
+        if self.video_info['pred_writer'] is not None:
+            pred_writer = self.video_info['pred_writer']
+            pred_writer.close()
+            self.video_info['pred_writer'] = None
+            print_log(
+                f'the predictions have been saved at {pred_writer.file}',
+                logger='current',
+                level=logging.INFO)
@@ -17,6 +17,7 @@ from mmengine.structures import InstanceData
 from mmpose.evaluation.functional import nms
 from mmpose.registry import INFERENCERS
 from mmpose.structures import PoseDataSample, merge_data_samples
+from mmpose.utils import ImageCache
 from .base_mmpose_inferencer import BaseMMPoseInferencer
 
 InstanceList = List[InstanceData]
@@ -69,7 +70,9 @@ class Hand3DInferencer(BaseMMPoseInferencer):
         'vis_out_dir',
         'num_instances',
     }
-    postprocess_kwargs: set = {'pred_out_dir', 'return_datasample'}
+    postprocess_kwargs: set = {
+        'pred_out_dir', 'pred_out_format', 'return_datasample'
+    }
 
     def __init__(self,
                  model: Union[ModelType, str],
@@ -298,7 +301,8 @@ class Hand3DInferencer(BaseMMPoseInferencer):
 
         for single_input, pred in zip(inputs, preds):
             if isinstance(single_input, str):
-                img = mmcv.imread(single_input, channel_order='rgb')
+                img = ImageCache.get_default().load(single_input)
+                img = mmcv.bgr2rgb(img)
             elif isinstance(single_input, np.ndarray):
                 img = mmcv.bgr2rgb(single_input)
             else:
@@ -7,7 +7,6 @@ import torch
 from mmengine.config import Config, ConfigDict
 from mmengine.infer.infer import ModelType
 from mmengine.structures import InstanceData
-from rich.progress import track
 
 from .base_mmpose_inferencer import BaseMMPoseInferencer
 from .hand3d_inferencer import Hand3DInferencer
@@ -58,7 +57,7 @@ class MMPoseInferencer(BaseMMPoseInferencer):
 
     preprocess_kwargs: set = {
         'bbox_thr', 'nms_thr', 'bboxes', 'use_oks_tracking', 'tracking_thr',
-        'disable_norm_pose_2d'
+        'disable_norm_pose_2d', 'det_interval', 'propagate_score_thr'
     }
     forward_kwargs: set = {
         'merge_results', 'disable_rebase_keypoint', 'pose_based_nms'
@@ -68,7 +67,9 @@ class MMPoseInferencer(BaseMMPoseInferencer):
         'kpt_thr', 'vis_out_dir', 'skeleton_style', 'draw_heatmap',
         'black_background', 'num_instances'
     }
-    postprocess_kwargs: set = {'pred_out_dir', 'return_datasample'}
+    postprocess_kwargs: set = {
+        'pred_out_dir', 'pred_out_format', 'return_datasample'
+    }
 
     def __init__(self,
                  pose2d: Optional[str] = None,
@@ -104,6 +105,9 @@ class MMPoseInferencer(BaseMMPoseInferencer):
             raise ValueError('Either 2d or 3d pose estimation algorithm '
                              'should be provided.')
 
+        self.support_pipelined_inference = \
+            self.inferencer.support_pipelined_inference
+
     def preprocess(self, inputs: InputsType, batch_size: int = 1, **kwargs):
         """Process the inputs into a model-feedable format.
 
@@ -118,6 +122,12 @@ class MMPoseInferencer(BaseMMPoseInferencer):
         for data in self.inferencer.preprocess(inputs, batch_size, **kwargs):
             yield data
 
+    def _requires_sequential_inference(self, preprocess_kwargs: dict) -> bool:
+        """Whether the inputs should be processed sequentially, which is
+        decided by the inferencer in use."""
+        return self.inferencer._requires_sequential_inference(
+            preprocess_kwargs)
+
     @torch.no_grad()
     def forward(self, inputs: InputType, **forward_kwargs) -> PredType:
         """Forward the inputs to the model.
@@ -136,6 +146,7 @@ class MMPoseInferencer(BaseMMPoseInferencer):
         return_datasamples: bool = False,
         batch_size: int = 1,
         out_dir: Optional[str] = None,
+        pipelined: bool = False,
         **kwargs,
     ) -> dict:
         """Call the inferencer.
@@ -148,6 +159,9 @@ class MMPoseInferencer(BaseMMPoseInferencer):
             out_dir (str, optional): directory to save visualization
                 results and predictions. Will be overoden if vis_out_dir or
                 pred_out_dir are given. Defaults to None
+            pipelined (bool): Whether to run the stages of the inference
+                concurrently in worker threads. It only takes effect for 2D
+                pose estimation. Defaults to False
             **kwargs: Key words arguments passed to :meth:`preprocess`,
                 :meth:`forward`, :meth:`visualize` and :meth:`postprocess`.
                 Each key in kwargs should be in the corresponding set of
@@ -194,27 +208,19 @@ class MMPoseInferencer(BaseMMPoseInferencer):
         if self._video_input:
             self.video_info = self.inferencer.video_info
 
-        inputs = self.preprocess(
-            inputs, batch_size=batch_size, **preprocess_kwargs)
-
         # forward
         if 'bbox_thr' in self.inferencer.forward_kwargs:
             forward_kwargs['bbox_thr'] = preprocess_kwargs.get('bbox_thr', -1)
 
-        preds = []
-
-        for proc_inputs, ori_inputs in (track(inputs, description='Inference')
-                                        if self.show_progress else inputs):
-            preds = self.forward(proc_inputs, **forward_kwargs)
-
-            visualization = self.visualize(ori_inputs, preds,
-                                           **visualize_kwargs)
-            results = self.postprocess(
-                preds,
-                visualization,
-                return_datasamples=return_datasamples,
-                **postprocess_kwargs)
-            yield results
+        yield from self._process_inputs(
+            inputs,
+            batch_size=batch_size,
+            return_datasamples=return_datasamples,
+            pipelined=pipelined,
+            preprocess_kwargs=preprocess_kwargs,
+            forward_kwargs=forward_kwargs,
+            visualize_kwargs=visualize_kwargs,
+            postprocess_kwargs=postprocess_kwargs)
 
         if self._video_input:
             self._finalize_video_processing(
@@ -2,7 +2,6 @@
 import logging
 from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-import mmcv
 import numpy as np
 import torch
 from mmengine.config import Config, ConfigDict
@@ -12,9 +11,11 @@ from mmengine.model import revert_sync_batchnorm
 from mmengine.registry import init_default_scope
 from mmengine.structures import InstanceData
 
+from mmpose.apis.inference import pipeline_topdown_instances
 from mmpose.evaluation.functional import nearby_joints_nms, nms
 from mmpose.registry import INFERENCERS
-from mmpose.structures import merge_data_samples
+from mmpose.structures import PoseDataSample, merge_data_samples
+from mmpose.utils import ImageCache, profile_stage
 from .base_mmpose_inferencer import BaseMMPoseInferencer
 
 InstanceList = List[InstanceData]
@@ -55,8 +56,11 @@ class Pose2DInferencer(BaseMMPoseInferencer):
             detection model. Defaults to None.
     """
 
-    preprocess_kwargs: set = {'bbox_thr', 'nms_thr', 'bboxes'}
+    preprocess_kwargs: set = {
+        'bbox_thr', 'nms_thr', 'bboxes', 'det_interval', 'propagate_score_thr'
+    }
     forward_kwargs: set = {'merge_results', 'pose_based_nms'}
+    support_pipelined_inference: bool = True
     visualize_kwargs: set = {
         'return_vis',
         'show',
@@ -70,7 +74,13 @@ class Pose2DInferencer(BaseMMPoseInferencer):
         'draw_heatmap',
         'black_background',
     }
-    postprocess_kwargs: set = {'pred_out_dir', 'return_datasample'}
+    postprocess_kwargs: set = {
+        'pred_out_dir', 'pred_out_format', 'return_datasample'
+    }
+
+    # the ratio to enlarge the bboxes propagated from the keypoints of the
+    # last frame when the detector is skipped
+    propagate_bbox_scale: float = 1.25
 
     def __init__(self,
                  model: Union[ModelType, str],
@@ -104,6 +114,14 @@ class Pose2DInferencer(BaseMMPoseInferencer):
             )
 
         self._video_input = False
+        self._buffer = dict()
+
+    @property
+    def support_batch_inference(self) -> bool:
+        """Only the top-down models support batch inference. The bottom-up
+        heads and test-time augmentations take one image at a time, and the
+        images of different sizes cannot be collated into a batch."""
+        return self.cfg.data_mode == 'topdown'
 
     def update_model_visualizer_settings(self,
                                          draw_heatmap: bool = False,
@@ -134,7 +152,9 @@ class Pose2DInferencer(BaseMMPoseInferencer):
                           bbox_thr: float = 0.3,
                           nms_thr: float = 0.3,
                           bboxes: Union[List[List], List[np.ndarray],
-                                        np.ndarray] = []):
+                                        np.ndarray] = [],
+                          det_interval: int = 1,
+                          propagate_score_thr: float = 0.3):
         """Process a single input into a model-feedable format.
 
         Args:
@@ -144,71 +164,147 @@ class Pose2DInferencer(BaseMMPoseInferencer):
                 Defaults to 0.3.
             nms_thr (float): IoU threshold for bounding box NMS.
                 Defaults to 0.3.
+            det_interval (int): The interval of the frames to run the
+                detector on. The inputs are treated as consecutive frames,
+                and on the other frames the bboxes are propagated from the
+                keypoints predicted on the last frame. Defaults to 1, which
+                runs the detector on every input.
+            propagate_score_thr (float): The keypoint score threshold of the
+                bbox propagation. The detector still runs if any instance of
+                the last frame has a mean keypoint score below it, i.e. the
+                instance may be lost, and only the keypoints with higher
+                scores are used to get the propagated bboxes.
+                Defaults to 0.3.
 
         Yields:
             Any: Data processed by the ``pipeline`` and ``collate_fn``.
         """
 
         if isinstance(input, str):
-            data_info = dict(img_path=input)
+            # decode the image only once for the detector, the pose pipeline
+            # and the visualizer
+            img = ImageCache.get_default().load(input)
+            data_info = dict(img=img, img_path=input)
         else:
+            img = input
             data_info = dict(img=input, img_path=f'{index}.jpg'.rjust(10, '0'))
         data_info.update(self.model.dataset_meta)
 
         if self.cfg.data_mode == 'topdown':
             bboxes = []
             if self.detector is not None:
-                try:
-                    det_results = self.detector(
-                        input, return_datasamples=True)['predictions']
-                except ValueError:
-                    print_log(
-                        'Support for mmpose and mmdet versions up to 3.1.0 '
-                        'will be discontinued in upcoming releases. To '
-                        'ensure ongoing compatibility, please upgrade to '
-                        'mmdet version 3.2.0 or later.',
-                        logger='current',
-                        level=logging.WARNING)
-                    det_results = self.detector(
-                        input, return_datasample=True)['predictions']
-                pred_instance = det_results[0].pred_instances.cpu().numpy()
-                bboxes = np.concatenate(
-                    (pred_instance.bboxes, pred_instance.scores[:, None]),
-                    axis=1)
-
-                label_mask = np.zeros(len(bboxes), dtype=np.uint8)
-                for cat_id in self.det_cat_ids:
-                    label_mask = np.logical_or(label_mask,
-                                               pred_instance.labels == cat_id)
-
-                bboxes = bboxes[np.logical_and(
-                    label_mask, pred_instance.scores > bbox_thr)]
-                bboxes = bboxes[nms(bboxes, nms_thr)]
+                bboxes = None
+                if det_interval > 1 and index % det_interval != 0:
+                    bboxes = self._propagate_bboxes(index, nms_thr,
+                                                    propagate_score_thr)
+                if bboxes is None:
+                    bboxes = self._detect_bboxes(img, bbox_thr, nms_thr)
+                self._buffer['last_index'] = index
 
             data_infos = []
-            if len(bboxes) > 0:
-                for bbox in bboxes:
+            with profile_stage('pipeline'):
+                if len(bboxes) > 0:
+                    inst = data_info.copy()
+                    inst['bbox'] = bboxes[:, :4]
+                    inst['bbox_score'] = bboxes[:, 4]
+                    data_infos = pipeline_topdown_instances(
+                        self.pipeline, inst)
+                else:
                     inst = data_info.copy()
-                    inst['bbox'] = bbox[None, :4]
-                    inst['bbox_score'] = bbox[4:5]
-                    data_infos.append(self.pipeline(inst))
-            else:
-                inst = data_info.copy()
 
-                # get bbox from the image size
-                if isinstance(input, str):
-                    input = mmcv.imread(input)
-                h, w = input.shape[:2]
+                    # get bbox from the image size
+                    h, w = img.shape[:2]
 
-                inst['bbox'] = np.array([[0, 0, w, h]], dtype=np.float32)
-                inst['bbox_score'] = np.ones(1, dtype=np.float32)
-                data_infos.append(self.pipeline(inst))
+                    inst['bbox'] = np.array([[0, 0, w, h]], dtype=np.float32)
+                    inst['bbox_score'] = np.ones(1, dtype=np.float32)
+                    data_infos.append(self.pipeline(inst))
 
         else:  # bottom-up
-            data_infos = [self.pipeline(data_info)]
+            with profile_stage('pipeline'):
+                data_infos = [self.pipeline(data_info)]
 
         return data_infos
 
+    def _detect_bboxes(self, img: np.ndarray, bbox_thr: float,
+                       nms_thr: float) -> np.ndarray:
+        """Detect the bboxes of the instances in the image.
+
+        Returns:
+            np.ndarray: The bboxes in shape (N, 5), in (left, top, right,
+            bottom, score) format.
+        """
+        with profile_stage('detection'):
+            try:
+                det_results = self.detector(
+                    img, return_datasamples=True)['predictions']
+            except ValueError:
+                print_log(
+                    'Support for mmpose and mmdet versions up to 3.1.0 '
+                    'will be discontinued in upcoming releases. To '
+                    'ensure ongoing compatibility, please upgrade to '
+                    'mmdet version 3.2.0 or later.',
+                    logger='current',
+                    level=logging.WARNING)
+                det_results = self.detector(
+                    img, return_datasample=True)['predictions']
+        pred_instance = det_results[0].pred_instances.cpu().numpy()
+        bboxes = np.concatenate(
+            (pred_instance.bboxes, pred_instance.scores[:, None]), axis=1)
+
+        label_mask = np.zeros(len(bboxes), dtype=np.uint8)
+        for cat_id in self.det_cat_ids:
+            label_mask = np.logical_or(label_mask,
+                                       pred_instance.labels == cat_id)
+
+        keep = np.logical_and(label_mask, pred_instance.scores > bbox_thr)
+        bboxes = bboxes[keep]
+        with profile_stage('bbox_nms'):
+            keep = nms(bboxes, nms_thr)
+        return bboxes[keep]
+
+    def _propagate_bboxes(self, index: int, nms_thr: float,
+                          score_thr: float) -> Optional[np.ndarray]:
+        """Get the bboxes of the instances from the keypoints predicted on
+        the last frame, so that the detector can be skipped.
+
+        Returns:
+            np.ndarray, optional: The bboxes in shape (N, 5), in (left, top,
+            right, bottom, score) format, where the scores are the bbox
+            scores of the last frame. ``None`` if the bboxes can not be
+            propagated, e.g. the last input is not the last frame or an
+            instance of the last frame has low keypoint scores.
+        """
+        last_results = self._buffer.get('last_pose_results')
+        if not last_results or self._buffer.get('last_index') != index - 1:
+            return None
+
+        pred_instances = [ds.pred_instances for ds in last_results]
+        keypoints = np.concatenate([inst.keypoints for inst in pred_instances])
+        scores = np.concatenate(
+            [inst.keypoint_scores for inst in pred_instances])
+        bbox_scores = np.concatenate(
+            [inst.bbox_scores for inst in pred_instances])
+        if len(keypoints) == 0 or scores.mean(axis=1).min() < score_thr:
+            return None
+
+        visible = (scores > score_thr)[..., None]
+        lt = np.where(visible, keypoints, np.inf).min(axis=1)
+        rb = np.where(visible, keypoints, -np.inf).max(axis=1)
+        center = (lt + rb) / 2
+        half_size = (rb - lt) * self.propagate_bbox_scale / 2
+        bboxes = np.concatenate(
+            (center - half_size, center + half_size, bbox_scores[:, None]),
+            axis=1)
+        with profile_stage('bbox_nms'):
+            keep = nms(bboxes, nms_thr)
+        return bboxes[keep]
+
+    def _requires_sequential_inference(self, preprocess_kwargs: dict) -> bool:
+        """The bboxes can only be propagated from the predictions of the
+        last frame if the frames are processed one by one."""
+        return self.cfg.data_mode == 'topdown' and preprocess_kwargs.get(
+            'det_interval', 1) > 1
+
     @torch.no_grad()
     def forward(self,
                 inputs: Union[dict, tuple],
@@ -220,9 +316,9 @@ class Pose2DInferencer(BaseMMPoseInferencer):
         Args:
             inputs (Union[dict, tuple]): The input data to be processed. Can
                 be either a dictionary or a tuple.
-            merge_results (bool, optional): Whether to merge data samples,
-                default to True. This is only applicable when the data_mode
-                is 'topdown'.
+            merge_results (bool, optional): Whether to merge the data
+                samples of each input, default to True. This is only
+                applicable when the data_mode is 'topdown'.
             bbox_thr (float, optional): A threshold for the bounding box
                 scores. Bounding boxes with scores greater than this value
                 will be retained. Default value is -1 which retains all
@@ -233,7 +329,23 @@ class Pose2DInferencer(BaseMMPoseInferencer):
         """
         data_samples = self.model.test_step(inputs)
         if self.cfg.data_mode == 'topdown' and merge_results:
-            data_samples = [merge_data_samples(data_samples)]
+            # merge the instances of each input in the batch, where an input
+            # without any instance gets an empty data sample
+            img_paths = data_samples[0].get('batch_img_paths', [None]) \
+                if data_samples else []
+            groups = [[] for _ in img_paths]
+            for ds in data_samples:
+                groups[ds.get('input_index', 0)].append(ds)
+            merged = []
+            for group, img_path in zip(groups, img_paths):
+                if group:
+                    merged.append(merge_data_samples(group))
+                else:
+                    merged.append(
+                        PoseDataSample(
+                            metainfo=dict(img_path=img_path),
+                            pred_instances=data_samples[0].pred_instances[:0]))
+            data_samples = merged
 
         if bbox_thr > 0:
             for ds in data_samples:
@@ -259,4 +371,8 @@ class Pose2DInferencer(BaseMMPoseInferencer):
                 )
                 ds.pred_instances = ds.pred_instances[kept_indices]
 
+        if self.cfg.data_mode == 'topdown':
+            # keep the predictions to propagate the bboxes to the next frame
+            self._buffer['last_pose_results'] = data_samples
+
         return data_samples
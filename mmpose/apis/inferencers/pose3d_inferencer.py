@@ -13,10 +13,11 @@ from mmengine.model import revert_sync_batchnorm
 from mmengine.registry import init_default_scope
 from mmengine.structures import InstanceData
 
-from mmpose.apis import (_track_by_iou, _track_by_oks, collate_pose_sequence,
-                         convert_keypoint_definition, extract_pose_sequence)
+from mmpose.apis import (PoseSequenceBuffer, PoseTracker,
+                         convert_keypoint_definition)
 from mmpose.registry import INFERENCERS
 from mmpose.structures import PoseDataSample, merge_data_samples
+from mmpose.utils import ImageCache
 from .base_mmpose_inferencer import BaseMMPoseInferencer
 from .pose2d_inferencer import Pose2DInferencer
 
@@ -77,7 +78,9 @@ class Pose3DInferencer(BaseMMPoseInferencer):
         'kpt_thr',
         'vis_out_dir',
     }
-    postprocess_kwargs: set = {'pred_out_dir', 'return_datasample'}
+    postprocess_kwargs: set = {
+        'pred_out_dir', 'pred_out_format', 'return_datasample'
+    }
 
     def __init__(self,
                  model: Union[ModelType, str],
@@ -116,8 +119,7 @@ class Pose3DInferencer(BaseMMPoseInferencer):
             pose_lift_dataset=self.model.dataset_meta['dataset_name'],
         )
 
-        self._pose_seq_extractor = partial(
-            extract_pose_sequence,
+        self._pose_seq_buffer_cfg = dict(
             causal=self.cfg.test_dataloader.dataset.get('causal', False),
             seq_len=self.cfg.test_dataloader.dataset.get('seq_len', 1),
             step=self.cfg.test_dataloader.dataset.get('seq_step', 1))
@@ -191,29 +193,20 @@ class Pose3DInferencer(BaseMMPoseInferencer):
         img_path = results_pose2d[0].metainfo['img_path']
 
         # instance matching
-        if use_oks_tracking:
-            _track = partial(_track_by_oks)
-        else:
-            _track = _track_by_iou
-
+        tracker = self._buffer.get('pose_tracker')
+        if tracker is None or tracker.use_oks != use_oks_tracking or \
+                tracker.tracking_thr != tracking_thr:
+            tracker = PoseTracker(
+                use_oks=use_oks_tracking, tracking_thr=tracking_thr)
+            self._buffer['pose_tracker'] = tracker
+
+        tracker.update(results_pose2d)
         for result in results_pose2d:
-            track_id, self._buffer['results_pose2d_last'], _ = _track(
-                result, self._buffer['results_pose2d_last'], tracking_thr)
-            if track_id == -1:
-                pred_instances = result.pred_instances.cpu().numpy()
-                keypoints = pred_instances.keypoints
-                if np.count_nonzero(keypoints[:, :, 1]) >= 3:
-                    next_id = self._buffer.get('next_id', 0)
-                    result.set_field(next_id, 'track_id')
-                    self._buffer['next_id'] = next_id + 1
-                else:
-                    # If the number of keypoints detected is small,
-                    # delete that person instance.
-                    result.pred_instances.keypoints[..., 1] = -10
-                    result.pred_instances.bboxes *= 0
-                    result.set_field(-1, 'track_id')
-            else:
-                result.set_field(track_id, 'track_id')
+            if result.track_id == -1:
+                # If the number of keypoints detected is small,
+                # delete that person instance.
+                result.pred_instances.keypoints[..., 1] = -10
+                result.pred_instances.bboxes *= 0
         self._buffer['pose2d_results'] = merge_data_samples(results_pose2d)
 
         # convert keypoints
@@ -221,64 +214,42 @@ class Pose3DInferencer(BaseMMPoseInferencer):
         for ds in results_pose2d_converted:
             ds.pred_instances.keypoints = self._keypoint_converter(
                 ds.pred_instances.keypoints)
-        self._buffer['pose_est_results_list'].append(results_pose2d_converted)
-
-        # extract and pad input pose2d sequence
-        pose_results_2d = self._pose_seq_extractor(
-            self._buffer['pose_est_results_list'],
-            frame_idx=index if self._video_input else 0)
-        causal = self.cfg.test_dataloader.dataset.get('causal', False)
-        target_idx = -1 if causal else len(pose_results_2d) // 2
-
-        stats_info = self.model.dataset_meta.get('stats_info', {})
-        bbox_center = stats_info.get('bbox_center', None)
-        bbox_scale = stats_info.get('bbox_scale', None)
-
-        pose_results_2d_copy = []
-        for pose_res in pose_results_2d:
-            pose_res_copy = []
-            for data_sample in pose_res:
-
-                data_sample_copy = PoseDataSample()
-                data_sample_copy.gt_instances = \
-                    data_sample.gt_instances.clone()
-                data_sample_copy.pred_instances = \
-                    data_sample.pred_instances.clone()
-                data_sample_copy.track_id = data_sample.track_id
-
-                kpts = data_sample.pred_instances.keypoints
-                bboxes = data_sample.pred_instances.bboxes
-                keypoints = []
-                for k in range(len(kpts)):
-                    kpt = kpts[k]
-                    if not disable_norm_pose_2d:
-                        bbox = bboxes[k]
-                        center = np.array([[(bbox[0] + bbox[2]) / 2,
-                                            (bbox[1] + bbox[3]) / 2]])
-                        scale = max(bbox[2] - bbox[0], bbox[3] - bbox[1])
-                        keypoints.append((kpt[:, :2] - center) / scale *
-                                         bbox_scale + bbox_center)
-                    else:
-                        keypoints.append(kpt[:, :2])
-                data_sample_copy.pred_instances.set_field(
-                    np.array(keypoints), 'keypoints')
-                pose_res_copy.append(data_sample_copy)
-
-            pose_results_2d_copy.append(pose_res_copy)
-        pose_sequences_2d = collate_pose_sequence(pose_results_2d_copy, True,
-                                                  target_idx)
-        if not pose_sequences_2d:
+        self._buffer['pose_est_results'] = results_pose2d_converted
+
+        # normalize the 2d keypoints with their bboxes
+        num_keypoints = self.model.dataset_meta['num_keypoints']
+        keypoints = np.zeros((0, num_keypoints, 2), dtype=np.float32)
+        if results_pose2d_converted:
+            keypoints = np.concatenate([
+                ds.pred_instances.keypoints[..., :2]
+                for ds in results_pose2d_converted
+            ])
+        if results_pose2d_converted and not disable_norm_pose_2d:
+            stats_info = self.model.dataset_meta.get('stats_info', {})
+            bbox_center = stats_info.get('bbox_center', None)
+            bbox_scale = stats_info.get('bbox_scale', None)
+            bboxes = np.concatenate(
+                [ds.pred_instances.bboxes for ds in results_pose2d_converted])
+            centers = (bboxes[:, None, :2] + bboxes[:, None, 2:4]) / 2
+            scales = np.maximum(bboxes[:, 2] - bboxes[:, 0],
+                                bboxes[:, 3] - bboxes[:, 1])
+            keypoints = (keypoints - centers) / scales[:, None, None] * \
+                bbox_scale + bbox_center
+
+        # gather the input pose2d sequences of all the instances, where the
+        # keypoints of the previous frames are kept in a ring buffer
+        seq_buffer = self._buffer.get('pose_seq_buffer')
+        if seq_buffer is None:
+            seq_buffer = PoseSequenceBuffer(**self._pose_seq_buffer_cfg)
+            self._buffer['pose_seq_buffer'] = seq_buffer
+        track_ids = [ds.track_id for ds in results_pose2d_converted]
+        pose_sequences_2d = seq_buffer.update(keypoints, track_ids)
+        if not len(pose_sequences_2d):
             return []
 
         data_list = []
-        for i, pose_seq in enumerate(pose_sequences_2d):
+        for keypoints_2d in pose_sequences_2d:
             data_info = dict()
-
-            keypoints_2d = pose_seq.pred_instances.keypoints
-            keypoints_2d = np.squeeze(
-                keypoints_2d,
-                axis=0) if keypoints_2d.ndim == 4 else keypoints_2d
-
             T, K, C = keypoints_2d.shape
 
             data_info['keypoints'] = keypoints_2d
@@ -319,7 +290,7 @@ class Pose3DInferencer(BaseMMPoseInferencer):
         pose_lift_results = self.model.test_step(inputs)
 
         # Post-processing of pose estimation results
-        pose_est_results_converted = self._buffer['pose_est_results_list'][-1]
+        pose_est_results_converted = self._buffer['pose_est_results']
         for idx, pose_lift_res in enumerate(pose_lift_results):
             # Update track_id from the pose estimation results
             pose_lift_res.track_id = pose_est_results_converted[idx].get(
@@ -411,7 +382,8 @@ class Pose3DInferencer(BaseMMPoseInferencer):
 
         for single_input, pred in zip(inputs, preds):
             if isinstance(single_input, str):
-                img = mmcv.imread(single_input, channel_order='rgb')
+                img = ImageCache.get_default().load(single_input)
+                img = mmcv.bgr2rgb(img)
             elif isinstance(single_input, np.ndarray):
                 img = mmcv.bgr2rgb(single_input)
             else:
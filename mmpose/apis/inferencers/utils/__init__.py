@@ -1,5 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .default_det_models import default_det_models
 from .get_model_alias import get_model_aliases
+from .prediction_writer import PredictionReader, PredictionWriter
+from .threaded_map import threaded_map
 
-__all__ = ['default_det_models', 'get_model_aliases']
+__all__ = [
+    'default_det_models', 'get_model_aliases', 'threaded_map',
+    'PredictionWriter', 'PredictionReader'
+]
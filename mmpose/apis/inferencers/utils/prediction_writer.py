@@ -0,0 +1,162 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os
+import os.path as osp
+from typing import Any, Optional
+
+import mmengine
+import numpy as np
+from mmengine.utils import mkdir_or_exist
+
+
+class PredictionWriter:
+    """Write the predictions of video frames to a file incrementally.
+
+    The predictions of each frame are written as soon as they are available,
+    so the memory usage does not grow with the length of the video. Two
+    formats are supported:
+
+        - ``'json'``: a JSON list of ``dict(frame_id, instances)``, which is
+            complete after :meth:`close` is called
+        - ``'jsonl'``: JSON Lines, one ``dict(frame_id, instances)`` per
+            line. Each line is flushed once written, so the predictions of
+            the processed frames are kept even if the job is interrupted.
+            The byte offset of each line is stored in an index file
+            ``<file>.idx`` as int64, which allows random access by the frame
+            id through :class:`PredictionReader`
+
+    Args:
+        file (str): The output file path
+        format (str): The file format. Options are ``'json'`` and
+            ``'jsonl'``. Defaults to ``'json'``
+    """
+
+    def __init__(self, file: str, format: str = 'json') -> None:
+        if format not in ('json', 'jsonl'):
+            raise ValueError(f'Invalid prediction file format "{format}". '
+                             'Options are "json" and "jsonl".')
+
+        self.file = file
+        self.format = format
+        self.num_frames = 0
+
+        mkdir_or_exist(osp.dirname(osp.abspath(file)))
+        self._file = open(file, 'wb')
+        self._index_file = None
+        if format == 'json':
+            self._file.write(b'[')
+        else:
+            self._index_file = open(f'{file}.idx', 'wb')
+
+    def write(self, instances: Any, frame_id: Optional[int] = None) -> None:
+        """Write the predictions of the next frame.
+
+        Args:
+            instances (Any): The json-serializable predictions of the frame,
+                which may contain numpy arrays and scalars
+            frame_id (int, optional): The frame id. Defaults to the number of
+                frames written before
+        """
+        if frame_id is None:
+            frame_id = self.num_frames
+        # dump with the json handler of mmengine, which converts the numpy
+        # arrays and scalars like ``mmengine.dump`` of the other predictions
+        line = mmengine.dump(
+            dict(frame_id=frame_id, instances=instances),
+            file_format='json').encode('utf-8')
+
+        if self.format == 'json':
+            self._file.write(b',\n' if self.num_frames else b'\n')
+            self._file.write(line)
+        else:
+            self._index_file.write(np.int64(self._file.tell()).tobytes())
+            self._file.write(line + b'\n')
+            self._file.flush()
+            self._index_file.flush()
+
+        self.num_frames += 1
+
+    def close(self) -> None:
+        """Finish and close the file."""
+        if self._file.closed:
+            return
+        if self.format == 'json':
+            self._file.write(b'\n]\n')
+        else:
+            self._index_file.close()
+        self._file.close()
+
+    def __enter__(self) -> 'PredictionWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class PredictionReader:
+    """Read the predictions of video frames written by
+    :class:`PredictionWriter` with random access by the frame index.
+
+    For the JSON Lines format, the line offsets are memory mapped from the
+    index file if it exists, or collected by scanning the file once
+    otherwise. A file in the JSON format is loaded as a whole.
+
+    Args:
+        file (str): The prediction file path
+
+    Example:
+        >>> reader = PredictionReader('predictions/video.jsonl')
+        >>> len(reader)
+        1000
+        >>> reader[500]['frame_id']
+        500
+    """
+
+    def __init__(self, file: str) -> None:
+        self.file = file
+        self.frames = None
+
+        with open(file, 'rb') as f:
+            is_json = f.read(1) == b'['
+        if is_json:
+            with open(file, 'rb') as f:
+                self.frames = json.load(f)
+            self.offsets = np.arange(len(self.frames), dtype=np.int64)
+            return
+
+        index_file = f'{file}.idx'
+        if osp.isfile(index_file) and os.path.getsize(index_file) > 0:
+            self.offsets = np.memmap(index_file, dtype=np.int64, mode='r')
+        else:
+            offsets = []
+            with open(file, 'rb') as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        offsets.append(offset)
+                    offset += len(line)
+            self.offsets = np.array(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, idx: int) -> dict:
+        """Read the predictions of a frame.
+
+        Args:
+            idx (int): The index of the frame in the file
+
+        Returns:
+            dict: The predictions with keys ``'frame_id'`` and
+            ``'instances'``.
+        """
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f'index {idx} is out of range')
+
+        if self.frames is not None:
+            return self.frames[idx]
+        with open(self.file, 'rb') as f:
+            f.seek(int(self.offsets[idx]))
+            return json.loads(f.readline())
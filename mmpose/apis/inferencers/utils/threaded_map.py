@@ -0,0 +1,80 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import queue
+import threading
+from typing import Any, Callable, Generator, Iterable, Optional
+
+_END = object()
+
+
+class _Raised:
+    """Wrap an exception raised in the worker thread."""
+
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+def threaded_map(func: Optional[Callable],
+                 iterable: Iterable,
+                 queue_size: int = 2) -> Generator[Any, None, None]:
+    """Apply a function to the items of an iterable in a background thread.
+
+    The items are taken from ``iterable`` and processed by ``func`` one by
+    one in a worker thread, and the results are put into a bounded queue,
+    from which they are yielded in the same order. The worker blocks once
+    ``queue_size`` results are waiting, so a fast stage never runs far
+    ahead of a slow consumer. Chaining multiple ``threaded_map`` makes a
+    pipeline where the stages run concurrently, e.g. decoding the next frame
+    while the current one is forwarded.
+
+    Exceptions raised in the worker are re-raised in the consumer thread.
+    If the consumer stops iterating, the worker is stopped as well.
+
+    Args:
+        func (Callable, optional): The function applied to each item. If
+            ``None``, the items are yielded as they are, which prefetches the
+            items of ``iterable`` in the background
+        iterable (Iterable): The items to process. It is iterated in the
+            worker thread
+        queue_size (int): The maximum number of results waiting in the
+            queue. Defaults to 2
+
+    Yields:
+        Any: The result of each item.
+    """
+    results = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def _put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker():
+        try:
+            for item in iterable:
+                if func is not None:
+                    item = func(item)
+                if not _put(item):
+                    return
+        except BaseException as e:  # noqa: B902
+            _put(_Raised(e))
+        else:
+            _put(_END)
+
+    thread = threading.Thread(target=_worker, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = results.get()
+            if item is _END:
+                break
+            if isinstance(item, _Raised):
+                raise item.exception
+            yield item
+    finally:
+        stopped.set()
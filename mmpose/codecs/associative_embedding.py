@@ -1,10 +1,14 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from functools import partial
 from itertools import product
 from typing import Any, List, Optional, Tuple
 
 import numpy as np
 import torch
 from munkres import Munkres
+from scipy.optimize import linear_sum_assignment
 from torch import Tensor
 
 from mmpose.registry import KEYPOINT_CODECS
@@ -15,19 +19,34 @@ from .utils import (batch_heatmap_nms, generate_gaussian_heatmaps,
                     refine_keypoints_dark_udp)
 
 
-def _py_max_match(scores):
-    """Apply munkres algorithm to get the best match.
+def _max_match(costs: np.ndarray, solver: str = 'munkres') -> np.ndarray:
+    """Match the rows to the columns with the minimum total cost.
 
     Args:
-        scores(np.ndarray): cost matrix.
+        costs (np.ndarray): The cost matrix in shape (M, N)
+        solver (str): The solver of the assignment problem, which should be
+            one of ``'munkres'`` and ``'scipy'``. The two solvers find the
+            same minimum total cost, but they may break the ties differently.
+            Defaults to ``'munkres'``
 
     Returns:
-        np.ndarray: best match.
+        np.ndarray: The matched column index of each row in shape (M, ), where
+        -1 means that the row is not matched, which happens when M > N.
     """
-    m = Munkres()
-    tmp = m.compute(scores)
-    tmp = np.array(tmp).astype(int)
-    return tmp
+    M, N = costs.shape
+    matches = np.full(M, -1, dtype=np.int64)
+    if solver == 'scipy':
+        rows, cols = linear_sum_assignment(costs)
+        matches[rows] = cols
+        return matches
+
+    if M > N:
+        padding = np.full((M, M - N), 1e10, dtype=np.float32)
+        costs = np.concatenate((costs, padding), axis=1)
+    pairs = np.array(Munkres().compute(costs), dtype=np.int64)
+    pairs = pairs[pairs[:, 1] < N]
+    matches[pairs[:, 0]] = pairs[:, 1]
+    return matches
 
 
 def _group_keypoints_by_tags(vals: np.ndarray,
@@ -36,8 +55,9 @@ def _group_keypoints_by_tags(vals: np.ndarray,
                              keypoint_order: List[int],
                              val_thr: float,
                              tag_thr: float = 1.0,
-                             max_groups: Optional[int] = None) -> np.ndarray:
-    """Group the keypoints by tags using Munkres algorithm.
+                             max_groups: Optional[int] = None,
+                             solver: str = 'munkres') -> np.ndarray:
+    """Group the keypoints by tags using the Hungarian algorithm.
 
     Note:
 
@@ -63,82 +83,78 @@ def _group_keypoints_by_tags(vals: np.ndarray,
             of the existing groups will initializes a new group
         max_groups (int, optional): The maximum group number. ``None`` means
             no limitation. Defaults to ``None``
+        solver (str): The solver to match the keypoints to the groups. See
+            :func:`_max_match` for details. Defaults to ``'munkres'``
 
     Returns:
         np.ndarray: grouped keypoints in shape (G, K, D+1), where the last
         dimenssion is the concatenated keypoint coordinates and scores.
     """
 
-    tag_k, loc_k, val_k = tags, locs, vals
     K, M, D = locs.shape
+    L = tags.shape[2]
     assert vals.shape == tags.shape[:2] == (K, M)
     assert len(keypoint_order) == K
 
-    default_ = np.zeros((K, 3 + tag_k.shape[2]), dtype=np.float32)
-
-    joint_dict = {}
-    tag_dict = {}
-    for i in range(K):
-        idx = keypoint_order[i]
-
-        tags = tag_k[idx]
-        joints = np.concatenate((loc_k[idx], val_k[idx, :, None], tags), 1)
-        mask = joints[:, 2] > val_thr
-        tags = tags[mask]  # shape: [M, L]
-        joints = joints[mask]  # shape: [M, 3 + L], 3: x, y, val
-
-        if joints.shape[0] == 0:
+    # The groups are stored in arrays in the order of creation. Each
+    # candidate creates at most one group, so there are at most K*M groups.
+    # A group is identified by the first tag value of the candidate that
+    # creates it, and a new candidate with the same value is added to the
+    # existing group instead of creating a new one. The tags of each group
+    # are kept in the order of addition, and the mean tag is only updated
+    # for the groups changed at each keypoint step.
+    group_joints = np.zeros((K * M, K, D + 1), dtype=np.float32)
+    group_tag_lists = np.zeros((K * M, K, L), dtype=np.float32)
+    group_tag_counts = np.zeros(K * M, dtype=np.int64)
+    group_tags = np.zeros((K * M, L), dtype=np.float32)
+    group_keys = dict()
+
+    for idx in keypoint_order:
+        mask = vals[idx] > val_thr
+        if not mask.any():
             continue
 
-        if i == 0 or len(joint_dict) == 0:
-            for tag, joint in zip(tags, joints):
-                key = tag[0]
-                joint_dict.setdefault(key, np.copy(default_))[idx] = joint
-                tag_dict[key] = [tag]
+        # shape: [M, D + 1]
+        joints = np.concatenate((locs[idx][mask], vals[idx][mask, None]), 1)
+        # shape: [M, L]
+        joint_tags = tags[idx][mask]
+        num_groups = len(group_keys)
+
+        if num_groups == 0:
+            matches = np.full(joints.shape[0], -1, dtype=np.int64)
         else:
-            # shape: [M]
-            grouped_keys = list(joint_dict.keys())
-            # shape: [M, L]
-            grouped_tags = [np.mean(tag_dict[i], axis=0) for i in grouped_keys]
-
-            # shape: [M, M, L]
-            diff = joints[:, None, 3:] - np.array(grouped_tags)[None, :, :]
-            # shape: [M, M]
-            diff_normed = np.linalg.norm(diff, ord=2, axis=2)
-            diff_saved = np.copy(diff_normed)
-            diff_normed = np.round(diff_normed) * 100 - joints[:, 2:3]
-
-            num_added = diff.shape[0]
-            num_grouped = diff.shape[1]
-
-            if num_added > num_grouped:
-                diff_normed = np.concatenate(
-                    (diff_normed,
-                     np.zeros((num_added, num_added - num_grouped),
-                              dtype=np.float32) + 1e10),
-                    axis=1)
-
-            pairs = _py_max_match(diff_normed)
-            for row, col in pairs:
-                if (row < num_added and col < num_grouped
-                        and diff_saved[row][col] < tag_thr):
-                    key = grouped_keys[col]
-                    joint_dict[key][idx] = joints[row]
-                    tag_dict[key].append(tags[row])
-                else:
-                    key = tags[row][0]
-                    joint_dict.setdefault(key, np.copy(default_))[idx] = \
-                        joints[row]
-                    tag_dict[key] = [tags[row]]
-
-    joint_dict_keys = list(joint_dict.keys())[:max_groups]
-
-    if joint_dict_keys:
-        results = np.array([joint_dict[i]
-                            for i in joint_dict_keys]).astype(np.float32)
-        results = results[..., :D + 1]
-    else:
-        results = np.empty((0, K, D + 1), dtype=np.float32)
+            # shape: [M, G]
+            diff_normed = np.linalg.norm(
+                joint_tags.astype(joints.dtype)[:, None] -
+                group_tags[None, :num_groups],
+                ord=2,
+                axis=2)
+            costs = np.round(diff_normed) * 100 - joints[:, D:]
+
+            matches = _max_match(costs, solver)
+            # the candidates far from the matched groups start new groups
+            rows = np.nonzero(matches >= 0)[0]
+            far = diff_normed[rows, matches[rows]] >= tag_thr
+            matches[rows[far]] = -1
+
+        updated_groups = set()
+        for row, group in enumerate(matches):
+            if group < 0:
+                key = joint_tags[row, 0]
+                group = group_keys.setdefault(key, len(group_keys))
+                group_tag_counts[group] = 0
+            group_joints[group, idx] = joints[row]
+            group_tag_lists[group, group_tag_counts[group]] = joint_tags[row]
+            group_tag_counts[group] += 1
+            updated_groups.add(group)
+
+        # average the tags of each group as a whole rather than keeping
+        # running sums, which keeps the float32 rounding of the mean tags
+        for group in updated_groups:
+            group_tags[group] = np.mean(
+                group_tag_lists[group, :group_tag_counts[group]], axis=0)
+
+    results = group_joints[:len(group_keys)][:max_groups].copy()
     return results
 
 
@@ -196,6 +212,17 @@ class AssociativeEmbedding(BaseKeypointCodec):
         decode_max_instances (int, optional): The maximum number of instances
             to decode. ``None`` means no limitation to the instance number.
             Defaults to ``None``
+        decode_num_workers (int): The number of workers to group the
+            keypoints of the images in a batch in parallel. 0 means grouping
+            the images serially in the main thread. Defaults to 0
+        decode_pool_type (str): The type of the worker pool, which should be
+            one of ``'thread'`` and ``'process'``. Defaults to ``'thread'``
+        decode_assignment_solver (str): The solver to match the keypoints to
+            the groups, which should be one of ``'munkres'`` and ``'scipy'``.
+            The scipy solver is faster on crowded images, but it may break
+            the ties of the matching costs differently and group some
+            keypoints differently from the Munkres solver. Defaults to
+            ``'munkres'``
 
     .. _`Associative Embedding: End-to-End Learning for Joint Detection and
     Grouping`: https://arxiv.org/abs/1611.05424
@@ -216,6 +243,9 @@ class AssociativeEmbedding(BaseKeypointCodec):
         decode_topk: int = 30,
         decode_center_shift=0.0,
         decode_max_instances: Optional[int] = None,
+        decode_num_workers: int = 0,
+        decode_pool_type: str = 'thread',
+        decode_assignment_solver: str = 'munkres',
     ) -> None:
         super().__init__()
         self.input_size = input_size
@@ -230,6 +260,18 @@ class AssociativeEmbedding(BaseKeypointCodec):
         self.decode_max_instances = decode_max_instances
         self.decode_keypoint_order = decode_keypoint_order.copy()
 
+        if decode_pool_type not in ('thread', 'process'):
+            raise ValueError('`decode_pool_type` should be one of "thread" '
+                             f'and "process", but got {decode_pool_type}')
+        if decode_assignment_solver not in ('munkres', 'scipy'):
+            raise ValueError('`decode_assignment_solver` should be one of '
+                             '"munkres" and "scipy", but got '
+                             f'{decode_assignment_solver}')
+        self.decode_num_workers = decode_num_workers
+        self.decode_pool_type = decode_pool_type
+        self.decode_assignment_solver = decode_assignment_solver
+        self._decode_pool = None
+
         if self.use_udp:
             self.scale_factor = ((np.array(input_size) - 1) /
                                  (np.array(heatmap_size) - 1)).astype(
@@ -375,21 +417,44 @@ class AssociativeEmbedding(BaseKeypointCodec):
             scores.
         """
 
-        def _group_func(inputs: Tuple):
-            vals, tags, locs = inputs
-            return _group_keypoints_by_tags(
-                vals,
-                tags,
-                locs,
-                keypoint_order=self.decode_keypoint_order,
-                val_thr=self.decode_keypoint_thr,
-                tag_thr=self.decode_tag_thr,
-                max_groups=self.decode_max_instances)
-
-        _results = map(_group_func, zip(batch_vals, batch_tags, batch_locs))
-        results = list(_results)
+        group_func = partial(
+            _group_keypoints_by_tags,
+            keypoint_order=self.decode_keypoint_order,
+            val_thr=self.decode_keypoint_thr,
+            tag_thr=self.decode_tag_thr,
+            max_groups=self.decode_max_instances,
+            solver=self.decode_assignment_solver)
+
+        if self.decode_num_workers > 0 and len(batch_vals) > 1:
+            _map = self._get_decode_pool().map
+        else:
+            _map = map
+
+        results = list(_map(group_func, batch_vals, batch_tags, batch_locs))
         return results
 
+    def _get_decode_pool(self) -> Executor:
+        """Get the worker pool to group the keypoints, which is created at
+        the first call."""
+        if self._decode_pool is None:
+            if self.decode_pool_type == 'thread':
+                self._decode_pool = ThreadPoolExecutor(self.decode_num_workers)
+            else:
+                self._decode_pool = ProcessPoolExecutor(
+                    self.decode_num_workers)
+        return self._decode_pool
+
+    def __getstate__(self) -> dict:
+        # the worker pool can not be pickled or copied
+        state = self.__dict__.copy()
+        state['_decode_pool'] = None
+        return state
+
+    def __del__(self) -> None:
+        # shut down the worker pool with the codec
+        if getattr(self, '_decode_pool', None) is not None:
+            self._decode_pool.shutdown(wait=False)
+
     def _fill_missing_keypoints(self, keypoints: np.ndarray,
                                 keypoint_scores: np.ndarray,
                                 heatmaps: np.ndarray, tags: np.ndarray):
@@ -1,14 +1,19 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
+from torch import Tensor
 
 from mmpose.registry import KEYPOINT_CODECS
+from mmpose.utils.tensor_utils import to_numpy
 from .base import BaseKeypointCodec
 from .utils.gaussian_heatmap import (generate_gaussian_heatmaps,
                                      generate_unbiased_gaussian_heatmaps)
-from .utils.post_processing import get_heatmap_maximum
-from .utils.refinement import refine_keypoints, refine_keypoints_dark
+from .utils.post_processing import (get_heatmap_maximum,
+                                    get_heatmap_maximum_torch)
+from .utils.refinement import (refine_keypoints, refine_keypoints_dark,
+                               refine_keypoints_dark_torch,
+                               refine_keypoints_torch)
 
 
 @KEYPOINT_CODECS.register_module()
@@ -41,6 +46,10 @@ class MSRAHeatmap(BaseKeypointCodec):
             modulation in DarkPose. The kernel size and sigma should follow
             the expirical formula :math:`sigma = 0.3*((ks-1)*0.5-1)+0.8`.
             Defaults to 11
+        decode_on_device (bool): Whether to decode a batch of heatmaps on
+            their device with :meth:`batch_decode`, so that only the decoded
+            keypoints and scores are copied to the host. Defaults to
+            ``False``
 
     .. _`Simple Baselines for Human Pose Estimation and Tracking`:
         https://arxiv.org/abs/1804.06208
@@ -55,12 +64,14 @@ class MSRAHeatmap(BaseKeypointCodec):
                  heatmap_size: Tuple[int, int],
                  sigma: float,
                  unbiased: bool = False,
-                 blur_kernel_size: int = 11) -> None:
+                 blur_kernel_size: int = 11,
+                 decode_on_device: bool = False) -> None:
         super().__init__()
         self.input_size = input_size
         self.heatmap_size = heatmap_size
         self.sigma = sigma
         self.unbiased = unbiased
+        self.decode_on_device = decode_on_device
 
         # The Gaussian blur kernel size of the heatmap modulation
         # in DarkPose and the sigma value follows the expirical
@@ -151,3 +162,46 @@ class MSRAHeatmap(BaseKeypointCodec):
         keypoints = keypoints * self.scale_factor
 
         return keypoints, scores
+
+    def batch_decode(self, batch_heatmaps: Tensor
+                     ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Decode keypoint coordinates from a batch of heatmaps on their
+        device. The decoded keypoint coordinates are in the input image
+        space.
+
+        Args:
+            batch_heatmaps (Tensor): Heatmaps in shape (B, K, H, W)
+
+        Returns:
+            tuple:
+            - batch_keypoints (List[np.ndarray]): Decoded keypoint coordinates
+                of the batch, each is in shape (1, K, D)
+            - batch_scores (List[np.ndarray]): The keypoint scores of the
+                batch, each is in shape (1, K). It usually represents the
+                confidence of the keypoint prediction
+        """
+        keypoints, scores = get_heatmap_maximum_torch(batch_heatmaps)
+
+        if self.unbiased:
+            # Alleviate biased coordinate
+            keypoints = refine_keypoints_dark_torch(
+                keypoints,
+                batch_heatmaps,
+                blur_kernel_size=self.blur_kernel_size)
+
+        else:
+            keypoints = refine_keypoints_torch(keypoints, batch_heatmaps)
+
+        # Restore the keypoint scale
+        keypoints = keypoints * keypoints.new_tensor(self.scale_factor)
+
+        # Only copy the decoded results to the host
+        keypoints, scores = to_numpy([keypoints, scores])
+
+        return list(keypoints[:, None]), list(scores[:, None])
+
+    @property
+    def support_batch_decoding(self) -> bool:
+        """Return whether the codec decodes a batch of heatmaps on their
+        device."""
+        return self.decode_on_device
@@ -1,12 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from itertools import product
-from typing import Optional, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
+import torch
+from torch import Tensor
 
-from mmpose.codecs.utils import get_simcc_maximum
-from mmpose.codecs.utils.refinement import refine_simcc_dark
+from mmpose.codecs.utils import get_simcc_maximum, get_simcc_maximum_torch
+from mmpose.codecs.utils.refinement import (refine_simcc_dark,
+                                            refine_simcc_dark_torch)
 from mmpose.registry import KEYPOINT_CODECS
+from mmpose.utils.tensor_utils import to_numpy
 from .base import BaseKeypointCodec
 
 
@@ -53,6 +57,10 @@ class SimCCLabel(BaseKeypointCodec):
             to False.
         decode_beta (float): The beta value for decoding visibility. Defaults
             to 150.0.
+        decode_on_device (bool): Whether to decode a batch of SimCC
+            representations on their device with :meth:`batch_decode`, so
+            that only the decoded keypoints and scores are copied to the
+            host. Defaults to False.
 
     .. _`SimCC: a Simple Coordinate Classification Perspective for Human Pose
     Estimation`: https://arxiv.org/abs/2107.03332
@@ -75,6 +83,7 @@ class SimCCLabel(BaseKeypointCodec):
         use_dark: bool = False,
         decode_visibility: bool = False,
         decode_beta: float = 150.0,
+        decode_on_device: bool = False,
     ) -> None:
         super().__init__()
 
@@ -86,6 +95,7 @@ class SimCCLabel(BaseKeypointCodec):
         self.use_dark = use_dark
         self.decode_visibility = decode_visibility
         self.decode_beta = decode_beta
+        self.decode_on_device = decode_on_device
 
         if isinstance(sigma, (float, int)):
             self.sigma = np.array([sigma, sigma])
@@ -179,14 +189,12 @@ class SimCCLabel(BaseKeypointCodec):
             scores = scores[None, :]
 
         if self.use_dark:
-            x_blur = int((self.sigma[0] * 20 - 7) // 3)
-            y_blur = int((self.sigma[1] * 20 - 7) // 3)
-            x_blur -= int((x_blur % 2) == 0)
-            y_blur -= int((y_blur % 2) == 0)
-            keypoints[:, :, 0] = refine_simcc_dark(keypoints[:, :, 0], simcc_x,
-                                                   x_blur)
-            keypoints[:, :, 1] = refine_simcc_dark(keypoints[:, :, 1], simcc_y,
-                                                   y_blur)
+            x_blur, y_blur = self._get_blur_kernel_sizes()
+            # refine on copies since the modulation is in-place
+            keypoints[:, :, 0] = refine_simcc_dark(keypoints[:, :, 0],
+                                                   simcc_x.copy(), x_blur)
+            keypoints[:, :, 1] = refine_simcc_dark(keypoints[:, :, 1],
+                                                   simcc_y.copy(), y_blur)
 
         keypoints /= self.simcc_split_ratio
 
@@ -199,6 +207,70 @@ class SimCCLabel(BaseKeypointCodec):
         else:
             return keypoints, scores
 
+    def batch_decode(self, batch_simcc_x: Tensor, batch_simcc_y: Tensor
+                     ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Decode keypoint coordinates from a batch of SimCC representations
+        on their device. The decoded coordinates are in the input image
+        space.
+
+        Args:
+            batch_simcc_x (Tensor): SimCC for x-axis in shape (B, K, Wx)
+            batch_simcc_y (Tensor): SimCC for y-axis in shape (B, K, Wy)
+
+        Returns:
+            tuple:
+            - batch_keypoints (List[np.ndarray]): Decoded coordinates of the
+                batch, each is in shape (1, K, D)
+            - batch_scores (List[np.ndarray]): The keypoint scores of the
+                batch, each is in shape (1, K). It usually represents the
+                confidence of the keypoint prediction. If
+                ``decode_visibility`` is ``True``, a tuple of the keypoint
+                scores and visibilities is returned instead.
+        """
+
+        keypoints, scores = get_simcc_maximum_torch(batch_simcc_x,
+                                                    batch_simcc_y)
+
+        if self.use_dark:
+            x_blur, y_blur = self._get_blur_kernel_sizes()
+            keypoints_x = refine_simcc_dark_torch(keypoints[..., 0],
+                                                  batch_simcc_x, x_blur)
+            keypoints_y = refine_simcc_dark_torch(keypoints[..., 1],
+                                                  batch_simcc_y, y_blur)
+            keypoints = torch.stack((keypoints_x, keypoints_y), dim=-1)
+
+        keypoints = keypoints / self.simcc_split_ratio
+
+        # Only copy the decoded results to the host
+        keypoints, scores = to_numpy([keypoints, scores])
+        batch_keypoints = list(keypoints[:, None])
+        batch_scores = list(scores[:, None])
+
+        if self.decode_visibility:
+            _, visibility = get_simcc_maximum_torch(
+                batch_simcc_x * self.decode_beta * self.sigma[0],
+                batch_simcc_y * self.decode_beta * self.sigma[1],
+                apply_softmax=True)
+            batch_visibility = list(to_numpy(visibility)[:, None])
+            return batch_keypoints, (batch_scores, batch_visibility)
+        else:
+            return batch_keypoints, batch_scores
+
+    @property
+    def support_batch_decoding(self) -> bool:
+        """Return whether the codec decodes a batch of SimCC representations
+        on their device."""
+        return self.decode_on_device
+
+    def _get_blur_kernel_sizes(self) -> Tuple[int, int]:
+        """Get the Gaussian blur kernel sizes of the x-axis and y-axis SimCC
+        modulation in DARK according to the label sigma."""
+        x_blur = int((self.sigma[0] * 20 - 7) // 3)
+        y_blur = int((self.sigma[1] * 20 - 7) // 3)
+        x_blur -= int((x_blur % 2) == 0)
+        y_blur -= int((y_blur % 2) == 0)
+        return x_blur, y_blur
+
     def _map_coordinates(
         self,
         keypoints: np.ndarray,
@@ -1,13 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import cv2
 import numpy as np
+from torch import Tensor
 
 from mmpose.registry import KEYPOINT_CODECS
+from mmpose.utils.tensor_utils import to_numpy
 from .base import BaseKeypointCodec
 from .utils import (generate_offset_heatmap, generate_udp_gaussian_heatmaps,
-                    get_heatmap_maximum, refine_keypoints_dark_udp)
+                    get_heatmap_maximum, get_heatmap_maximum_torch,
+                    refine_keypoints_dark_udp, refine_keypoints_dark_udp_torch)
 
 
 @KEYPOINT_CODECS.register_module()
@@ -52,6 +55,10 @@ class UDPHeatmap(BaseKeypointCodec):
             :math:`r=radius_factor*max(W, H)`. Defaults to 0.0546875
         blur_kernel_size (int): The Gaussian blur kernel size of the heatmap
             modulation in DarkPose. Defaults to 11
+        decode_on_device (bool): Whether to decode a batch of heatmaps on
+            their device with :meth:`batch_decode`, so that only the decoded
+            keypoints and scores are copied to the host. Only supported when
+            ``heatmap_type=='gaussian'``. Defaults to ``False``
 
     .. _`The Devil is in the Details: Delving into Unbiased Data Processing for
     Human Pose Estimation`: https://arxiv.org/abs/1911.07524
@@ -66,7 +73,8 @@ class UDPHeatmap(BaseKeypointCodec):
                  heatmap_type: str = 'gaussian',
                  sigma: float = 2.,
                  radius_factor: float = 0.0546875,
-                 blur_kernel_size: int = 11) -> None:
+                 blur_kernel_size: int = 11,
+                 decode_on_device: bool = False) -> None:
         super().__init__()
         self.input_size = input_size
         self.heatmap_size = heatmap_size
@@ -74,6 +82,7 @@ class UDPHeatmap(BaseKeypointCodec):
         self.radius_factor = radius_factor
         self.heatmap_type = heatmap_type
         self.blur_kernel_size = blur_kernel_size
+        self.decode_on_device = decode_on_device
         self.scale_factor = ((np.array(input_size) - 1) /
                              (np.array(heatmap_size) - 1)).astype(np.float32)
 
@@ -83,6 +92,11 @@ class UDPHeatmap(BaseKeypointCodec):
                 f'{self.heatmap_type}. Should be one of '
                 '{"gaussian", "combined"}')
 
+        if self.decode_on_device and self.heatmap_type != 'gaussian':
+            raise ValueError(
+                f'{self.__class__.__name__} only supports `decode_on_device` '
+                'when `heatmap_type` is "gaussian"')
+
     def encode(self,
                keypoints: np.ndarray,
                keypoints_visible: Optional[np.ndarray] = None) -> dict:
@@ -186,3 +200,39 @@ class UDPHeatmap(BaseKeypointCodec):
         keypoints = keypoints / [W - 1, H - 1] * self.input_size
 
         return keypoints, scores
+
+    def batch_decode(self, batch_heatmaps: Tensor
+                     ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Decode keypoint coordinates from a batch of Gaussian heatmaps on
+        their device. The decoded keypoint coordinates are in the input image
+        space.
+
+        Args:
+            batch_heatmaps (Tensor): Heatmaps in shape (B, K, H, W)
+
+        Returns:
+            tuple:
+            - batch_keypoints (List[np.ndarray]): Decoded keypoint coordinates
+                of the batch, each is in shape (1, K, D)
+            - batch_scores (List[np.ndarray]): The keypoint scores of the
+                batch, each is in shape (1, K). It usually represents the
+                confidence of the keypoint prediction
+        """
+        keypoints, scores = get_heatmap_maximum_torch(batch_heatmaps)
+        keypoints = refine_keypoints_dark_udp_torch(
+            keypoints, batch_heatmaps, blur_kernel_size=self.blur_kernel_size)
+
+        W, H = self.heatmap_size
+        keypoints = keypoints / keypoints.new_tensor(
+            [W - 1, H - 1]) * keypoints.new_tensor(self.input_size)
+
+        # Only copy the decoded results to the host
+        keypoints, scores = to_numpy([keypoints, scores])
+
+        return list(keypoints[:, None]), list(scores[:, None])
+
+    @property
+    def support_batch_decoding(self) -> bool:
+        """Return whether the codec decodes a batch of heatmaps on their
+        device."""
+        return self.decode_on_device
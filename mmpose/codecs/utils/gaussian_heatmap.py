@@ -1,5 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from itertools import product
+from functools import lru_cache
 from typing import Optional, Tuple, Union
 
 import numpy as np
@@ -117,6 +117,116 @@ def generate_3d_gaussian_heatmaps(
     return heatmaps, keypoint_weights
 
 
+@lru_cache(maxsize=64, typed=True)
+def _get_gaussian_kernel(sigma: float) -> np.ndarray:
+    """Get the unnormalized 2D Gaussian kernel of the given sigma, whose
+    center value equals 1. The kernel size follows the 3-sigma rule.
+
+    Args:
+        sigma (float): The sigma value of the Gaussian kernel
+
+    Returns:
+        np.ndarray: The read-only Gaussian kernel in shape (S, S)
+    """
+    # 3-sigma rule
+    radius = sigma * 3
+
+    # xy grid
+    gaussian_size = 2 * radius + 1
+    x = np.arange(0, gaussian_size, 1, dtype=np.float32)
+    y = x[:, None]
+    x0 = y0 = gaussian_size // 2
+
+    # The gaussian is not normalized,
+    # we want the center value to equal 1
+    gaussian = np.exp(-((x - x0)**2 + (y - y0)**2) / (2 * sigma**2))
+    gaussian = gaussian.astype(np.float32)
+    gaussian.flags.writeable = False
+
+    return gaussian
+
+
+def _get_gaussian_ranges(
+    keypoints: np.ndarray, keypoints_visible: np.ndarray, radius: float,
+    heatmap_size: Tuple[int, int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Get the integer gaussian centers and the gaussian ranges of keypoints,
+    and check whether each gaussian has an in-bounds part.
+
+    Args:
+        keypoints (np.ndarray): Keypoint coordinates in shape (N, K, D)
+        keypoints_visible (np.ndarray): Keypoint visibilities in shape
+            (N, K)
+        radius (float): The radius of the gaussian
+        heatmap_size (Tuple[int, int]): Heatmap size in [W, H]
+
+    Returns:
+        tuple:
+        - mu (np.ndarray): The integer gaussian centers in shape (N, K, 2)
+        - left_top (np.ndarray): The left-top corners of the gaussians in
+            shape (N, K, 2)
+        - right_bottom (np.ndarray): The right-bottom corners (exclusive) of
+            the gaussians in shape (N, K, 2)
+        - valid (np.ndarray): Whether each keypoint is labeled and its
+            gaussian has an in-bounds part, in shape (N, K)
+        - out_of_bounds (np.ndarray): Whether each keypoint is labeled but
+            its gaussian is out of the heatmap, in shape (N, K)
+    """
+    W, H = heatmap_size
+
+    mu = (keypoints[..., :2] + 0.5).astype(np.int64)
+    left_top = (mu - radius).astype(np.int64)
+    right_bottom = (mu + radius + 1).astype(np.int64)
+
+    # skip unlabled keypoints
+    labeled = ~(keypoints_visible < 0.5)
+    # check that the gaussian has in-bounds part
+    out_of_bounds = ((left_top[..., 0] >= W) | (left_top[..., 1] >= H) |
+                     (right_bottom[..., 0] < 0) | (right_bottom[..., 1] < 0))
+
+    return (mu, left_top, right_bottom, labeled & ~out_of_bounds,
+            labeled & out_of_bounds)
+
+
+def _paste_gaussians(heatmaps: np.ndarray, channels: np.ndarray,
+                     left_top: np.ndarray, right_bottom: np.ndarray,
+                     gaussians: np.ndarray) -> None:
+    """Paste local gaussians to the heatmaps in place by element-wise maximum.
+
+    Args:
+        heatmaps (np.ndarray): The heatmaps in shape (K, H, W)
+        channels (np.ndarray): The heatmap channel of each gaussian in shape
+            (P, )
+        left_top (np.ndarray): The left-top corners of the gaussians in
+            shape (P, 2)
+        right_bottom (np.ndarray): The right-bottom corners (exclusive) of the
+            gaussians in shape (P, 2)
+        gaussians (np.ndarray): The local gaussians in shape (S, S) which is
+            shared by all the keypoints, or (P, S, S)
+    """
+    _, H, W = heatmaps.shape
+    size = gaussians.shape[-1]
+
+    offsets = np.arange(size)
+    xs = left_top[:, :1] + offsets
+    ys = left_top[:, 1:] + offsets
+
+    # valid range in heatmap
+    x_valid = (xs >= 0) & (xs < np.minimum(W, right_bottom[:, :1]))
+    y_valid = (ys >= 0) & (ys < np.minimum(H, right_bottom[:, 1:]))
+    p, dy, dx = np.nonzero(y_valid[:, :, None] & x_valid[:, None, :])
+
+    if gaussians.ndim == 2:
+        values = gaussians[dy, dx]
+    else:
+        values = gaussians[p, dy, dx]
+
+    # scatter-max on the flattened heatmaps, which is much faster than
+    # indexing with a tuple of index arrays
+    indices = (channels[p] * H + ys[p, dy]) * W + xs[p, dx]
+    np.maximum.at(heatmaps.reshape(-1), indices, values)
+
+
 def generate_gaussian_heatmaps(
     heatmap_size: Tuple[int, int],
     keypoints: np.ndarray,
@@ -151,53 +261,29 @@ def generate_gaussian_heatmaps(
     if isinstance(sigma, (int, float)):
         sigma = (sigma, ) * N
 
-    for n in range(N):
-        # 3-sigma rule
-        radius = sigma[n] * 3
-
-        # xy grid
-        gaussian_size = 2 * radius + 1
-        x = np.arange(0, gaussian_size, 1, dtype=np.float32)
-        y = x[:, None]
-        x0 = y0 = gaussian_size // 2
-
-        for k in range(K):
-            # skip unlabled keypoints
-            if keypoints_visible[n, k] < 0.5:
-                continue
-
-            # get gaussian center coordinates
-            mu = (keypoints[n, k] + 0.5).astype(np.int64)
-
-            # check that the gaussian has in-bounds part
-            left, top = (mu - radius).astype(np.int64)
-            right, bottom = (mu + radius + 1).astype(np.int64)
+    # generate the gaussians of all the instances sharing the same sigma
+    # value at once
+    instance_sigmas = list(sigma)[:N]
+    for _sigma in dict.fromkeys(instance_sigmas):
+        inst_indices = np.array(
+            [n for n, s in enumerate(instance_sigmas) if s == _sigma])
 
-            if left >= W or top >= H or right < 0 or bottom < 0:
-                keypoint_weights[n, k] = 0
-                continue
-
-            # The gaussian is not normalized,
-            # we want the center value to equal 1
-            gaussian = np.exp(-((x - x0)**2 + (y - y0)**2) / (2 * sigma[n]**2))
-
-            # valid range in gaussian
-            g_x1 = max(0, -left)
-            g_x2 = min(W, right) - left
-            g_y1 = max(0, -top)
-            g_y2 = min(H, bottom) - top
-
-            # valid range in heatmap
-            h_x1 = max(0, left)
-            h_x2 = min(W, right)
-            h_y1 = max(0, top)
-            h_y2 = min(H, bottom)
-
-            heatmap_region = heatmaps[k, h_y1:h_y2, h_x1:h_x2]
-            gaussian_regsion = gaussian[g_y1:g_y2, g_x1:g_x2]
-
-            _ = np.maximum(
-                heatmap_region, gaussian_regsion, out=heatmap_region)
+        # 3-sigma rule
+        radius = _sigma * 3
+
+        _, left_top, right_bottom, valid, out_of_bounds = \
+            _get_gaussian_ranges(keypoints[inst_indices],
+                                 keypoints_visible[inst_indices], radius,
+                                 heatmap_size)
+        keypoint_weights[inst_indices[np.nonzero(out_of_bounds)[0]],
+                         np.nonzero(out_of_bounds)[1]] = 0
+
+        _paste_gaussians(
+            heatmaps,
+            channels=np.nonzero(valid)[1],
+            left_top=left_top[valid],
+            right_bottom=right_bottom[valid],
+            gaussians=_get_gaussian_kernel(_sigma))
 
     return heatmaps, keypoint_weights
 
@@ -239,22 +325,24 @@ def generate_unbiased_gaussian_heatmaps(
     x = np.arange(0, W, 1, dtype=np.float32)
     y = np.arange(0, H, 1, dtype=np.float32)[:, None]
 
-    for n, k in product(range(N), range(K)):
-        # skip unlabled keypoints
-        if keypoints_visible[n, k] < 0.5:
-            continue
-
-        mu = keypoints[n, k]
-        # check that the gaussian has in-bounds part
-        left, top = mu - radius
-        right, bottom = mu + radius + 1
+    # skip unlabled keypoints
+    labeled = ~(keypoints_visible < 0.5)
 
-        if left >= W or top >= H or right < 0 or bottom < 0:
-            keypoint_weights[n, k] = 0
-            continue
+    mu = keypoints[..., :2]
+    # check that the gaussian has in-bounds part
+    left, top = np.moveaxis(mu - radius, -1, 0)
+    right, bottom = np.moveaxis(mu + radius + 1, -1, 0)
+    out_of_bounds = (left >= W) | (top >= H) | (right < 0) | (bottom < 0)
 
-        gaussian = np.exp(-((x - mu[0])**2 + (y - mu[1])**2) / (2 * sigma**2))
+    keypoint_weights[labeled & out_of_bounds] = 0
+    valid = labeled & ~out_of_bounds
 
+    # the unbiased gaussians cover the whole heatmap, so generating them is
+    # bounded by the exp computation and batching the peaks does not help.
+    # Only the bounds checks above are vectorized.
+    for n, k in zip(*np.nonzero(valid)):
+        gaussian = np.exp(-((x - mu[n, k, 0])**2 + (y - mu[n, k, 1])**2) /
+                          (2 * sigma**2))
         _ = np.maximum(gaussian, heatmaps[k], out=heatmaps[k])
 
     return heatmaps, keypoint_weights
@@ -299,41 +387,23 @@ def generate_udp_gaussian_heatmaps(
     x = np.arange(0, gaussian_size, 1, dtype=np.float32)
     y = x[:, None]
 
-    for n, k in product(range(N), range(K)):
-        # skip unlabled keypoints
-        if keypoints_visible[n, k] < 0.5:
-            continue
-
-        mu = (keypoints[n, k] + 0.5).astype(np.int64)
-        # check that the gaussian has in-bounds part
-        left, top = (mu - radius).astype(np.int64)
-        right, bottom = (mu + radius + 1).astype(np.int64)
-
-        if left >= W or top >= H or right < 0 or bottom < 0:
-            keypoint_weights[n, k] = 0
-            continue
-
-        mu_ac = keypoints[n, k]
-        x0 = y0 = gaussian_size // 2
-        x0 += mu_ac[0] - mu[0]
-        y0 += mu_ac[1] - mu[1]
-        gaussian = np.exp(-((x - x0)**2 + (y - y0)**2) / (2 * sigma**2))
-
-        # valid range in gaussian
-        g_x1 = max(0, -left)
-        g_x2 = min(W, right) - left
-        g_y1 = max(0, -top)
-        g_y2 = min(H, bottom) - top
-
-        # valid range in heatmap
-        h_x1 = max(0, left)
-        h_x2 = min(W, right)
-        h_y1 = max(0, top)
-        h_y2 = min(H, bottom)
-
-        heatmap_region = heatmaps[k, h_y1:h_y2, h_x1:h_x2]
-        gaussian_regsion = gaussian[g_y1:g_y2, g_x1:g_x2]
-
-        _ = np.maximum(heatmap_region, gaussian_regsion, out=heatmap_region)
+    mu, left_top, right_bottom, valid, out_of_bounds = _get_gaussian_ranges(
+        keypoints, keypoints_visible, radius, heatmap_size)
+    keypoint_weights[out_of_bounds] = 0
+
+    # the gaussian centers are shifted by the sub-pixel offsets of keypoints
+    mu_ac = keypoints[..., :2][valid]
+    x0 = y0 = gaussian_size // 2
+    x0 = x0 + (mu_ac[:, 0] - mu[valid][:, 0])
+    y0 = y0 + (mu_ac[:, 1] - mu[valid][:, 1])
+    gaussians = np.exp(-((x - x0[:, None, None])**2 +
+                         (y - y0[:, None, None])**2) / (2 * sigma**2))
+
+    _paste_gaussians(
+        heatmaps,
+        channels=np.nonzero(valid)[1],
+        left_top=left_top[valid],
+        right_bottom=right_bottom[valid],
+        gaussians=gaussians.astype(np.float32))
 
     return heatmaps, keypoint_weights
@@ -1,5 +1,4 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from itertools import product
 from typing import Tuple
 
 import cv2
@@ -105,6 +104,50 @@ def get_simcc_maximum(simcc_x: np.ndarray,
     return locs, vals
 
 
+def get_simcc_maximum_torch(simcc_x: Tensor,
+                            simcc_y: Tensor,
+                            apply_softmax: bool = False
+                            ) -> Tuple[Tensor, Tensor]:
+    """Get maximum response location and value from simcc representations.
+    This is the PyTorch version of :func:`get_simcc_maximum` which runs on
+    the device of the simcc.
+
+    Note:
+        instance number: N
+        num_keypoints: K
+
+    Args:
+        simcc_x (Tensor): x-axis SimCC in shape (K, Wx) or (N, K, Wx)
+        simcc_y (Tensor): y-axis SimCC in shape (K, Wy) or (N, K, Wy)
+        apply_softmax (bool): whether to apply softmax on the heatmap.
+            Defaults to False.
+
+    Returns:
+        tuple:
+        - locs (Tensor): locations of maximum heatmap responses in shape
+            (K, 2) or (N, K, 2)
+        - vals (Tensor): values of maximum heatmap responses in shape
+            (K,) or (N, K)
+    """
+    assert simcc_x.shape[:-1] == simcc_y.shape[:-1], (
+        f'{simcc_x.shape} != {simcc_y.shape}')
+
+    if apply_softmax:
+        simcc_x = simcc_x.softmax(dim=-1)
+        simcc_y = simcc_y.softmax(dim=-1)
+
+    x_locs = simcc_x.argmax(dim=-1, keepdim=True)
+    y_locs = simcc_y.argmax(dim=-1, keepdim=True)
+    max_val_x = simcc_x.gather(-1, x_locs)[..., 0]
+    max_val_y = simcc_y.gather(-1, y_locs)[..., 0]
+
+    locs = torch.cat((x_locs, y_locs), dim=-1).float()
+    vals = torch.minimum(max_val_x, max_val_y)
+    locs[vals <= 0.] = -1
+
+    return locs, vals
+
+
 def get_heatmap_3d_maximum(heatmaps: np.ndarray
                            ) -> Tuple[np.ndarray, np.ndarray]:
     """Get maximum response location and value from heatmaps.
@@ -198,6 +241,41 @@ def get_heatmap_maximum(heatmaps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     return locs, vals
 
 
+def get_heatmap_maximum_torch(heatmaps: Tensor) -> Tuple[Tensor, Tensor]:
+    """Get maximum response location and value from heatmaps. This is the
+    PyTorch version of :func:`get_heatmap_maximum` which runs on the device
+    of the heatmaps.
+
+    Note:
+        batch_size: B
+        num_keypoints: K
+        heatmap height: H
+        heatmap width: W
+
+    Args:
+        heatmaps (Tensor): Heatmaps in shape (K, H, W) or (B, K, H, W)
+
+    Returns:
+        tuple:
+        - locs (Tensor): locations of maximum heatmap responses in shape
+            (K, 2) or (B, K, 2)
+        - vals (Tensor): values of maximum heatmap responses in shape
+            (K,) or (B, K)
+    """
+    assert heatmaps.ndim == 3 or heatmaps.ndim == 4, (
+        f'Invalid shape {heatmaps.shape}')
+
+    W = heatmaps.shape[-1]
+    heatmaps_flatten = heatmaps.flatten(-2)
+
+    indices = heatmaps_flatten.argmax(dim=-1, keepdim=True)
+    vals = heatmaps_flatten.gather(-1, indices)[..., 0]
+    locs = torch.cat((indices % W, indices // W), dim=-1).float()
+    locs[vals <= 0.] = -1
+
+    return locs, vals
+
+
 def gaussian_blur(heatmaps: np.ndarray, kernel: int = 11) -> np.ndarray:
     """Modulate heatmap distribution with Gaussian.
 
@@ -220,13 +298,18 @@ def gaussian_blur(heatmaps: np.ndarray, kernel: int = 11) -> np.ndarray:
     border = (kernel - 1) // 2
     K, H, W = heatmaps.shape
 
-    for k in range(K):
-        origin_max = np.max(heatmaps[k])
-        dr = np.zeros((H + 2 * border, W + 2 * border), dtype=np.float32)
-        dr[border:-border, border:-border] = heatmaps[k].copy()
-        dr = cv2.GaussianBlur(dr, (kernel, kernel), 0)
-        heatmaps[k] = dr[border:-border, border:-border].copy()
-        heatmaps[k] *= origin_max / np.max(heatmaps[k])
+    # blur all the channels in one call by stacking the zero-padded heatmaps
+    # vertically. The padding of each heatmap is as wide as the kernel
+    # radius, so the channels do not affect each other
+    origin_max = heatmaps.reshape(K, -1).max(axis=1)
+    dr = np.zeros((K, H + 2 * border, W + 2 * border), dtype=np.float32)
+    dr[:, border:-border, border:-border] = heatmaps
+    dr = cv2.GaussianBlur(
+        dr.reshape(K * (H + 2 * border), -1), (kernel, kernel), 0)
+    dr = dr.reshape(K, H + 2 * border, -1)
+    heatmaps[:] = dr[:, border:-border, border:-border]
+    scale = origin_max / heatmaps.reshape(K, -1).max(axis=1)
+    heatmaps *= scale[:, None, None]
     return heatmaps
 
 
@@ -251,16 +334,106 @@ def gaussian_blur1d(simcc: np.ndarray, kernel: int = 11) -> np.ndarray:
     border = (kernel - 1) // 2
     N, K, Wx = simcc.shape
 
-    for n, k in product(range(N), range(K)):
-        origin_max = np.max(simcc[n, k])
-        dr = np.zeros((1, Wx + 2 * border), dtype=np.float32)
-        dr[0, border:-border] = simcc[n, k].copy()
-        dr = cv2.GaussianBlur(dr, (kernel, 1), 0)
-        simcc[n, k] = dr[0, border:-border].copy()
-        simcc[n, k] *= origin_max / np.max(simcc[n, k])
+    # blur all the rows in one call with a horizontal kernel
+    origin_max = simcc.max(axis=2)
+    dr = np.zeros((N * K, Wx + 2 * border), dtype=np.float32)
+    dr[:, border:-border] = simcc.reshape(N * K, Wx)
+    dr = cv2.GaussianBlur(dr, (kernel, 1), 0)
+    simcc[:] = dr[:, border:-border].reshape(N, K, Wx)
+    simcc *= (origin_max / simcc.max(axis=2))[..., None]
     return simcc
 
 
+def gaussian_blur_torch(heatmaps: Tensor, kernel: int = 11) -> Tensor:
+    """Modulate heatmap distribution with Gaussian. This is the PyTorch
+    version of :func:`gaussian_blur` which runs on the device of the
+    heatmaps.
+
+    Note:
+        - batch_size: B
+        - num_keypoints: K
+        - heatmap height: H
+        - heatmap width: W
+
+    Args:
+        heatmaps (Tensor): model predicted heatmaps in shape (K, H, W) or
+            (B, K, H, W)
+        kernel (int): Gaussian kernel size (K) for modulation, which should
+            match the heatmap gaussian sigma when training.
+            K=17 for sigma=3 and k=11 for sigma=2.
+
+    Returns:
+        Tensor: Modulated heatmap distribution in the same shape as the
+        input heatmaps.
+    """
+    assert kernel % 2 == 1
+
+    border = (kernel - 1) // 2
+    shape = heatmaps.shape
+    H, W = shape[-2:]
+
+    # blur each heatmap as a channel of a depthwise convolution
+    heatmaps = heatmaps.reshape(1, -1, H, W)
+    C = heatmaps.shape[1]
+    origin_max = heatmaps.amax(dim=(2, 3), keepdim=True)
+
+    # the same kernel as cv2.GaussianBlur with sigma=0, applied separately
+    # in the two directions with zero padding
+    weight = torch.from_numpy(cv2.getGaussianKernel(kernel, 0)).to(heatmaps)
+    heatmaps = F.conv2d(
+        heatmaps,
+        weight.view(1, 1, -1, 1).expand(C, -1, -1, -1),
+        padding=(border, 0),
+        groups=C)
+    heatmaps = F.conv2d(
+        heatmaps,
+        weight.view(1, 1, 1, -1).expand(C, -1, -1, -1),
+        padding=(0, border),
+        groups=C)
+    heatmaps = heatmaps * (
+        origin_max / heatmaps.amax(dim=(2, 3), keepdim=True))
+
+    return heatmaps.reshape(shape)
+
+
+def gaussian_blur1d_torch(simcc: Tensor, kernel: int = 11) -> Tensor:
+    """Modulate simcc distribution with Gaussian. This is the PyTorch version
+    of :func:`gaussian_blur1d` which runs on the device of the simcc.
+
+    Note:
+        - num_keypoints: K
+        - simcc length: Wx
+
+    Args:
+        simcc (Tensor): model predicted simcc in shape (N, K, Wx)
+        kernel (int): Gaussian kernel size (K) for modulation, which should
+            match the simcc gaussian sigma when training.
+            K=17 for sigma=3 and k=11 for sigma=2.
+
+    Returns:
+        Tensor: Modulated simcc distribution in shape (N, K, Wx).
+    """
+    assert kernel % 2 == 1
+
+    border = (kernel - 1) // 2
+    shape = simcc.shape
+
+    # blur each simcc as a channel of a depthwise convolution
+    simcc = simcc.reshape(1, -1, shape[-1])
+    C = simcc.shape[1]
+    origin_max = simcc.amax(dim=2, keepdim=True)
+
+    weight = torch.from_numpy(cv2.getGaussianKernel(kernel, 0)).to(simcc)
+    simcc = F.conv1d(
+        simcc,
+        weight.view(1, 1, -1).expand(C, -1, -1),
+        padding=border,
+        groups=C)
+    simcc = simcc * (origin_max / simcc.amax(dim=2, keepdim=True))
+
+    return simcc.reshape(shape)
+
+
 def batch_heatmap_nms(batch_heatmaps: Tensor, kernel_size: int = 5):
     """Apply NMS on a batch of heatmaps.
 
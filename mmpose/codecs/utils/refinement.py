@@ -1,9 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from itertools import product
-
 import numpy as np
+import torch
+from torch import Tensor
 
-from .post_processing import gaussian_blur, gaussian_blur1d
+from .post_processing import (gaussian_blur, gaussian_blur1d,
+                              gaussian_blur1d_torch, gaussian_blur_torch)
 
 
 def refine_keypoints(keypoints: np.ndarray,
@@ -28,20 +29,24 @@ def refine_keypoints(keypoints: np.ndarray,
     N, K = keypoints.shape[:2]
     H, W = heatmaps.shape[1:]
 
-    for n, k in product(range(N), range(K)):
-        x, y = keypoints[n, k, :2].astype(int)
+    x, y = np.moveaxis(keypoints[..., :2].astype(int), -1, 0)
+    k = np.broadcast_to(np.arange(K), (N, K))
 
-        if 1 < x < W - 1 and 0 < y < H:
-            dx = heatmaps[k, y, x + 1] - heatmaps[k, y, x - 1]
-        else:
-            dx = 0.
+    x_valid = (1 < x) & (x < W - 1) & (0 < y) & (y < H)
+    y_valid = (1 < y) & (y < H - 1) & (0 < x) & (x < W)
 
-        if 1 < y < H - 1 and 0 < x < W:
-            dy = heatmaps[k, y + 1, x] - heatmaps[k, y - 1, x]
-        else:
-            dy = 0.
+    # clip the indices of invalid keypoints, whose gradients will be masked
+    x_ = np.clip(x, 1, W - 2)
+    y_ = np.clip(y, 1, H - 2)
+    dx = np.where(
+        x_valid, heatmaps[k, np.clip(y, 0, H - 1), x_ + 1] -
+        heatmaps[k, np.clip(y, 0, H - 1), x_ - 1], 0.)
+    dy = np.where(
+        y_valid, heatmaps[k, y_ + 1, np.clip(x, 0, W - 1)] -
+        heatmaps[k, y_ - 1, np.clip(x, 0, W - 1)], 0.)
 
-        keypoints[n, k] += np.sign([dx, dy], dtype=np.float32) * 0.25
+    keypoints[..., :2] += np.sign(
+        np.stack((dx, dy), axis=-1), dtype=np.float32) * 0.25
 
     return keypoints
 
@@ -77,28 +82,36 @@ def refine_keypoints_dark(keypoints: np.ndarray, heatmaps: np.ndarray,
     np.maximum(heatmaps, 1e-10, heatmaps)
     np.log(heatmaps, heatmaps)
 
-    for n, k in product(range(N), range(K)):
-        x, y = keypoints[n, k, :2].astype(int)
-        if 1 < x < W - 2 and 1 < y < H - 2:
-            dx = 0.5 * (heatmaps[k, y, x + 1] - heatmaps[k, y, x - 1])
-            dy = 0.5 * (heatmaps[k, y + 1, x] - heatmaps[k, y - 1, x])
-
-            dxx = 0.25 * (
-                heatmaps[k, y, x + 2] - 2 * heatmaps[k, y, x] +
-                heatmaps[k, y, x - 2])
-            dxy = 0.25 * (
-                heatmaps[k, y + 1, x + 1] - heatmaps[k, y - 1, x + 1] -
-                heatmaps[k, y + 1, x - 1] + heatmaps[k, y - 1, x - 1])
-            dyy = 0.25 * (
-                heatmaps[k, y + 2, x] - 2 * heatmaps[k, y, x] +
-                heatmaps[k, y - 2, x])
-            derivative = np.array([[dx], [dy]])
-            hessian = np.array([[dxx, dxy], [dxy, dyy]])
-            if dxx * dyy - dxy**2 != 0:
-                hessianinv = np.linalg.inv(hessian)
-                offset = -hessianinv @ derivative
-                offset = np.squeeze(np.array(offset.T), axis=0)
-                keypoints[n, k, :2] += offset
+    x, y = np.moveaxis(keypoints[..., :2].astype(int), -1, 0)
+    valid = (1 < x) & (x < W - 2) & (1 < y) & (y < H - 2)
+
+    # compute the derivatives and hessians of all the valid keypoints at once
+    n, k = np.nonzero(valid)
+    x, y = x[valid], y[valid]
+
+    dx = 0.5 * (heatmaps[k, y, x + 1] - heatmaps[k, y, x - 1])
+    dy = 0.5 * (heatmaps[k, y + 1, x] - heatmaps[k, y - 1, x])
+
+    dxx = 0.25 * (
+        heatmaps[k, y, x + 2] - 2 * heatmaps[k, y, x] + heatmaps[k, y, x - 2])
+    dxy = 0.25 * (
+        heatmaps[k, y + 1, x + 1] - heatmaps[k, y - 1, x + 1] -
+        heatmaps[k, y + 1, x - 1] + heatmaps[k, y - 1, x - 1])
+    dyy = 0.25 * (
+        heatmaps[k, y + 2, x] - 2 * heatmaps[k, y, x] + heatmaps[k, y - 2, x])
+
+    # skip the keypoints with singular hessians
+    invertible = dxx * dyy - dxy**2 != 0
+    n, k = n[invertible], k[invertible]
+    derivative = np.stack((dx, dy), axis=-1)[invertible, :, None]
+    hessian = np.stack((dxx, dxy, dxy, dyy), axis=-1)[invertible]
+    hessian = hessian.reshape(-1, 2, 2)
+
+    if len(hessian) > 0:
+        hessianinv = np.linalg.inv(hessian)
+        offset = -hessianinv @ derivative
+        keypoints[n, k, :2] += offset[..., 0]
+
     return keypoints
 
 
@@ -136,31 +149,30 @@ def refine_keypoints_dark_udp(keypoints: np.ndarray, heatmaps: np.ndarray,
     heatmaps_pad = np.pad(
         heatmaps, ((0, 0), (1, 1), (1, 1)), mode='edge').flatten()
 
-    for n in range(N):
-        index = keypoints[n, :, 0] + 1 + (keypoints[n, :, 1] + 1) * (W + 2)
-        index += (W + 2) * (H + 2) * np.arange(0, K)
-        index = index.astype(int).reshape(-1, 1)
-        i_ = heatmaps_pad[index]
-        ix1 = heatmaps_pad[index + 1]
-        iy1 = heatmaps_pad[index + W + 2]
-        ix1y1 = heatmaps_pad[index + W + 3]
-        ix1_y1_ = heatmaps_pad[index - W - 3]
-        ix1_ = heatmaps_pad[index - 1]
-        iy1_ = heatmaps_pad[index - 2 - W]
-
-        dx = 0.5 * (ix1 - ix1_)
-        dy = 0.5 * (iy1 - iy1_)
-        derivative = np.concatenate([dx, dy], axis=1)
-        derivative = derivative.reshape(K, 2, 1)
-
-        dxx = ix1 - 2 * i_ + ix1_
-        dyy = iy1 - 2 * i_ + iy1_
-        dxy = 0.5 * (ix1y1 - ix1 - iy1 + i_ + i_ - ix1_ - iy1_ + ix1_y1_)
-        hessian = np.concatenate([dxx, dxy, dxy, dyy], axis=1)
-        hessian = hessian.reshape(K, 2, 2)
-        hessian = np.linalg.inv(hessian + np.finfo(np.float32).eps * np.eye(2))
-        keypoints[n] -= np.einsum('imn,ink->imk', hessian,
-                                  derivative).squeeze()
+    index = keypoints[..., 0] + 1 + (keypoints[..., 1] + 1) * (W + 2)
+    index += (W + 2) * (H + 2) * np.arange(0, K)
+    index = index.astype(int).reshape(-1, 1)
+    i_ = heatmaps_pad[index]
+    ix1 = heatmaps_pad[index + 1]
+    iy1 = heatmaps_pad[index + W + 2]
+    ix1y1 = heatmaps_pad[index + W + 3]
+    ix1_y1_ = heatmaps_pad[index - W - 3]
+    ix1_ = heatmaps_pad[index - 1]
+    iy1_ = heatmaps_pad[index - 2 - W]
+
+    dx = 0.5 * (ix1 - ix1_)
+    dy = 0.5 * (iy1 - iy1_)
+    derivative = np.concatenate([dx, dy], axis=1)
+    derivative = derivative.reshape(N * K, 2, 1)
+
+    dxx = ix1 - 2 * i_ + ix1_
+    dyy = iy1 - 2 * i_ + iy1_
+    dxy = 0.5 * (ix1y1 - ix1 - iy1 + i_ + i_ - ix1_ - iy1_ + ix1_y1_)
+    hessian = np.concatenate([dxx, dxy, dxy, dyy], axis=1)
+    hessian = hessian.reshape(N * K, 2, 2)
+    hessian = np.linalg.inv(hessian + np.finfo(np.float32).eps * np.eye(2))
+    keypoints[..., :2] -= np.einsum('imn,ink->imk', hessian,
+                                    derivative).reshape(N, K, 2)
 
     return keypoints
 
@@ -188,8 +200,6 @@ def refine_simcc_dark(keypoints: np.ndarray, simcc: np.ndarray,
 
     .. _`UDP`: https://arxiv.org/abs/1911.07524
     """
-    N = simcc.shape[0]
-
     # modulate simcc
     simcc = gaussian_blur1d(simcc, blur_kernel_size)
     np.clip(simcc, 1e-3, 50., simcc)
@@ -197,19 +207,218 @@ def refine_simcc_dark(keypoints: np.ndarray, simcc: np.ndarray,
 
     simcc = np.pad(simcc, ((0, 0), (0, 0), (2, 2)), 'edge')
 
-    for n in range(N):
-        px = (keypoints[n] + 2.5).astype(np.int64).reshape(-1, 1)  # K, 1
+    px = (keypoints + 2.5).astype(np.int64)[..., None]  # N, K, 1
+
+    dx0 = np.take_along_axis(simcc, px, axis=2)  # N, K, 1
+    dx1 = np.take_along_axis(simcc, px + 1, axis=2)
+    dx_1 = np.take_along_axis(simcc, px - 1, axis=2)
+    dx2 = np.take_along_axis(simcc, px + 2, axis=2)
+    dx_2 = np.take_along_axis(simcc, px - 2, axis=2)
+
+    dx = 0.5 * (dx1 - dx_1)
+    dxx = 1e-9 + 0.25 * (dx2 - 2 * dx0 + dx_2)
+
+    offset = dx / dxx
+    keypoints -= offset[..., 0]
+
+    return keypoints
+
+
+def _gather_heatmaps(heatmaps: Tensor, x: Tensor, y: Tensor) -> Tensor:
+    """Gather the heatmap values at the given locations, which are clamped
+    into the heatmap.
+
+    Args:
+        heatmaps (Tensor): The heatmaps in shape (B, K, H, W)
+        x (Tensor): The integer x-coordinates in shape (B, K)
+        y (Tensor): The integer y-coordinates in shape (B, K)
+
+    Returns:
+        Tensor: The heatmap values in shape (B, K)
+    """
+    B, K, H, W = heatmaps.shape
+    index = y.clamp(0, H - 1) * W + x.clamp(0, W - 1)
+    return heatmaps.flatten(2).gather(2, index[..., None])[..., 0]
+
+
+def refine_keypoints_torch(keypoints: Tensor, heatmaps: Tensor) -> Tensor:
+    """PyTorch version of :func:`refine_keypoints` which refines the
+    keypoints of a batch of top-down heatmaps on their device.
+
+    Note:
+
+        - batch size: B
+        - keypoint number: K
+        - keypoint dimension: D
+        - heatmap size: [W, H]
+
+    Args:
+        keypoints (Tensor): The keypoint coordinates in shape (B, K, D)
+        heatmaps (Tensor): The heatmaps in shape (B, K, H, W)
+
+    Returns:
+        Tensor: Refine keypoint coordinates in shape (B, K, D)
+    """
+    H, W = heatmaps.shape[2:]
+
+    x, y = keypoints[..., :2].long().unbind(dim=-1)
+
+    x_valid = (1 < x) & (x < W - 1) & (0 < y) & (y < H)
+    y_valid = (1 < y) & (y < H - 1) & (0 < x) & (x < W)
+
+    dx = _gather_heatmaps(heatmaps, x + 1, y) - _gather_heatmaps(
+        heatmaps, x - 1, y)
+    dy = _gather_heatmaps(heatmaps, x, y + 1) - _gather_heatmaps(
+        heatmaps, x, y - 1)
+    offset = torch.stack((dx * x_valid, dy * y_valid), dim=-1).sign() * 0.25
+
+    keypoints = keypoints.clone()
+    keypoints[..., :2] += offset
+    return keypoints
+
+
+def refine_keypoints_dark_torch(keypoints: Tensor, heatmaps: Tensor,
+                                blur_kernel_size: int) -> Tensor:
+    """PyTorch version of :func:`refine_keypoints_dark` which refines the
+    keypoints of a batch of top-down heatmaps on their device.
+
+    Note:
+
+        - batch size: B
+        - keypoint number: K
+        - keypoint dimension: D
+        - heatmap size: [W, H]
+
+    Args:
+        keypoints (Tensor): The keypoint coordinates in shape (B, K, D)
+        heatmaps (Tensor): The heatmaps in shape (B, K, H, W)
+        blur_kernel_size (int): The Gaussian blur kernel size of the heatmap
+            modulation
+
+    Returns:
+        Tensor: Refine keypoint coordinates in shape (B, K, D)
+    """
+    H, W = heatmaps.shape[2:]
+
+    # modulate heatmaps
+    heatmaps = gaussian_blur_torch(heatmaps, blur_kernel_size)
+    heatmaps = heatmaps.clamp(min=1e-10).log()
+
+    x, y = keypoints[..., :2].long().unbind(dim=-1)
+    valid = (1 < x) & (x < W - 2) & (1 < y) & (y < H - 2)
+
+    def _get(dx: int, dy: int) -> Tensor:
+        return _gather_heatmaps(heatmaps, x + dx, y + dy)
+
+    dx = 0.5 * (_get(1, 0) - _get(-1, 0))
+    dy = 0.5 * (_get(0, 1) - _get(0, -1))
 
-        dx0 = np.take_along_axis(simcc[n], px, axis=1)  # K, 1
-        dx1 = np.take_along_axis(simcc[n], px + 1, axis=1)
-        dx_1 = np.take_along_axis(simcc[n], px - 1, axis=1)
-        dx2 = np.take_along_axis(simcc[n], px + 2, axis=1)
-        dx_2 = np.take_along_axis(simcc[n], px - 2, axis=1)
+    dxx = 0.25 * (_get(2, 0) - 2 * _get(0, 0) + _get(-2, 0))
+    dxy = 0.25 * (_get(1, 1) - _get(1, -1) - _get(-1, 1) + _get(-1, -1))
+    dyy = 0.25 * (_get(0, 2) - 2 * _get(0, 0) + _get(0, -2))
 
-        dx = 0.5 * (dx1 - dx_1)
-        dxx = 1e-9 + 0.25 * (dx2 - 2 * dx0 + dx_2)
+    # solve the 2x2 linear systems in closed form and skip the keypoints
+    # with singular hessians
+    det = dxx * dyy - dxy**2
+    valid = valid & (det != 0)
+    det = torch.where(valid, det, torch.ones_like(det))
+    offset = torch.stack((dxy * dy - dyy * dx, dxy * dx - dxx * dy), dim=-1)
+    offset = offset / det[..., None] * valid[..., None]
 
-        offset = dx / dxx
-        keypoints[n] -= offset.reshape(-1)
+    keypoints = keypoints.clone()
+    keypoints[..., :2] += offset
+    return keypoints
+
+
+def refine_keypoints_dark_udp_torch(keypoints: Tensor, heatmaps: Tensor,
+                                    blur_kernel_size: int) -> Tensor:
+    """PyTorch version of :func:`refine_keypoints_dark_udp` which refines
+    the keypoints of a batch of top-down heatmaps on their device.
+
+    Note:
+
+        - batch size: B
+        - keypoint number: K
+        - keypoint dimension: D
+        - heatmap size: [W, H]
+
+    Args:
+        keypoints (Tensor): The keypoint coordinates in shape (B, K, D)
+        heatmaps (Tensor): The heatmaps in shape (B, K, H, W)
+        blur_kernel_size (int): The Gaussian blur kernel size of the heatmap
+            modulation
 
+    Returns:
+        Tensor: Refine keypoint coordinates in shape (B, K, D)
+    """
+    # modulate heatmaps
+    heatmaps = gaussian_blur_torch(heatmaps, blur_kernel_size)
+    heatmaps = heatmaps.clamp(1e-3, 50.).log()
+    heatmaps = torch.nn.functional.pad(
+        heatmaps, (1, 1, 1, 1), mode='replicate')
+
+    x, y = (keypoints[..., :2] + 1).long().unbind(dim=-1)
+
+    def _get(dx: int, dy: int) -> Tensor:
+        return _gather_heatmaps(heatmaps, x + dx, y + dy)
+
+    i_ = _get(0, 0)
+    ix1 = _get(1, 0)
+    iy1 = _get(0, 1)
+    ix1y1 = _get(1, 1)
+    ix1_y1_ = _get(-1, -1)
+    ix1_ = _get(-1, 0)
+    iy1_ = _get(0, -1)
+
+    dx = 0.5 * (ix1 - ix1_)
+    dy = 0.5 * (iy1 - iy1_)
+
+    eps = torch.finfo(torch.float32).eps
+    dxx = ix1 - 2 * i_ + ix1_ + eps
+    dyy = iy1 - 2 * i_ + iy1_ + eps
+    dxy = 0.5 * (ix1y1 - ix1 - iy1 + i_ + i_ - ix1_ - iy1_ + ix1_y1_)
+
+    # solve the 2x2 linear systems in closed form
+    det = dxx * dyy - dxy**2
+    offset = torch.stack((dyy * dx - dxy * dy, dxx * dy - dxy * dx), dim=-1)
+
+    keypoints = keypoints.clone()
+    keypoints[..., :2] -= offset / det[..., None]
     return keypoints
+
+
+def refine_simcc_dark_torch(keypoints: Tensor, simcc: Tensor,
+                            blur_kernel_size: int) -> Tensor:
+    """PyTorch version of :func:`refine_simcc_dark` which refines the
+    keypoints on the device of the simcc.
+
+    Note:
+
+        - instance number: N
+        - keypoint number: K
+
+    Args:
+        keypoints (Tensor): The keypoint coordinates along the simcc axis in
+            shape (N, K)
+        simcc (Tensor): The simcc in shape (N, K, Wx)
+        blur_kernel_size (int): The Gaussian blur kernel size of the simcc
+            modulation
+
+    Returns:
+        Tensor: Refine keypoint coordinates in shape (N, K)
+    """
+    # modulate simcc
+    simcc = gaussian_blur1d_torch(simcc, blur_kernel_size)
+    simcc = simcc.clamp(1e-3, 50.).log()
+    simcc = torch.nn.functional.pad(simcc, (2, 2), mode='replicate')
+
+    px = (keypoints + 2.5).long()[..., None]  # N, K, 1
+
+    def _get(dx: int) -> Tensor:
+        return simcc.gather(2, (px + dx).clamp(0, simcc.shape[2] - 1))
+
+    dx = 0.5 * (_get(1) - _get(-1))
+    dxx = 1e-9 + 0.25 * (_get(2) - 2 * _get(0) + _get(-2))
+
+    offset = dx / dxx
+    return keypoints - offset[..., 0]
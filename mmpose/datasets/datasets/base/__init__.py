@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from .base_coco_style_dataset import BaseCocoStyleDataset
 from .base_mocap_dataset import BaseMocapDataset
+from .columnar_data_list import ColumnarDataList
 
-__all__ = ['BaseCocoStyleDataset', 'BaseMocapDataset']
+__all__ = ['BaseCocoStyleDataset', 'BaseMocapDataset', 'ColumnarDataList']
@@ -1,6 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
+import hashlib
+import os
 import os.path as osp
+import pickle
 from copy import deepcopy
 from itertools import chain, filterfalse, groupby
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
@@ -8,13 +11,14 @@ from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 import numpy as np
 from mmengine.dataset import BaseDataset, force_full_init
 from mmengine.fileio import exists, get_local_path, load
-from mmengine.logging import MessageHub
-from mmengine.utils import is_list_of
+from mmengine.logging import MessageHub, print_log
+from mmengine.utils import is_list_of, mkdir_or_exist
 from xtcocotools.coco import COCO
 
 from mmpose.registry import DATASETS
 from mmpose.structures.bbox import bbox_xywh2xyxy
-from ..utils import parse_pose_metainfo
+from ..utils import get_readonly_view, parse_pose_metainfo
+from .columnar_data_list import ColumnarDataList
 
 
 @DATASETS.register_module()
@@ -59,8 +63,26 @@ class BaseCocoStyleDataset(BaseDataset):
             image. Default: 1000.
         sample_interval (int, optional): The sample interval of the dataset.
             Default: 1.
+        columnar_data (bool, optional): Whether to hold the data list in a
+            :class:`ColumnarDataList`, which stores the annotations in
+            contiguous arrays and materializes the data info of a sample
+            when it is accessed. It takes much less memory than the
+            serialized data list and the COCO index is released after
+            loading. If ``True``, ``serialize_data`` is ignored.
+            Default: ``False``.
+        cache_dir (str, optional): The directory to cache the parsed and
+            filtered data list. The cache file is named by the hash of the
+            annotation files and the dataset settings, so it is reused by all
+            the ranks and the later runs with the same settings, which skips
+            parsing the annotation file. It is loaded with memory mapping if
+            ``columnar_data`` is ``True``. Default: ``None``, which means no
+            cache is used.
     """
 
+    # bump the version to invalidate the existing cache files when the
+    # parsing of the annotations changes
+    CACHE_VERSION: int = 1
+
     METAINFO: dict = dict()
 
     def __init__(self,
@@ -77,7 +99,9 @@ class BaseCocoStyleDataset(BaseDataset):
                  test_mode: bool = False,
                  lazy_init: bool = False,
                  max_refetch: int = 1000,
-                 sample_interval: int = 1):
+                 sample_interval: int = 1,
+                 columnar_data: bool = False,
+                 cache_dir: Optional[str] = None):
 
         if data_mode not in {'topdown', 'bottomup'}:
             raise ValueError(
@@ -99,6 +123,13 @@ class BaseCocoStyleDataset(BaseDataset):
                     'supported when `test_mode==True`.')
         self.bbox_file = bbox_file
         self.sample_interval = sample_interval
+        self.columnar_data = columnar_data
+        self.cache_dir = cache_dir
+        if columnar_data:
+            # the columnar data list takes the place of the serialized one
+            serialize_data = False
+
+        self._readonly_metainfo = dict()
 
         super().__init__(
             ann_file=ann_file,
@@ -169,6 +200,113 @@ class BaseCocoStyleDataset(BaseDataset):
 
         return self.pipeline(data_info)
 
+    def full_init(self):
+        """Load annotation file and set ``BaseDataset._fully_initialized`` to
+        True.
+
+        :class:`BaseCocoStyleDataset` overrides this method from
+        :class:`mmengine.dataset.BaseDataset` to load the filtered data list
+        from the cache in ``cache_dir`` if available, and to convert the data
+        list into a :class:`ColumnarDataList` if ``columnar_data`` is
+        ``True``.
+        """
+        if self._fully_initialized:
+            return
+
+        cache_file = self._get_cache_file() if self.cache_dir else None
+        if cache_file is not None and osp.isfile(cache_file):
+            self.data_list = self._load_cache(cache_file)
+        else:
+            # load data information
+            self.data_list = self.load_data_list()
+            # filter illegal data, such as data that has no annotations.
+            self.data_list = self.filter_data()
+            if cache_file is not None:
+                self._dump_cache(cache_file)
+
+        # Get subset data according to indices.
+        if self._indices is not None:
+            self.data_list = self._get_unserialized_subset(self._indices)
+
+        if self.columnar_data:
+            if not isinstance(self.data_list, ColumnarDataList):
+                self.data_list = ColumnarDataList.from_data_list(
+                    self.data_list)
+            # the COCO index is only used to load the data list
+            self.coco = None
+        elif self.serialize_data:
+            self.data_bytes, self.data_address = self._serialize_data()
+
+        self._fully_initialized = True
+
+    def _get_cache_file(self) -> str:
+        """Get the path of the cache file of the data list, which is named by
+        the hash of the annotation files and the settings that affect the
+        loaded data list."""
+
+        def _hash_file(filename):
+            file_hash = hashlib.sha1()
+            with get_local_path(filename) as local_path:
+                with open(local_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        file_hash.update(chunk)
+            return file_hash.hexdigest()
+
+        settings = dict(
+            version=self.CACHE_VERSION,
+            dataset=f'{self.__module__}.{self.__class__.__qualname__}',
+            ann_file=_hash_file(self.ann_file),
+            bbox_file=_hash_file(self.bbox_file) if self.bbox_file else None,
+            data_mode=self.data_mode,
+            data_prefix=self.data_prefix,
+            filter_cfg=self.filter_cfg,
+            sample_interval=self.sample_interval,
+            test_mode=self.test_mode,
+            # the categories are added to the metainfo from the annotations
+            metainfo={
+                k: v
+                for k, v in self._metainfo.items() if k != 'CLASSES'
+            })
+        digest = hashlib.sha1(pickle.dumps(settings, protocol=4)).hexdigest()
+
+        return osp.join(self.cache_dir,
+                        f'{self.__class__.__name__}_{digest[:16]}.bin')
+
+    def _load_cache(self, cache_file: str) -> Union[list, ColumnarDataList]:
+        """Load the data list and the metainfo collected while loading the
+        annotations from the cache file."""
+        data_list = ColumnarDataList.load(cache_file, mmap=self.columnar_data)
+        self._metainfo.update(data_list.meta)
+        print_log(
+            f'Loaded the data list of {self.__class__.__name__} from '
+            f'cache {cache_file}',
+            logger='current')
+
+        if not self.columnar_data:
+            data_list = list(data_list)
+        return data_list
+
+    def _dump_cache(self, cache_file: str) -> None:
+        """Dump the data list to the cache file.
+
+        The cache file is written to a temporary file first and then renamed,
+        so that the ranks that dump the cache at the same time never read a
+        partially written file.
+        """
+        meta = dict()
+        if 'CLASSES' in self._metainfo:
+            meta['CLASSES'] = self._metainfo['CLASSES']
+        data_list = ColumnarDataList.from_data_list(self.data_list, meta)
+
+        mkdir_or_exist(self.cache_dir)
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        data_list.dump(tmp_file)
+        os.replace(tmp_file, cache_file)
+
+        if self.columnar_data:
+            self.data_list = data_list
+
+    @force_full_init
     def get_data_info(self, idx: int) -> dict:
         """Get data info by index.
 
@@ -178,7 +316,13 @@ class BaseCocoStyleDataset(BaseDataset):
         Returns:
             dict: Data info.
         """
-        data_info = super().get_data_info(idx)
+        if isinstance(self.data_list, ColumnarDataList):
+            # the data info is materialized as a new dict, so it is not
+            # necessary to copy it
+            data_info = self.data_list[idx]
+            data_info['sample_idx'] = idx if idx >= 0 else len(self) + idx
+        else:
+            data_info = super().get_data_info(idx)
 
         # Add metainfo items that are required in the pipeline and the model
         metainfo_keys = [
@@ -191,7 +335,12 @@ class BaseCocoStyleDataset(BaseDataset):
                 f'"{key}" is a reserved key for `metainfo`, but already '
                 'exists in the `data_info`.')
 
-            data_info[key] = deepcopy(self._metainfo[key])
+            # the metainfo is shared by all the samples, so it is read-only
+            # and the transforms should copy it before modifying it
+            if key not in self._readonly_metainfo:
+                self._readonly_metainfo[key] = get_readonly_view(
+                    self._metainfo[key])
+            data_info[key] = self._readonly_metainfo[key]
 
         return data_info
 
@@ -14,7 +14,7 @@ from mmengine.logging import print_log
 from mmengine.utils import is_abs
 
 from mmpose.registry import DATASETS
-from ..utils import parse_pose_metainfo
+from ..utils import get_readonly_view, load_npz_mmap, parse_pose_metainfo
 
 
 @DATASETS.register_module()
@@ -32,6 +32,18 @@ class BaseMocapDataset(BaseDataset):
         subset_frac (float): The fraction to reduce dataset size. If set to 1,
             the dataset size is not reduced. Default: 1.
         camera_param_file (str): Cameras' parameters file. Default: ``None``.
+        lazy_window (bool): If set to ``True``, the per-frame annotations are
+            kept once and each data sample only stores the frame indices of
+            its sequence, which are gathered into the sequence in
+            :meth:`get_data_info`. Otherwise, the annotations of each
+            sequence are copied into its data sample, which takes
+            ``seq_len`` times the memory of the annotations. Only supported
+            in ``'topdown'`` mode. Default: ``False``.
+        mmap_ann_file (bool): Whether to memory-map the arrays in the
+            annotation file instead of reading them into memory, which
+            requires the arrays to be stored uncompressed (e.g. by
+            :func:`numpy.savez`). It is most useful with ``lazy_window``.
+            Default: ``False``.
         data_mode (str): Specifies the mode of data samples: ``'topdown'`` or
             ``'bottomup'``. In ``'topdown'`` mode, each data sample contains
             one instance; while in ``'bottomup'`` mode, each data sample
@@ -72,6 +84,8 @@ class BaseMocapDataset(BaseDataset):
                  causal: bool = True,
                  subset_frac: float = 1.0,
                  camera_param_file: Optional[str] = None,
+                 lazy_window: bool = False,
+                 mmap_ann_file: bool = False,
                  data_mode: str = 'topdown',
                  metainfo: Optional[dict] = None,
                  data_root: Optional[str] = None,
@@ -90,6 +104,15 @@ class BaseMocapDataset(BaseDataset):
                 f'{data_mode}. Should be "topdown" or "bottomup".')
         self.data_mode = data_mode
 
+        if lazy_window and data_mode != 'topdown':
+            raise ValueError(
+                f'{self.__class__.__name__} only supports `lazy_window` in '
+                f'"topdown" mode, but got data_mode: {data_mode}.')
+        self.lazy_window = lazy_window
+        self.mmap_ann_file = mmap_ann_file
+        # the per-frame annotations gathered into the sequences lazily
+        self.frame_data: Dict[str, np.ndarray] = dict()
+
         _ann_file = ann_file
         if not is_abs(_ann_file):
             _ann_file = osp.join(data_root, _ann_file)
@@ -123,6 +146,8 @@ class BaseMocapDataset(BaseDataset):
 
         self.sequence_indices = self.get_sequence_indices()
 
+        self._readonly_metainfo = dict()
+
         super().__init__(
             ann_file=ann_file,
             metainfo=metainfo,
@@ -147,7 +172,10 @@ class BaseMocapDataset(BaseDataset):
         """
 
         with get_local_path(ann_file) as local_path:
-            self.ann_data = np.load(local_path)
+            if self.mmap_ann_file:
+                self.ann_data = load_npz_mmap(local_path)
+            else:
+                self.ann_data = np.load(local_path)
 
     @classmethod
     def _load_metainfo(cls, metainfo: dict = None) -> dict:
@@ -201,6 +229,9 @@ class BaseMocapDataset(BaseDataset):
         """
         data_info = super().get_data_info(idx)
 
+        if self.lazy_window:
+            self._gather_sequence(data_info, self.frame_data)
+
         # Add metainfo items that are required in the pipeline and the model
         metainfo_keys = [
             'upper_body_ids', 'lower_body_ids', 'flip_pairs',
@@ -212,7 +243,12 @@ class BaseMocapDataset(BaseDataset):
                 f'"{key}" is a reserved key for `metainfo`, but already '
                 'exists in the `data_info`.')
 
-            data_info[key] = deepcopy(self._metainfo[key])
+            # the metainfo is shared by all the samples, so it is read-only
+            # and the transforms should copy it before modifying it
+            if key not in self._readonly_metainfo:
+                self._readonly_metainfo[key] = get_readonly_view(
+                    self._metainfo[key])
+            data_info[key] = self._readonly_metainfo[key]
 
         return data_info
 
@@ -284,8 +320,17 @@ class BaseMocapDataset(BaseDataset):
             sequence_indices = sequence_indices_merged
         return sequence_indices
 
-    def _load_annotations(self) -> Tuple[List[dict], List[dict]]:
-        """Load data from annotations in COCO format."""
+    def _load_frame_data(self) -> Dict[str, np.ndarray]:
+        """Load the per-frame annotations, which are gathered into the
+        sequences by :meth:`_gather_sequence`.
+
+        Override this method to add or replace the per-frame annotations.
+
+        Returns:
+            Dict[str, np.ndarray]: The annotations of all frames indexed by
+            their keys in the data info. ``'img_paths'`` contains the image
+            names, and the others are converted to float32 when gathered.
+        """
         num_keypoints = self.metainfo['num_keypoints']
 
         img_names = self.ann_data['imgname']
@@ -301,6 +346,70 @@ class BaseMocapDataset(BaseDataset):
         else:
             kpts_2d = np.zeros((num_imgs, num_keypoints, 3), dtype=np.float32)
 
+        frame_data = {
+            'img_paths': img_names,
+            'keypoints': kpts_2d[..., :2],
+            'keypoints_visible': kpts_2d[..., 2],
+            'keypoints_3d': kpts_3d[..., :3],
+            'keypoints_3d_visible': kpts_3d[..., 3],
+        }
+        return frame_data
+
+    def _get_target_idx(self) -> List[int]:
+        """Get the indices of the target frames in a sequence."""
+        if self.multiple_target:
+            return list(range(self.multiple_target))
+        return [-1] if self.causal else [int(self.seq_len) // 2]
+
+    def _gather_sequence(self, data_info: dict,
+                         frame_data: Dict[str, np.ndarray]) -> dict:
+        """Gather the per-frame annotations of the frames in
+        ``data_info['img_ids']`` into the data info in place.
+
+        Args:
+            data_info (dict): The data info of a sequence
+            frame_data (Dict[str, np.ndarray]): The annotations of all frames
+                from :meth:`_load_frame_data`
+
+        Returns:
+            dict: The data info with the annotations of the sequence.
+        """
+        frame_ids = list(data_info['img_ids'])
+        data_info['img_ids'] = frame_ids
+
+        for key, values in frame_data.items():
+            if key != 'img_paths':
+                data_info[key] = values[frame_ids].astype(np.float32)
+
+        target_idx = self._get_target_idx()
+        img_names = frame_data['img_paths'][frame_ids]
+        data_info['img_paths'] = list(img_names)
+        data_info['target_img_path'] = img_names[target_idx]
+        data_info['lifting_target'] = data_info['keypoints_3d'][target_idx]
+        data_info['lifting_target_visible'] = data_info[
+            'keypoints_3d_visible'][target_idx]
+        return data_info
+
+    @staticmethod
+    def _compress_frame_ids(frame_ids: List[int]) -> Union[range, List[int]]:
+        """Convert the frame indices of a sequence to a ``range`` if they are
+        evenly spaced, which takes much less memory than a list."""
+        step = frame_ids[1] - frame_ids[0] if len(frame_ids) > 1 else 1
+        if step == 0:
+            return frame_ids
+        stop = frame_ids[-1] + (1 if step > 0 else -1)
+        frame_range = range(frame_ids[0], stop, step)
+        if list(frame_range) == list(frame_ids):
+            return frame_range
+        return frame_ids
+
+    def _load_annotations(self) -> Tuple[List[dict], List[dict]]:
+        """Load data from annotations in COCO format."""
+        num_keypoints = self.metainfo['num_keypoints']
+
+        img_names = self.ann_data['imgname']
+        num_imgs = len(img_names)
+
         if 'center' in self.ann_data.keys():
             centers = self.ann_data['center']
         else:
@@ -311,6 +420,13 @@ class BaseMocapDataset(BaseDataset):
         else:
             scales = np.zeros(num_imgs, dtype=np.float32)
 
+        # In lazy mode, the per-frame annotations are kept and gathered into
+        # the sequences in `get_data_info`, and the data list only stores the
+        # frame indices of the sequences.
+        frame_data = self._load_frame_data()
+        if self.lazy_window:
+            self.frame_data = frame_data
+
         instance_list = []
         image_list = []
 
@@ -323,42 +439,25 @@ class BaseMocapDataset(BaseDataset):
                 f'Expected `frame_ids` == {expected_num_frames}, but '
                 f'got {len(frame_ids)} ')
 
-            _img_names = img_names[frame_ids]
-
-            _keypoints = kpts_2d[frame_ids].astype(np.float32)
-            keypoints = _keypoints[..., :2]
-            keypoints_visible = _keypoints[..., 2]
-
-            _keypoints_3d = kpts_3d[frame_ids].astype(np.float32)
-            keypoints_3d = _keypoints_3d[..., :3]
-            keypoints_3d_visible = _keypoints_3d[..., 3]
-
-            target_idx = [-1] if self.causal else [int(self.seq_len) // 2]
-            if self.multiple_target:
-                target_idx = list(range(self.multiple_target))
-
             instance_info = {
                 'num_keypoints': num_keypoints,
-                'keypoints': keypoints,
-                'keypoints_visible': keypoints_visible,
-                'keypoints_3d': keypoints_3d,
-                'keypoints_3d_visible': keypoints_3d_visible,
                 'scale': scales[idx],
                 'center': centers[idx].astype(np.float32).reshape(1, -1),
                 'id': idx,
                 'category_id': 1,
                 'iscrowd': 0,
-                'img_paths': list(_img_names),
                 'img_ids': frame_ids,
-                'lifting_target': keypoints_3d[target_idx],
-                'lifting_target_visible': keypoints_3d_visible[target_idx],
-                'target_img_path': _img_names[target_idx],
             }
 
             if self.camera_param_file:
-                _cam_param = self.get_camera_param(_img_names[0])
+                _cam_param = self.get_camera_param(img_names[frame_ids[0]])
                 instance_info['camera_param'] = _cam_param
 
+            if self.lazy_window:
+                instance_info['img_ids'] = self._compress_frame_ids(frame_ids)
+            else:
+                self._gather_sequence(instance_info, frame_data)
+
             instance_list.append(instance_info)
 
         if self.data_mode == 'bottomup':
@@ -396,6 +495,16 @@ class BaseMocapDataset(BaseDataset):
         # sanitize data samples
         data_list_tp = list(filter(self._is_valid_instance, instance_list))
 
+        if self.lazy_window:
+            # the keypoints are not gathered yet, so the sequences are checked
+            # by the maximum keypoint coordinates of the frames
+            keypoints = self.frame_data['keypoints']
+            frame_max = keypoints.max(axis=tuple(range(1, keypoints.ndim)))
+            data_list_tp = [
+                data_info for data_info in data_list_tp
+                if frame_max[data_info['img_ids']].max() > 0
+            ]
+
         return data_list_tp
 
     def _get_bottomup_data_infos(self, instance_list: List[Dict],
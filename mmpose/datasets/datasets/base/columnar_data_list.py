@@ -0,0 +1,261 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import pickle
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+
+def _align(offset: int, alignment: int = 64) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _encode_bytes(values: List[bytes]) -> Dict[str, np.ndarray]:
+    """Concatenate byte strings into a flat buffer with offsets."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(v) for v in values])
+    data = np.frombuffer(b''.join(values), dtype=np.uint8)
+    return dict(data=data, offsets=offsets)
+
+
+class ColumnarDataList(Sequence):
+    """A compact columnar store of data infos.
+
+    The data infos, e.g. the instance annotations of a COCO-style dataset,
+    are stored column by column in a few contiguous NumPy arrays instead of
+    one Python dict per sample. Each column is stored in one of the
+    following kinds according to its values:
+
+        - ``'array'``: arrays of the same dtype and trailing shape, which
+            are concatenated along the first axis. 0-dim arrays are stacked.
+        - ``'scalar'``: Python ``int``, ``float`` or ``bool`` values
+        - ``'str'``: strings, which are stored as a table of unique strings
+            and the index of each value in the table
+        - ``'object'``: other values, which are pickled individually
+
+    The data info of a sample is materialized when it is accessed, so that
+    the arrays are never modified by the pipelines. Since the arrays hold no
+    Python objects, the pages are not duplicated by copy-on-write in the
+    dataloader workers. The store can also be dumped to a single file and
+    loaded with memory mapping, so that the processes on the same node share
+    the same pages.
+
+    Args:
+        columns (dict): The columns, each is a dict with the ``'kind'`` and
+            the arrays of the column
+        length (int): The number of data infos
+        meta (dict, optional): Extra information that is saved along with
+            the data infos by :meth:`dump`, e.g. the meta information
+            collected while loading the annotations. Defaults to ``None``
+
+    Example:
+        >>> import numpy as np
+        >>> from mmpose.datasets.datasets.base import ColumnarDataList
+        >>> data_list = ColumnarDataList.from_data_list([
+        ...     dict(img_path='a.jpg', bbox=np.zeros((1, 4)), id=0),
+        ...     dict(img_path='a.jpg', bbox=np.ones((1, 4)), id=1)])
+        >>> data_list[1]
+        {'img_path': 'a.jpg', 'bbox': array([[1., 1., 1., 1.]]), 'id': 1}
+    """
+
+    _MAGIC = b'MMPCOL01'
+
+    def __init__(self,
+                 columns: Dict[str, dict],
+                 length: int,
+                 meta: Optional[dict] = None) -> None:
+        self.columns = columns
+        self.length = length
+        self.meta = dict() if meta is None else meta
+
+    @classmethod
+    def from_data_list(cls,
+                       data_list: List[dict],
+                       meta: Optional[dict] = None) -> 'ColumnarDataList':
+        """Build the store from a list of data infos.
+
+        Args:
+            data_list (List[dict]): The data infos
+            meta (dict, optional): Extra information of the store.
+                Defaults to ``None``
+
+        Returns:
+            ColumnarDataList: The columnar store of the data infos.
+        """
+        keys = dict()
+        for data_info in data_list:
+            keys.update(dict.fromkeys(data_info))
+
+        columns = {
+            key: cls._build_column([d.get(key, ...) for d in data_list])
+            for key in keys
+        }
+        return cls(columns, len(data_list), meta)
+
+    @staticmethod
+    def _build_column(values: list) -> dict:
+        """Build a column from the values of all data infos. Missing values
+        are marked by ``Ellipsis``."""
+
+        first = values[0]
+        if isinstance(first, np.ndarray) and first.dtype != object:
+            if all(
+                    isinstance(v, np.ndarray) and v.dtype == first.dtype
+                    and v.shape[1:] == first.shape[1:] and v.ndim == first.ndim
+                    for v in values):
+                if first.ndim == 0:
+                    return dict(kind='array', data=np.stack(values))
+                offsets = np.zeros(len(values) + 1, dtype=np.int64)
+                offsets[1:] = np.cumsum([len(v) for v in values])
+                return dict(
+                    kind='array', data=np.concatenate(values), offsets=offsets)
+
+        elif type(first) in (int, float, bool):
+            dtype = {int: np.int64, float: np.float64, bool: np.bool_}
+            if all(type(v) is type(first) for v in values):
+                try:
+                    data = np.array(values, dtype=dtype[type(first)])
+                except OverflowError:
+                    pass
+                else:
+                    return dict(kind='scalar', data=data)
+
+        elif isinstance(first, str):
+            if all(isinstance(v, str) for v in values):
+                table, indices = np.unique(
+                    np.array(values, dtype=object), return_inverse=True)
+                column = _encode_bytes([s.encode() for s in table])
+                column.update(kind='str', indices=indices.astype(np.int64))
+                return column
+
+        # fall back to pickle the values individually and mark the missing
+        # values with empty bytes
+        column = _encode_bytes(
+            [b'' if v is ... else pickle.dumps(v, protocol=4) for v in values])
+        column.update(kind='object')
+        return column
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[dict, List[dict]]:
+        """Materialize the data info of the given index.
+
+        Args:
+            idx (int | slice): The index of the data info
+
+        Returns:
+            dict | List[dict]: The data info, or a list of data infos if
+            ``idx`` is a slice.
+        """
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.length))]
+
+        if idx < 0:
+            idx += self.length
+        if not 0 <= idx < self.length:
+            raise IndexError(f'index {idx} is out of range')
+
+        data_info = dict()
+        for key, column in self.columns.items():
+            kind = column['kind']
+            if kind == 'array':
+                if 'offsets' in column:
+                    start, end = column['offsets'][idx:idx + 2]
+                    data_info[key] = np.array(column['data'][start:end])
+                else:
+                    data_info[key] = np.array(column['data'][idx])
+            elif kind == 'scalar':
+                data_info[key] = column['data'][idx].item()
+            elif kind == 'str':
+                i = column['indices'][idx]
+                start, end = column['offsets'][i:i + 2]
+                data_info[key] = column['data'][start:end].tobytes().decode()
+            else:
+                start, end = column['offsets'][idx:idx + 2]
+                if end > start:
+                    data_info[key] = pickle.loads(
+                        memoryview(column['data'][start:end]))
+
+        return data_info
+
+    @property
+    def nbytes(self) -> int:
+        """int: The total size in bytes of the arrays in the store."""
+        return sum(array.nbytes for column in self.columns.values()
+                   for array in column.values()
+                   if isinstance(array, np.ndarray))
+
+    def dump(self, file: str) -> None:
+        """Dump the store to a file, which can be loaded by :meth:`load`
+        with memory mapping.
+
+        Args:
+            file (str): The file path
+        """
+        schema = dict()
+        arrays = []
+        offset = 0
+        for key, column in self.columns.items():
+            schema[key] = dict()
+            for name, value in column.items():
+                if isinstance(value, np.ndarray):
+                    value = np.ascontiguousarray(value)
+                    schema[key][name] = (value.dtype.str, value.shape, offset)
+                    arrays.append((offset, value))
+                    offset = _align(offset + value.nbytes)
+                else:
+                    schema[key][name] = value
+
+        header = pickle.dumps(
+            dict(length=self.length, columns=schema, meta=self.meta),
+            protocol=4)
+        data_start = _align(len(self._MAGIC) + 8 + len(header))
+
+        with open(file, 'wb') as f:
+            f.write(self._MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for array_offset, array in arrays:
+                f.seek(data_start + array_offset)
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+
+    @classmethod
+    def load(cls, file: str, mmap: bool = True) -> 'ColumnarDataList':
+        """Load a store dumped by :meth:`dump`.
+
+        Args:
+            file (str): The file path
+            mmap (bool): Whether to map the file into memory instead of
+                reading it, so that the pages are shared by all the
+                processes that load the same file. Defaults to ``True``
+
+        Returns:
+            ColumnarDataList: The loaded store.
+        """
+        with open(file, 'rb') as f:
+            if f.read(len(cls._MAGIC)) != cls._MAGIC:
+                raise ValueError(f'{file} is not a valid {cls.__name__} file')
+            header_size = int.from_bytes(f.read(8), 'little')
+            header = pickle.loads(f.read(header_size))
+
+        if mmap:
+            buffer = np.memmap(file, dtype=np.uint8, mode='r')
+        else:
+            buffer = np.fromfile(file, dtype=np.uint8)
+        data_start = _align(len(cls._MAGIC) + 8 + header_size)
+
+        columns = dict()
+        for key, schema in header['columns'].items():
+            columns[key] = dict()
+            for name, value in schema.items():
+                if isinstance(value, tuple):
+                    dtype, shape, offset = value
+                    dtype = np.dtype(dtype)
+                    start = data_start + offset
+                    end = start + dtype.itemsize * int(np.prod(shape))
+                    value = buffer[start:end].view(dtype).reshape(shape)
+                columns[key][name] = value
+
+        return cls(columns, header['length'], header['meta'])
@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os.path as osp
 from collections import defaultdict
-from typing import Callable, List, Optional, Sequence, Tuple, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from mmengine.fileio import exists, get_local_path
@@ -73,6 +73,13 @@ class Human36mDataset(BaseMocapDataset):
             factor loaded from this file will be used instead of calculated
             factors. Default: ``None``.
         camera_param_file (str): Cameras' parameters file. Default: ``None``.
+        lazy_window (bool): If set to ``True``, the per-frame annotations are
+            kept once and each data sample only stores the frame indices of
+            its sequence, which saves memory for long sequences. Only
+            supported in ``'topdown'`` mode. Default: ``False``.
+        mmap_ann_file (bool): Whether to memory-map the arrays in the
+            annotation file instead of reading them into memory.
+            Default: ``False``.
         data_mode (str): Specifies the mode of data samples: ``'topdown'`` or
             ``'bottomup'``. In ``'topdown'`` mode, each data sample contains
             one instance; while in ``'bottomup'`` mode, each data sample
@@ -120,6 +127,8 @@ class Human36mDataset(BaseMocapDataset):
                  keypoint_2d_det_file: Optional[str] = None,
                  factor_file: Optional[str] = None,
                  camera_param_file: Optional[str] = None,
+                 lazy_window: bool = False,
+                 mmap_ann_file: bool = False,
                  data_mode: str = 'topdown',
                  metainfo: Optional[dict] = None,
                  data_root: Optional[str] = None,
@@ -166,6 +175,8 @@ class Human36mDataset(BaseMocapDataset):
             causal=causal,
             subset_frac=subset_frac,
             camera_param_file=camera_param_file,
+            lazy_window=lazy_window,
+            mmap_ann_file=mmap_ann_file,
             data_mode=data_mode,
             metainfo=metainfo,
             data_root=data_root,
@@ -243,11 +254,9 @@ class Human36mDataset(BaseMocapDataset):
 
         return sequence_indices
 
-    def _load_annotations(self) -> Tuple[List[dict], List[dict]]:
-        instance_list, image_list = super()._load_annotations()
-
-        h36m_data = self.ann_data
-        kpts_3d = h36m_data['S']
+    def _load_frame_data(self) -> Dict[str, np.ndarray]:
+        frame_data = super()._load_frame_data()
+        num_frames = frame_data['keypoints_3d'].shape[0]
 
         if self.keypoint_2d_src == 'detection':
             assert exists(self.keypoint_2d_det_file), (
@@ -255,39 +264,29 @@ class Human36mDataset(BaseMocapDataset):
                 'does not exist.')
             kpts_2d = self._load_keypoint_2d_detection(
                 self.keypoint_2d_det_file)
-            assert kpts_2d.shape[0] == kpts_3d.shape[0], (
+            assert kpts_2d.shape[0] == num_frames, (
                 f'Number of `kpts_2d` ({kpts_2d.shape[0]}) does not match '
-                f'number of `kpts_3d` ({kpts_3d.shape[0]}).')
+                f'number of `kpts_3d` ({num_frames}).')
 
             assert kpts_2d.shape[2] == 3, (
                 f'Expect `kpts_2d.shape[2]` == 3, but got '
                 f'{kpts_2d.shape[2]}. Please check the format of '
                 f'{self.keypoint_2d_det_file}')
 
-            for idx, frame_ids in enumerate(self.sequence_indices):
-                kpt_2d = kpts_2d[frame_ids].astype(np.float32)
-                keypoints = kpt_2d[..., :2]
-                keypoints_visible = kpt_2d[..., 2]
-                instance_list[idx].update({
-                    'keypoints':
-                    keypoints,
-                    'keypoints_visible':
-                    keypoints_visible
-                })
+            frame_data['keypoints'] = kpts_2d[..., :2]
+            frame_data['keypoints_visible'] = kpts_2d[..., 2]
+
         if self.factor_file:
             with get_local_path(self.factor_file) as local_path:
                 factors = np.load(local_path).astype(np.float32)
         else:
-            factors = np.zeros((kpts_3d.shape[0], ), dtype=np.float32)
-        assert factors.shape[0] == kpts_3d.shape[0], (
+            factors = np.zeros((num_frames, ), dtype=np.float32)
+        assert factors.shape[0] == num_frames, (
             f'Number of `factors` ({factors.shape[0]}) does not match '
-            f'number of `kpts_3d` ({kpts_3d.shape[0]}).')
-
-        for idx, frame_ids in enumerate(self.sequence_indices):
-            factor = factors[frame_ids].astype(np.float32)
-            instance_list[idx].update({'factor': factor})
+            f'number of `kpts_3d` ({num_frames}).')
+        frame_data['factor'] = factors
 
-        return instance_list, image_list
+        return frame_data
 
     @staticmethod
     def _parse_h36m_imgname(imgname) -> Tuple[str, str, str]:
@@ -1,6 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os.path as osp
+import struct
 import warnings
+import zipfile
+from copy import deepcopy
+from typing import Any, Dict
 
 import numpy as np
 from mmengine import Config
@@ -200,3 +204,106 @@ def parse_pose_metainfo(metainfo: dict):
         parsed['skeleton_link_colors'], dtype=np.uint8)
 
     return parsed
+
+
+class ReadOnlyList(list):
+    """A list that can not be modified in place.
+
+    It is used to share the meta information among the data samples without
+    copying it. The copy of a :class:`ReadOnlyList` is a normal ``list``, so
+    the transforms that need to modify it should make a copy first.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f'{self.__class__.__name__} is read-only. Please '
+                        'make a copy by `list()` before modifying it.')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = _readonly
+    sort = reverse = _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return [deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return self.__class__, (list(self), )
+
+
+def get_readonly_view(value: Any) -> Any:
+    """Get a read-only view of the meta information, which can be shared by
+    the data samples without copying.
+
+    Lists are converted into :class:`ReadOnlyList` recursively and arrays
+    are viewed as non-writeable arrays. The values of other types are
+    returned as they are.
+
+    Args:
+        value (Any): The value of the meta information
+
+    Returns:
+        Any: The read-only view of the value.
+    """
+    if isinstance(value, list):
+        return ReadOnlyList(get_readonly_view(item) for item in value)
+    elif isinstance(value, tuple):
+        return tuple(get_readonly_view(item) for item in value)
+    elif isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+    return value
+
+
+def load_npz_mmap(file_path: str) -> Dict[str, np.ndarray]:
+    """Load the arrays in a ``.npz`` file as memory-maps.
+
+    :func:`numpy.load` ignores ``mmap_mode`` for ``.npz`` files and reads
+    the arrays into memory. The arrays stored uncompressed (e.g. by
+    :func:`numpy.savez`) are memory-mapped from their offsets in the zip
+    file instead, so that they are only read on access and the pages are
+    shared by the processes. The compressed arrays can not be
+    memory-mapped, and are read into memory.
+
+    Args:
+        file_path (str): The path of the ``.npz`` file
+
+    Returns:
+        Dict[str, np.ndarray]: The arrays indexed by their names.
+    """
+    arrays = dict()
+    with zipfile.ZipFile(file_path) as zip_file, open(file_path, 'rb') as f:
+        for info in zip_file.infolist():
+            name = info.filename
+            if name.endswith('.npy'):
+                name = name[:-4]
+
+            if info.compress_type == zipfile.ZIP_STORED:
+                # skip the local file header, whose size is 30 bytes plus the
+                # lengths of the file name and the extra field
+                f.seek(info.header_offset + 26)
+                name_len, extra_len = struct.unpack('<HH', f.read(4))
+                f.seek(name_len + extra_len, 1)
+
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    header = np.lib.format.read_array_header_1_0(f)
+                else:
+                    header = np.lib.format.read_array_header_2_0(f)
+                shape, fortran_order, dtype = header
+
+                if not dtype.hasobject:
+                    arrays[name] = np.memmap(
+                        file_path,
+                        dtype=dtype,
+                        mode='r',
+                        offset=f.tell(),
+                        shape=shape,
+                        order='F' if fortran_order else 'C')
+                    continue
+
+            with zip_file.open(info) as member:
+                arrays[name] = np.load(member)
+
+    return arrays
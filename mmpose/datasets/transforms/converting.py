@@ -123,6 +123,9 @@ class KeypointConverter(BaseTransform):
                     'keypoints_visible'][:, self.source_index2]
             # Flip keypoints if flip_indices provided
             if flip_indices is not None:
+                # the flip indices from the dataset metainfo are shared
+                # and read-only
+                flip_indices = list(flip_indices)
                 for i, (x1, x2) in enumerate(
                         zip(self.source_index, self.source_index2)):
                     idx = flip_indices[x1] if x1 == x2 else i
@@ -5,6 +5,7 @@ import numpy as np
 from mmcv.transforms import LoadImageFromFile
 
 from mmpose.registry import TRANSFORMS
+from mmpose.utils import ImageCache
 
 
 @TRANSFORMS.register_module()
@@ -37,8 +38,49 @@ class LoadImage(LoadImageFromFile):
             uri corresponding backend. Defaults to None.
         ignore_empty (bool): Whether to allow loading empty image or file path
             not existent. Defaults to False.
+        use_cache (bool): Whether to look up and store the decoded images of
+            local files in the shared :class:`~mmpose.utils.ImageCache`, so
+            that an image used by multiple samples is only decoded once. The
+            cached images are read-only. Defaults to False.
     """
 
+    def __init__(self, *args, use_cache: bool = False, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.use_cache = use_cache
+
+    def _load_from_cache(self, results: dict) -> Optional[dict]:
+        """Load the image of ``results['img_path']`` through the shared image
+        cache.
+
+        Args:
+            results (dict): The result dict
+
+        Returns:
+            dict: The result dict, or ``None`` if the image can not be read
+            and ``self.ignore_empty`` is ``True``.
+        """
+        filename = results['img_path']
+        try:
+            img = ImageCache.get_default().load(
+                filename,
+                color_type=self.color_type,
+                backend=self.imdecode_backend)
+        except Exception as e:
+            if self.ignore_empty:
+                return None
+            else:
+                raise e
+        # the image is `None` if the file can not be decoded, the same as
+        # :meth:`LoadImageFromFile.transform`
+        assert img is not None, f'failed to load image: {filename}'
+        if self.to_float32:
+            img = img.astype(np.float32)
+
+        results['img'] = img
+        results['img_shape'] = img.shape[:2]
+        results['ori_shape'] = img.shape[:2]
+        return results
+
     def transform(self, results: dict) -> Optional[dict]:
         """The transform function of :class:`LoadImage`.
 
@@ -50,8 +92,14 @@ class LoadImage(LoadImageFromFile):
         """
         try:
             if 'img' not in results:
-                # Load image from file by :meth:`LoadImageFromFile.transform`
-                results = super().transform(results)
+                if self.use_cache and self.backend_args is None:
+                    results = self._load_from_cache(results)
+                    if results is None:
+                        return None
+                else:
+                    # Load image from file by
+                    # :meth:`LoadImageFromFile.transform`
+                    results = super().transform(results)
             else:
                 img = results['img']
                 assert isinstance(img, np.ndarray)
@@ -1,5 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
@@ -7,7 +7,8 @@ from mmcv.transforms import BaseTransform
 from mmengine import is_seq_of
 
 from mmpose.registry import TRANSFORMS
-from mmpose.structures.bbox import get_udp_warp_matrix, get_warp_matrix
+from mmpose.structures.bbox import (get_udp_warp_matrices, get_udp_warp_matrix,
+                                    get_warp_matrices, get_warp_matrix)
 
 
 @TRANSFORMS.register_module()
@@ -38,9 +39,21 @@ class TopdownAffine(BaseTransform):
         use_udp (bool): Whether use unbiased data processing. See
             `UDP (CVPR 2020)`_ for details. Defaults to ``False``
 
+    Note:
+        :meth:`transform` only accepts a single instance. To crop multiple
+        instances of the same image in one pass, use
+        :meth:`transform_instances`, which returns one result dict per
+        instance.
+
     .. _`UDP (CVPR 2020)`: https://arxiv.org/abs/1911.07524
     """
 
+    # keys holding per-instance data, which will be split by
+    # :meth:`transform_instances`
+    instance_keys = ('bbox', 'bbox_score', 'bbox_center', 'bbox_scale',
+                     'bbox_rotation', 'keypoints', 'keypoints_visible',
+                     'transformed_keypoints', 'area', 'category_id', 'id')
+
     def __init__(self,
                  input_size: Tuple[int, int],
                  use_udp: bool = False) -> None:
@@ -89,10 +102,10 @@ class TopdownAffine(BaseTransform):
         results['bbox_scale'] = self._fix_aspect_ratio(
             results['bbox_scale'], aspect_ratio=w / h)
 
-        # TODO: support multi-instance
         assert results['bbox_center'].shape[0] == 1, (
             'Top-down heatmap only supports single instance. Got invalid '
-            f'shape of bbox_center {results["bbox_center"].shape}.')
+            f'shape of bbox_center {results["bbox_center"].shape}. Use '
+            '`transform_instances` to handle multiple instances.')
 
         center = results['bbox_center'][0]
         scale = results['bbox_scale'][0]
@@ -133,6 +146,89 @@ class TopdownAffine(BaseTransform):
 
         return results
 
+    def transform_instances(self, results: Dict) -> List[dict]:
+        """Crop all the instances of the input image at once.
+
+        The warp matrices of all instances are computed in a batch and the
+        source image is shared by all instances, so the image only needs to
+        be loaded and decoded once. Each returned result dict is the same as
+        the output of :meth:`transform` given the corresponding single
+        instance, including the cropped image.
+
+        Args:
+            results (dict): The result dict with N instances
+
+        Returns:
+            List[dict]: The N result dicts, each containing one instance.
+        """
+
+        w, h = self.input_size
+        warp_size = (int(w), int(h))
+
+        # reshape bbox to fixed aspect ratio
+        results['bbox_scale'] = self._fix_aspect_ratio(
+            results['bbox_scale'], aspect_ratio=w / h)
+
+        centers = results['bbox_center']
+        scales = results['bbox_scale']
+        num_instances = centers.shape[0]
+        rots = results.get('bbox_rotation', 0.)
+
+        if self.use_udp:
+            warp_mats = get_udp_warp_matrices(
+                centers, scales, rots, output_size=(w, h))
+        else:
+            warp_mats = get_warp_matrices(
+                centers, scales, rots, output_size=(w, h))
+
+        instance_keys = [
+            key for key in self.instance_keys
+            if isinstance(results.get(key, None), np.ndarray)
+            and len(results[key]) == num_instances
+        ]
+        shared = {
+            key: value
+            for key, value in results.items() if key not in instance_keys
+        }
+
+        results_list = []
+        for i, warp_mat in enumerate(warp_mats):
+            inst_results = shared.copy()
+            for key in instance_keys:
+                inst_results[key] = results[key][i:i + 1]
+
+            if isinstance(results['img'], list):
+                inst_results['img'] = [
+                    cv2.warpAffine(
+                        img, warp_mat, warp_size, flags=cv2.INTER_LINEAR)
+                    for img in results['img']
+                ]
+            else:
+                inst_results['img'] = cv2.warpAffine(
+                    results['img'],
+                    warp_mat,
+                    warp_size,
+                    flags=cv2.INTER_LINEAR)
+
+            if inst_results.get('keypoints', None) is not None:
+                keypoints = inst_results['keypoints']
+                if inst_results.get('transformed_keypoints', None) is not None:
+                    transformed_keypoints = inst_results[
+                        'transformed_keypoints'].copy()
+                else:
+                    transformed_keypoints = keypoints.copy()
+                # Only transform (x, y) coordinates
+                transformed_keypoints[..., :2] = cv2.transform(
+                    keypoints[..., :2], warp_mat)
+                inst_results['transformed_keypoints'] = transformed_keypoints
+
+            inst_results['input_size'] = (w, h)
+            inst_results['input_center'] = centers[i]
+            inst_results['input_scale'] = scales[i]
+            results_list.append(inst_results)
+
+        return results_list
+
     def __repr__(self) -> str:
         """print the basic information of the transform.
 
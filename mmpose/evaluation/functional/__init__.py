@@ -1,9 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .keypoint_eval import (keypoint_auc, keypoint_epe, keypoint_mpjpe,
-                            keypoint_nme, keypoint_pck_accuracy,
+from .coco_eval import (coco_keypoint_eval, coco_keypoint_match,
+                        coco_keypoint_summarize, merge_coco_keypoint_matches)
+from .keypoint_eval import (keypoint_auc, keypoint_distance_sum, keypoint_epe,
+                            keypoint_mpjpe, keypoint_nme,
+                            keypoint_pck_accuracy, keypoint_pck_counts,
+                            keypoint_position_errors,
                             multilabel_classification_accuracy,
-                            pose_pck_accuracy, simcc_pck_accuracy)
-from .nms import nearby_joints_nms, nms, nms_torch, oks_nms, soft_oks_nms
+                            pck_accuracy_from_counts, pose_pck_accuracy,
+                            simcc_pck_accuracy)
+from .mesh_eval import batch_compute_similarity_transform
+from .nms import (batched_oks_nms, nearby_joints_nms, nms, nms_torch,
+                  oks_iou_matrix, oks_nms, soft_oks_nms)
 from .transforms import transform_ann, transform_pred, transform_sigmas
 
 __all__ = [
@@ -11,5 +18,9 @@ __all__ = [
     'pose_pck_accuracy', 'multilabel_classification_accuracy',
     'simcc_pck_accuracy', 'nms', 'oks_nms', 'soft_oks_nms', 'keypoint_mpjpe',
     'nms_torch', 'transform_ann', 'transform_sigmas', 'transform_pred',
-    'nearby_joints_nms'
+    'nearby_joints_nms', 'oks_iou_matrix', 'batched_oks_nms',
+    'coco_keypoint_eval', 'coco_keypoint_match', 'coco_keypoint_summarize',
+    'merge_coco_keypoint_matches', 'keypoint_pck_counts',
+    'pck_accuracy_from_counts', 'keypoint_distance_sum',
+    'batch_compute_similarity_transform', 'keypoint_position_errors'
 ]
@@ -0,0 +1,657 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# the keypoint evaluation parameters of `xtcocotools.cocoeval.Params`
+IOU_THRS = np.linspace(
+    .5, 0.95, int(np.round((0.95 - .5) / .05)) + 1, endpoint=True)
+REC_THRS = np.linspace(
+    .0, 1.00, int(np.round((1.00 - .0) / .01)) + 1, endpoint=True)
+AREA_RNGS = [[0**2, 1e5**2], [32**2, 96**2], [96**2, 1e5**2]]
+AREA_RNG_LABELS = ['all', 'medium', 'large']
+MAX_DETS = 20
+
+# the maximum number of elements of the per-keypoint arrays in a chunk
+_CHUNK_ELEMENTS = 1 << 22
+
+
+def _compute_oks(dt_kpts: np.ndarray, dt_valid: np.ndarray,
+                 gt_kpts: np.ndarray, gt_valid: np.ndarray,
+                 gt_bboxes: np.ndarray, gt_areas: np.ndarray,
+                 sigmas: np.ndarray) -> np.ndarray:
+    """Compute the OKS between the detections and ground truths of a chunk
+    of images in the same way as ``COCOeval.computeOks``.
+
+    Returns:
+        np.ndarray: The OKS in shape (n, D, G).
+    """
+    n, D, K = dt_kpts.shape[:3]
+    G = gt_kpts.shape[1]
+    ious = np.zeros((n, D, G))
+
+    # only compute the pairs of valid detections and ground truths
+    pairs = dt_valid[:, :, None] & gt_valid[:, None, :]
+    inds_n, inds_d, inds_g = np.nonzero(pairs)
+    if len(inds_n) == 0:
+        return ious
+
+    vars = (sigmas * 2)**2
+    dt = dt_kpts[inds_n, inds_d]
+    gt = gt_kpts[inds_n, inds_g]
+    bbox = gt_bboxes[inds_n, inds_g, :, None]
+    area = gt_areas[inds_n, inds_g, None]
+    gt_vis = gt[..., 2] > 0
+    num_vis = np.count_nonzero(gt_vis, axis=-1)
+    visible = (num_vis > 0)[:, None]
+
+    # measure the per-keypoint distance if keypoints visible, otherwise the
+    # minimum distance to the ignore region (the doubled gt bbox)
+    xd, yd = dt[..., 0], dt[..., 1]
+    x0 = bbox[:, 0] - bbox[:, 2]
+    x1 = bbox[:, 0] + bbox[:, 2] * 2
+    y0 = bbox[:, 1] - bbox[:, 3]
+    y1 = bbox[:, 1] + bbox[:, 3] * 2
+    dx = np.where(visible, xd - gt[..., 0],
+                  np.maximum(0, x0 - xd) + np.maximum(0, xd - x1))
+    dy = np.where(visible, yd - gt[..., 1],
+                  np.maximum(0, y0 - yd) + np.maximum(0, yd - y1))
+
+    e = (dx**2 + dy**2) / vars / (area + np.spacing(1)) / 2
+    exp_e = np.exp(-e)
+
+    # average over the visible keypoints (or all keypoints if none is
+    # visible). The pairs are grouped by the number of averaged keypoints
+    # so that each sum is reduced over a packed row, which gives the same
+    # rounding as summing the keypoints of each pair separately
+    kpt_mask = gt_vis | ~visible
+    num_kpts = np.where(num_vis > 0, num_vis, K)
+    oks = np.zeros(len(inds_n))
+    for num in np.unique(num_kpts):
+        group = num_kpts == num
+        values = exp_e[group][kpt_mask[group]].reshape(-1, num)
+        oks[group] = values.sum(axis=-1) / num
+    ious[inds_n, inds_d, inds_g] = oks
+
+    return ious
+
+
+def _match(ious: np.ndarray, dt_valid: np.ndarray, gt_valid: np.ndarray,
+           gt_ignore: np.ndarray,
+           gt_crowd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Greedily match the detections to the ground truths at every OKS
+    threshold in the same way as ``COCOeval.evaluateImg``.
+
+    The detections are sorted by score and the ground truths are sorted with
+    the ignored ones last in each image.
+
+    Returns:
+        tuple:
+        - dt_matched (np.ndarray): Whether each detection is matched at each
+            threshold in shape (n, T, D)
+        - dt_ignore (np.ndarray): Whether each detection is matched to an
+            ignored ground truth in shape (n, T, D)
+    """
+    n, D, G = ious.shape
+    T = len(IOU_THRS)
+    thrs = np.minimum(IOU_THRS, 1 - 1e-10)[None, :, None]
+
+    gt_matched = np.zeros((n, T, G), dtype=bool)
+    dt_matched = np.zeros((n, T, D), dtype=bool)
+    dt_ignore = np.zeros((n, T, D), dtype=bool)
+    if G == 0:
+        # no ground truth to match, so all the detections are unmatched
+        return dt_matched, dt_ignore
+
+    for d in range(D):
+        # only the images with at least d + 1 detections
+        rows = np.flatnonzero(dt_valid[:, d])
+        iou = ious[rows, None, d]
+        available = (
+            gt_valid[rows, None]
+            & (~gt_matched[rows] | gt_crowd[rows, None])
+            & (iou >= thrs))
+        # a detection is only matched to an ignored ground truth if no
+        # regular one is available
+        regular = available & ~gt_ignore[rows, None]
+        candidates = np.where(
+            regular.any(axis=-1, keepdims=True), regular, available)
+
+        # take the last ground truth with the highest OKS
+        values = np.where(candidates, iou, -np.inf)
+        m = G - 1 - np.argmax(values[..., ::-1], axis=-1)
+        matched = candidates.any(axis=-1)
+
+        inds_r, inds_t = np.nonzero(matched)
+        gt_matched[rows[inds_r], inds_t, m[inds_r, inds_t]] = True
+        dt_matched[rows, :, d] = matched
+        dt_ignore[rows, :, d] = matched & gt_ignore[rows[:, None], m]
+
+    return dt_matched, dt_ignore
+
+
+def _evaluate_chunk(chunk: dict) -> dict:
+    """Evaluate a chunk of images of the same category at every area range.
+
+    Returns:
+        dict: The results at each area range, including whether each valid
+        detection is matched (``'dt_matched'``, (A, T, N)) or ignored
+        (``'dt_ignore'``, (A, T, N)), and the number of the non-ignored
+        ground truths in each image (``'num_gts'``, (A, n)).
+    """
+    dt_valid = chunk['dt_valid']
+    gt_valid = chunk['gt_valid']
+    ious = _compute_oks(chunk['dt_kpts'], dt_valid, chunk['gt_kpts'], gt_valid,
+                        chunk['gt_bboxes'], chunk['gt_areas'], chunk['sigmas'])
+
+    results = dict(dt_matched=[], dt_ignore=[], num_gts=[])
+    for area_rng in AREA_RNGS:
+        gt_areas = chunk['gt_areas']
+        gt_ignore = chunk['gt_ignore'] | (gt_areas < area_rng[0]) | (
+            gt_areas > area_rng[1])
+
+        # sort the ground truths with the ignored ones last
+        gt_order = np.argsort(
+            np.where(gt_valid, gt_ignore, 2), axis=-1, kind='mergesort')
+        sorted_ious = np.take_along_axis(ious, gt_order[:, None], axis=-1)
+
+        def _sort(x):
+            return np.take_along_axis(x, gt_order, axis=-1)
+
+        dt_matched, dt_ignore = _match(sorted_ious, dt_valid, _sort(gt_valid),
+                                       _sort(gt_ignore),
+                                       _sort(chunk['gt_crowd']))
+
+        # set unmatched detections outside of area range to ignore
+        dt_areas = chunk['dt_areas']
+        dt_out = (dt_areas < area_rng[0]) | (dt_areas > area_rng[1])
+        dt_ignore |= ~dt_matched & dt_out[:, None]
+
+        results['dt_matched'].append(
+            dt_matched.transpose(1, 0, 2)[:, dt_valid])
+        results['dt_ignore'].append(dt_ignore.transpose(1, 0, 2)[:, dt_valid])
+        results['num_gts'].append(
+            np.count_nonzero(gt_valid & ~gt_ignore, axis=-1))
+
+    return {key: np.stack(value) for key, value in results.items()}
+
+
+def _pad(values: np.ndarray, rows: np.ndarray, cols: np.ndarray,
+         shape: tuple) -> np.ndarray:
+    """Scatter the values of instances into a padded (n, D, ...) array."""
+    padded = np.zeros(shape + values.shape[1:], dtype=values.dtype)
+    padded[rows, cols] = values
+    return padded
+
+
+def _group_slots(img_ranks: np.ndarray) -> np.ndarray:
+    """Get the position of each instance in its image, given the image rank
+    of the instances sorted by image."""
+    if len(img_ranks) == 0:
+        return np.zeros((0, ), dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, img_ranks[1:] != img_ranks[:-1]])
+    counts = np.diff(np.r_[starts, len(img_ranks)])
+    return np.arange(len(img_ranks)) - np.repeat(starts, counts)
+
+
+def _evaluate_category(gts: Dict[str, np.ndarray],
+                       preds: Dict[str, np.ndarray],
+                       sigmas: np.ndarray,
+                       nproc: int = 0) -> dict:
+    """Evaluate the detections of a category on every image."""
+    # sort the detections by image and then by score, and keep the top
+    # `MAX_DETS` ones in each image
+    order = np.lexsort((-preds['scores'], preds['img_ranks']))
+    dt_imgs = preds['img_ranks'][order]
+    dt_slots = _group_slots(dt_imgs)
+    keep = dt_slots < MAX_DETS
+    order, dt_imgs, dt_slots = order[keep], dt_imgs[keep], dt_slots[keep]
+
+    gt_order = np.argsort(gts['img_ranks'], kind='mergesort')
+    gt_imgs = gts['img_ranks'][gt_order]
+    gt_slots = _group_slots(gt_imgs)
+
+    imgs = np.unique(np.concatenate([dt_imgs, gt_imgs]))
+    dt_rows = np.searchsorted(imgs, dt_imgs)
+    gt_rows = np.searchsorted(imgs, gt_imgs)
+    D = int(dt_slots.max()) + 1 if len(dt_slots) else 0
+    G = int(gt_slots.max()) + 1 if len(gt_slots) else 0
+    K = len(sigmas)
+
+    # split the images into chunks to bound the memory usage
+    chunk_size = max(_CHUNK_ELEMENTS // max(D * G * K, 1), 1)
+    chunks = []
+    for start in range(0, len(imgs), chunk_size):
+        end = min(start + chunk_size, len(imgs))
+        dt_inds = np.flatnonzero((dt_rows >= start) & (dt_rows < end))
+        gt_inds = np.flatnonzero((gt_rows >= start) & (gt_rows < end))
+        dt_pos = (dt_rows[dt_inds] - start, dt_slots[dt_inds])
+        gt_pos = (gt_rows[gt_inds] - start, gt_slots[gt_inds])
+        dt_shape = (end - start, D)
+        gt_shape = (end - start, G)
+        dt_src = order[dt_inds]
+        gt_src = gt_order[gt_inds]
+
+        chunks.append(
+            dict(
+                dt_kpts=_pad(preds['keypoints'][dt_src], *dt_pos, dt_shape),
+                dt_areas=_pad(preds['areas'][dt_src], *dt_pos, dt_shape),
+                dt_valid=_pad(
+                    np.ones(len(dt_src), dtype=bool), *dt_pos, dt_shape),
+                gt_kpts=_pad(gts['keypoints'][gt_src], *gt_pos, gt_shape),
+                gt_bboxes=_pad(gts['bboxes'][gt_src], *gt_pos, gt_shape),
+                gt_areas=_pad(gts['areas'][gt_src], *gt_pos, gt_shape),
+                gt_ignore=_pad(gts['ignore'][gt_src], *gt_pos, gt_shape),
+                gt_crowd=_pad(gts['iscrowd'][gt_src], *gt_pos, gt_shape),
+                gt_valid=_pad(
+                    np.ones(len(gt_src), dtype=bool), *gt_pos, gt_shape),
+                sigmas=sigmas))
+
+    if nproc > 1 and len(chunks) > 1:
+        with Pool(min(nproc, len(chunks))) as pool:
+            results = pool.map(_evaluate_chunk, chunks)
+    else:
+        results = [_evaluate_chunk(chunk) for chunk in chunks]
+
+    A, T = len(AREA_RNGS), len(IOU_THRS)
+    if len(results) == 0:
+        results = [
+            dict(
+                dt_matched=np.zeros((A, T, 0), dtype=bool),
+                dt_ignore=np.zeros((A, T, 0), dtype=bool),
+                num_gts=np.zeros((A, 0), dtype=np.int64))
+        ]
+
+    return dict(
+        dt_imgs=dt_imgs,
+        dt_scores=preds['scores'][order],
+        dt_matched=np.concatenate([r['dt_matched'] for r in results], -1),
+        dt_ignore=np.concatenate([r['dt_ignore'] for r in results], -1),
+        gt_imgs=imgs,
+        num_gts=np.concatenate([r['num_gts'] for r in results], -1))
+
+
+def _accumulate(dt_scores: np.ndarray, dt_matched: np.ndarray,
+                dt_ignore: np.ndarray,
+                num_gts: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the precision at every recall threshold and the recall in the
+    same way as ``COCOeval.accumulate``.
+
+    Returns:
+        tuple:
+        - precision (np.ndarray): The precision in shape (T, R)
+        - recall (np.ndarray): The recall in shape (T, )
+    """
+    inds = np.argsort(-dt_scores, kind='mergesort')
+    dt_matched = dt_matched[:, inds]
+    dt_ignore = dt_ignore[:, inds]
+
+    tps = np.logical_and(dt_matched, np.logical_not(dt_ignore))
+    fps = np.logical_and(~dt_matched, np.logical_not(dt_ignore))
+    tp_sum = np.cumsum(tps, axis=1).astype(dtype=np.float64)
+    fp_sum = np.cumsum(fps, axis=1).astype(dtype=np.float64)
+
+    nd = tp_sum.shape[1]
+    rc = tp_sum / num_gts
+    pr = tp_sum / (fp_sum + tp_sum + np.spacing(1))
+    recall = rc[:, -1] if nd else np.zeros(len(rc))
+
+    # make the precision monotonically decreasing
+    pr = np.maximum.accumulate(pr[:, ::-1], axis=1)[:, ::-1]
+
+    precision = np.zeros((len(rc), len(REC_THRS)))
+    for t in range(len(rc)):
+        inds = np.searchsorted(rc[t], REC_THRS, side='left')
+        valid = inds < nd
+        precision[t, valid] = pr[t, inds[valid]]
+
+    return precision, recall
+
+
+def _accumulate_all(results: List[dict],
+                    img_mask: Optional[np.ndarray] = None
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """Accumulate the results of all categories on the images selected by
+    ``img_mask``.
+
+    Returns:
+        tuple:
+        - precision (np.ndarray): The precision in shape (T, R, K, A, M)
+        - recall (np.ndarray): The recall in shape (T, K, A, M)
+    """
+    T, R, K, A = len(IOU_THRS), len(REC_THRS), len(results), len(AREA_RNGS)
+    precision = -np.ones((T, R, K, A, 1))
+    recall = -np.ones((T, K, A, 1))
+
+    for k, result in enumerate(results):
+        dt_keep = slice(None)
+        gt_keep = slice(None)
+        if img_mask is not None:
+            dt_keep = img_mask[result['dt_imgs']]
+            gt_keep = img_mask[result['gt_imgs']]
+
+        for a in range(A):
+            num_gts = int(result['num_gts'][a][gt_keep].sum())
+            if num_gts == 0:
+                continue
+            dt_matched = result['dt_matched'][a][:, dt_keep]
+            dt_ignore = result['dt_ignore'][a][:, dt_keep]
+            prec, rec = _accumulate(result['dt_scores'][dt_keep], dt_matched,
+                                    dt_ignore, num_gts)
+            precision[:, :, k, a, 0] = prec
+            recall[:, k, a, 0] = rec
+
+    return precision, recall
+
+
+def _summarize(precision: np.ndarray,
+               recall: np.ndarray,
+               ap: bool = True,
+               iou_thr: Optional[float] = None,
+               area_rng: str = 'all') -> float:
+    """Average the precision or recall in the same way as
+    ``COCOeval.summarize``."""
+    aind = [i for i, lbl in enumerate(AREA_RNG_LABELS) if lbl == area_rng]
+    mind = [0]
+    if ap:
+        s = precision
+        if iou_thr is not None:
+            t = np.where(iou_thr == IOU_THRS)[0]
+            s = s[t]
+        s = s[:, :, :, aind, mind]
+    else:
+        s = recall
+        if iou_thr is not None:
+            t = np.where(iou_thr == IOU_THRS)[0]
+            s = s[t]
+        s = s[:, :, aind, mind]
+    if len(s[s > -1]) == 0:
+        return -1
+    return np.mean(s[s > -1])
+
+
+def coco_keypoint_match(gts: Dict[str, np.ndarray],
+                        preds: Dict[str, np.ndarray],
+                        img_ids: Sequence[int],
+                        cat_ids: Sequence[int],
+                        sigmas: np.ndarray,
+                        use_area: bool = True,
+                        iou_type: str = 'keypoints',
+                        nproc: int = 0) -> List[dict]:
+    """Match the detections to the ground truths on every image, which is
+    the first stage of :func:`coco_keypoint_eval` and corresponds to
+    ``COCOeval.evaluate``.
+
+    The matches of disjoint subsets of the images, e.g. evaluated on
+    different ranks, can be merged by :func:`merge_coco_keypoint_matches`
+    as long as the same ``img_ids`` and ``cat_ids`` are given.
+
+    Args:
+        gts (Dict[str, np.ndarray]): The ground truth instances. See
+            :func:`coco_keypoint_eval` for details
+        preds (Dict[str, np.ndarray]): The detected instances. See
+            :func:`coco_keypoint_eval` for details
+        img_ids (Sequence[int]): The ids of all images to evaluate
+        cat_ids (Sequence[int]): The ids of all categories to evaluate
+        sigmas (np.ndarray): Keypoint labelling uncertainty. Shape: (K, )
+        use_area (bool): Whether to use the annotated areas of the ground
+            truths. Defaults to ``True``
+        iou_type (str): ``'keypoints'`` or ``'keypoints_crowd'``. Defaults
+            to ``'keypoints'``
+        nproc (int): The number of processes to evaluate the images.
+            Defaults to 0
+
+    Returns:
+        List[dict]: The matches of each category, with the image rank, the
+        score and the matching results of each detection, and the number
+        of ground truths to match in each image.
+    """
+    if iou_type not in ('keypoints', 'keypoints_crowd'):
+        raise ValueError('`iou_type` should be "keypoints" or '
+                         f'"keypoints_crowd", but got "{iou_type}"')
+
+    sigmas = np.asarray(sigmas)
+    K = len(sigmas)
+    img_ids = np.unique(np.asarray(img_ids))
+    cat_ids = np.unique(np.asarray(cat_ids))
+
+    gt_img_ids = np.asarray(gts['img_ids'])
+    gt_cat_ids = np.asarray(gts['category_ids'])
+    gt_kpts = np.asarray(gts['keypoints'], dtype=np.float64).reshape(-1, K, 3)
+    gt_bboxes = np.asarray(gts['bboxes'], dtype=np.float64).reshape(-1, 4)
+    gt_areas = np.asarray(gts['areas'], dtype=np.float64)
+    gt_crowd = np.asarray(gts['iscrowd']).astype(bool)
+
+    dt_img_ids = np.asarray(preds['img_ids'])
+    dt_cat_ids = np.asarray(preds['category_ids'])
+    dt_kpts = np.asarray(
+        preds['keypoints'], dtype=np.float64).reshape(-1, K, 3)
+    dt_scores = np.asarray(preds['scores'], dtype=np.float64)
+    dt_areas = np.asarray(preds['areas'], dtype=np.float64)
+
+    if not np.isin(dt_img_ids, img_ids).all():
+        raise ValueError('Results do not correspond to current coco set')
+
+    # ignore the crowd instances and the ones without labeled keypoints
+    if iou_type == 'keypoints_crowd':
+        num_labeled = np.asarray(gts['num_keypoints'])
+    else:
+        num_labeled = np.count_nonzero(gt_kpts[..., 2] > 0, axis=-1)
+    gt_ignore = (num_labeled == 0) | gt_crowd
+
+    # the areas used to compute OKS and to check the area ranges
+    bbox_areas = gt_bboxes[:, 3] * gt_bboxes[:, 2] * 0.53
+    if use_area:
+        gt_areas = np.where(np.isnan(gt_areas), bbox_areas, gt_areas)
+    else:
+        gt_areas = bbox_areas
+
+    # ignore the detections whose keypoints all have zero scores
+    dt_keep = np.count_nonzero(dt_kpts[..., 2] > 0, axis=-1) > 0
+
+    matches = []
+    for cat_id in cat_ids:
+        gt_inds = np.flatnonzero((gt_cat_ids == cat_id)
+                                 & np.isin(gt_img_ids, img_ids))
+        dt_inds = np.flatnonzero((dt_cat_ids == cat_id) & dt_keep)
+        cat_gts = dict(
+            img_ranks=np.searchsorted(img_ids, gt_img_ids[gt_inds]),
+            keypoints=gt_kpts[gt_inds],
+            bboxes=gt_bboxes[gt_inds],
+            areas=gt_areas[gt_inds],
+            ignore=gt_ignore[gt_inds],
+            iscrowd=gt_crowd[gt_inds])
+        cat_preds = dict(
+            img_ranks=np.searchsorted(img_ids, dt_img_ids[dt_inds]),
+            keypoints=dt_kpts[dt_inds],
+            scores=dt_scores[dt_inds],
+            areas=dt_areas[dt_inds])
+        matches.append(_evaluate_category(cat_gts, cat_preds, sigmas, nproc))
+
+    return matches
+
+
+def merge_coco_keypoint_matches(matches_list: Sequence[List[dict]]
+                                ) -> List[dict]:
+    """Merge the matches of disjoint subsets of the images returned by
+    :func:`coco_keypoint_match`.
+
+    The merged matches are ordered by image in the same way as the matches
+    of all images, so the summarized results are exactly the same.
+
+    Args:
+        matches_list (Sequence[List[dict]]): The matches of each subset
+
+    Returns:
+        List[dict]: The merged matches of each category.
+    """
+    merged = []
+    for cat_matches in zip(*matches_list):
+
+        def _cat(key):
+            return np.concatenate([m[key] for m in cat_matches], axis=-1)
+
+        dt_order = np.argsort(_cat('dt_imgs'), kind='stable')
+        gt_order = np.argsort(_cat('gt_imgs'), kind='stable')
+        merged.append(
+            dict(
+                dt_imgs=_cat('dt_imgs')[dt_order],
+                dt_scores=_cat('dt_scores')[dt_order],
+                dt_matched=_cat('dt_matched')[..., dt_order],
+                dt_ignore=_cat('dt_ignore')[..., dt_order],
+                gt_imgs=_cat('gt_imgs')[gt_order],
+                num_gts=_cat('num_gts')[..., gt_order]))
+    return merged
+
+
+def coco_keypoint_summarize(matches: List[dict],
+                            img_ids: Sequence[int],
+                            iou_type: str = 'keypoints',
+                            crowd_indices: Optional[Sequence[float]] = None
+                            ) -> dict:
+    """Accumulate and summarize the matches returned by
+    :func:`coco_keypoint_match`, which corresponds to ``COCOeval.accumulate``
+    and ``COCOeval.summarize``.
+
+    Args:
+        matches (List[dict]): The matches of each category
+        img_ids (Sequence[int]): The ids of all images to evaluate, which
+            should be the same as the ones given to
+            :func:`coco_keypoint_match`
+        iou_type (str): ``'keypoints'`` or ``'keypoints_crowd'``. Defaults
+            to ``'keypoints'``
+        crowd_indices (Sequence[float], optional): The crowd index of each
+            image in ``img_ids``, required if ``iou_type`` is
+            ``'keypoints_crowd'``. Defaults to ``None``
+
+    Returns:
+        dict: The evaluation results. See :func:`coco_keypoint_eval` for
+        details.
+    """
+    if iou_type not in ('keypoints', 'keypoints_crowd'):
+        raise ValueError('`iou_type` should be "keypoints" or '
+                         f'"keypoints_crowd", but got "{iou_type}"')
+    if iou_type == 'keypoints_crowd' and crowd_indices is None:
+        raise ValueError('`crowd_indices` is required for the '
+                         '"keypoints_crowd" iou type')
+
+    precision, recall = _accumulate_all(matches)
+
+    stats = [
+        _summarize(precision, recall, True),
+        _summarize(precision, recall, True, iou_thr=.5),
+        _summarize(precision, recall, True, iou_thr=.75),
+    ]
+    if iou_type == 'keypoints_crowd':
+        stats.extend([
+            _summarize(precision, recall, False),
+            _summarize(precision, recall, False, iou_thr=.5),
+            _summarize(precision, recall, False, iou_thr=.75),
+        ])
+        # AP on the easy, medium and hard images split by the crowd index
+        all_img_ids = np.asarray(img_ids)
+        sorter = np.argsort(all_img_ids, kind='mergesort')
+        img_crowd_indices = np.asarray(crowd_indices)[sorter[np.searchsorted(
+            all_img_ids, np.unique(all_img_ids), sorter=sorter)]]
+        easy = img_crowd_indices < 0.2
+        medium = ~easy & (img_crowd_indices < 0.8)
+        hard = ~easy & ~medium
+        for img_mask in (easy, medium, hard):
+            type_precision, _ = _accumulate_all(matches, img_mask)
+            stats.append(round(np.mean(type_precision[:, :, :, 0, :]), 4))
+    else:
+        stats.extend([
+            _summarize(precision, recall, True, area_rng='medium'),
+            _summarize(precision, recall, True, area_rng='large'),
+            _summarize(precision, recall, False),
+            _summarize(precision, recall, False, iou_thr=.5),
+            _summarize(precision, recall, False, iou_thr=.75),
+            _summarize(precision, recall, False, area_rng='medium'),
+            _summarize(precision, recall, False, area_rng='large'),
+        ])
+
+    return dict(precision=precision, recall=recall, stats=np.array(stats))
+
+
+def coco_keypoint_eval(gts: Dict[str, np.ndarray],
+                       preds: Dict[str, np.ndarray],
+                       img_ids: Sequence[int],
+                       cat_ids: Sequence[int],
+                       sigmas: np.ndarray,
+                       use_area: bool = True,
+                       iou_type: str = 'keypoints',
+                       crowd_indices: Optional[Sequence[float]] = None,
+                       nproc: int = 0) -> dict:
+    """Evaluate keypoint detection results in the COCO protocol from arrays.
+
+    This is an in-memory equivalent of evaluating with
+    :class:`xtcocotools.cocoeval.COCOeval` with the ``'keypoints'`` or
+    ``'keypoints_crowd'`` iou type, which needs neither dumping the results
+    to a json file nor loading them back. The OKS, the matching and the
+    accumulation are computed for all images at once, and the results match
+    those of ``COCOeval`` exactly.
+
+    Note:
+
+        - number of keypoints: K
+        - number of ground truth instances: G
+        - number of detected instances: N
+
+    Args:
+        gts (Dict[str, np.ndarray]): The ground truth instances with the
+            following keys:
+
+                - ``'img_ids'``: The image ids. Shape: (G, )
+                - ``'category_ids'``: The category ids. Shape: (G, )
+                - ``'keypoints'``: The keypoint coordinates and
+                    visibilities. Shape: (G, K, 3)
+                - ``'bboxes'``: The bboxes in xywh format. Shape: (G, 4)
+                - ``'areas'``: The areas, ``nan`` if not annotated.
+                    Shape: (G, )
+                - ``'iscrowd'``: The crowd flags. Shape: (G, )
+                - ``'num_keypoints'``: The number of labeled keypoints,
+                    required if ``iou_type`` is ``'keypoints_crowd'``.
+                    Shape: (G, )
+
+        preds (Dict[str, np.ndarray]): The detected instances with the
+            following keys:
+
+                - ``'img_ids'``: The image ids. Shape: (N, )
+                - ``'category_ids'``: The category ids. Shape: (N, )
+                - ``'keypoints'``: The keypoint coordinates and scores.
+                    Shape: (N, K, 3)
+                - ``'scores'``: The instance scores. Shape: (N, )
+                - ``'areas'``: The areas used to ignore the unmatched
+                    detections out of the area ranges. Shape: (N, )
+
+        img_ids (Sequence[int]): The ids of all images to evaluate
+        cat_ids (Sequence[int]): The ids of all categories to evaluate
+        sigmas (np.ndarray): Keypoint labelling uncertainty. Shape: (K, )
+        use_area (bool): Whether to use the annotated areas of the ground
+            truths. If ``False``, the areas are estimated from the bboxes.
+            Defaults to ``True``
+        iou_type (str): ``'keypoints'`` or ``'keypoints_crowd'``. Defaults
+            to ``'keypoints'``
+        crowd_indices (Sequence[float], optional): The crowd index of each
+            image in ``img_ids``, required if ``iou_type`` is
+            ``'keypoints_crowd'``. Defaults to ``None``
+        nproc (int): The number of processes to evaluate the images. The
+            images are evaluated in the current process if it is less than
+            2. Defaults to 0
+
+    Returns:
+        dict: The evaluation results with the following keys:
+
+            - ``'precision'``: The precision in shape (T, R, K, A, M)
+            - ``'recall'``: The recall in shape (T, K, A, M)
+            - ``'stats'``: The summarized metrics, which are the same as
+                ``COCOeval.stats``
+    """
+    if iou_type == 'keypoints_crowd' and crowd_indices is None:
+        raise ValueError('`crowd_indices` is required for the '
+                         '"keypoints_crowd" iou type')
+
+    matches = coco_keypoint_match(gts, preds, img_ids, cat_ids, sigmas,
+                                  use_area, iou_type, nproc)
+    return coco_keypoint_summarize(matches, img_ids, iou_type, crowd_indices)
@@ -1,10 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from mmpose.codecs.utils import get_heatmap_maximum, get_simcc_maximum
-from .mesh_eval import compute_similarity_transform
+from .mesh_eval import batch_compute_similarity_transform
 
 
 def _calc_distances(preds: np.ndarray, gts: np.ndarray, mask: np.ndarray,
@@ -42,28 +42,6 @@ def _calc_distances(preds: np.ndarray, gts: np.ndarray, mask: np.ndarray,
     return distances.T
 
 
-def _distance_acc(distances: np.ndarray, thr: float = 0.5) -> float:
-    """Return the percentage below the distance threshold, while ignoring
-    distances values with -1.
-
-    Note:
-        - instance number: N
-
-    Args:
-        distances (np.ndarray[N, ]): The normalized distances.
-        thr (float): Threshold of the distances.
-
-    Returns:
-        float: Percentage of distances below the threshold. \
-            If all target keypoints are missing, return -1.
-    """
-    distance_valid = distances != -1
-    num_distance_valid = distance_valid.sum()
-    if num_distance_valid > 0:
-        return (distances[distance_valid] < thr).sum() / num_distance_valid
-    return -1
-
-
 def keypoint_pck_accuracy(pred: np.ndarray, gt: np.ndarray, mask: np.ndarray,
                           thr: np.ndarray, norm_factor: np.ndarray) -> tuple:
     """Calculate the pose accuracy of PCK for each individual keypoint and the
@@ -95,8 +73,70 @@ def keypoint_pck_accuracy(pred: np.ndarray, gt: np.ndarray, mask: np.ndarray,
         - avg_acc (float): Averaged accuracy across all keypoints.
         - cnt (int): Number of valid keypoints.
     """
+    correct, valid = keypoint_pck_counts(pred, gt, mask, thr, norm_factor)
+    return pck_accuracy_from_counts(correct, valid)
+
+
+def keypoint_pck_counts(pred: np.ndarray, gt: np.ndarray, mask: np.ndarray,
+                        thr: Union[float, Sequence[float]],
+                        norm_factor: np.ndarray) -> tuple:
+    """Count the correct and the valid predictions of each keypoint for PCK.
+
+    The counts can be summed over subsets of the instances, e.g. the ones on
+    different ranks, and converted to the same accuracy as
+    :func:`keypoint_pck_accuracy` by :func:`pck_accuracy_from_counts`.
+
+    Note:
+        - instance number: N
+        - keypoint number: K
+        - threshold number: T
+
+    Args:
+        pred (np.ndarray[N, K, 2]): Predicted keypoint location.
+        gt (np.ndarray[N, K, 2]): Groundtruth keypoint location.
+        mask (np.ndarray[N, K]): Visibility of the target. False for invisible
+            joints, and True for visible. Invisible joints will be ignored for
+            accuracy calculation.
+        thr (float | Sequence[float]): Threshold(s) of PCK calculation.
+        norm_factor (np.ndarray[N, 2]): Normalization factor for H&W.
+
+    Returns:
+        tuple: A tuple containing the counts.
+
+        - correct (np.ndarray[K] | np.ndarray[K, T]): Number of correct
+            predictions of each keypoint (at each threshold).
+        - valid (np.ndarray[K]): Number of valid predictions of each
+            keypoint.
+    """
     distances = _calc_distances(pred, gt, mask, norm_factor)
-    acc = np.array([_distance_acc(d, thr) for d in distances])
+    valid = distances != -1
+    if np.ndim(thr) > 0:
+        correct = np.stack([((distances < t) & valid).sum(axis=1)
+                            for t in thr],
+                           axis=-1)
+    else:
+        correct = ((distances < thr) & valid).sum(axis=1)
+    return correct, valid.sum(axis=1)
+
+
+def pck_accuracy_from_counts(correct: np.ndarray, valid: np.ndarray) -> tuple:
+    """Calculate the PCK accuracy from the counts of
+    :func:`keypoint_pck_counts`.
+
+    Args:
+        correct (np.ndarray[K]): Number of correct predictions of each
+            keypoint.
+        valid (np.ndarray[K]): Number of valid predictions of each keypoint.
+
+    Returns:
+        tuple: A tuple containing keypoint accuracy.
+
+        - acc (np.ndarray[K]): Accuracy of each keypoint. -1 if the keypoint
+            has no valid prediction.
+        - avg_acc (float): Averaged accuracy across all keypoints.
+        - cnt (int): Number of valid keypoints.
+    """
+    acc = np.where(valid > 0, correct / np.maximum(valid, 1), -1.)
     valid_acc = acc[acc >= 0]
     cnt = len(valid_acc)
     avg_acc = valid_acc.mean() if cnt > 0 else 0.0
@@ -188,6 +228,33 @@ def keypoint_epe(pred: np.ndarray, gt: np.ndarray, mask: np.ndarray) -> float:
     return distance_valid.sum() / max(1, len(distance_valid))
 
 
+def keypoint_distance_sum(pred: np.ndarray, gt: np.ndarray, mask: np.ndarray,
+                          norm_factor: np.ndarray) -> Tuple[float, int]:
+    """Sum the normalized distances of the valid keypoints, which can be
+    summed over subsets of the instances and divided by the number of valid
+    keypoints to get the NME or EPE.
+
+    Note:
+        - instance number: N
+        - keypoint number: K
+
+    Args:
+        pred (np.ndarray[N, K, 2]): Predicted keypoint location.
+        gt (np.ndarray[N, K, 2]): Groundtruth keypoint location.
+        mask (np.ndarray[N, K]): Visibility of the target. False for invisible
+            joints, and True for visible. Invisible joints will be ignored for
+            accuracy calculation.
+        norm_factor (np.ndarray[N, 2]): Normalization factor.
+
+    Returns:
+        tuple: A tuple containing the sum of distances (float) and the number
+        of valid keypoints (int).
+    """
+    distances = _calc_distances(pred, gt, mask, norm_factor)
+    distance_valid = distances[distances != -1]
+    return distance_valid.sum(dtype=np.float64), len(distance_valid)
+
+
 def pose_pck_accuracy(output: np.ndarray,
                       target: np.ndarray,
                       mask: np.ndarray,
@@ -321,10 +388,51 @@ def multilabel_classification_accuracy(pred: np.ndarray,
     return acc
 
 
+def keypoint_position_errors(pred: np.ndarray,
+                             gt: np.ndarray,
+                             alignment: str = 'none',
+                             chunk_size: Optional[int] = None) -> np.ndarray:
+    """Calculate the position error of each keypoint after aligning the
+    prediction with the ground truth, which can be averaged over any subset
+    of the keypoints to get the MPJPE.
+
+    Note:
+        - batch_size: N
+        - num_keypoints: K
+        - keypoint_dims: C
+
+    Args:
+        pred (np.ndarray): Predicted keypoint location with shape [N, K, C].
+        gt (np.ndarray): Groundtruth keypoint location with shape [N, K, C].
+        alignment (str, optional): method to align the prediction with the
+            groundtruth. See :func:`keypoint_mpjpe` for the options.
+        chunk_size (int, optional): The number of samples to align at a time
+            with ``'procrustes'`` alignment, which bounds the memory. If not
+            given, align all the samples at once. Defaults to ``None``.
+
+    Returns:
+        np.ndarray: The position errors with shape [N, K].
+    """
+    if alignment == 'none':
+        pass
+    elif alignment == 'procrustes':
+        pred = batch_compute_similarity_transform(
+            pred, gt, chunk_size=chunk_size)
+    elif alignment == 'scale':
+        pred_dot_pred = np.einsum('nkc,nkc->n', pred, pred)
+        pred_dot_gt = np.einsum('nkc,nkc->n', pred, gt)
+        scale_factor = pred_dot_gt / pred_dot_pred
+        pred = pred * scale_factor[:, None, None]
+    else:
+        raise ValueError(f'Invalid value for alignment: {alignment}')
+    return np.linalg.norm(pred - gt, ord=2, axis=-1)
+
+
 def keypoint_mpjpe(pred: np.ndarray,
                    gt: np.ndarray,
                    mask: np.ndarray,
-                   alignment: str = 'none'):
+                   alignment: str = 'none',
+                   chunk_size: Optional[int] = None):
     """Calculate the mean per-joint position error (MPJPE) and the error after
     rigid alignment with the ground truth (P-MPJPE).
 
@@ -346,6 +454,9 @@ def keypoint_mpjpe(pred: np.ndarray,
                 - ``'scale'``: align in the least-square sense in scale
                 - ``'procrustes'``: align in the least-square sense in
                     scale, rotation and translation.
+        chunk_size (int, optional): The number of samples to align at a time
+            with ``'procrustes'`` alignment, which bounds the memory. If not
+            given, align all the samples at once. Defaults to ``None``.
 
     Returns:
         tuple: A tuple containing joint position errors
@@ -356,20 +467,7 @@ def keypoint_mpjpe(pred: np.ndarray,
     """
     assert mask.any()
 
-    if alignment == 'none':
-        pass
-    elif alignment == 'procrustes':
-        pred = np.stack([
-            compute_similarity_transform(pred_i, gt_i)
-            for pred_i, gt_i in zip(pred, gt)
-        ])
-    elif alignment == 'scale':
-        pred_dot_pred = np.einsum('nkc,nkc->n', pred, pred)
-        pred_dot_gt = np.einsum('nkc,nkc->n', pred, gt)
-        scale_factor = pred_dot_gt / pred_dot_pred
-        pred = pred * scale_factor[:, None, None]
-    else:
-        raise ValueError(f'Invalid value for alignment: {alignment}')
-    error = np.linalg.norm(pred - gt, ord=2, axis=-1)[mask].mean()
+    errors = keypoint_position_errors(pred, gt, alignment, chunk_size)
+    error = errors[mask].mean()
 
     return error
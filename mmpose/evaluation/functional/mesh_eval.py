@@ -64,3 +64,72 @@ def compute_similarity_transform(source_points, target_points):
     source_points_hat = source_points_hat.T
 
     return source_points_hat
+
+
+def batch_compute_similarity_transform(source_points,
+                                       target_points,
+                                       chunk_size=None):
+    """Computes the similarity transforms (sR, t) that take a batch of 3D
+    point sets source_points closest to the point sets target_points, and
+    return the transformed source points. It is the batched version of
+    :func:`compute_similarity_transform`, which solves the orthogonal
+    Procrustes problems of all the samples with a batched SVD.
+
+    Note:
+        - Batch size: B
+        - Points number: N
+
+    Args:
+        source_points (np.ndarray): Source point sets with shape [B, N, 3].
+        target_points (np.ndarray): Target point sets with shape [B, N, 3].
+        chunk_size (int, optional): The number of samples to transform at a
+            time, which bounds the memory of the intermediate arrays. If not
+            given, transform all the samples at once. Defaults to ``None``.
+
+    Returns:
+        np.ndarray: Transformed source point sets with shape [B, N, 3].
+    """
+
+    assert target_points.shape == source_points.shape
+    assert source_points.ndim == 3 and source_points.shape[2] == 3
+
+    if chunk_size is not None and len(source_points) > chunk_size:
+        return np.concatenate([
+            batch_compute_similarity_transform(source_points[i:i + chunk_size],
+                                               target_points[i:i + chunk_size])
+            for i in range(0, len(source_points), chunk_size)
+        ])
+
+    # 1. Remove mean.
+    mu1 = source_points.mean(axis=1, keepdims=True)
+    mu2 = target_points.mean(axis=1, keepdims=True)
+    X1 = source_points - mu1
+    X2 = target_points - mu2
+
+    # 2. Compute variance of X1 used for scale.
+    var1 = np.sum(X1**2, axis=(1, 2))
+
+    # 3. The outer product of X1 and X2.
+    K = X1.transpose(0, 2, 1) @ X2
+
+    # 4. Solution that Maximizes trace(R'K) is R=U*V', where U, V are
+    # singular vectors of K.
+    U, _, Vh = np.linalg.svd(K)
+    V = Vh.transpose(0, 2, 1)
+    # Construct Z that fixes the orientation of R to get det(R)=1.
+    Z = np.tile(np.eye(3), (len(K), 1, 1))
+    Z[:, -1, -1] *= np.sign(np.linalg.det(U @ Vh))
+    # Construct R.
+    R = V @ Z @ U.transpose(0, 2, 1)
+
+    # 5. Recover scale.
+    scale = np.trace(R @ K, axis1=1, axis2=2) / var1
+
+    # 6. Recover translation.
+    t = mu2 - scale[:, None, None] * (mu1 @ R.transpose(0, 2, 1))
+
+    # 7. Transform the source points:
+    source_points_hat = scale[:, None, None] * (
+        source_points @ R.transpose(0, 2, 1)) + t
+
+    return source_points_hat
@@ -4,7 +4,7 @@
 # Original licence: Copyright (c) Microsoft, under the MIT License.
 # ------------------------------------------------------------------------------
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 import torch
@@ -12,6 +12,11 @@ from torch import Tensor
 
 from mmpose.structures.bbox import bbox_overlaps
 
+_COCO_SIGMAS = np.array([
+    .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07, .87,
+    .87, .89, .89
+]) / 10.0
+
 
 def nms(dets: np.ndarray, thr: float) -> List[int]:
     """Greedily select boxes with high confidence and overlap <= thr.
@@ -55,6 +60,84 @@ def nms(dets: np.ndarray, thr: float) -> List[int]:
     return keep
 
 
+def oks_iou_matrix(kpts_a: np.ndarray,
+                   kpts_b: np.ndarray,
+                   areas_a: np.ndarray,
+                   areas_b: np.ndarray,
+                   sigmas: Optional[np.ndarray] = None,
+                   vis_thr: Optional[float] = None) -> np.ndarray:
+    """Calculate the OKS ious between every pair of instances in two sets.
+
+    Note:
+
+        - number of keypoints: K
+        - number of instances in ``kpts_a``: N
+        - number of instances in ``kpts_b``: M
+
+    Args:
+        kpts_a (np.ndarray): The keypoint coordinates and visibilities of the
+            first set. Shape: (N, K*3) or (N, K, 3)
+        kpts_b (np.ndarray): The keypoint coordinates and visibilities of the
+            second set. Shape: (M, K*3) or (M, K, 3)
+        areas_a (np.ndarray): Areas of the instances in the first set.
+            Shape: (N, )
+        areas_b (np.ndarray): Areas of the instances in the second set.
+            Shape: (M, )
+        sigmas (np.ndarray, optional): Keypoint labelling uncertainty.
+            Please refer to `COCO keypoint evaluation
+            <https://cocodataset.org/#keypoints-eval>`__ for more details.
+            If not given, use the sigmas on COCO dataset.
+            If specified, shape: (K, ). Defaults to ``None``
+        vis_thr(float, optional): Threshold of the keypoint visibility.
+            If specified, will calculate OKS based on those keypoints whose
+            visibility higher than vis_thr. If not given, calculate the OKS
+            based on all keypoints. Defaults to ``None``
+
+    Returns:
+        np.ndarray: The oks ious in shape (N, M), where the element at
+        ``[i, j]`` is the OKS between ``kpts_a[i]`` and ``kpts_b[j]``.
+    """
+    if sigmas is None:
+        sigmas = _COCO_SIGMAS
+
+    kpts_a = np.asarray(kpts_a).reshape(len(kpts_a), len(sigmas), 3)
+    kpts_b = np.asarray(kpts_b).reshape(len(kpts_b), len(sigmas), 3)
+    areas_a = np.asarray(areas_a).reshape(-1)
+    areas_b = np.asarray(areas_b).reshape(-1)
+
+    return _oks_iou(kpts_a, kpts_b, areas_a, areas_b, sigmas, vis_thr)
+
+
+def _oks_iou(kpts_a: np.ndarray, kpts_b: np.ndarray, areas_a: np.ndarray,
+             areas_b: np.ndarray, sigmas: np.ndarray,
+             vis_thr: Optional[float]) -> np.ndarray:
+    """Calculate the OKS ious between every pair of instances in two sets,
+    broadcasting over any leading batch dimensions.
+
+    The keypoints are in shape (..., N, K, 3) and (..., M, K, 3), the areas
+    in shape (..., N) and (..., M), and the returned ious in shape
+    (..., N, M).
+    """
+    vars = (sigmas * 2)**2
+
+    dx = kpts_b[..., None, :, :, 0] - kpts_a[..., :, None, :, 0]
+    dy = kpts_b[..., None, :, :, 1] - kpts_a[..., :, None, :, 1]
+    area = (areas_a[..., :, None] + areas_b[..., None, :]) / 2 + np.spacing(1)
+    e = (dx**2 + dy**2) / vars / area[..., None] / 2
+
+    if vis_thr is None:
+        ious = np.exp(-e).sum(axis=-1) / e.shape[-1]
+    else:
+        valid = ((kpts_a[..., :, None, :, 2] > vis_thr) &
+                 (kpts_b[..., None, :, :, 2] > vis_thr))
+        num_valid = valid.sum(axis=-1)
+        ious = np.where(valid, np.exp(-e), 0.).sum(axis=-1)
+        ious = np.divide(
+            ious, num_valid, out=np.zeros_like(ious), where=num_valid != 0)
+
+    return ious.astype(np.float32)
+
+
 def oks_iou(g: np.ndarray,
             d: np.ndarray,
             a_g: float,
@@ -88,28 +171,43 @@ def oks_iou(g: np.ndarray,
     Returns:
         np.ndarray: The oks ious.
     """
-    if sigmas is None:
-        sigmas = np.array([
-            .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07,
-            .87, .87, .89, .89
-        ]) / 10.0
-    vars = (sigmas * 2)**2
-    xg = g[0::3]
-    yg = g[1::3]
-    vg = g[2::3]
-    ious = np.zeros(len(d), dtype=np.float32)
-    for n_d in range(0, len(d)):
-        xd = d[n_d, 0::3]
-        yd = d[n_d, 1::3]
-        vd = d[n_d, 2::3]
-        dx = xd - xg
-        dy = yd - yg
-        e = (dx**2 + dy**2) / vars / ((a_g + a_d[n_d]) / 2 + np.spacing(1)) / 2
-        if vis_thr is not None:
-            ind = list((vg > vis_thr) & (vd > vis_thr))
-            e = e[ind]
-        ious[n_d] = np.sum(np.exp(-e)) / len(e) if len(e) != 0 else 0.0
-    return ious
+    g = np.asarray(g).reshape(1, -1)
+    d = np.asarray(d).reshape(len(d), g.shape[1])
+    return oks_iou_matrix(g, d, np.array([a_g]), a_d, sigmas, vis_thr)[0]
+
+
+def _parse_kpts_db(kpts_db: List[dict],
+                   score_per_joint: bool = False
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stack the keypoints, scores and areas of a list of instances."""
+    if score_per_joint:
+        scores = np.array([k['score'].mean() for k in kpts_db])
+    else:
+        scores = np.array([k['score'] for k in kpts_db])
+
+    kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
+    areas = np.array([k['area'] for k in kpts_db])
+
+    return kpts, scores, areas
+
+
+def _oks_nms(ious: np.ndarray, scores: np.ndarray, thr: float) -> np.ndarray:
+    """Greedy OKS NMS on a precomputed (N, N) OKS matrix."""
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while len(order) > 0:
+        i = order[0]
+        keep.append(i)
+
+        oks_ovr = ious[i, order[1:]]
+
+        inds = np.where(oks_ovr <= thr)[0]
+        order = order[inds + 1]
+
+    keep = np.array(keep, dtype=np.intp)
+
+    return keep
 
 
 def oks_nms(kpts_db: List[dict],
@@ -139,30 +237,10 @@ def oks_nms(kpts_db: List[dict],
     if len(kpts_db) == 0:
         return []
 
-    if score_per_joint:
-        scores = np.array([k['score'].mean() for k in kpts_db])
-    else:
-        scores = np.array([k['score'] for k in kpts_db])
+    kpts, scores, areas = _parse_kpts_db(kpts_db, score_per_joint)
+    ious = oks_iou_matrix(kpts, kpts, areas, areas, sigmas, vis_thr)
 
-    kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
-    areas = np.array([k['area'] for k in kpts_db])
-
-    order = scores.argsort()[::-1]
-
-    keep = []
-    while len(order) > 0:
-        i = order[0]
-        keep.append(i)
-
-        oks_ovr = oks_iou(kpts[i], kpts[order[1:]], areas[i], areas[order[1:]],
-                          sigmas, vis_thr)
-
-        inds = np.where(oks_ovr <= thr)[0]
-        order = order[inds + 1]
-
-    keep = np.array(keep)
-
-    return keep
+    return _oks_nms(ious, scores, thr)
 
 
 def _rescore(overlap: np.ndarray,
@@ -193,6 +271,36 @@ def _rescore(overlap: np.ndarray,
     return scores
 
 
+def _soft_oks_nms(ious: np.ndarray,
+                  scores: np.ndarray,
+                  thr: float,
+                  max_dets: int = 20) -> np.ndarray:
+    """Soft OKS NMS on a precomputed (N, N) OKS matrix."""
+    order = scores.argsort()[::-1]
+    scores = scores[order]
+
+    keep = np.zeros(max_dets, dtype=np.intp)
+    keep_cnt = 0
+    while len(order) > 0 and keep_cnt < max_dets:
+        i = order[0]
+
+        oks_ovr = ious[i, order[1:]]
+
+        order = order[1:]
+        scores = _rescore(oks_ovr, scores[1:], thr)
+
+        tmp = scores.argsort()[::-1]
+        order = order[tmp]
+        scores = scores[tmp]
+
+        keep[keep_cnt] = i
+        keep_cnt += 1
+
+    keep = keep[:keep_cnt]
+
+    return keep
+
+
 def soft_oks_nms(kpts_db: List[dict],
                  thr: float,
                  max_dets: int = 20,
@@ -222,38 +330,101 @@ def soft_oks_nms(kpts_db: List[dict],
     if len(kpts_db) == 0:
         return []
 
-    if score_per_joint:
-        scores = np.array([k['score'].mean() for k in kpts_db])
-    else:
-        scores = np.array([k['score'] for k in kpts_db])
+    kpts, scores, areas = _parse_kpts_db(kpts_db, score_per_joint)
+    ious = oks_iou_matrix(kpts, kpts, areas, areas, sigmas, vis_thr)
 
-    kpts = np.array([k['keypoints'].flatten() for k in kpts_db])
-    areas = np.array([k['area'] for k in kpts_db])
+    return _soft_oks_nms(ious, scores, thr, max_dets)
 
-    order = scores.argsort()[::-1]
-    scores = scores[order]
 
-    keep = np.zeros(max_dets, dtype=np.intp)
-    keep_cnt = 0
-    while len(order) > 0 and keep_cnt < max_dets:
-        i = order[0]
+def batched_oks_nms(keypoints: np.ndarray,
+                    scores: np.ndarray,
+                    areas: np.ndarray,
+                    group_ids: np.ndarray,
+                    thr: float,
+                    sigmas: Optional[np.ndarray] = None,
+                    vis_thr: Optional[float] = None,
+                    soft: bool = False,
+                    max_dets: int = 20) -> np.ndarray:
+    """Perform (soft) OKS NMS independently within each group of a batch of
+    instances, e.g. all the predictions of a dataset grouped by image id.
 
-        oks_ovr = oks_iou(kpts[i], kpts[order[1:]], areas[i], areas[order[1:]],
-                          sigmas, vis_thr)
-
-        order = order[1:]
-        scores = _rescore(oks_ovr, scores[1:], thr)
+    Note:
 
-        tmp = scores.argsort()[::-1]
-        order = order[tmp]
-        scores = scores[tmp]
+        - number of keypoints: K
+        - number of instances in the batch: N
 
-        keep[keep_cnt] = i
-        keep_cnt += 1
+    Args:
+        keypoints (np.ndarray): The keypoint coordinates and visibilities
+            (or scores) of all instances. Shape: (N, K, 3) or (N, K*3)
+        scores (np.ndarray): The instance scores. Shape: (N, )
+        areas (np.ndarray): The instance areas. Shape: (N, )
+        group_ids (np.ndarray): The group (e.g. image id) of each instance.
+            NMS is only applied among instances of the same group.
+            Shape: (N, )
+        thr (float): The threshold of NMS. Will retain oks overlap < thr.
+        sigmas (np.ndarray, optional): Keypoint labelling uncertainty.
+            If not given, use the sigmas on COCO dataset. Defaults to ``None``
+        vis_thr(float, optional): Threshold of the keypoint visibility.
+            Defaults to ``None``
+        soft (bool): Whether to use soft OKS NMS. Defaults to ``False``
+        max_dets (int): Maximum number of detections to keep per group when
+            ``soft`` is ``True``. Defaults to 20
 
-    keep = keep[:keep_cnt]
+    Returns:
+        np.ndarray: indexes (into the batch) to keep, ordered by group in
+        order of first appearance and by the NMS keep order within each
+        group.
+    """
+    num_instances = len(scores)
+    if num_instances == 0:
+        return np.zeros((0, ), dtype=np.intp)
+
+    keypoints = np.asarray(keypoints).reshape(num_instances, -1, 3)
+    scores = np.asarray(scores)
+    areas = np.asarray(areas)
+    group_ids = np.asarray(group_ids)
+
+    # split the batch into groups, keeping the order of first appearance
+    _, first_inds, inverse = np.unique(
+        group_ids, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    sort_inds = np.argsort(inverse, kind='stable')
+    groups = np.split(sort_inds, np.cumsum(np.bincount(inverse))[:-1])
+
+    # compute the OKS matrices of the groups of the same size together,
+    # in chunks of at most `max_pairs` instance pairs
+    if sigmas is None:
+        sigmas = _COCO_SIGMAS
+    group_ious = dict()
+    group_sizes = np.bincount(inverse)
+    max_pairs = 65536
+    for size in np.unique(group_sizes):
+        if size == 1:
+            # a single instance is always kept
+            continue
+        ranks = np.flatnonzero(group_sizes == size)
+        chunk_size = max(max_pairs // (size * size), 1)
+        for start in range(0, len(ranks), chunk_size):
+            chunk = ranks[start:start + chunk_size]
+            inds = np.stack([groups[rank] for rank in chunk])
+            ious = _oks_iou(keypoints[inds], keypoints[inds], areas[inds],
+                            areas[inds], sigmas, vis_thr)
+            group_ious.update(zip(chunk.tolist(), ious))
 
-    return keep
+    keep = []
+    for group_rank in np.argsort(first_inds, kind='stable'):
+        inds = groups[group_rank]
+        if len(inds) == 1:
+            keep.append(inds[:max_dets] if soft else inds)
+            continue
+        ious = group_ious[group_rank]
+        if soft:
+            group_keep = _soft_oks_nms(ious, scores[inds], thr, max_dets)
+        else:
+            group_keep = _oks_nms(ious, scores[inds], thr)
+        keep.append(inds[group_keep])
+
+    return np.concatenate(keep)
 
 
 def nearby_joints_nms(
@@ -7,10 +7,12 @@ from .keypoint_2d_metrics import (AUC, EPE, NME, JhmdbPCKAccuracy,
 from .keypoint_3d_metrics import MPJPE
 from .keypoint_partition_metric import KeypointPartitionMetric
 from .posetrack18_metric import PoseTrack18Metric
+from .sharded_metric import ShardedMetricMixin
 from .simple_keypoint_3d_metrics import SimpleMPJPE
 
 __all__ = [
     'CocoMetric', 'PCKAccuracy', 'MpiiPCKAccuracy', 'JhmdbPCKAccuracy', 'AUC',
     'EPE', 'NME', 'PoseTrack18Metric', 'CocoWholeBodyMetric',
-    'KeypointPartitionMetric', 'MPJPE', 'InterHandMetric', 'SimpleMPJPE'
+    'KeypointPartitionMetric', 'MPJPE', 'InterHandMetric', 'SimpleMPJPE',
+    'ShardedMetricMixin'
 ]
@@ -3,9 +3,11 @@ import datetime
 import os.path as osp
 import tempfile
 from collections import OrderedDict, defaultdict
-from typing import Dict, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
+from mmengine.dist import (all_gather_object, broadcast_object_list,
+                           gather_object, get_dist_info)
 from mmengine.evaluator import BaseMetric
 from mmengine.fileio import dump, get_local_path, load
 from mmengine.logging import MessageHub, MMLogger, print_log
@@ -14,12 +16,15 @@ from xtcocotools.cocoeval import COCOeval
 
 from mmpose.registry import METRICS
 from mmpose.structures.bbox import bbox_xyxy2xywh
-from ..functional import (oks_nms, soft_oks_nms, transform_ann, transform_pred,
-                          transform_sigmas)
+from ..functional import (batched_oks_nms, coco_keypoint_eval,
+                          coco_keypoint_match, coco_keypoint_summarize,
+                          merge_coco_keypoint_matches, transform_ann,
+                          transform_pred, transform_sigmas)
+from .sharded_metric import ShardedMetricMixin
 
 
 @METRICS.register_module()
-class CocoMetric(BaseMetric):
+class CocoMetric(ShardedMetricMixin, BaseMetric):
     """COCO pose estimation task evaluation metric.
 
     Evaluate AR, AP, and mAP for keypoint detection tasks. Support COCO
@@ -83,6 +88,20 @@ class CocoMetric(BaseMetric):
         outfile_prefix (str | None): The prefix of json files. It includes
             the file path and the prefix of filename, e.g., ``'a/b/prefix'``.
             If not specified, a temp file will be created. Defaults to ``None``
+        use_native_eval (bool): Whether to evaluate the results in memory
+            with :func:`coco_keypoint_eval`, which gives the same results as
+            :class:`xtcocotools.COCOeval` much faster. The results are dumped
+            to a json file only if ``outfile_prefix`` is specified. If
+            ``False``, the results are always dumped and evaluated by
+            ``COCOeval``. Defaults to ``True``
+        eval_nproc (int): The number of processes used by the native
+            evaluation. Defaults to ``0``
+        sharded (bool): Whether to evaluate the results on each rank and
+            gather only the matching results of the detections to rank 0,
+            instead of gathering all results. Only valid for the native
+            evaluation with ``ann_file`` when the results are not dumped,
+            otherwise the results are gathered as usual. See
+            :meth:`compute_sharded_metrics`. Defaults to ``False``
         collect_device (str): Device name used for collecting results from
             different ranks during distributed training. Must be ``'cpu'`` or
             ``'gpu'``. Defaults to ``'cpu'``
@@ -92,6 +111,9 @@ class CocoMetric(BaseMetric):
             will be used instead. Defaults to ``None``
     """
     default_prefix: Optional[str] = 'coco'
+    # whether the evaluation of the metric can be done by
+    # `coco_keypoint_eval` instead of `_do_python_keypoint_eval`
+    support_native_eval: bool = True
 
     def __init__(self,
                  ann_file: Optional[str] = None,
@@ -105,9 +127,13 @@ class CocoMetric(BaseMetric):
                  pred_converter: Dict = None,
                  gt_converter: Dict = None,
                  outfile_prefix: Optional[str] = None,
+                 use_native_eval: bool = True,
+                 eval_nproc: int = 0,
+                 sharded: bool = False,
                  collect_device: str = 'cpu',
                  prefix: Optional[str] = None) -> None:
-        super().__init__(collect_device=collect_device, prefix=prefix)
+        super().__init__(
+            collect_device=collect_device, prefix=prefix, sharded=sharded)
         self.ann_file = ann_file
         # initialize coco helper with the annotation json file
         # if ann_file is not specified, initialize with the converted dataset
@@ -151,6 +177,8 @@ class CocoMetric(BaseMetric):
         self.outfile_prefix = outfile_prefix
         self.pred_converter = pred_converter
         self.gt_converter = gt_converter
+        self.use_native_eval = use_native_eval
+        self.eval_nproc = eval_nproc
 
     @property
     def dataset_meta(self) -> Optional[dict]:
@@ -392,100 +420,20 @@ class CocoMetric(BaseMetric):
             coco_json_path = self.gt_to_coco_json(
                 gt_dicts=gts, outfile_prefix=outfile_prefix)
             self.coco = COCO(coco_json_path)
-        if self.gt_converter is not None:
-            for id_, ann in self.coco.anns.items():
-                self.coco.anns[id_] = transform_ann(
-                    ann, self.gt_converter['num_keypoints'],
-                    self.gt_converter['mapping'])
+        self._convert_gts()
+        preds, num_keypoints = self._convert_preds(preds)
 
-        kpts = defaultdict(list)
+        # stack the instances of all preds, and keep the ones after scoring
+        # and NMS in each image
+        instances = self._stack_preds(preds)
+        valid_kpts = self._select_instances(instances, num_keypoints)
 
-        # group the preds by img_id
-        for pred in preds:
-            img_id = pred['img_id']
-
-            if self.pred_converter is not None:
-                pred = transform_pred(pred,
-                                      self.pred_converter['num_keypoints'],
-                                      self.pred_converter['mapping'])
-
-            for idx, keypoints in enumerate(pred['keypoints']):
-
-                instance = {
-                    'id': pred['id'],
-                    'img_id': pred['img_id'],
-                    'category_id': pred['category_id'],
-                    'keypoints': keypoints,
-                    'keypoint_scores': pred['keypoint_scores'][idx],
-                    'bbox_score': pred['bbox_scores'][idx],
-                }
-                if 'bbox' in pred:
-                    instance['bbox'] = pred['bbox'][idx]
+        use_native_eval = self._use_native_eval()
 
-                if 'areas' in pred:
-                    instance['area'] = pred['areas'][idx]
-                else:
-                    # use keypoint to calculate bbox and get area
-                    area = (
-                        np.max(keypoints[:, 0]) - np.min(keypoints[:, 0])) * (
-                            np.max(keypoints[:, 1]) - np.min(keypoints[:, 1]))
-                    instance['area'] = area
-
-                kpts[img_id].append(instance)
-
-        # sort keypoint results according to id and remove duplicate ones
-        kpts = self._sort_and_unique_bboxes(kpts, key='id')
-
-        # score the prediction results according to `score_mode`
-        # and perform NMS according to `nms_mode`
-        valid_kpts = defaultdict(list)
-        if self.pred_converter is not None:
-            num_keypoints = self.pred_converter['num_keypoints']
-        else:
-            num_keypoints = self.dataset_meta['num_keypoints']
-        for img_id, instances in kpts.items():
-            for instance in instances:
-                # concatenate the keypoint coordinates and scores
-                instance['keypoints'] = np.concatenate([
-                    instance['keypoints'], instance['keypoint_scores'][:, None]
-                ],
-                                                       axis=-1)
-                if self.score_mode == 'bbox':
-                    instance['score'] = instance['bbox_score']
-                elif self.score_mode == 'keypoint':
-                    instance['score'] = np.mean(instance['keypoint_scores'])
-                else:
-                    bbox_score = instance['bbox_score']
-                    if self.score_mode == 'bbox_rle':
-                        keypoint_scores = instance['keypoint_scores']
-                        instance['score'] = float(bbox_score +
-                                                  np.mean(keypoint_scores) +
-                                                  np.max(keypoint_scores))
-
-                    else:  # self.score_mode == 'bbox_keypoint':
-                        mean_kpt_score = 0
-                        valid_num = 0
-                        for kpt_idx in range(num_keypoints):
-                            kpt_score = instance['keypoint_scores'][kpt_idx]
-                            if kpt_score > self.keypoint_score_thr:
-                                mean_kpt_score += kpt_score
-                                valid_num += 1
-                        if valid_num != 0:
-                            mean_kpt_score /= valid_num
-                        instance['score'] = bbox_score * mean_kpt_score
-            # perform nms
-            if self.nms_mode == 'none':
-                valid_kpts[img_id] = instances
-            else:
-                nms = oks_nms if self.nms_mode == 'oks_nms' else soft_oks_nms
-                keep = nms(
-                    instances,
-                    self.nms_thr,
-                    sigmas=self.dataset_meta['sigmas'])
-                valid_kpts[img_id] = [instances[_keep] for _keep in keep]
-
-        # convert results to coco style and dump into a json file
-        self.results2json(valid_kpts, outfile_prefix=outfile_prefix)
+        # convert results to coco style and dump into a json file, which is
+        # not needed by the native evaluation unless requested
+        if not use_native_eval or self.outfile_prefix is not None:
+            self.results2json(valid_kpts, outfile_prefix=outfile_prefix)
 
         # only format the results without doing quantitative evaluation
         if self.format_only:
@@ -496,7 +444,10 @@ class CocoMetric(BaseMetric):
         # evaluation results
         eval_results = OrderedDict()
         logger.info(f'Evaluating {self.__class__.__name__}...')
-        info_str = self._do_python_keypoint_eval(outfile_prefix)
+        if use_native_eval:
+            info_str = self._do_native_keypoint_eval(valid_kpts)
+        else:
+            info_str = self._do_python_keypoint_eval(outfile_prefix)
         name_value = OrderedDict(info_str)
         eval_results.update(name_value)
 
@@ -504,6 +455,217 @@ class CocoMetric(BaseMetric):
             tmp_dir.cleanup()
         return eval_results
 
+    def compute_sharded_metrics(self, results: list,
+                                sample_inds: np.ndarray) -> Dict[str, float]:
+        """Compute the metrics in sharded mode.
+
+        The predicted instances of an image may be processed on different
+        ranks, e.g. in top-down mode, so the instances of each image are
+        first sent to a single rank, which is the first rank having them.
+        Then each rank does the scoring, NMS and matching of its own images
+        by :func:`coco_keypoint_match`, and only the matching results of
+        each detection are gathered to rank 0 to compute the metrics.
+
+        Args:
+            results (list): The processed results of the data samples on
+                the current rank, without the padded ones
+            sample_inds (np.ndarray): The index of each data sample in the
+                dataset
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        logger: MMLogger = MMLogger.get_current_instance()
+        rank, world_size = get_dist_info()
+
+        self._convert_gts()
+        preds, num_keypoints = self._convert_preds(
+            [pred for pred, _ in results])
+
+        instances = None
+        if len(preds):
+            instances = self._stack_preds(preds)
+            # the index of the data sample of each instance, which keeps
+            # the instances in the original order after being exchanged
+            instances['sample_ind'] = np.repeat(
+                sample_inds, [len(pred['keypoints']) for pred in preds])
+
+        # each image is evaluated on the first rank having its instances
+        local_img_ids = [] if instances is None else list(
+            dict.fromkeys(instances['img_id']))
+        img_owners = dict()
+        for src, src_img_ids in enumerate(all_gather_object(local_img_ids)):
+            for img_id in src_img_ids:
+                img_owners.setdefault(img_id, src)
+
+        # send the instances of each image to the rank evaluating it
+        received = None
+        for dst in range(world_size):
+            inds = [] if instances is None else [
+                i for i, img_id in enumerate(instances['img_id'])
+                if img_owners[img_id] == dst
+            ]
+            gathered = gather_object(
+                self._take_instances(instances, inds) if inds else None,
+                dst=dst)
+            if dst == rank:
+                received = [item for item in gathered if item is not None]
+
+        valid_kpts = dict()
+        if received:
+            instances = dict()
+            for key, value in received[0].items():
+                if isinstance(value, np.ndarray):
+                    instances[key] = np.concatenate(
+                        [item[key] for item in received])
+                else:
+                    instances[key] = [
+                        v for item in received for v in item[key]
+                    ]
+            order = np.argsort(instances['sample_ind'], kind='stable')
+            valid_kpts = self._select_instances(
+                self._take_instances(instances, order), num_keypoints)
+
+        # the images without predictions are split evenly among ranks
+        img_ids = self.coco.getImgIds()
+        eval_img_ids = [
+            img_id for i, img_id in enumerate(img_ids)
+            if img_owners.get(img_id, i % world_size) == rank
+        ]
+        matches = coco_keypoint_match(
+            self._get_native_gts(eval_img_ids),
+            self._get_native_preds(valid_kpts),
+            img_ids,
+            self.coco.getCatIds(),
+            self.dataset_meta['sigmas'],
+            use_area=self.use_area,
+            iou_type=self.iou_type,
+            nproc=self.eval_nproc)
+
+        matches = gather_object(matches, dst=0)
+        eval_results = [None]
+        if rank == 0:
+            logger.info(f'Evaluating {self.__class__.__name__}...')
+            stats = coco_keypoint_summarize(
+                merge_coco_keypoint_matches(matches),
+                img_ids,
+                iou_type=self.iou_type,
+                crowd_indices=self._get_crowd_indices(img_ids))['stats']
+            eval_results = [OrderedDict(zip(self._get_stats_names(), stats))]
+        broadcast_object_list(eval_results)
+
+        return eval_results[0]
+
+    def _can_shard(self) -> bool:
+        """Whether the metrics can be computed in sharded mode, which needs
+        the native evaluation with the annotation file, and does not dump
+        the results."""
+        return (self.sharded and self._use_native_eval()
+                and self.coco is not None and not self.format_only
+                and self.outfile_prefix is None)
+
+    def _use_native_eval(self) -> bool:
+        """Whether to evaluate the results by :func:`coco_keypoint_eval`."""
+        return (self.use_native_eval and self.support_native_eval
+                and self.iou_type in ('keypoints', 'keypoints_crowd'))
+
+    def _convert_gts(self) -> None:
+        """Convert the ground truth annotations by ``gt_converter``."""
+        if self.gt_converter is not None:
+            for id_, ann in self.coco.anns.items():
+                self.coco.anns[id_] = transform_ann(
+                    ann, self.gt_converter['num_keypoints'],
+                    self.gt_converter['mapping'])
+
+    def _convert_preds(self, preds: Sequence[dict]) -> Tuple[list, int]:
+        """Convert the predictions by ``pred_converter``.
+
+        Returns:
+            tuple:
+            - preds (list): The converted predictions
+            - num_keypoints (int): The number of keypoints after conversion
+        """
+        if self.pred_converter is not None:
+            preds = [
+                transform_pred(pred, self.pred_converter['num_keypoints'],
+                               self.pred_converter['mapping'])
+                for pred in preds
+            ]
+            num_keypoints = self.pred_converter['num_keypoints']
+        else:
+            num_keypoints = self.dataset_meta['num_keypoints']
+        return list(preds), num_keypoints
+
+    @staticmethod
+    def _take_instances(instances: dict, inds: Sequence[int]) -> dict:
+        """Take the stacked instances at ``inds``."""
+        taken = dict()
+        for key, value in instances.items():
+            if isinstance(value, np.ndarray):
+                taken[key] = value[inds]
+            else:
+                taken[key] = [value[i] for i in inds]
+        return taken
+
+    def _select_instances(self, instances: dict,
+                          num_keypoints: int) -> Dict[int, list]:
+        """Score the stacked instances according to ``score_mode`` and
+        perform NMS in each image according to ``nms_mode``.
+
+        Args:
+            instances (dict): The instances stacked by :meth:`_stack_preds`
+            num_keypoints (int): The number of keypoints
+
+        Returns:
+            Dict[int, list]: The kept instances of each image.
+        """
+        # sort the instances according to id and remove duplicate ones in
+        # each image
+        inds = self._sort_and_unique_inds(instances['img_id'], instances['id'])
+
+        keypoint_scores = instances['keypoint_scores'][inds]
+        keypoints = np.concatenate(
+            [instances['keypoints'][inds], keypoint_scores[..., None]],
+            axis=-1)
+        areas = instances['areas'][inds]
+        img_ids = [instances['img_id'][i] for i in inds]
+
+        # score the prediction results according to `score_mode`
+        scores = self._compute_scores(instances['bbox_scores'][inds],
+                                      keypoint_scores, num_keypoints)
+
+        # perform NMS in each image according to `nms_mode`
+        if self.nms_mode == 'none':
+            keep = np.arange(len(inds))
+        else:
+            keep = batched_oks_nms(
+                keypoints,
+                scores,
+                areas,
+                np.asarray(img_ids),
+                self.nms_thr,
+                sigmas=self.dataset_meta['sigmas'],
+                soft=self.nms_mode == 'soft_oks_nms')
+
+        valid_kpts = defaultdict(list)
+        for k in keep:
+            i = inds[k]
+            instance = {
+                'id': instances['id'][i],
+                'img_id': img_ids[k],
+                'category_id': instances['category_id'][i],
+                'keypoints': keypoints[k],
+                'keypoint_scores': keypoint_scores[k],
+                'bbox_score': instances['bbox_scores'][i],
+                'area': areas[k],
+                'score': scores[k],
+            }
+            if instances['bbox'][i] is not None:
+                instance['bbox'] = instances['bbox'][i]
+            valid_kpts[img_ids[k]].append(instance)
+
+        return valid_kpts
+
     def results2json(self, keypoints: Dict[int, list],
                      outfile_prefix: str) -> str:
         """Dump the keypoint detection results to a COCO style json file.
@@ -545,6 +707,103 @@ class CocoMetric(BaseMetric):
         res_file = f'{outfile_prefix}.keypoints.json'
         dump(cat_results, res_file, sort_keys=True, indent=4)
 
+    def _do_native_keypoint_eval(self, keypoints: Dict[int, list]) -> list:
+        """Do keypoint evaluation in memory with :func:`coco_keypoint_eval`,
+        which gives the same results as :meth:`_do_python_keypoint_eval`.
+
+        Args:
+            keypoints (Dict[int, list]): Keypoint detection results
+                of the dataset.
+
+        Returns:
+            list: a list of tuples. Each tuple contains the evaluation stats
+            name and corresponding stats value.
+        """
+        img_ids = self.coco.getImgIds()
+        stats = coco_keypoint_eval(
+            self._get_native_gts(img_ids),
+            self._get_native_preds(keypoints),
+            img_ids,
+            self.coco.getCatIds(),
+            self.dataset_meta['sigmas'],
+            use_area=self.use_area,
+            iou_type=self.iou_type,
+            crowd_indices=self._get_crowd_indices(img_ids),
+            nproc=self.eval_nproc)['stats']
+
+        return list(zip(self._get_stats_names(), stats))
+
+    def _get_native_gts(self, img_ids: Sequence[int]) -> dict:
+        """Collect the ground truths of the images in the same order as
+        ``COCOeval`` for :func:`coco_keypoint_eval`."""
+        num_keypoints = len(self.dataset_meta['sigmas'])
+        anns = [
+            self.coco.anns[ann['id']] for img_id in img_ids
+            for ann in self.coco.imgToAnns[img_id]
+        ]
+        return dict(
+            img_ids=np.array([ann['image_id'] for ann in anns]),
+            category_ids=np.array([ann['category_id'] for ann in anns]),
+            keypoints=np.array([ann['keypoints'] for ann in anns],
+                               dtype=np.float64).reshape(-1, num_keypoints, 3),
+            bboxes=np.array([ann['bbox'] for ann in anns],
+                            dtype=np.float64).reshape(-1, 4),
+            areas=np.array([ann.get('area', np.nan) for ann in anns],
+                           dtype=np.float64),
+            iscrowd=np.array([ann.get('iscrowd', 0) for ann in anns]),
+            num_keypoints=np.array(
+                [ann.get('num_keypoints', 0) for ann in anns]))
+
+    def _get_native_preds(self, keypoints: Dict[int, list]) -> dict:
+        """Collect the predictions in the order of :meth:`results2json` for
+        :func:`coco_keypoint_eval`."""
+        num_keypoints = self.dataset_meta['num_keypoints']
+        instances = [
+            img_kpt for img_kpts in keypoints.values() for img_kpt in img_kpts
+        ]
+        pred_keypoints = np.array(
+            [img_kpt['keypoints'] for img_kpt in instances],
+            dtype=np.float64).reshape(-1, num_keypoints, 3)
+        # the areas are computed as `COCO.loadRes`, which takes the bboxes
+        # if the results have bboxes, or the keypoint extents otherwise
+        if len(instances) and len(instances[0].get('bbox', [])):
+            bboxes = np.array([img_kpt['bbox'] for img_kpt in instances],
+                              dtype=np.float64).reshape(-1, 4)
+            areas = bboxes[:, 2] * bboxes[:, 3]
+        else:
+            xs = pred_keypoints[..., 0]
+            ys = pred_keypoints[..., 1]
+            areas = (xs.max(axis=-1) - xs.min(axis=-1)) * (
+                ys.max(axis=-1) - ys.min(axis=-1))
+        return dict(
+            img_ids=np.array([img_kpt['img_id'] for img_kpt in instances]),
+            category_ids=np.array(
+                [img_kpt['category_id'] for img_kpt in instances]),
+            keypoints=pred_keypoints,
+            scores=np.array([float(img_kpt['score'])
+                             for img_kpt in instances]),
+            areas=areas)
+
+    def _get_crowd_indices(self,
+                           img_ids: Sequence[int]) -> Optional[List[float]]:
+        """Get the crowd index of each image for the ``'keypoints_crowd'``
+        iou type."""
+        if self.iou_type != 'keypoints_crowd':
+            return None
+        return [self.coco.imgs[img_id]['crowdIndex'] for img_id in img_ids]
+
+    def _get_stats_names(self) -> List[str]:
+        """Get the names of the stats of ``COCOeval``."""
+        if self.iou_type == 'keypoints_crowd':
+            return [
+                'AP', 'AP .5', 'AP .75', 'AR', 'AR .5', 'AR .75', 'AP(E)',
+                'AP(M)', 'AP(H)'
+            ]
+        return [
+            'AP', 'AP .5', 'AP .75', 'AP (M)', 'AP (L)', 'AR', 'AR .5',
+            'AR .75', 'AR (M)', 'AR (L)'
+        ]
+
     def _do_python_keypoint_eval(self, outfile_prefix: str) -> list:
         """Do keypoint evaluation using COCOAPI.
 
@@ -582,6 +841,119 @@ class CocoMetric(BaseMetric):
 
         return info_str
 
+    @staticmethod
+    def _stack_preds(preds: Sequence[dict]) -> dict:
+        """Stack the instances of all predictions.
+
+        Args:
+            preds (Sequence[dict]): The predictions of each sample
+
+        Returns:
+            dict: The arrays ``'keypoints'`` (N, K, 2), ``'keypoint_scores'``
+            (N, K), ``'bbox_scores'`` (N, ) and ``'areas'`` (N, ), and the
+            lists ``'id'``, ``'img_id'``, ``'category_id'`` and ``'bbox'``
+            (``None`` if not predicted) of the N instances.
+        """
+        instances = defaultdict(list)
+        for pred in preds:
+            keypoints = pred['keypoints']
+            num_instances = len(keypoints)
+
+            if 'areas' in pred:
+                areas = pred['areas']
+            else:
+                # use keypoint to calculate bbox and get area
+                areas = (np.max(keypoints[..., 0], axis=-1) -
+                         np.min(keypoints[..., 0], axis=-1)) * (
+                             np.max(keypoints[..., 1], axis=-1) -
+                             np.min(keypoints[..., 1], axis=-1))
+
+            instances['keypoints'].append(keypoints)
+            instances['keypoint_scores'].append(pred['keypoint_scores'])
+            instances['bbox_scores'].append(pred['bbox_scores'])
+            instances['areas'].append(areas)
+            for key in ('id', 'img_id', 'category_id'):
+                instances[key].extend([pred[key]] * num_instances)
+            if 'bbox' in pred:
+                instances['bbox'].extend(pred['bbox'][:num_instances])
+            else:
+                instances['bbox'].extend([None] * num_instances)
+
+        for key in ('keypoints', 'keypoint_scores', 'bbox_scores', 'areas'):
+            instances[key] = np.concatenate(instances[key])
+
+        return instances
+
+    @staticmethod
+    def _sort_and_unique_inds(img_ids: Sequence, ids: Sequence) -> np.ndarray:
+        """Group the instances by image in the order of first appearance,
+        sort them according to id in each image and remove the duplicate
+        ones, which usually occur in multi-batch testing. The array version
+        of :meth:`_sort_and_unique_bboxes`.
+
+        Args:
+            img_ids (Sequence): The image id of each instance
+            ids (Sequence): The id of each instance. If the ids are sequences
+                (bottomup-style output), the instances are only grouped
+
+        Returns:
+            np.ndarray: The indexes of the sorted unique instances.
+        """
+        if len(img_ids) == 0:
+            return np.zeros((0, ), dtype=np.intp)
+
+        _, first_inds, inverse = np.unique(
+            np.asarray(img_ids), return_index=True, return_inverse=True)
+        group_ranks = np.argsort(
+            np.argsort(first_inds, kind='stable'),
+            kind='stable')[inverse.reshape(-1)]
+
+        # deal with bottomup-style output
+        if any(isinstance(_id, Sequence) for _id in ids):
+            return np.argsort(group_ranks, kind='stable')
+
+        ids = np.asarray(ids)
+        inds = np.lexsort((ids, group_ranks))
+        duplicate = (group_ranks[inds[1:]] == group_ranks[inds[:-1]]) & (
+            ids[inds[1:]] == ids[inds[:-1]])
+        return inds[np.concatenate([[True], ~duplicate])]
+
+    def _compute_scores(self, bbox_scores: np.ndarray,
+                        keypoint_scores: np.ndarray,
+                        num_keypoints: int) -> np.ndarray:
+        """Compute the instance scores according to ``score_mode``.
+
+        Args:
+            bbox_scores (np.ndarray): The bbox scores in shape (N, )
+            keypoint_scores (np.ndarray): The keypoint scores in shape (N, K)
+            num_keypoints (int): The number of keypoints used in
+                ``'bbox_keypoint'`` mode
+
+        Returns:
+            np.ndarray: The instance scores in shape (N, ).
+        """
+        if self.score_mode == 'bbox':
+            return bbox_scores
+        elif self.score_mode == 'keypoint':
+            return np.mean(keypoint_scores, axis=-1)
+        elif self.score_mode == 'bbox_rle':
+            return (bbox_scores + np.mean(keypoint_scores, axis=-1) +
+                    np.max(keypoint_scores, axis=-1)).astype(np.float64)
+        else:  # self.score_mode == 'bbox_keypoint':
+            keypoint_scores = keypoint_scores[:, :num_keypoints]
+            valid = keypoint_scores > self.keypoint_score_thr
+            # accumulate the valid scores keypoint by keypoint so that the
+            # rounding matches a per-instance sum
+            mean_kpt_scores = np.zeros(
+                len(keypoint_scores), dtype=keypoint_scores.dtype)
+            for kpt_idx in range(keypoint_scores.shape[1]):
+                mean_kpt_scores += np.where(valid[:, kpt_idx],
+                                            keypoint_scores[:, kpt_idx], 0)
+            valid_num = np.maximum(valid.sum(axis=-1), 1)
+            mean_kpt_scores = mean_kpt_scores / valid_num.astype(
+                np.result_type(mean_kpt_scores.dtype, 1.0))
+            return bbox_scores * mean_kpt_scores
+
     def _sort_and_unique_bboxes(self,
                                 kpts: Dict[int, list],
                                 key: str = 'id') -> Dict[int, list]:
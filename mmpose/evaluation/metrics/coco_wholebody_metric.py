@@ -72,6 +72,7 @@ class CocoWholeBodyMetric(CocoMetric):
         **kwargs: Keyword parameters passed to :class:`mmeval.BaseMetric`
     """
     default_prefix: Optional[str] = 'coco-wholebody'
+    support_native_eval: bool = False
     body_num = 17
     foot_num = 6
     face_num = 68
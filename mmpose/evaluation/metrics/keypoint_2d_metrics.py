@@ -7,12 +7,14 @@ from mmengine.evaluator import BaseMetric
 from mmengine.logging import MMLogger
 
 from mmpose.registry import METRICS
-from ..functional import (keypoint_auc, keypoint_epe, keypoint_nme,
-                          keypoint_pck_accuracy)
+from ..functional import (keypoint_auc, keypoint_distance_sum, keypoint_epe,
+                          keypoint_nme, keypoint_pck_counts,
+                          pck_accuracy_from_counts)
+from .sharded_metric import ShardedMetricMixin
 
 
 @METRICS.register_module()
-class PCKAccuracy(BaseMetric):
+class PCKAccuracy(ShardedMetricMixin, BaseMetric):
     """PCK accuracy evaluation metric.
     Calculate the pose accuracy of Percentage of Correct Keypoints (PCK) for
     each individual keypoint and the averaged accuracy across all keypoints.
@@ -37,6 +39,9 @@ class PCKAccuracy(BaseMetric):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, ``self.default_prefix``
             will be used instead. Default: ``None``.
+        sharded (bool): Whether to compute the metric from the statistics
+            summed across ranks instead of gathering all results to rank 0.
+            See :class:`ShardedMetricMixin`. Default: ``False``.
 
     Examples:
 
@@ -71,8 +76,10 @@ class PCKAccuracy(BaseMetric):
                  thr: float = 0.05,
                  norm_item: Union[str, Sequence[str]] = 'bbox',
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None) -> None:
-        super().__init__(collect_device=collect_device, prefix=prefix)
+                 prefix: Optional[str] = None,
+                 sharded: bool = False) -> None:
+        super().__init__(
+            collect_device=collect_device, prefix=prefix, sharded=sharded)
         self.thr = thr
         self.norm_item = norm_item if isinstance(norm_item,
                                                  (tuple,
@@ -154,15 +161,20 @@ class PCKAccuracy(BaseMetric):
         Args:
             results (list): The processed results of each batch.
         Returns:
-            Dict[str, float]: The computed metrics. The keys are the names of
-            the metrics, and the values are corresponding results.
-            The returned result dict may have the following keys:
-                - 'PCK': The pck accuracy normalized by `bbox_size`.
-                - 'PCKh': The pck accuracy normalized by `head_size`.
-                - 'tPCK': The pck accuracy normalized by `torso_size`.
+            Dict[str, float]: The computed metrics. See
+            :meth:`compute_metrics_from_stats` for details.
         """
-        logger: MMLogger = MMLogger.get_current_instance()
+        return self.compute_metrics_from_stats(self.compute_stats(results))
+
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Count the correct and the valid predictions of each keypoint.
 
+        Args:
+            results (list): The processed results of each batch.
+        Returns:
+            Dict[str, np.ndarray]: The counts ``'{norm_item}_correct'`` and
+            ``'{norm_item}_valid'`` of each normalized item.
+        """
         # pred_coords: [N, K, D]
         pred_coords = np.concatenate(
             [result['pred_coords'] for result in results])
@@ -171,39 +183,45 @@ class PCKAccuracy(BaseMetric):
         # mask: [N, K]
         mask = np.concatenate([result['mask'] for result in results])
 
-        metrics = dict()
-        if 'bbox' in self.norm_item:
-            norm_size_bbox = np.concatenate(
-                [result['bbox_size'] for result in results])
-
-            logger.info(f'Evaluating {self.__class__.__name__} '
-                        f'(normalized by ``"bbox_size"``)...')
-
-            _, pck, _ = keypoint_pck_accuracy(pred_coords, gt_coords, mask,
-                                              self.thr, norm_size_bbox)
-            metrics['PCK'] = pck
+        stats = dict()
+        for item in self.norm_item:
+            norm_size = np.concatenate(
+                [result[f'{item}_size'] for result in results])
+            correct, valid = keypoint_pck_counts(pred_coords, gt_coords, mask,
+                                                 self.thr, norm_size)
+            stats[f'{item}_correct'] = correct
+            stats[f'{item}_valid'] = valid
 
-        if 'head' in self.norm_item:
-            norm_size_head = np.concatenate(
-                [result['head_size'] for result in results])
+        return stats
 
-            logger.info(f'Evaluating {self.__class__.__name__} '
-                        f'(normalized by ``"head_size"``)...')
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the counts of :meth:`compute_stats`.
 
-            _, pckh, _ = keypoint_pck_accuracy(pred_coords, gt_coords, mask,
-                                               self.thr, norm_size_head)
-            metrics['PCKh'] = pckh
+        Args:
+            stats (Dict[str, np.ndarray]): The counts of all results.
+        Returns:
+            Dict[str, float]: The computed metrics. The keys are the names of
+            the metrics, and the values are corresponding results.
+            The returned result dict may have the following keys:
+                - 'PCK': The pck accuracy normalized by `bbox_size`.
+                - 'PCKh': The pck accuracy normalized by `head_size`.
+                - 'tPCK': The pck accuracy normalized by `torso_size`.
+        """
+        logger: MMLogger = MMLogger.get_current_instance()
 
-        if 'torso' in self.norm_item:
-            norm_size_torso = np.concatenate(
-                [result['torso_size'] for result in results])
+        metrics = dict()
+        for item, name in (('bbox', 'PCK'), ('head', 'PCKh'), ('torso',
+                                                               'tPCK')):
+            if item not in self.norm_item:
+                continue
 
             logger.info(f'Evaluating {self.__class__.__name__} '
-                        f'(normalized by ``"torso_size"``)...')
+                        f'(normalized by ``"{item}_size"``)...')
 
-            _, tpck, _ = keypoint_pck_accuracy(pred_coords, gt_coords, mask,
-                                               self.thr, norm_size_torso)
-            metrics['tPCK'] = tpck
+            _, pck, _ = pck_accuracy_from_counts(stats[f'{item}_correct'],
+                                                 stats[f'{item}_valid'])
+            metrics[name] = pck
 
         return metrics
 
@@ -237,6 +255,9 @@ class MpiiPCKAccuracy(PCKAccuracy):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, ``self.default_prefix``
             will be used instead. Default: ``None``.
+        sharded (bool): Whether to compute the metric from the statistics
+            summed across ranks instead of gathering all results to rank 0.
+            See :class:`ShardedMetricMixin`. Default: ``False``.
 
     Examples:
 
@@ -272,19 +293,65 @@ class MpiiPCKAccuracy(PCKAccuracy):
                  thr: float = 0.5,
                  norm_item: Union[str, Sequence[str]] = 'head',
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None) -> None:
+                 prefix: Optional[str] = None,
+                 sharded: bool = False) -> None:
         super().__init__(
             thr=thr,
             norm_item=norm_item,
             collect_device=collect_device,
-            prefix=prefix)
+            prefix=prefix,
+            sharded=sharded)
 
-    def compute_metrics(self, results: list) -> Dict[str, float]:
-        """Compute the metrics from processed results.
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Count the correct predictions of each keypoint at ``self.thr`` and
+        at the thresholds from 0 to 0.5, and the valid and the visible ones.
 
         Args:
             results (list): The processed results of each batch.
 
+        Returns:
+            Dict[str, np.ndarray]: The counts.
+        """
+        if 'head' not in self.norm_item:
+            return dict()
+
+        # pred_coords: [N, K, D]
+        pred_coords = np.concatenate(
+            [result['pred_coords'] for result in results])
+        # gt_coords: [N, K, D]
+        gt_coords = np.concatenate([result['gt_coords'] for result in results])
+        # mask: [N, K]
+        mask = np.concatenate([result['mask'] for result in results])
+
+        # MPII uses matlab format, gt index is 1-based,
+        # convert 0-based index to 1-based index
+        pred_coords = pred_coords + 1.0
+
+        norm_size_head = np.concatenate(
+            [result['head_size'] for result in results])
+
+        correct, valid = keypoint_pck_counts(pred_coords, gt_coords, mask,
+                                             self.thr, norm_size_head)
+        # `norm_size_head` has been modified in place, so the valid ones
+        # at the thresholds below are counted again
+        rng = np.arange(0, 0.5 + 0.01, 0.01)
+        correct_all, valid_all = keypoint_pck_counts(pred_coords, gt_coords,
+                                                     mask, rng, norm_size_head)
+
+        return dict(
+            head_correct=correct,
+            head_valid=valid,
+            head_correct_all=correct_all,
+            head_valid_all=valid_all,
+            jnt_count=np.sum(mask, axis=0))
+
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the counts of :meth:`compute_stats`.
+
+        Args:
+            stats (Dict[str, np.ndarray]): The counts of all results.
+
         Returns:
             Dict[str, float]: The computed metrics. The keys are the names of
             the metrics, and the values are corresponding results.
@@ -302,41 +369,24 @@ class MpiiPCKAccuracy(PCKAccuracy):
         """
         logger: MMLogger = MMLogger.get_current_instance()
 
-        # pred_coords: [N, K, D]
-        pred_coords = np.concatenate(
-            [result['pred_coords'] for result in results])
-        # gt_coords: [N, K, D]
-        gt_coords = np.concatenate([result['gt_coords'] for result in results])
-        # mask: [N, K]
-        mask = np.concatenate([result['mask'] for result in results])
-
-        # MPII uses matlab format, gt index is 1-based,
-        # convert 0-based index to 1-based index
-        pred_coords = pred_coords + 1.0
-
         metrics = {}
         if 'head' in self.norm_item:
-            norm_size_head = np.concatenate(
-                [result['head_size'] for result in results])
-
             logger.info(f'Evaluating {self.__class__.__name__} '
                         f'(normalized by ``"head_size"``)...')
 
-            pck_p, _, _ = keypoint_pck_accuracy(pred_coords, gt_coords, mask,
-                                                self.thr, norm_size_head)
+            pck_p, _, _ = pck_accuracy_from_counts(stats['head_correct'],
+                                                   stats['head_valid'])
 
-            jnt_count = np.sum(mask, axis=0)
+            jnt_count = stats['jnt_count']
             PCKh = 100. * pck_p
 
-            rng = np.arange(0, 0.5 + 0.01, 0.01)
-            pckAll = np.zeros((len(rng), 16), dtype=np.float32)
+            correct_all = stats['head_correct_all']
+            pckAll = np.zeros((correct_all.shape[1], 16), dtype=np.float32)
 
-            for r, threshold in enumerate(rng):
-                _pck, _, _ = keypoint_pck_accuracy(pred_coords, gt_coords,
-                                                   mask, threshold,
-                                                   norm_size_head)
+            for r in range(correct_all.shape[1]):
+                _pck, _, _ = pck_accuracy_from_counts(correct_all[:, r],
+                                                      stats['head_valid_all'])
                 pckAll[r, :] = 100. * _pck
-
             PCKh = np.ma.array(PCKh, mask=False)
             PCKh.mask[6:8] = True
 
@@ -399,6 +449,9 @@ class JhmdbPCKAccuracy(PCKAccuracy):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, ``self.default_prefix``
             will be used instead. Default: ``None``.
+        sharded (bool): Whether to compute the metric from the statistics
+            summed across ranks instead of gathering all results to rank 0.
+            See :class:`ShardedMetricMixin`. Default: ``False``.
 
     Examples:
 
@@ -437,18 +490,21 @@ class JhmdbPCKAccuracy(PCKAccuracy):
                  thr: float = 0.05,
                  norm_item: Union[str, Sequence[str]] = 'bbox',
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None) -> None:
+                 prefix: Optional[str] = None,
+                 sharded: bool = False) -> None:
         super().__init__(
             thr=thr,
             norm_item=norm_item,
             collect_device=collect_device,
-            prefix=prefix)
+            prefix=prefix,
+            sharded=sharded)
 
-    def compute_metrics(self, results: list) -> Dict[str, float]:
-        """Compute the metrics from processed results.
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the counts of :meth:`compute_stats`.
 
         Args:
-            results (list): The processed results of each batch.
+            stats (Dict[str, np.ndarray]): The counts of all results.
 
         Returns:
             Dict[str, float]: The computed metrics. The keys are the names of
@@ -476,25 +532,14 @@ class JhmdbPCKAccuracy(PCKAccuracy):
         """
         logger: MMLogger = MMLogger.get_current_instance()
 
-        # pred_coords: [N, K, D]
-        pred_coords = np.concatenate(
-            [result['pred_coords'] for result in results])
-        # gt_coords: [N, K, D]
-        gt_coords = np.concatenate([result['gt_coords'] for result in results])
-        # mask: [N, K]
-        mask = np.concatenate([result['mask'] for result in results])
-
         metrics = dict()
         if 'bbox' in self.norm_item:
-            norm_size_bbox = np.concatenate(
-                [result['bbox_size'] for result in results])
-
             logger.info(f'Evaluating {self.__class__.__name__} '
                         f'(normalized by ``"bbox_size"``)...')
 
-            pck_p, pck, _ = keypoint_pck_accuracy(pred_coords, gt_coords, mask,
-                                                  self.thr, norm_size_bbox)
-            stats = {
+            pck_p, pck, _ = pck_accuracy_from_counts(stats['bbox_correct'],
+                                                     stats['bbox_valid'])
+            pck_stats = {
                 'Head PCK': pck_p[2],
                 'Sho PCK': 0.5 * pck_p[3] + 0.5 * pck_p[4],
                 'Elb PCK': 0.5 * pck_p[7] + 0.5 * pck_p[8],
@@ -505,20 +550,17 @@ class JhmdbPCKAccuracy(PCKAccuracy):
                 'PCK': pck
             }
 
-            for stats_name, stat in stats.items():
+            for stats_name, stat in pck_stats.items():
                 metrics[stats_name] = stat
 
         if 'torso' in self.norm_item:
-            norm_size_torso = np.concatenate(
-                [result['torso_size'] for result in results])
-
             logger.info(f'Evaluating {self.__class__.__name__} '
                         f'(normalized by ``"torso_size"``)...')
 
-            pck_p, pck, _ = keypoint_pck_accuracy(pred_coords, gt_coords, mask,
-                                                  self.thr, norm_size_torso)
+            pck_p, pck, _ = pck_accuracy_from_counts(stats['torso_correct'],
+                                                     stats['torso_valid'])
 
-            stats = {
+            pck_stats = {
                 'Head tPCK': pck_p[2],
                 'Sho tPCK': 0.5 * pck_p[3] + 0.5 * pck_p[4],
                 'Elb tPCK': 0.5 * pck_p[7] + 0.5 * pck_p[8],
@@ -529,14 +571,14 @@ class JhmdbPCKAccuracy(PCKAccuracy):
                 'tPCK': pck
             }
 
-            for stats_name, stat in stats.items():
+            for stats_name, stat in pck_stats.items():
                 metrics[stats_name] = stat
 
         return metrics
 
 
 @METRICS.register_module()
-class AUC(BaseMetric):
+class AUC(ShardedMetricMixin, BaseMetric):
     """AUC evaluation metric.
 
     Calculate the Area Under Curve (AUC) of keypoint PCK accuracy.
@@ -559,14 +601,19 @@ class AUC(BaseMetric):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, ``self.default_prefix``
             will be used instead. Default: ``None``.
+        sharded (bool): Whether to compute the metric from the statistics
+            summed across ranks instead of gathering all results to rank 0.
+            See :class:`ShardedMetricMixin`. Default: ``False``.
     """
 
     def __init__(self,
                  norm_factor: float = 30,
                  num_thrs: int = 20,
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None) -> None:
-        super().__init__(collect_device=collect_device, prefix=prefix)
+                 prefix: Optional[str] = None,
+                 sharded: bool = False) -> None:
+        super().__init__(
+            collect_device=collect_device, prefix=prefix, sharded=sharded)
         self.norm_factor = norm_factor
         self.num_thrs = num_thrs
 
@@ -633,9 +680,60 @@ class AUC(BaseMetric):
 
         return metrics
 
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Count the correct predictions of each keypoint at each threshold
+        and the valid ones.
+
+        Args:
+            results (list): The processed results of each batch.
+
+        Returns:
+            Dict[str, np.ndarray]: The counts.
+        """
+        # pred_coords: [N, K, D]
+        pred_coords = np.concatenate(
+            [result['pred_coords'] for result in results])
+        # gt_coords: [N, K, D]
+        gt_coords = np.concatenate([result['gt_coords'] for result in results])
+        # mask: [N, K]
+        mask = np.concatenate([result['mask'] for result in results])
+
+        norm_factor = np.tile(
+            np.array([[self.norm_factor, self.norm_factor]]),
+            (pred_coords.shape[0], 1))
+        thrs = [1.0 * i / self.num_thrs for i in range(self.num_thrs)]
+        correct, valid = keypoint_pck_counts(pred_coords, gt_coords, mask,
+                                             thrs, norm_factor)
+
+        return dict(correct=correct, valid=valid)
+
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the counts of :meth:`compute_stats`.
+
+        Args:
+            stats (Dict[str, np.ndarray]): The counts of all results.
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        logger: MMLogger = MMLogger.get_current_instance()
+        logger.info(f'Evaluating {self.__class__.__name__}...')
+
+        auc = 0
+        for i in range(self.num_thrs):
+            _, avg_acc, _ = pck_accuracy_from_counts(stats['correct'][:, i],
+                                                     stats['valid'])
+            auc += 1.0 / self.num_thrs * avg_acc
+
+        metrics = dict()
+        metrics['AUC'] = auc
+
+        return metrics
+
 
 @METRICS.register_module()
-class EPE(BaseMetric):
+class EPE(ShardedMetricMixin, BaseMetric):
     """EPE evaluation metric.
 
     Calculate the end-point error (EPE) of keypoints.
@@ -653,6 +751,9 @@ class EPE(BaseMetric):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, ``self.default_prefix``
             will be used instead. Default: ``None``.
+        sharded (bool): Whether to compute the metric from the statistics
+            summed across ranks instead of gathering all results to rank 0.
+            See :class:`ShardedMetricMixin`. Default: ``False``.
     """
 
     def process(self, data_batch: Sequence[dict],
@@ -717,9 +818,52 @@ class EPE(BaseMetric):
 
         return metrics
 
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Sum the end-point errors and count the valid keypoints.
+
+        Args:
+            results (list): The processed results of each batch.
+
+        Returns:
+            Dict[str, np.ndarray]: The sum and the count.
+        """
+        # pred_coords: [N, K, D]
+        pred_coords = np.concatenate(
+            [result['pred_coords'] for result in results])
+        # gt_coords: [N, K, D]
+        gt_coords = np.concatenate([result['gt_coords'] for result in results])
+        # mask: [N, K]
+        mask = np.concatenate([result['mask'] for result in results])
+
+        distance_sum, num_valid = keypoint_distance_sum(
+            pred_coords, gt_coords, mask,
+            np.ones((pred_coords.shape[0], pred_coords.shape[2]),
+                    dtype=np.float32))
+
+        return dict(distance_sum=distance_sum, num_valid=num_valid)
+
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the sum of :meth:`compute_stats`.
+
+        Args:
+            stats (Dict[str, np.ndarray]): The sum and the count of all
+                results.
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        logger: MMLogger = MMLogger.get_current_instance()
+        logger.info(f'Evaluating {self.__class__.__name__}...')
+
+        metrics = dict()
+        metrics['EPE'] = stats['distance_sum'] / max(1, stats['num_valid'])
+
+        return metrics
+
 
 @METRICS.register_module()
-class NME(BaseMetric):
+class NME(ShardedMetricMixin, BaseMetric):
     """NME evaluation metric.
 
     Calculate the normalized mean error (NME) of keypoints.
@@ -755,6 +899,9 @@ class NME(BaseMetric):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, ``self.default_prefix``
             will be used instead. Default: ``None``.
+        sharded (bool): Whether to compute the metric from the statistics
+            summed across ranks instead of gathering all results to rank 0.
+            See :class:`ShardedMetricMixin`. Default: ``False``.
     """
 
     DEFAULT_KEYPOINT_INDICES = {
@@ -778,8 +925,10 @@ class NME(BaseMetric):
                  norm_item: Optional[str] = None,
                  keypoint_indices: Optional[Sequence[int]] = None,
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None) -> None:
-        super().__init__(collect_device=collect_device, prefix=prefix)
+                 prefix: Optional[str] = None,
+                 sharded: bool = False) -> None:
+        super().__init__(
+            collect_device=collect_device, prefix=prefix, sharded=sharded)
         allowed_norm_modes = ['use_norm_item', 'keypoint_distance']
         if norm_mode not in allowed_norm_modes:
             raise KeyError("`norm_mode` should be 'use_norm_item' or "
@@ -867,41 +1016,96 @@ class NME(BaseMetric):
         logger.info(f'Evaluating {self.__class__.__name__}...')
         metrics = dict()
 
+        # normalize_factor: [N, 2]
+        normalize_factor = self._get_results_normalize_factor(
+            results, gt_coords)
+        nme = keypoint_nme(pred_coords, gt_coords, mask, normalize_factor)
+        metrics['NME'] = nme
+
+        return metrics
+
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Sum the normalized errors and count the valid keypoints.
+
+        Args:
+            results (list): The processed results of each batch.
+
+        Returns:
+            Dict[str, np.ndarray]: The sum and the count.
+        """
+        # pred_coords: [N, K, D]
+        pred_coords = np.concatenate(
+            [result['pred_coords'] for result in results])
+        # gt_coords: [N, K, D]
+        gt_coords = np.concatenate([result['gt_coords'] for result in results])
+        # mask: [N, K]
+        mask = np.concatenate([result['mask'] for result in results])
+
+        normalize_factor = self._get_results_normalize_factor(
+            results, gt_coords)
+        distance_sum, num_valid = keypoint_distance_sum(
+            pred_coords, gt_coords, mask, normalize_factor)
+
+        return dict(distance_sum=distance_sum, num_valid=num_valid)
+
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the sum of :meth:`compute_stats`.
+
+        Args:
+            stats (Dict[str, np.ndarray]): The sum and the count of all
+                results.
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        logger: MMLogger = MMLogger.get_current_instance()
+        logger.info(f'Evaluating {self.__class__.__name__}...')
+
+        metrics = dict()
+        metrics['NME'] = stats['distance_sum'] / max(1, stats['num_valid'])
+
+        return metrics
+
+    def _get_results_normalize_factor(self, results: list,
+                                      gt_coords: np.ndarray) -> np.ndarray:
+        """Get the normalize factor of the results according to
+        ``self.norm_mode``.
+
+        Args:
+            results (list): The processed results of each batch.
+            gt_coords (np.ndarray[N, K, 2]): Groundtruth keypoint coordinates.
+
+        Returns:
+            np.ndarray[N, 2]: normalized factor
+        """
         if self.norm_mode == 'use_norm_item':
             normalize_factor_ = np.concatenate(
                 [result[self.norm_item] for result in results])
             # normalize_factor: [N, 2]
-            normalize_factor = np.tile(normalize_factor_, [1, 2])
-            nme = keypoint_nme(pred_coords, gt_coords, mask, normalize_factor)
-            metrics['NME'] = nme
+            return np.tile(normalize_factor_, [1, 2])
 
+        if self.keypoint_indices is None:
+            # use default keypoint_indices in some datasets
+            dataset_name = self.dataset_meta['dataset_name']
+            if dataset_name not in self.DEFAULT_KEYPOINT_INDICES:
+                raise KeyError(
+                    '`norm_mode` is set to `keypoint_distance`, and the '
+                    'keypoint_indices is set to None, can not find the '
+                    'keypoint_indices in `DEFAULT_KEYPOINT_INDICES`, '
+                    'please specify `keypoint_indices` appropriately.')
+            self.keypoint_indices = self.DEFAULT_KEYPOINT_INDICES[dataset_name]
         else:
-            if self.keypoint_indices is None:
-                # use default keypoint_indices in some datasets
-                dataset_name = self.dataset_meta['dataset_name']
-                if dataset_name not in self.DEFAULT_KEYPOINT_INDICES:
-                    raise KeyError(
-                        '`norm_mode` is set to `keypoint_distance`, and the '
-                        'keypoint_indices is set to None, can not find the '
-                        'keypoint_indices in `DEFAULT_KEYPOINT_INDICES`, '
-                        'please specify `keypoint_indices` appropriately.')
-                self.keypoint_indices = self.DEFAULT_KEYPOINT_INDICES[
-                    dataset_name]
-            else:
-                assert len(self.keypoint_indices) == 2, 'The keypoint '\
-                    'indices used for normalization should be a pair.'
-                keypoint_id2name = self.dataset_meta['keypoint_id2name']
-                dataset_name = self.dataset_meta['dataset_name']
-                for idx in self.keypoint_indices:
-                    assert idx in keypoint_id2name, f'The {dataset_name} '\
-                        f'dataset does not contain the required '\
-                        f'{idx}-th keypoint.'
-            # normalize_factor: [N, 2]
-            normalize_factor = self._get_normalize_factor(gt_coords=gt_coords)
-            nme = keypoint_nme(pred_coords, gt_coords, mask, normalize_factor)
-            metrics['NME'] = nme
-
-        return metrics
+            assert len(self.keypoint_indices) == 2, 'The keypoint '\
+                'indices used for normalization should be a pair.'
+            keypoint_id2name = self.dataset_meta['keypoint_id2name']
+            dataset_name = self.dataset_meta['dataset_name']
+            for idx in self.keypoint_indices:
+                assert idx in keypoint_id2name, f'The {dataset_name} '\
+                    f'dataset does not contain the required '\
+                    f'{idx}-th keypoint.'
+        # normalize_factor: [N, 2]
+        return self._get_normalize_factor(gt_coords=gt_coords)
 
     def _get_normalize_factor(self, gt_coords: np.ndarray) -> np.ndarray:
         """Get the normalize factor. generally inter-ocular distance measured
@@ -4,11 +4,13 @@ from os import path as osp
 from typing import Dict, List, Optional, Sequence
 
 import numpy as np
+from mmengine.dist import get_dist_info
 from mmengine.evaluator import BaseMetric
 from mmengine.logging import MMLogger
 
 from mmpose.registry import METRICS
-from ..functional import keypoint_mpjpe
+from ..functional import keypoint_position_errors
+from .sharded_metric import sum_rank_stats
 
 
 @METRICS.register_module()
@@ -40,6 +42,16 @@ class MPJPE(BaseMetric):
             will be used instead. Default: ``None``.
         skip_list (list, optional): The list of subject and action combinations
             to be skipped. Default: [].
+        chunk_size (int, optional): The number of samples to align at a time
+            in ``'p-mpjpe'`` mode, which bounds the memory. If not given,
+            align all the samples at once. Default: ``None``.
+        online (bool): Whether to accumulate the sums of the errors of each
+            action in ``process`` instead of keeping all the predictions and
+            ground truths until ``evaluate``. Only the sums are exchanged
+            across ranks, so the memory does not grow with the size of the
+            dataset. It assumes that only the last sample of a rank can be
+            padded by the sampler, which holds for
+            :class:`mmengine.dataset.DefaultSampler`. Default: ``False``.
     """
 
     ALIGNMENT = {'mpjpe': 'none', 'p-mpjpe': 'procrustes', 'n-mpjpe': 'scale'}
@@ -48,7 +60,9 @@ class MPJPE(BaseMetric):
                  mode: str = 'mpjpe',
                  collect_device: str = 'cpu',
                  prefix: Optional[str] = None,
-                 skip_list: List[str] = []) -> None:
+                 skip_list: List[str] = [],
+                 chunk_size: Optional[int] = None,
+                 online: bool = False) -> None:
         super().__init__(collect_device=collect_device, prefix=prefix)
         allowed_modes = self.ALIGNMENT.keys()
         if mode not in allowed_modes:
@@ -57,6 +71,21 @@ class MPJPE(BaseMetric):
 
         self.mode = mode
         self.skip_list = skip_list
+        self.chunk_size = chunk_size
+        self.online = online
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        """Reset the accumulated statistics of the online mode."""
+        self._stats = dict()
+        self._pending_stats = dict()
+        self._num_samples = 0
+
+    def _merge_stats(self, stats: Dict[str, np.ndarray]) -> None:
+        """Add the statistics to the accumulated ones."""
+        for name, value in stats.items():
+            self._stats[name] = self._stats[name] + value \
+                if name in self._stats else value
 
     def process(self, data_batch: Sequence[dict],
                 data_samples: Sequence[dict]) -> None:
@@ -70,6 +99,7 @@ class MPJPE(BaseMetric):
             data_samples (Sequence[dict]): A batch of outputs from
                 the model.
         """
+        results = []
         for data_sample in data_samples:
             # predicted keypoints coordinates, [T, K, D]
             pred_coords = data_sample['pred_instances']['keypoints']
@@ -90,6 +120,7 @@ class MPJPE(BaseMetric):
 
             subj_act = osp.basename(img_path).split('.')[0]
             if subj_act in self.skip_list:
+                results.append(None)
                 continue
 
             result = {
@@ -99,7 +130,22 @@ class MPJPE(BaseMetric):
                 'actions': actions
             }
 
-            self.results.append(result)
+            results.append(result)
+
+        if not self.online:
+            self.results.extend(result for result in results
+                                if result is not None)
+        elif results:
+            # only the last sample of a rank can be padded by the sampler,
+            # so its statistics are kept aside until the size of the dataset
+            # is known in ``evaluate``
+            self._merge_stats(self._pending_stats)
+            self._merge_stats(
+                self.compute_stats(
+                    [result for result in results[:-1] if result is not None]))
+            self._pending_stats = self.compute_stats(
+                [result for result in results[-1:] if result is not None])
+            self._num_samples += len(results)
 
     def compute_metrics(self, results: list) -> Dict[str, float]:
         """Compute the metrics from processed results.
@@ -132,12 +178,106 @@ class MPJPE(BaseMetric):
         logger.info(f'Evaluating {self.mode.upper()}...')
         metrics = dict()
 
-        metrics[error_name] = keypoint_mpjpe(pred_coords, gt_coords, mask,
-                                             self.ALIGNMENT[self.mode])
+        # errors: [N, K]
+        errors = keypoint_position_errors(pred_coords, gt_coords,
+                                          self.ALIGNMENT[self.mode],
+                                          self.chunk_size)
+
+        metrics[error_name] = errors[mask].mean()
 
         for action_category, indices in action_category_indices.items():
-            metrics[f'{error_name}_{action_category}'] = keypoint_mpjpe(
-                pred_coords[indices], gt_coords[indices], mask[indices],
-                self.ALIGNMENT[self.mode])
+            metrics[f'{error_name}_{action_category}'] = errors[indices][
+                mask[indices]].mean()
+
+        return metrics
+
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Sum the errors and count the valid keypoints of each action
+        category.
+
+        Args:
+            results (list): The processed results of the data samples.
+
+        Returns:
+            Dict[str, np.ndarray]: The sum of the errors and the number of the
+            valid keypoints of each action category.
+        """
+        if not results:
+            return dict()
+
+        # pred_coords: [N, K, D]
+        pred_coords = np.concatenate(
+            [result['pred_coords'] for result in results])
+        # gt_coords: [N, K, D]
+        gt_coords = np.concatenate([result['gt_coords'] for result in results])
+        # mask: [N, K]
+        mask = np.concatenate([result['mask'] for result in results])
+        action_categories = np.array([
+            action.split('_')[0] for result in results
+            for action in result['actions']
+        ])
+
+        # errors: [N, K]
+        errors = keypoint_position_errors(pred_coords, gt_coords,
+                                          self.ALIGNMENT[self.mode],
+                                          self.chunk_size)
+
+        stats = dict()
+        for action_category in dict.fromkeys(action_categories):
+            valid = mask & (action_categories == action_category)[:, None]
+            stats[action_category] = np.array(
+                [errors[valid].sum(), valid.sum()], dtype=np.float64)
+        return stats
+
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the sum of :meth:`compute_stats`.
+
+        Args:
+            stats (Dict[str, np.ndarray]): The sum of the errors and the
+                number of the valid keypoints of each action category.
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        logger: MMLogger = MMLogger.get_current_instance()
+        error_name = self.mode.upper()
+        logger.info(f'Evaluating {error_name}...')
+
+        error_sum, num_valid = sum(stats.values(), np.zeros(2))
+        metrics = dict()
+        metrics[error_name] = error_sum / max(1, num_valid)
+        for action_category, (error_sum, num_valid) in stats.items():
+            metrics[f'{error_name}_{action_category}'] = \
+                error_sum / max(1, num_valid)
+
+        return metrics
+
+    def evaluate(self, size: int) -> dict:
+        """Evaluate the model performance of the whole dataset after
+        processing all batches.
+
+        Args:
+            size (int): Length of the entire validation dataset.
+
+        Returns:
+            dict: Evaluation metrics dict on the val dataset.
+        """
+        if not self.online:
+            return super().evaluate(size)
+
+        # the index of the last sample of the rank in the dataset
+        rank, world_size = get_dist_info()
+        if (self._num_samples - 1) * world_size + rank < size:
+            self._merge_stats(self._pending_stats)
+
+        metrics = self.compute_metrics_from_stats(sum_rank_stats(self._stats))
+        if self.prefix:
+            metrics = {
+                '/'.join((self.prefix, k)): v
+                for k, v in metrics.items()
+            }
 
+        # reset the accumulated statistics
+        self._reset_stats()
         return metrics
@@ -8,10 +8,11 @@ import numpy as np
 from mmengine.evaluator import BaseMetric
 
 from mmpose.registry import METRICS
+from .sharded_metric import ShardedMetricMixin, sum_rank_stats
 
 
 @METRICS.register_module()
-class KeypointPartitionMetric(BaseMetric):
+class KeypointPartitionMetric(ShardedMetricMixin, BaseMetric):
     """Wrapper metric for evaluating pose metric on user-defined body parts.
 
     Sometimes one may be interested in the performance of a pose model on
@@ -45,6 +46,15 @@ class KeypointPartitionMetric(BaseMetric):
             ``PoseTrack18Metric``
         Keypoint partitioning is included in these metrics.
 
+    Sharded mode:
+        If ``sharded=True`` is set in ``metric``, the statistics of every
+        partition are computed on each rank by ``compute_stats`` of the
+        partition's metric, and the statistics of all partitions are summed
+        across ranks at once. See :class:`ShardedMetricMixin`. This is
+        supported by ``PCKAccuracy``, ``AUC``, ``EPE`` and ``NME``.
+        ``CocoMetric`` needs the ``ann_file`` to be sharded, so its results
+        are always gathered to rank 0.
+
     Args:
         metric (dict): arguments to instantiate a metric, please refer to the
             arguments required by the metric of your choice.
@@ -66,7 +76,7 @@ class KeypointPartitionMetric(BaseMetric):
         metric: dict,
         partitions: dict,
     ) -> None:
-        super().__init__()
+        super().__init__(sharded=metric.get('sharded', False))
         # check metric type
         supported_metric_types = [
             'CocoMetric', 'PCKAccuracy', 'AUC', 'EPE', 'NME'
@@ -191,8 +201,18 @@ class KeypointPartitionMetric(BaseMetric):
     def compute_metrics(self, results: list) -> dict:
         pass
 
+    def _can_shard(self) -> bool:
+        """Whether the metrics can be computed in sharded mode, which needs
+        the statistics of every partition."""
+        return self.sharded and all(
+            type(metric).compute_stats is not ShardedMetricMixin.compute_stats
+            for metric in self.metrics.values())
+
     def evaluate(self, size: int) -> dict:
         """Run evaluation for each partition."""
+        if self._can_shard():
+            return self._evaluate_sharded(size)
+
         eval_results = OrderedDict()
         for partition_name, metric in self.metrics.items():
             _eval_results = metric.evaluate(size)
@@ -201,3 +221,30 @@ class KeypointPartitionMetric(BaseMetric):
                 _eval_results[new_key] = _eval_results.pop(key)
             eval_results.update(_eval_results)
         return eval_results
+
+    def _evaluate_sharded(self, size: int) -> dict:
+        """Compute the statistics of each partition on the current rank, sum
+        the statistics of all partitions across ranks at once, and compute
+        the metrics of each partition from them."""
+        stats = dict()
+        for partition_name, metric in self.metrics.items():
+            results, _ = metric._get_local_results(size)
+            if results:
+                for name, value in metric.compute_stats(results).items():
+                    stats[(partition_name, name)] = value
+            metric.results.clear()
+        stats = sum_rank_stats(stats)
+
+        eval_results = OrderedDict()
+        for partition_name, metric in self.metrics.items():
+            _stats = {
+                name: value
+                for (_partition_name, name), value in stats.items()
+                if _partition_name == partition_name
+            }
+            _eval_results = metric.compute_metrics_from_stats(_stats)
+            for key, value in _eval_results.items():
+                if metric.prefix:
+                    key = metric.prefix + '/' + key
+                eval_results[partition_name + '/' + key] = value
+        return eval_results
@@ -70,6 +70,7 @@ class PoseTrack18Metric(CocoMetric):
         **kwargs: Keyword parameters passed to :class:`mmeval.BaseMetric`
     """
     default_prefix: Optional[str] = 'posetrack18'
+    support_native_eval: bool = False
 
     def __init__(self,
                  ann_file: Optional[str] = None,
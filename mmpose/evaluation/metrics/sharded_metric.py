@@ -0,0 +1,135 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Dict, List, Tuple
+
+import numpy as np
+from mmengine.dist import all_gather_object, get_dist_info
+
+
+def sum_rank_stats(stats: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Sum the statistics of all ranks by name. A name missing on some ranks
+    is summed over the ranks which have it.
+
+    Args:
+        stats (Dict[str, np.ndarray]): The statistics of the current rank
+
+    Returns:
+        Dict[str, np.ndarray]: The statistics summed across ranks.
+    """
+    # the statistics are small, so they are exchanged as objects, which
+    # also works for the ranks without any results
+    summed_stats = dict()
+    for rank_stats in all_gather_object(stats):
+        for name, value in rank_stats.items():
+            summed_stats[name] = summed_stats[name] + value \
+                if name in summed_stats else value
+    return summed_stats
+
+
+class ShardedMetricMixin:
+    """Mixin of metrics that can be computed from statistics summed across
+    ranks instead of the results gathered to rank 0.
+
+    By default, :class:`mmengine.evaluator.BaseMetric` gathers the processed
+    results of all ranks to rank 0, which computes the metrics while the
+    other ranks wait. In sharded mode, each rank computes the statistics
+    (e.g. the number of correct keypoints and the sum of errors) of its own
+    results by :meth:`compute_stats`. Only the statistics are exchanged and
+    summed across ranks, and the metrics are computed from the summed
+    statistics by :meth:`compute_metrics_from_stats` on every rank.
+
+    The results padded by the sampler to divide the dataset evenly among
+    ranks are dropped before computing the statistics, assuming that one
+    result is added for each data sample in ``process`` and that the
+    ``i``-th sample of a rank is the ``i * world_size + rank``-th sample of
+    the dataset, which holds for :class:`mmengine.dataset.DefaultSampler`.
+
+    Args:
+        sharded (bool): Whether to compute the metrics in sharded mode.
+            Defaults to ``False``
+    """
+
+    def __init__(self, *args, sharded: bool = False, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.sharded = sharded
+
+    def compute_stats(self, results: list) -> Dict[str, np.ndarray]:
+        """Compute the statistics of the processed results, which can be
+        summed over disjoint subsets of the dataset.
+
+        Args:
+            results (list): The processed results of the data samples on
+                the current rank
+
+        Returns:
+            Dict[str, np.ndarray]: The statistics.
+        """
+        raise NotImplementedError
+
+    def compute_metrics_from_stats(self, stats: Dict[str, np.ndarray]
+                                   ) -> Dict[str, float]:
+        """Compute the metrics from the statistics of all ranks.
+
+        Args:
+            stats (Dict[str, np.ndarray]): The statistics summed across ranks
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        raise NotImplementedError
+
+    def compute_sharded_metrics(self, results: list,
+                                sample_inds: np.ndarray) -> Dict[str, float]:
+        """Compute the metrics in sharded mode. All ranks get the same
+        metrics.
+
+        Args:
+            results (list): The processed results of the data samples on
+                the current rank, without the padded ones
+            sample_inds (np.ndarray): The index of each data sample in the
+                dataset
+
+        Returns:
+            Dict[str, float]: The computed metrics.
+        """
+        stats = self.compute_stats(results) if results else {}
+        return self.compute_metrics_from_stats(sum_rank_stats(stats))
+
+    def _can_shard(self) -> bool:
+        """Whether the metrics can be computed in sharded mode."""
+        return self.sharded
+
+    def _get_local_results(self, size: int) -> Tuple[List, np.ndarray]:
+        """Get the results of the data samples on the current rank without
+        the padded ones, and the index of each sample in the dataset."""
+        rank, world_size = get_dist_info()
+        sample_inds = np.arange(len(self.results)) * world_size + rank
+        keep = sample_inds < size
+        results = [
+            result for result, valid in zip(self.results, keep) if valid
+        ]
+        return results, sample_inds[keep]
+
+    def evaluate(self, size: int) -> dict:
+        """Evaluate the model performance of the whole dataset after
+        processing all batches.
+
+        Args:
+            size (int): Length of the entire validation dataset
+
+        Returns:
+            dict: Evaluation metrics dict on the val dataset.
+        """
+        if not self._can_shard():
+            return super().evaluate(size)
+
+        results, sample_inds = self._get_local_results(size)
+        metrics = self.compute_sharded_metrics(results, sample_inds)
+        if self.prefix:
+            metrics = {
+                '/'.join((self.prefix, k)): v
+                for k, v in metrics.items()
+            }
+
+        # reset the results list
+        self.results.clear()
+        return metrics
@@ -38,6 +38,9 @@ class SimpleMPJPE(BaseMetric):
             will be used instead. Default: ``None``.
         skip_list (list, optional): The list of subject and action combinations
             to be skipped. Default: [].
+        chunk_size (int, optional): The number of samples to align at a time
+            in ``'p-mpjpe'`` mode, which bounds the memory. If not given,
+            align all the samples at once. Default: ``None``.
     """
 
     ALIGNMENT = {'mpjpe': 'none', 'p-mpjpe': 'procrustes', 'n-mpjpe': 'scale'}
@@ -46,7 +49,8 @@ class SimpleMPJPE(BaseMetric):
                  mode: str = 'mpjpe',
                  collect_device: str = 'cpu',
                  prefix: Optional[str] = None,
-                 skip_list: List[str] = []) -> None:
+                 skip_list: List[str] = [],
+                 chunk_size: Optional[int] = None) -> None:
         super().__init__(collect_device=collect_device, prefix=prefix)
         allowed_modes = self.ALIGNMENT.keys()
         if mode not in allowed_modes:
@@ -55,6 +59,7 @@ class SimpleMPJPE(BaseMetric):
 
         self.mode = mode
         self.skip_list = skip_list
+        self.chunk_size = chunk_size
 
     def process(self, data_batch: Sequence[dict],
                 data_samples: Sequence[dict]) -> None:
@@ -114,6 +119,10 @@ class SimpleMPJPE(BaseMetric):
         logger.info(f'Evaluating {self.mode.upper()}...')
         return {
             error_name:
-            keypoint_mpjpe(pred_coords, gt_coords, mask,
-                           self.ALIGNMENT[self.mode])
+            keypoint_mpjpe(
+                pred_coords,
+                gt_coords,
+                mask,
+                self.ALIGNMENT[self.mode],
+                chunk_size=self.chunk_size)
         }
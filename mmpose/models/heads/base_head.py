@@ -7,6 +7,7 @@ from mmengine.structures import InstanceData
 from torch import Tensor
 
 from mmpose.utils.tensor_utils import to_numpy
+from mmpose.utils.timer import profile_stage
 from mmpose.utils.typing import (Features, InstanceList, OptConfigType,
                                  OptSampleList, Predictions)
 
@@ -53,7 +54,8 @@ class BaseHead(BaseModule, metaclass=ABCMeta):
         def _pack_and_call(args, func):
             if not isinstance(args, tuple):
                 args = (args, )
-            return func(*args)
+            with profile_stage('codec_decode'):
+                return func(*args)
 
         if self.decoder is None:
             raise RuntimeError(
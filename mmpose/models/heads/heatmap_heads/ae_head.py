@@ -9,6 +9,7 @@ from torch import Tensor
 from mmpose.models.utils.tta import aggregate_heatmaps, flip_heatmaps
 from mmpose.registry import MODELS
 from mmpose.utils.tensor_utils import to_numpy
+from mmpose.utils.timer import profile_stage
 from mmpose.utils.typing import (ConfigType, Features, InstanceList,
                                  OptConfigType, OptSampleList, Predictions)
 from .heatmap_head import HeatmapHead
@@ -243,7 +244,8 @@ class AssociativeEmbeddingHead(HeatmapHead):
         def _pack_and_call(args, func):
             if not isinstance(args, tuple):
                 args = (args, )
-            return func(*args)
+            with profile_stage('codec_decode'):
+                return func(*args)
 
         if self.decoder is None:
             raise RuntimeError(
@@ -12,6 +12,7 @@ from mmpose.models.necks import GlobalAveragePooling
 from mmpose.models.utils.tta import flip_heatmaps
 from mmpose.registry import KEYPOINT_CODECS, MODELS
 from mmpose.utils.tensor_utils import to_numpy
+from mmpose.utils.timer import profile_stage
 from mmpose.utils.typing import (ConfigType, Features, InstanceList,
                                  OptConfigType, OptSampleList, Predictions)
 from ..base_head import BaseHead
@@ -406,7 +407,8 @@ class InternetHead(BaseHead):
         def _pack_and_call(args, func):
             if not isinstance(args, tuple):
                 args = (args, )
-            return func(*args)
+            with profile_stage('codec_decode'):
+                return func(*args)
 
         if self.decoder is None:
             raise RuntimeError(
@@ -11,6 +11,7 @@ from torch import Tensor
 from mmpose.datasets.datasets.utils import parse_pose_metainfo
 from mmpose.models.utils import check_and_update_config
 from mmpose.registry import MODELS
+from mmpose.utils.timer import profile_stage
 from mmpose.utils.typing import (ConfigType, ForwardResults, OptConfigType,
                                  Optional, OptMultiConfig, OptSampleList,
                                  SampleList)
@@ -174,6 +175,21 @@ class BasePoseEstimator(BaseModel, metaclass=ABCMeta):
         """Predict results from a batch of inputs and data samples with post-
         processing."""
 
+    def test_step(self, data: Union[dict, tuple, list]) -> list:
+        """Predict results from the data sampled from the dataset, which is
+        the same as :meth:`mmengine.model.BaseModel.test_step` with the data
+        preprocessing profiled.
+
+        Args:
+            data (dict or tuple or list): Data sampled from dataset.
+
+        Returns:
+            list: The predictions of given data.
+        """
+        with profile_stage('data_preprocessor'):
+            data = self.data_preprocessor(data, False)
+        return self._run_forward(data, mode='predict')
+
     def _forward(self,
                  inputs: Tensor,
                  data_samples: OptSampleList = None
@@ -204,9 +220,11 @@ class BasePoseEstimator(BaseModel, metaclass=ABCMeta):
             tuple[Tensor]: Multi-level features that may have various
             resolutions.
         """
-        x = self.backbone(inputs)
+        with profile_stage('backbone'):
+            x = self.backbone(inputs)
         if self.with_neck:
-            x = self.neck(x)
+            with profile_stage('neck'):
+                x = self.neck(x)
 
         return x
 
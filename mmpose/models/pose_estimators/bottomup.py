@@ -6,6 +6,7 @@ from mmengine.utils import is_list_of
 from torch import Tensor
 
 from mmpose.registry import MODELS
+from mmpose.utils.timer import profile_stage
 from mmpose.utils.typing import (ConfigType, InstanceList, OptConfigType,
                                  OptMultiConfig, PixelDataList, SampleList)
 from .base import BasePoseEstimator
@@ -127,7 +128,9 @@ class BottomupPoseEstimator(BasePoseEstimator):
         if not multiscale_test:
             feats = feats[0]
 
-        preds = self.head.predict(feats, data_samples, test_cfg=self.test_cfg)
+        with profile_stage('head'):
+            preds = self.head.predict(
+                feats, data_samples, test_cfg=self.test_cfg)
 
         if isinstance(preds, tuple):
             batch_pred_instances, batch_pred_fields = preds
@@ -5,6 +5,7 @@ from typing import Optional
 from torch import Tensor
 
 from mmpose.registry import MODELS
+from mmpose.utils.timer import profile_stage
 from mmpose.utils.typing import (ConfigType, InstanceList, OptConfigType,
                                  OptMultiConfig, PixelDataList, SampleList)
 from .base import BasePoseEstimator
@@ -106,7 +107,9 @@ class TopdownPoseEstimator(BasePoseEstimator):
         else:
             feats = self.extract_feat(inputs)
 
-        preds = self.head.predict(feats, data_samples, test_cfg=self.test_cfg)
+        with profile_stage('head'):
+            preds = self.head.predict(
+                feats, data_samples, test_cfg=self.test_cfg)
 
         if isinstance(preds, tuple):
             batch_pred_instances, batch_pred_fields = preds
@@ -1,6 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import math
-from typing import Tuple
+from typing import Tuple, Union
 
 import cv2
 import numpy as np
@@ -435,6 +435,136 @@ def get_warp_matrix(
     return warp_mat
 
 
+def get_udp_warp_matrices(
+    center: np.ndarray,
+    scale: np.ndarray,
+    rot: Union[float, np.ndarray],
+    output_size: Tuple[int, int],
+) -> np.ndarray:
+    """Calculate the affine transformation matrices of multiple bboxes under
+    the unbiased constraint at once. This is the batched version of
+    :func:`get_udp_warp_matrix`.
+
+    Note:
+
+        - The bbox number: N
+
+    Args:
+        center (np.ndarray): Centers of the bounding boxes (x, y) in shape
+            (N, 2)
+        scale (np.ndarray): Scales of the bounding boxes wrt [width, height]
+            in shape (N, 2)
+        rot (float | np.ndarray): Rotation angle (degree) shared by all
+            bboxes, or per-bbox angles in shape (N, )
+        output_size (tuple): Size ([w, h]) of the output image
+
+    Returns:
+        np.ndarray: The 2x3 transformation matrices in shape (N, 2, 3)
+    """
+    center = np.asarray(center, dtype=np.float64).reshape(-1, 2)
+    scale = np.asarray(scale, dtype=np.float64).reshape(-1, 2)
+    assert len(center) == len(scale)
+    assert len(output_size) == 2
+
+    input_size = center * 2
+    rot_rad = np.deg2rad(np.broadcast_to(rot, (len(center), )))
+    sn, cs = np.sin(rot_rad), np.cos(rot_rad)
+    warp_mat = np.zeros((len(center), 2, 3), dtype=np.float32)
+    scale_x = (output_size[0] - 1) / scale[:, 0]
+    scale_y = (output_size[1] - 1) / scale[:, 1]
+    warp_mat[:, 0, 0] = cs * scale_x
+    warp_mat[:, 0, 1] = -sn * scale_x
+    warp_mat[:, 0,
+             2] = scale_x * (-0.5 * input_size[:, 0] * cs +
+                             0.5 * input_size[:, 1] * sn + 0.5 * scale[:, 0])
+    warp_mat[:, 1, 0] = sn * scale_y
+    warp_mat[:, 1, 1] = cs * scale_y
+    warp_mat[:, 1,
+             2] = scale_y * (-0.5 * input_size[:, 0] * sn -
+                             0.5 * input_size[:, 1] * cs + 0.5 * scale[:, 1])
+    return warp_mat
+
+
+def get_warp_matrices(
+    center: np.ndarray,
+    scale: np.ndarray,
+    rot: Union[float, np.ndarray],
+    output_size: Tuple[int, int],
+    shift: Tuple[float, float] = (0., 0.),
+    inv: bool = False,
+    fix_aspect_ratio: bool = True,
+) -> np.ndarray:
+    """Calculate the affine transformation matrices that warp multiple bbox
+    areas in the input image to the output size at once. This is the batched
+    version of :func:`get_warp_matrix`, and each matrix is exactly the same
+    as the one computed by :func:`get_warp_matrix` for the bbox.
+
+    Note:
+
+        - The bbox number: N
+
+    Args:
+        center (np.ndarray): Centers of the bounding boxes (x, y) in shape
+            (N, 2)
+        scale (np.ndarray): Scales of the bounding boxes wrt [width, height]
+            in shape (N, 2)
+        rot (float | np.ndarray): Rotation angle (degree) shared by all
+            bboxes, or per-bbox angles in shape (N, )
+        output_size (np.ndarray[2, ] | list(2,)): Size of the
+            destination heatmaps.
+        shift (0-100%): Shift translation ratio wrt the width/height.
+            Default (0., 0.).
+        inv (bool): Option to inverse the affine transform direction.
+            (inv=False: src->dst or inv=True: dst->src)
+        fix_aspect_ratio (bool): Whether to fix aspect ratio during transform.
+            Defaults to True.
+
+    Returns:
+        np.ndarray: The 2x3 transformation matrices in shape (N, 2, 3)
+    """
+    center = np.asarray(center).reshape(-1, 2)
+    scale = np.asarray(scale).reshape(-1, 2)
+    assert len(center) == len(scale)
+    assert len(output_size) == 2
+    assert len(shift) == 2
+
+    num_bboxes = len(center)
+    shift = np.array(shift)
+    dst_w, dst_h = output_size[:2]
+
+    rot_rad = np.deg2rad(np.broadcast_to(rot, (num_bboxes, )))
+    sn, cs = np.sin(rot_rad), np.cos(rot_rad)
+    # rotate the direction vectors (-w/2, 0) and (0, -h/2) of each bbox
+    src_dir = np.stack([cs, sn], axis=-1) * (scale[:, :1] * -0.5)
+    src_dir_2 = np.stack([-sn, cs], axis=-1) * (scale[:, 1:2] * -0.5)
+
+    src = np.zeros((num_bboxes, 3, 2), dtype=np.float32)
+    src[:, 0, :] = center + scale * shift
+    src[:, 1, :] = center + src_dir + scale * shift
+
+    dst = np.zeros((num_bboxes, 3, 2), dtype=np.float32)
+    dst[:, 0, :] = [dst_w * 0.5, dst_h * 0.5]
+    dst[:, 1, :] = np.array([dst_w * 0.5, dst_h * 0.5]) + [dst_w * -0.5, 0.]
+
+    if fix_aspect_ratio:
+        src[:, 2, :] = _get_3rd_point(src[:, 0, :], src[:, 1, :])
+        dst[:, 2, :] = _get_3rd_point(dst[:, 0, :], dst[:, 1, :])
+    else:
+        src[:, 2, :] = center + src_dir_2 + scale * shift
+        dst[:,
+            2, :] = np.array([dst_w * 0.5, dst_h * 0.5]) + [0., dst_h * -0.5]
+
+    if inv:
+        src, dst = dst, src
+
+    # solve each matrix from the point pairs with the same call as
+    # `get_warp_matrix`, so that the matrices are exactly the same
+    warp_mat = np.zeros((num_bboxes, 2, 3), dtype=np.float64)
+    for i in range(num_bboxes):
+        warp_mat[i] = cv2.getAffineTransform(src[i], dst[i])
+    return warp_mat
+
+
 def get_pers_warp_matrix(center: np.ndarray, translate: np.ndarray,
                          scale: float, rot: float,
                          shear: np.ndarray) -> np.ndarray:
@@ -514,12 +644,12 @@ def _get_3rd_point(a: np.ndarray, b: np.ndarray):
     anticlockwise, using b as the rotation center.
 
     Args:
-        a (np.ndarray): The 1st point (x,y) in shape (2, )
-        b (np.ndarray): The 2nd point (x,y) in shape (2, )
+        a (np.ndarray): The 1st point (x,y) in shape (2, ) or (n, 2)
+        b (np.ndarray): The 2nd point (x,y) in shape (2, ) or (n, 2)
 
     Returns:
         np.ndarray: The 3rd point.
     """
     direction = a - b
-    c = b + np.r_[-direction[1], direction[0]]
+    c = b + np.stack([-direction[..., 1], direction[..., 0]], axis=-1)
     return c
@@ -1,8 +1,13 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from ._codec_benchmark import (benchmark_codec, benchmark_func,
+                               format_codec_benchmarks,
+                               get_codec_benchmark_cfgs, run_codec_benchmarks)
 from ._utils import (get_coco_sample, get_config_file, get_packed_inputs,
                      get_pose_estimator_cfg, get_repo_dir)
 
 __all__ = [
     'get_packed_inputs', 'get_coco_sample', 'get_config_file',
-    'get_pose_estimator_cfg', 'get_repo_dir'
+    'get_pose_estimator_cfg', 'get_repo_dir', 'benchmark_func',
+    'benchmark_codec', 'get_codec_benchmark_cfgs', 'run_codec_benchmarks',
+    'format_codec_benchmarks'
 ]
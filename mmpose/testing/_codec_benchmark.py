@@ -0,0 +1,337 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+
+from mmpose.codecs.base import BaseKeypointCodec
+from mmpose.registry import KEYPOINT_CODECS
+from ._utils import _rand_bboxes, _rand_keypoints
+
+# the codecs that encode all instances of an image at once, the others
+# encode a single instance (a top-down crop or a pose sequence)
+MULTI_INSTANCE_CODECS = ('AssociativeEmbedding', 'SPR', 'DecoupledHeatmap')
+
+# the codecs that lift a sequence of 2d poses to 3d
+LIFTING_CODECS = ('ImagePoseLifting', 'VideoPoseLifting', 'MotionBERTLabel')
+
+
+def get_codec_benchmark_cfgs(input_size: Tuple[int, int] = (192, 256),
+                             num_keypoints: int = 17) -> Dict[str, dict]:
+    """Get the configs of the codecs to benchmark.
+
+    Args:
+        input_size (tuple): The input image size in [w, h]. The heatmaps are
+            4 times smaller. Defaults to ``(192, 256)``
+        num_keypoints (int): The number of keypoints. Defaults to 17
+
+    Returns:
+        Dict[str, dict]: The codec configs indexed by the benchmark names.
+    """
+    input_size = tuple(input_size)
+    heatmap_size = (input_size[0] // 4, input_size[1] // 4)
+    heatmap_cfg = dict(input_size=input_size, heatmap_size=heatmap_size)
+
+    cfgs = {
+        'MSRAHeatmap':
+        dict(type='MSRAHeatmap', sigma=2., **heatmap_cfg),
+        'MSRAHeatmap-DARK':
+        dict(type='MSRAHeatmap', sigma=2., unbiased=True, **heatmap_cfg),
+        'MegviiHeatmap':
+        dict(type='MegviiHeatmap', kernel_size=11, **heatmap_cfg),
+        'UDPHeatmap':
+        dict(type='UDPHeatmap', sigma=2., **heatmap_cfg),
+        'UDPHeatmap-combined':
+        dict(
+            type='UDPHeatmap',
+            heatmap_type='combined',
+            radius_factor=0.0546875,
+            **heatmap_cfg),
+        'RegressionLabel':
+        dict(type='RegressionLabel', input_size=input_size),
+        'IntegralRegressionLabel':
+        dict(type='IntegralRegressionLabel', sigma=2., **heatmap_cfg),
+        'SimCCLabel':
+        dict(type='SimCCLabel', input_size=input_size, sigma=6.),
+        'AssociativeEmbedding':
+        dict(
+            type='AssociativeEmbedding',
+            decode_keypoint_order=list(range(num_keypoints)),
+            **heatmap_cfg),
+        'SPR':
+        dict(type='SPR', sigma=(4, 2), **heatmap_cfg),
+        'DecoupledHeatmap':
+        dict(type='DecoupledHeatmap', **heatmap_cfg),
+        'ImagePoseLifting':
+        dict(type='ImagePoseLifting', num_keypoints=num_keypoints),
+        'VideoPoseLifting':
+        dict(type='VideoPoseLifting', num_keypoints=num_keypoints),
+        'MotionBERTLabel':
+        dict(type='MotionBERTLabel', num_keypoints=num_keypoints),
+    }
+    return cfgs
+
+
+def _get_codec_inputs(codec: BaseKeypointCodec, num_instances: int,
+                      num_keypoints: int, input_size: Tuple[int, int],
+                      rng: np.random.RandomState) -> Tuple[Callable, Callable]:
+    """Generate synthetic inputs of a codec and get the functions that
+    encode and decode them.
+
+    The decoding inputs are derived from the encoded labels, which mimics
+    the outputs of a perfectly trained model.
+    """
+    name = type(codec).__name__
+    w, h = input_size
+    bboxes = _rand_bboxes(rng, num_instances, w, h)
+    keypoints = _rand_keypoints(rng, bboxes, num_keypoints)
+    keypoints_visible = np.ones((num_instances, num_keypoints), np.float32)
+
+    encode_kwargs = dict(
+        keypoints=keypoints, keypoints_visible=keypoints_visible)
+    if name == 'DecoupledHeatmap':
+        # the bbox corners in shape (N, 4, 2)
+        encode_kwargs['bbox'] = bboxes[:, [0, 1, 0, 3, 2, 1, 2, 3]].reshape(
+            -1, 4, 2)
+    elif name in LIFTING_CODECS:
+        # the lifting target is the last frame of the sequence, except for
+        # MotionBERT which lifts the whole sequence
+        num_targets = num_instances if name == 'MotionBERTLabel' else 1
+        target_shape = (num_targets, num_keypoints)
+        encode_kwargs['lifting_target'] = rng.rand(*target_shape, 3)
+        encode_kwargs['lifting_target_visible'] = np.ones(
+            target_shape, np.float32)
+        if name != 'ImagePoseLifting':
+            encode_kwargs['camera_param'] = dict(w=w, h=h)
+
+    def encode():
+        return codec.encode(**encode_kwargs)
+
+    encoded = encode()
+
+    if name == 'SimCCLabel':
+        decode_args = (encoded['keypoint_x_labels'],
+                       encoded['keypoint_y_labels'])
+    elif name in ('RegressionLabel', 'IntegralRegressionLabel'):
+        decode_args = (encoded['keypoint_labels'], )
+    elif name == 'AssociativeEmbedding':
+        # the tags of the keypoints of each instance are the instance index
+        heatmaps = encoded['heatmaps']
+        K, H, W = heatmaps.shape
+        tags = np.zeros((K, H, W), dtype=np.float32)
+        keypoint_indices = encoded['keypoint_indices']
+        inds, ks = np.nonzero(keypoint_indices[..., 1])
+        ys, xs = np.unravel_index(keypoint_indices[inds, ks, 0], (H, W))
+        tags[ks, ys, xs] = inds
+        decode_args = (torch.from_numpy(heatmaps[None]),
+                       torch.from_numpy(tags[None]))
+    elif name == 'SPR':
+        decode_args = (torch.from_numpy(encoded['heatmaps']),
+                       torch.from_numpy(encoded['displacements']))
+    elif name == 'DecoupledHeatmap':
+        num_found = encoded['instance_coords'].shape[0]
+        instance_heatmaps = encoded['instance_heatmaps'].reshape(
+            num_found, -1, *encoded['instance_heatmaps'].shape[-2:])
+        decode_args = (instance_heatmaps, np.ones((num_found, 1)))
+    elif name == 'MotionBERTLabel':
+        decode_args = (encoded['lifting_target_label'][None], np.array([w]),
+                       np.array([h]))
+    elif name in LIFTING_CODECS:
+        decode_args = (encoded['lifting_target_label'], encoded['target_root'])
+    else:
+        decode_args = (encoded['heatmaps'], )
+
+    if codec.support_batch_decoding:
+        decode_func = codec.batch_decode
+    else:
+        decode_func = codec.decode
+
+    def decode():
+        return decode_func(*decode_args)
+
+    return encode, decode
+
+
+def benchmark_func(func: Callable,
+                   repeat: int = 50,
+                   warmup: int = 5) -> Dict[str, float]:
+    """Measure the running time and the peak memory of a function.
+
+    Args:
+        func (Callable): The function to benchmark, which is called without
+            arguments
+        repeat (int): The number of timed calls. Defaults to 50
+        warmup (int): The number of calls before timing. Defaults to 5
+
+    Returns:
+        Dict[str, float]: The benchmark results, including:
+
+            - ops_per_sec: The number of calls per second
+            - mean_ms, median_ms, min_ms, max_ms, std_ms: The statistics of
+              the running time of a call in milliseconds
+            - peak_memory_mb: The peak memory allocated by a call in MB,
+              which is traced by :mod:`tracemalloc` and thus covers the
+              Python objects and numpy arrays but not the memory allocated
+              by PyTorch
+    """
+    if repeat < 1:
+        raise ValueError(f'`repeat` should be positive, but got {repeat}')
+
+    for _ in range(warmup):
+        func()
+
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        times[i] = time.perf_counter() - start
+    times *= 1000
+
+    # the memory is traced in a separate call as tracing slows down the
+    # allocations
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, 'reset_peak'):
+        # python >= 3.9
+        tracemalloc.reset_peak()
+    base_memory = tracemalloc.get_traced_memory()[0]
+    func()
+    peak_memory = tracemalloc.get_traced_memory()[1] - base_memory
+    if not tracing:
+        tracemalloc.stop()
+
+    return dict(
+        ops_per_sec=1000. / times.mean(),
+        mean_ms=times.mean(),
+        median_ms=np.median(times),
+        min_ms=times.min(),
+        max_ms=times.max(),
+        std_ms=times.std(),
+        peak_memory_mb=peak_memory / 2**20)
+
+
+def benchmark_codec(cfg: dict,
+                    num_instances: int = 1,
+                    num_keypoints: int = 17,
+                    input_size: Tuple[int, int] = (192, 256),
+                    repeat: int = 50,
+                    warmup: int = 5,
+                    seed: int = 0) -> Dict[str, dict]:
+    """Benchmark the encoding and decoding of a codec on synthetic
+    keypoints.
+
+    Args:
+        cfg (dict): The codec config
+        num_instances (int): The number of instances in an image for the
+            bottom-up codecs, or the number of frames in a sequence for the
+            pose-lifting codecs. The other codecs always encode one
+            instance. Defaults to 1
+        num_keypoints (int): The number of keypoints. Defaults to 17
+        input_size (tuple): The image size in [w, h] where the keypoints
+            are generated. Defaults to ``(192, 256)``
+        repeat (int): The number of timed calls. Defaults to 50
+        warmup (int): The number of calls before timing. Defaults to 5
+        seed (int): The random seed of the synthetic keypoints. Defaults
+            to 0
+
+    Returns:
+        Dict[str, dict]: The results of ``'encode'`` and ``'decode'``
+        returned by :func:`benchmark_func`, and the actual
+        ``'num_instances'``.
+    """
+    codec = KEYPOINT_CODECS.build(cfg)
+    name = type(codec).__name__
+    if name == 'ImagePoseLifting' or (name not in MULTI_INSTANCE_CODECS
+                                      and name not in LIFTING_CODECS):
+        num_instances = 1
+
+    rng = np.random.RandomState(seed)
+    encode, decode = _get_codec_inputs(codec, num_instances, num_keypoints,
+                                       input_size, rng)
+    return dict(
+        num_instances=num_instances,
+        encode=benchmark_func(encode, repeat, warmup),
+        decode=benchmark_func(decode, repeat, warmup))
+
+
+def run_codec_benchmarks(codecs: Optional[Sequence[str]] = None,
+                         num_instances: int = 1,
+                         num_keypoints: int = 17,
+                         input_size: Tuple[int, int] = (192, 256),
+                         repeat: int = 50,
+                         warmup: int = 5,
+                         seed: int = 0) -> dict:
+    """Benchmark the codecs and collect a report.
+
+    Args:
+        codecs (Sequence[str], optional): The names of the codecs to
+            benchmark from :func:`get_codec_benchmark_cfgs`. ``None`` means
+            all codecs. Defaults to ``None``
+        num_instances (int): See :func:`benchmark_codec`. Defaults to 1
+        num_keypoints (int): The number of keypoints. Defaults to 17
+        input_size (tuple): The input image size in [w, h]. Defaults to
+            ``(192, 256)``
+        repeat (int): The number of timed calls. Defaults to 50
+        warmup (int): The number of calls before timing. Defaults to 5
+        seed (int): The random seed of the synthetic keypoints. Defaults
+            to 0
+
+    Returns:
+        dict: The report, which contains the environment, the settings and
+        the results of each codec, and can be dumped to json.
+    """
+    cfgs = get_codec_benchmark_cfgs(input_size, num_keypoints)
+    if codecs is None:
+        codecs = list(cfgs.keys())
+    unknown_codecs = [name for name in codecs if name not in cfgs]
+    if unknown_codecs:
+        raise ValueError(f'Unknown codecs {unknown_codecs}, the codecs to '
+                         f'benchmark are {list(cfgs.keys())}')
+
+    results: Dict[str, dict] = dict()
+    for name in codecs:
+        results[name] = dict(
+            cfg=cfgs[name],
+            **benchmark_codec(
+                cfgs[name],
+                num_instances=num_instances,
+                num_keypoints=num_keypoints,
+                input_size=input_size,
+                repeat=repeat,
+                warmup=warmup,
+                seed=seed))
+
+    env = dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        torch=torch.__version__,
+        platform=platform.platform(),
+        processor=platform.processor())
+    settings = dict(
+        num_instances=num_instances,
+        num_keypoints=num_keypoints,
+        input_size=list(input_size),
+        repeat=repeat,
+        warmup=warmup,
+        seed=seed)
+    return dict(env=env, settings=settings, results=results)
+
+
+def format_codec_benchmarks(report: dict) -> List[str]:
+    """Format the results in a report of :func:`run_codec_benchmarks` as
+    the lines of a table."""
+    lines = [
+        f'{"codec":<24}{"op":<8}{"ops/sec":>12}{"mean(ms)":>12}'
+        f'{"median(ms)":>12}{"peak mem(MB)":>14}'
+    ]
+    for name, result in report['results'].items():
+        for op in ('encode', 'decode'):
+            res = result[op]
+            lines.append(f'{name:<24}{op:<8}{res["ops_per_sec"]:>12.1f}'
+                         f'{res["mean_ms"]:>12.3f}{res["median_ms"]:>12.3f}'
+                         f'{res["peak_memory_mb"]:>14.3f}')
+    return lines
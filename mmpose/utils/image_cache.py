@@ -0,0 +1,147 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import mmcv
+import numpy as np
+from mmengine.utils import ManagerMixin
+
+from .timer import profile_stage
+
+
+class ImageCache(ManagerMixin):
+    """A size-bounded LRU cache of decoded images.
+
+    Images are keyed by the absolute file path together with the file
+    modification time and size, so a file that is rewritten on disk is
+    decoded again. The total size of the cached arrays is bounded by
+    ``max_bytes`` and the least recently used images are evicted first.
+
+    The cached arrays are shared by all users and are therefore marked as
+    read-only. Transforms that modify the image in place should copy it
+    first.
+
+    Args:
+        name (str): The name of the cache instance. The instance can be
+            accessed globally by ``ImageCache.get_instance(name)``
+        max_bytes (int): The maximum total size in bytes of the cached
+            images. Defaults to 512 MiB
+
+    Example:
+        >>> from mmpose.utils import ImageCache
+        >>> cache = ImageCache.get_default()
+        >>> img = cache.load('tests/data/coco/000000000785.jpg')
+        >>> img is cache.load('tests/data/coco/000000000785.jpg')
+        True
+    """
+
+    def __init__(self, name: str = 'image_cache', max_bytes: int = 512 << 20):
+        super().__init__(name)
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_default(cls) -> 'ImageCache':
+        """Get the default cache instance shared by :class:`LoadImage` and the
+        inferencers."""
+        return cls.get_instance('mmpose')
+
+    @property
+    def nbytes(self) -> int:
+        """int: The total size in bytes of the cached images."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def make_key(img_path: str, *args) -> Optional[tuple]:
+        """Make the cache key of an image file.
+
+        Args:
+            img_path (str): The image file path
+            *args: Other hashable arguments that affect the decoded image,
+                e.g. the color type and decoding backend
+
+        Returns:
+            tuple, optional: The cache key. ``None`` if ``img_path`` is not a
+            local file, in which case the image should not be cached.
+        """
+        try:
+            stat = os.stat(img_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        return (osp.abspath(img_path), stat.st_mtime_ns, stat.st_size) + args
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Get a cached image and mark it as recently used.
+
+        Args:
+            key (Hashable): The cache key
+
+        Returns:
+            np.ndarray, optional: The cached image. ``None`` if not cached.
+        """
+        with self._lock:
+            img = self._cache.get(key, None)
+            if img is not None:
+                self._cache.move_to_end(key)
+            return img
+
+    def put(self, key: Hashable, img: np.ndarray) -> None:
+        """Add an image to the cache and evict the least recently used images
+        if the cache is full. Images larger than ``max_bytes`` are not cached.
+
+        Args:
+            key (Hashable): The cache key
+            img (np.ndarray): The decoded image
+        """
+        if img.nbytes > self.max_bytes:
+            return
+
+        img.flags.writeable = False
+        with self._lock:
+            if key in self._cache:
+                self._nbytes -= self._cache.pop(key).nbytes
+            self._cache[key] = img
+            self._nbytes += img.nbytes
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Remove all the cached images."""
+        with self._lock:
+            self._cache.clear()
+            self._nbytes = 0
+
+    def load(self,
+             img_path: str,
+             color_type: str = 'color',
+             backend: Optional[str] = None) -> np.ndarray:
+        """Load an image in BGR order from the cache, or decode it from the
+        file and cache it.
+
+        Args:
+            img_path (str): The image file path
+            color_type (str): The flag argument for :func:`mmcv.imread`.
+                Defaults to ``'color'``
+            backend (str, optional): The image decoding backend type. See
+                :func:`mmcv.imread` for details. Defaults to ``None``
+
+        Returns:
+            np.ndarray: The read-only decoded image.
+        """
+        key = self.make_key(img_path, color_type, backend)
+        img = self.get(key) if key is not None else None
+        if img is None:
+            with profile_stage('decode'):
+                img = mmcv.imread(img_path, flag=color_type, backend=backend)
+            if key is not None and img is not None:
+                self.put(key, img)
+        return img
@@ -1,9 +1,15 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os
+import threading
+import time
 from collections import defaultdict
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from functools import partial
+from typing import Dict, List, Optional, Sequence
 
 import numpy as np
+import torch
 from mmengine import Timer
 
 
@@ -115,3 +121,201 @@ class StopWatch:
     def reset(self):
         self._record = defaultdict(list)
         self._active_timer_stack = []
+
+
+class LatencyProfiler:
+    r"""A helper class to record the wall-clock latency of the stages of the
+    inference, e.g. image decoding, detection, data pipeline, model forward
+    and visualization.
+
+    The profiling is opt-in. The stages instrumented by
+    :func:`profile_stage` are only recorded while a profiler is active, i.e.
+    inside its ``with`` block, and they cost nothing otherwise. The stages
+    run by the worker threads in the pipelined inference are recorded too.
+
+    The instrumented stages are ``'decode'``, ``'detection'``,
+    ``'bbox_nms'``, ``'pipeline'``, ``'collate'``, ``'data_preprocessor'``,
+    ``'backbone'``, ``'neck'``, ``'head'``, ``'codec_decode'`` and
+    ``'visualization'``. A stage can be nested in another one, e.g.
+    ``'codec_decode'`` in ``'head'``.
+
+    Args:
+        cuda_sync (bool): Whether to synchronize CUDA at the start and the
+            end of each stage, so that the asynchronous GPU work is counted
+            in the stage that launches it. It only takes effect if CUDA is
+            available. Defaults to ``True``
+
+    Example:
+        >>> from mmpose.apis import MMPoseInferencer
+        >>> from mmpose.utils import LatencyProfiler
+        >>> inferencer = MMPoseInferencer('human')
+        >>> with LatencyProfiler() as profiler:
+        >>>     for _ in inferencer('demo.mp4'):
+        >>>         pass
+        >>> summary = profiler.summary()
+        >>> profiler.dump('trace.json', file_format='chrome')
+    """
+
+    _active: Optional['LatencyProfiler'] = None
+
+    def __init__(self, cuda_sync: bool = True):
+        self.cuda_sync = cuda_sync and torch.cuda.is_available()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __enter__(self) -> 'LatencyProfiler':
+        if LatencyProfiler._active is not None:
+            raise RuntimeError('Another LatencyProfiler is already active.')
+        LatencyProfiler._active = self
+        return self
+
+    def __exit__(self, *args) -> None:
+        LatencyProfiler._active = None
+
+    @classmethod
+    def get_active(cls) -> Optional['LatencyProfiler']:
+        """Get the active profiler, or ``None`` if no profiler is active."""
+        return cls._active
+
+    def reset(self) -> None:
+        """Remove all records."""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._records = []
+
+    @contextmanager
+    def record(self, name: str):
+        """Record the latency of a code snippet as a stage.
+
+        Args:
+            name (str): The name of the stage
+        """
+        if self.cuda_sync:
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.cuda_sync:
+                torch.cuda.synchronize()
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._records.append((name, start - self._origin, duration,
+                                      threading.get_ident()))
+
+    def durations(self) -> Dict[str, np.ndarray]:
+        """Get the recorded durations of each stage.
+
+        Returns:
+            dict: The key is the stage name and the value is the durations
+            in milliseconds in the recorded order.
+        """
+        with self._lock:
+            records = list(self._records)
+
+        durations = defaultdict(list)
+        for name, _, duration, _ in records:
+            durations[name].append(duration * 1000.)
+        return {name: np.array(values) for name, values in durations.items()}
+
+    def summary(
+        self, percentiles: Sequence[float] = (50, 90, 99)
+    ) -> Dict[str, Dict[str, float]]:
+        """Aggregate the recorded durations of each stage.
+
+        Args:
+            percentiles (Sequence[float]): The percentiles to report.
+                Defaults to ``(50, 90, 99)``
+
+        Returns:
+            dict: The key is the stage name and the value is a dict of the
+            statistics in milliseconds, including ``'count'``, ``'total'``,
+            ``'mean'``, ``'max'`` and the percentiles, e.g. ``'p50'``.
+        """
+        summary = dict()
+        for name, values in self.durations().items():
+            stats = dict(
+                count=len(values),
+                total=float(values.sum()),
+                mean=float(values.mean()),
+                max=float(values.max()))
+            for q, value in zip(percentiles,
+                                np.percentile(values, percentiles)):
+                stats[f'p{q:g}'] = float(value)
+            summary[name] = stats
+        return summary
+
+    def report_strings(self) -> List[str]:
+        """Report the summary in texture strings.
+
+        Returns:
+            list(str): Each element is the information string of a stage, in
+            format of '{name}: mean {mean} ms, p50 {p50} ms, ...'.
+        """
+        strings = []
+        for name, stats in self.summary().items():
+            info = ', '.join(f'{key} {value:.2f} ms'
+                             for key, value in stats.items()
+                             if key not in ('count', 'total'))
+            strings.append(f'{name} (x{stats["count"]}): {info}')
+        return strings
+
+    def chrome_trace(self) -> dict:
+        """Get the records in the Chrome trace event format, which can be
+        loaded in ``chrome://tracing`` or Perfetto.
+
+        Returns:
+            dict: The trace events.
+        """
+        with self._lock:
+            records = list(self._records)
+
+        pid = os.getpid()
+        events = [
+            dict(
+                name=name,
+                cat='mmpose',
+                ph='X',
+                ts=start * 1e6,
+                dur=duration * 1e6,
+                pid=pid,
+                tid=tid) for name, start, duration, tid in records
+        ]
+        return dict(traceEvents=events, displayTimeUnit='ms')
+
+    def dump(self, file: str, file_format: str = 'json') -> None:
+        """Dump the records to a file.
+
+        Args:
+            file (str): The output file path
+            file_format (str): The file format. ``'json'`` for the summary
+                of :meth:`summary`, and ``'chrome'`` for the trace of
+                :meth:`chrome_trace`. Defaults to ``'json'``
+        """
+        if file_format == 'json':
+            content = self.summary()
+        elif file_format == 'chrome':
+            content = self.chrome_trace()
+        else:
+            raise ValueError('`file_format` should be \'json\' or '
+                             f'\'chrome\', but got {file_format}.')
+
+        with open(file, 'w') as f:
+            json.dump(content, f)
+
+
+def profile_stage(name: str):
+    """Record the latency of a code snippet as a stage with the active
+    :class:`LatencyProfiler`. It does nothing if no profiler is active.
+
+    Args:
+        name (str): The name of the stage
+
+    Example:
+        >>> with profile_stage('backbone'):
+        >>>     feats = self.backbone(inputs)
+    """
+    profiler = LatencyProfiler._active
+    if profiler is None:
+        return nullcontext()
+    return profiler.record(name)
@@ -3,6 +3,7 @@ import os.path as osp
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 import torch
@@ -10,7 +11,8 @@ from mmcv.image import imread, imwrite
 from mmengine.utils import is_list_of
 from parameterized import parameterized
 
-from mmpose.apis import inference_bottomup, inference_topdown, init_model
+from mmpose.apis import (inference_bottomup, inference_topdown,
+                         inference_topdown_batch, init_model)
 from mmpose.structures import PoseDataSample
 from mmpose.testing._utils import _rand_bboxes, get_config_file, get_repo_dir
 from mmpose.utils import register_all_modules
@@ -88,6 +90,79 @@ class TestInference(TestCase):
                 self.assertTrue(results[0].pred_instances.keypoints.shape,
                                 (1, 17, 2))
 
+    @parameterized.expand([(('configs/body_2d_keypoint/topdown_heatmap/coco/'
+                             'td-hm_hrnet-w32_8xb64-210e_coco-256x192.py'),
+                            ('cpu', 'cuda'))])
+    def test_inference_topdown_batch(self, config, devices):
+        config_file = get_config_file(config)
+
+        rng = np.random.RandomState(0)
+        img_w = img_h = 100
+        imgs = [
+            rng.randint(0, 255, (img_h, img_w, 3), dtype=np.uint8)
+            for _ in range(4)
+        ]
+        bboxes = [
+            _rand_bboxes(rng, 5, img_w, img_h), None, [],
+            _rand_bboxes(rng, 3, img_w, img_h)
+        ]
+        num_instances = [5, 1, 1, 3]
+
+        for device in devices:
+            if device == 'cuda' and not torch.cuda.is_available():
+                # Skip the test if cuda is required but unavailable
+                continue
+            model = init_model(config_file, device=device)
+            expected_results = [
+                inference_topdown(model, img, _bboxes, bbox_format='xywh')
+                for img, _bboxes in zip(imgs, bboxes)
+            ]
+
+            for batch_size in (1, 3, 4, 32):
+                with patch.object(
+                        model, 'test_step',
+                        wraps=model.test_step) as test_step:
+                    results = inference_topdown_batch(
+                        model,
+                        imgs,
+                        bboxes,
+                        bbox_format='xywh',
+                        batch_size=batch_size)
+
+                # the instances are packed into micro-batches across the
+                # image boundaries
+                total = sum(num_instances)
+                batch_sizes = [
+                    min(batch_size, total - start)
+                    for start in range(0, total, batch_size)
+                ]
+                call_sizes = [
+                    len(call.args[0]['inputs'])
+                    for call in test_step.call_args_list
+                ]
+                self.assertEqual(call_sizes, batch_sizes)
+
+                # the results are gathered back to each image in order
+                self.assertEqual(len(results), 4)
+                self.assertEqual([len(r) for r in results], num_instances)
+                for expected, _results in zip(expected_results, results):
+                    self.assertTrue(is_list_of(_results, PoseDataSample))
+                    for result, _result in zip(expected, _results):
+                        np.testing.assert_array_equal(
+                            result.pred_instances.bboxes,
+                            _result.pred_instances.bboxes)
+                        self.assertEqual(result.img_shape, _result.img_shape)
+                        self.assertTrue(
+                            np.allclose(
+                                result.pred_instances.keypoints,
+                                _result.pred_instances.keypoints,
+                                atol=1e-3))
+
+            with self.assertRaisesRegex(ValueError, 'groups of bboxes'):
+                _ = inference_topdown_batch(model, imgs, bboxes[:2])
+            with self.assertRaisesRegex(ValueError, 'Invalid batch_size'):
+                _ = inference_topdown_batch(model, imgs, bboxes, batch_size=0)
+
     @parameterized.expand([(('configs/body_2d_keypoint/'
                              'associative_embedding/coco/'
                              'ae_hrnet-w32_8xb24-300e_coco-512x512.py'),
@@ -0,0 +1,78 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import numpy as np
+from mmengine.structures import InstanceData
+
+from mmpose.apis import (PoseSequenceBuffer, collate_pose_sequence,
+                         extract_pose_sequence)
+from mmpose.structures import PoseDataSample
+
+
+class TestPoseSequenceBuffer(TestCase):
+
+    def _make_video(self, num_frames=30, num_tracks=12, seed=0):
+        rng = np.random.RandomState(seed)
+        # the tracks appear, disappear and reappear randomly
+        present = rng.rand(num_frames, num_tracks) < 0.7
+        keypoints = rng.rand(num_frames, num_tracks, 5, 2).astype(np.float32)
+
+        video = []
+        for t in range(num_frames):
+            track_ids = rng.permutation(np.flatnonzero(present[t]))
+            video.append((keypoints[t, track_ids], track_ids))
+        return video
+
+    def _get_sequences(self, results_list, frame_idx, seq_len, causal, step):
+        pose_results = extract_pose_sequence(
+            results_list, frame_idx, causal, seq_len, step=step)
+        target_idx = -1 if causal else len(pose_results) // 2
+        pose_seqs = collate_pose_sequence(pose_results, True, target_idx)
+        return [seq.pred_instances.keypoints[0] for seq in pose_seqs]
+
+    def test_update(self):
+        video = self._make_video()
+        for seq_len, causal, step in [(1, True, 1), (5, True, 1),
+                                      (7, False, 1), (6, False, 2),
+                                      (9, True, 3)]:
+            buffer = PoseSequenceBuffer(
+                seq_len, causal=causal, step=step, num_tracks=2)
+            results_list = []
+            for t, (keypoints, track_ids) in enumerate(video):
+                sequences = buffer.update(keypoints, track_ids)
+
+                results = []
+                for kpts, track_id in zip(keypoints, track_ids):
+                    data_sample = PoseDataSample()
+                    data_sample.pred_instances = InstanceData(
+                        keypoints=kpts[None])
+                    data_sample.gt_instances = InstanceData()
+                    data_sample.track_id = track_id
+                    results.append(data_sample)
+                results_list.append(results)
+                expected = self._get_sequences(results_list, t, seq_len,
+                                               causal, step)
+
+                self.assertEqual(len(sequences), len(expected))
+                for sequence, expected_sequence in zip(sequences, expected):
+                    np.testing.assert_array_equal(sequence, expected_sequence)
+
+        # the slots of the tracks out of the history are reused
+        self.assertLessEqual(len(buffer), 12)
+
+    def test_untracked_instances(self):
+        buffer = PoseSequenceBuffer(3, causal=True)
+        buffer.update(np.zeros((2, 5, 2)), [0, -1])
+        keypoints = np.random.rand(2, 5, 2)
+        sequences = buffer.update(keypoints, [-1, 0])
+        self.assertEqual(sequences.shape, (2, 3, 5, 2))
+        self.assertEqual(len(buffer), 1)
+        np.testing.assert_allclose(
+            sequences[0], np.repeat(keypoints[:1], 3, axis=0), rtol=1e-6)
+        np.testing.assert_allclose(sequences[1, 2], keypoints[1], rtol=1e-6)
+        np.testing.assert_array_equal(sequences[1, :2], 0)
+
+        buffer.reset()
+        self.assertEqual(len(buffer), 0)
+        sequences = buffer.update(np.zeros((0, 5, 2)), [])
+        self.assertEqual(sequences.shape, (0, 3, 5, 2))
@@ -0,0 +1,101 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import numpy as np
+from mmengine.structures import InstanceData
+
+from mmpose.apis import PoseTracker, _compute_iou
+from mmpose.apis.inference_tracking import _compute_iou_matrix
+from mmpose.structures import PoseDataSample
+
+
+class TestPoseTracker(TestCase):
+
+    def _make_results(self, centers, num_keypoints=17, noise=1.0, seed=0):
+        rng = np.random.RandomState(seed)
+        results = []
+        for center in centers:
+            pred_instances = InstanceData()
+            pred_instances.bboxes = np.concatenate(
+                (center - 30, center + 30))[None]
+            offsets = rng.randn(1, num_keypoints, 2) * noise
+            pred_instances.keypoints = center + offsets
+            pred_instances.keypoint_scores = np.ones((1, num_keypoints))
+            pred_instances.areas = np.array([3600.])
+            data_sample = PoseDataSample()
+            data_sample.pred_instances = pred_instances
+            results.append(data_sample)
+        return results
+
+    def test_compute_iou_matrix(self):
+        rng = np.random.RandomState(0)
+        bboxes_a = rng.rand(4, 5) * 50
+        bboxes_a[:, 2:4] += bboxes_a[:, :2]
+        bboxes_b = rng.rand(3, 4) * 50
+        bboxes_b[:, 2:] += bboxes_b[:, :2]
+
+        ious = _compute_iou_matrix(bboxes_a, bboxes_b)
+        self.assertEqual(ious.shape, (4, 3))
+        for i, bbox_a in enumerate(bboxes_a):
+            for j, bbox_b in enumerate(bboxes_b):
+                self.assertAlmostEqual(ious[i, j],
+                                       _compute_iou(bbox_a, bbox_b))
+
+    def test_update(self):
+        rng = np.random.RandomState(0)
+        centers = rng.rand(6, 2) * 500
+
+        for use_oks in (False, True):
+            tracker = PoseTracker(use_oks=use_oks)
+            track_ids = tracker.update(self._make_results(centers))
+            self.assertListEqual(track_ids.tolist(), list(range(6)))
+
+            # the instances are tracked in whatever order they come
+            for seed in range(3):
+                centers_moved = centers + rng.randn(6, 2)
+                perm = rng.permutation(6)
+                results = self._make_results(centers_moved[perm], seed=seed)
+                track_ids = tracker.update(results)
+                self.assertListEqual(track_ids.tolist(), perm.tolist())
+                self.assertListEqual([res.track_id for res in results],
+                                     perm.tolist())
+            self.assertEqual(len(tracker), 6)
+
+    def test_global_assignment(self):
+        # a greedy matching assigns the first instance to the first track,
+        # leaving the second instance unmatched
+        tracker = PoseTracker(tracking_thr=0.1)
+        tracker.update(self._make_results(np.array([[0., 0.], [45., 0.]])))
+        track_ids = tracker.update(
+            self._make_results(np.array([[20., 0.], [-20., 0.]])))
+        self.assertListEqual(track_ids.tolist(), [1, 0])
+
+    def test_new_tracks(self):
+        tracker = PoseTracker(max_age=2)
+        center = np.array([[100., 100.]])
+
+        self.assertListEqual(
+            tracker.update(self._make_results(center)).tolist(), [0])
+        # the track is kept for ``max_age`` frames
+        self.assertEqual(len(tracker.update([])), 0)
+        self.assertListEqual(
+            tracker.update(self._make_results(center)).tolist(), [0])
+        tracker.update([])
+        tracker.update([])
+        self.assertEqual(len(tracker), 0)
+        self.assertListEqual(
+            tracker.update(self._make_results(center)).tolist(), [1])
+
+        # the unmatched instances with too few keypoints are dropped
+        results = self._make_results(center + 500)
+        results[0].pred_instances.keypoints[..., 1] = 0
+        self.assertListEqual(tracker.update(results).tolist(), [-1])
+        self.assertEqual(results[0].track_id, -1)
+
+        tracker.reset()
+        self.assertEqual(len(tracker), 0)
+        self.assertListEqual(
+            tracker.update(self._make_results(center)).tolist(), [0])
+
+        with self.assertRaisesRegex(ValueError, '`max_age`'):
+            PoseTracker(max_age=0)
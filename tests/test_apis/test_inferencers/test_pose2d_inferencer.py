@@ -6,12 +6,15 @@ import unittest
 from collections import defaultdict
 from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
 import mmcv
+import numpy as np
 import torch
 from mmengine.infer.infer import BaseInferencer
 
 from mmpose.apis.inferencers import Pose2DInferencer
+from mmpose.apis.inferencers.utils import PredictionReader
 from mmpose.structures import PoseDataSample
 from mmpose.utils import register_all_modules
 
@@ -57,6 +60,7 @@ class TestPose2DInferencer(TestCase):
         self.assertIsInstance(inferencer.model, torch.nn.Module)
         self.assertIsInstance(inferencer.detector, BaseInferencer)
         self.assertSequenceEqual(inferencer.det_cat_ids, (0, ))
+        self.assertTrue(inferencer.support_batch_inference)
 
         # 2. init with config name
         inferencer = Pose2DInferencer(
@@ -90,6 +94,8 @@ class TestPose2DInferencer(TestCase):
         )
         self.assertIsInstance(inferencer.model, torch.nn.Module)
         self.assertFalse(hasattr(inferencer, 'detector'))
+        # the bottom-up models take one image at a time
+        self.assertFalse(inferencer.support_batch_inference)
 
     def test_call(self):
 
@@ -148,6 +154,56 @@ class TestPose2DInferencer(TestCase):
             for res in inferencer(inputs, vis_out_dir=f'{tmp_dir}/1.jpg'):
                 pass
 
+        # batch inference over the images in the directory
+        results4 = defaultdict(list)
+        for res in inferencer(inputs, batch_size=8):
+            self.assertLessEqual(len(res['predictions']), 4)
+            for key in res:
+                results4[key].extend(res[key])
+        self.assertEqual(len(results4['predictions']), 4)
+
+        # pipelined inference gives the same results in the same order
+        results5 = defaultdict(list)
+        for res in inferencer(inputs, batch_size=2, pipelined=True):
+            for key in res:
+                results5[key].extend(res[key])
+        self.assertEqual(len(results5['predictions']), 4)
+        for preds3, preds5 in zip(results3['predictions'],
+                                  results5['predictions']):
+            self.assertEqual(len(preds3), len(preds5))
+            for pred3, pred5 in zip(preds3, preds5):
+                self.assertTrue(
+                    np.allclose(
+                        pred3['keypoints'], pred5['keypoints'], atol=1e-3))
+        for preds3, preds4 in zip(results3['predictions'],
+                                  results4['predictions']):
+            self.assertEqual(len(preds3), len(preds4))
+            for pred3, pred4 in zip(preds3, preds4):
+                self.assertTrue(
+                    np.allclose(
+                        pred3['keypoints'], pred4['keypoints'], atol=1e-3))
+
+        # an input without any data sample in a batch gets an empty
+        # prediction, and the other inputs keep their predictions
+        preprocess_single = inferencer.preprocess_single
+
+        def _preprocess_single(input, index, **kwargs):
+            data_infos = preprocess_single(input, index, **kwargs)
+            return [] if index == 1 else data_infos
+
+        with patch.object(inferencer, 'preprocess_single', _preprocess_single):
+            results6 = []
+            for res in inferencer(inputs, batch_size=8):
+                results6.extend(res['predictions'])
+        self.assertEqual(len(results6), 4)
+        self.assertEqual(len(results6[1]), 0)
+        for i in (0, 2, 3):
+            self.assertEqual(len(results6[i]), len(results4['predictions'][i]))
+            for pred6, pred4 in zip(results6[i], results4['predictions'][i]):
+                self.assertTrue(
+                    np.allclose(
+                        pred6['keypoints'], pred4['keypoints'], atol=1e-3))
+
         # `inputs` is path to a video
         inputs = 'tests/data/posetrack18/videos/000001_mpiinew_test/' \
                  '000001_mpiinew_test.mp4'
@@ -162,3 +218,41 @@ class TestPose2DInferencer(TestCase):
                           os.listdir(f'{tmp_dir}/predictions'))
         self.assertTrue(inferencer._video_input)
         self.assertIn(len(results['predictions']), (4, 5))
+
+        # the predictions of the video frames are streamed to the file
+        for pred_out_format in ('json', 'jsonl'):
+            with TemporaryDirectory() as tmp_dir:
+                preds = []
+                for res in inferencer(
+                        inputs,
+                        pred_out_dir=tmp_dir,
+                        pred_out_format=pred_out_format):
+                    preds.extend(res['predictions'])
+                reader = PredictionReader(
+                    osp.join(tmp_dir,
+                             f'000001_mpiinew_test.{pred_out_format}'))
+                self.assertEqual(len(reader), len(preds))
+                for i, pred in enumerate(preds):
+                    self.assertEqual(reader[i]['frame_id'], i)
+                    instances = reader[i]['instances']
+                    self.assertEqual(len(instances), len(pred))
+                    for inst, inst_read in zip(pred, instances):
+                        self.assertTrue(
+                            np.allclose(inst['keypoints'],
+                                        inst_read['keypoints']))
+                        self.assertAlmostEqual(
+                            float(inst['bbox_score']), inst_read['bbox_score'])
+
+        # skip the detector on every other frame of the video, and the
+        # frames are processed serially despite the batch size
+        with patch.object(
+                inferencer, '_detect_bboxes',
+                wraps=inferencer._detect_bboxes) as detect_bboxes:
+            results_interval = []
+            kwargs = dict(det_interval=2, propagate_score_thr=0., batch_size=2)
+            for res in inferencer(inputs, **kwargs):
+                self.assertEqual(len(res['predictions']), 1)
+                results_interval.extend(res['predictions'])
+        self.assertEqual(len(results_interval), len(results['predictions']))
+        self.assertEqual(detect_bboxes.call_count,
+                         (len(results_interval) + 1) // 2)
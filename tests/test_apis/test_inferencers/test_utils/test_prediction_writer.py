@@ -0,0 +1,109 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os
+import os.path as osp
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from mmpose.apis.inferencers.utils import PredictionReader, PredictionWriter
+
+
+class TestPredictionWriter(TestCase):
+
+    def setUp(self) -> None:
+        self.predictions = [[
+            dict(keypoints=[[float(i), float(j)]], keypoint_scores=[0.5])
+            for j in range(i % 3)
+        ] for i in range(10)]
+
+    def test_json(self):
+        with TemporaryDirectory() as tmp_dir:
+            file = osp.join(tmp_dir, 'predictions', 'video.json')
+            with PredictionWriter(file) as writer:
+                for pred in self.predictions:
+                    writer.write(pred)
+            self.assertEqual(writer.num_frames, 10)
+
+            with open(file) as f:
+                results = json.load(f)
+            self.assertListEqual(results, [
+                dict(frame_id=i, instances=pred)
+                for i, pred in enumerate(self.predictions)
+            ])
+
+            # random access to the file in the JSON format
+            reader = PredictionReader(file)
+            self.assertEqual(len(reader), 10)
+            self.assertDictEqual(
+                reader[-2], dict(frame_id=8, instances=self.predictions[8]))
+
+            # empty predictions
+            with PredictionWriter(file):
+                pass
+            with open(file) as f:
+                self.assertListEqual(json.load(f), [])
+
+    def test_jsonl(self):
+        with TemporaryDirectory() as tmp_dir:
+            file = osp.join(tmp_dir, 'video.jsonl')
+            writer = PredictionWriter(file, format='jsonl')
+            for pred in self.predictions[:5]:
+                writer.write(pred)
+
+            # the written frames can be read before the writer is closed
+            reader = PredictionReader(file)
+            self.assertEqual(len(reader), 5)
+            self.assertDictEqual(
+                reader[3], dict(frame_id=3, instances=self.predictions[3]))
+
+            for pred in self.predictions[5:]:
+                writer.write(pred)
+            writer.close()
+
+            reader = PredictionReader(file)
+            self.assertEqual(len(reader), 10)
+            for i in (0, 4, 9, -1):
+                self.assertDictEqual(
+                    reader[i],
+                    dict(frame_id=i % 10, instances=self.predictions[i % 10]))
+            with self.assertRaises(IndexError):
+                _ = reader[10]
+
+            # read without the index file
+            os.remove(f'{file}.idx')
+            reader = PredictionReader(file)
+            self.assertEqual(len(reader), 10)
+            self.assertDictEqual(
+                reader[7], dict(frame_id=7, instances=self.predictions[7]))
+
+    def test_numpy_predictions(self):
+        # the predictions split from the instances of the top-down models
+        # contain numpy scalars
+        instances = [
+            dict(
+                keypoints=np.random.rand(17, 2).tolist(),
+                keypoint_scores=np.random.rand(17).tolist(),
+                bbox=(np.random.rand(4).tolist(), ),
+                bbox_score=np.float32(0.75)),
+            dict(keypoints=np.zeros((2, 2)), bbox_score=np.float64(0.5))
+        ]
+        for format in ('json', 'jsonl'):
+            with TemporaryDirectory() as tmp_dir:
+                file = osp.join(tmp_dir, f'video.{format}')
+                with PredictionWriter(file, format=format) as writer:
+                    writer.write(instances)
+
+                frame = PredictionReader(file)[0]
+                self.assertEqual(frame['frame_id'], 0)
+                self.assertListEqual(frame['instances'][0]['keypoints'],
+                                     instances[0]['keypoints'])
+                self.assertEqual(frame['instances'][0]['bbox_score'], 0.75)
+                self.assertListEqual(frame['instances'][1]['keypoints'],
+                                     [[0., 0.], [0., 0.]])
+                self.assertEqual(frame['instances'][1]['bbox_score'], 0.5)
+
+    def test_invalid_format(self):
+        with self.assertRaisesRegex(ValueError, 'Invalid prediction file'):
+            _ = PredictionWriter('video.npz', format='npz')
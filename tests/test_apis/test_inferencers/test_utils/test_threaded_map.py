@@ -0,0 +1,61 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import threading
+import time
+from unittest import TestCase
+
+from mmpose.apis.inferencers.utils import threaded_map
+
+
+class TestThreadedMap(TestCase):
+
+    def test_threaded_map(self):
+
+        def _double(x):
+            time.sleep(0.001)
+            return x * 2
+
+        # the results keep the order of the inputs
+        results = list(threaded_map(_double, range(20)))
+        self.assertListEqual(results, [x * 2 for x in range(20)])
+
+        # chained stages
+        results = list(
+            threaded_map(_double, threaded_map(None, range(20)), queue_size=1))
+        self.assertListEqual(results, [x * 2 for x in range(20)])
+
+        # empty inputs
+        self.assertListEqual(list(threaded_map(_double, [])), [])
+
+    def test_exception(self):
+
+        def _func(x):
+            if x == 3:
+                raise ValueError('invalid input')
+            return x
+
+        results = []
+        with self.assertRaisesRegex(ValueError, 'invalid input'):
+            for x in threaded_map(_func, range(10)):
+                results.append(x)
+        self.assertListEqual(results, [0, 1, 2])
+
+    def test_early_stop(self):
+        num_threads = threading.active_count()
+
+        def _infinite():
+            i = 0
+            while True:
+                yield i
+                i += 1
+
+        results = threaded_map(None, _infinite(), queue_size=2)
+        self.assertEqual(next(results), 0)
+        self.assertEqual(next(results), 1)
+        results.close()
+
+        # the worker thread stops after the consumer stops
+        for _ in range(50):
+            if threading.active_count() == num_threads:
+                break
+            time.sleep(0.01)
+        self.assertEqual(threading.active_count(), num_threads)
@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import gc
+from copy import deepcopy
 from itertools import product
 from unittest import TestCase
 
@@ -7,6 +9,8 @@ import torch
 from munkres import Munkres
 
 from mmpose.codecs import AssociativeEmbedding
+from mmpose.codecs.associative_embedding import (_group_keypoints_by_tags,
+                                                 _max_match)
 from mmpose.registry import KEYPOINT_CODECS
 from mmpose.testing import get_coco_sample
 
@@ -76,6 +80,39 @@ class TestAssociativeEmbedding(TestCase):
             index_encoded = keypoint_indices[0, k, 0]
             self.assertEqual(index_expected, index_encoded)
 
+    def test_encode_multi_instance(self):
+        data = get_coco_sample(img_shape=(256, 256), num_instances=4)
+        keypoints = data['keypoints']
+        keypoints_visible = data['keypoints_visible']
+        # move some keypoints out of the heatmap
+        keypoints[0, :3] = -100
+        keypoints[1, 3:5] = 1000
+
+        for use_udp in (False, True):
+            codec = AssociativeEmbedding(
+                input_size=(256, 256),
+                heatmap_size=(64, 64),
+                use_udp=use_udp,
+                decode_keypoint_order=self.decode_keypoint_order)
+
+            encoded = codec.encode(keypoints, keypoints_visible)
+
+            # the heatmaps of multiple instances should be the element-wise
+            # maximum of the heatmaps of each instance
+            encoded_single = [
+                codec.encode(keypoints[i:i + 1], keypoints_visible[i:i + 1])
+                for i in range(len(keypoints))
+            ]
+            heatmaps = np.max([e['heatmaps'] for e in encoded_single], axis=0)
+            keypoint_weights = np.concatenate(
+                [e['keypoint_weights'] for e in encoded_single])
+
+            self.assertTrue(np.array_equal(encoded['heatmaps'], heatmaps))
+            self.assertTrue(
+                np.array_equal(encoded['keypoint_weights'], keypoint_weights))
+            self.assertTrue(np.all(encoded['keypoint_weights'][0, :3] == 0))
+            self.assertTrue(np.all(encoded['keypoint_weights'][1, 3:5] == 0))
+
     def _get_tags(self,
                   heatmaps,
                   keypoint_indices,
@@ -240,3 +277,128 @@ class TestAssociativeEmbedding(TestCase):
         self.assertEqual(scores.shape, (2, 17))
 
         self.assertTrue(np.allclose(keypoints, data['keypoints'], atol=4.0))
+
+    def test_max_match(self):
+        rng = np.random.RandomState(0)
+        for shape in [(5, 5), (3, 6), (6, 3)]:
+            # the rounded costs with ties
+            costs = rng.randint(0, 3, shape).astype(np.float64)
+            munkres_costs = costs
+            if shape[0] > shape[1]:
+                munkres_costs = np.concatenate(
+                    (costs, np.full((shape[0], shape[0] - shape[1]), 1e10)),
+                    axis=1)
+            munkres_pairs = Munkres().compute(munkres_costs.tolist())
+            munkres_cost = sum(costs[i, j] for i, j in munkres_pairs
+                               if j < shape[1])
+
+            # the same assignment as the Munkres algorithm
+            matches = _max_match(costs)
+            self.assertEqual(matches.shape, (shape[0], ))
+            for i, j in munkres_pairs:
+                self.assertEqual(matches[i], j if j < shape[1] else -1)
+
+            # the same total cost with the scipy solver
+            matches = _max_match(costs, solver='scipy')
+            self.assertEqual(matches.shape, (shape[0], ))
+            rows = np.nonzero(matches >= 0)[0]
+            self.assertEqual(len(rows), min(shape))
+            self.assertAlmostEqual(costs[rows, matches[rows]].sum(),
+                                   munkres_cost)
+
+    def test_group_keypoints_by_tags(self):
+        rng = np.random.RandomState(0)
+        K, M, N = 17, 30, 5
+        keypoint_order = rng.permutation(K).tolist()
+
+        # the candidates of N instances with distinct tags and some
+        # low-response candidates
+        vals = rng.rand(K, M).astype(np.float32) * 0.1
+        tags = rng.randn(K, M, 1).astype(np.float32) * 10
+        locs = rng.randint(0, 64, (K, M, 2))
+        inst_inds = np.stack(
+            [rng.choice(M, N, replace=False) for _ in range(K)])
+        for k in range(K):
+            vals[k, inst_inds[k]] = 0.5 + 0.5 * rng.rand(N)
+            tags[k, inst_inds[k], 0] = np.arange(N) * 2 + 0.1 * rng.randn(N)
+
+        groups = _group_keypoints_by_tags(
+            vals, tags, locs, keypoint_order, val_thr=0.1, tag_thr=1.0)
+        self.assertEqual(groups.shape, (N, K, 3))
+        self.assertEqual(groups.dtype, np.float32)
+
+        # the groups are created in the order of the candidates of the first
+        # keypoint
+        inst_order = np.argsort(inst_inds[keypoint_order[0]])
+        for n, group in zip(inst_order, groups):
+            inds = (np.arange(K), inst_inds[:, n])
+            self.assertTrue(np.array_equal(group[:, :2], locs[inds]))
+            self.assertTrue(np.allclose(group[:, 2], vals[inds]))
+
+        groups = _group_keypoints_by_tags(
+            vals,
+            tags,
+            locs,
+            keypoint_order,
+            val_thr=0.1,
+            tag_thr=1.0,
+            max_groups=2)
+        self.assertEqual(groups.shape, (2, K, 3))
+
+        # no candidates above the threshold
+        groups = _group_keypoints_by_tags(
+            vals, tags, locs, keypoint_order, val_thr=1.0)
+        self.assertEqual(groups.shape, (0, K, 3))
+
+    def test_parallel_decode(self):
+        data = get_coco_sample(
+            img_shape=(256, 256), num_instances=2, non_occlusion=True)
+
+        cfg = dict(
+            input_size=(256, 256),
+            heatmap_size=(64, 64),
+            decode_keypoint_order=self.decode_keypoint_order)
+        codec = AssociativeEmbedding(**cfg)
+        encoded = codec.encode(data['keypoints'], data['keypoints_visible'])
+        tags = self._get_tags(
+            encoded['heatmaps'],
+            encoded['keypoint_indices'],
+            tag_per_keypoint=True)
+        batch_heatmaps = torch.from_numpy(encoded['heatmaps'][None]).repeat(
+            3, 1, 1, 1)
+        batch_tags = torch.from_numpy(tags[None]).repeat(3, 1, 1, 1)
+        batch_keypoints, batch_scores, _ = codec.batch_decode(
+            batch_heatmaps, batch_tags)
+
+        for pool_type in ('thread', 'process'):
+            codec = AssociativeEmbedding(
+                decode_num_workers=2, decode_pool_type=pool_type, **cfg)
+            results = codec.batch_decode(batch_heatmaps, batch_tags)
+            for keypoints, keypoints_parallel in zip(batch_keypoints,
+                                                     results[0]):
+                self.assertTrue(np.array_equal(keypoints, keypoints_parallel))
+            for scores, scores_parallel in zip(batch_scores, results[1]):
+                self.assertTrue(np.array_equal(scores, scores_parallel))
+
+            # the codec with a worker pool can be copied
+            codec_copy = deepcopy(codec)
+            self.assertIsNone(codec_copy._decode_pool)
+
+        # the worker pool is shut down with the codec
+        pool = codec._decode_pool
+        del codec
+        gc.collect()
+        with self.assertRaises(RuntimeError):
+            pool.submit(int)
+
+        # the groupings with the scipy solver
+        codec = AssociativeEmbedding(decode_assignment_solver='scipy', **cfg)
+        results = codec.batch_decode(batch_heatmaps, batch_tags)
+        for keypoints, keypoints_scipy in zip(batch_keypoints, results[0]):
+            self.assertTrue(np.allclose(keypoints, keypoints_scipy))
+
+        with self.assertRaisesRegex(ValueError, '`decode_pool_type`'):
+            AssociativeEmbedding(decode_pool_type='gpu', **cfg)
+
+        with self.assertRaisesRegex(ValueError, '`decode_assignment_solver`'):
+            AssociativeEmbedding(decode_assignment_solver='lap', **cfg)
@@ -0,0 +1,57 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+from unittest import TestCase
+
+from mmpose.testing import (benchmark_codec, benchmark_func,
+                            format_codec_benchmarks, get_codec_benchmark_cfgs,
+                            run_codec_benchmarks)
+
+
+class TestCodecBenchmark(TestCase):
+
+    def test_benchmark_func(self):
+        calls = []
+        results = benchmark_func(
+            lambda: calls.append(bytearray(2**20)), repeat=4, warmup=2)
+        self.assertEqual(len(calls), 7)
+        self.assertGreater(results['ops_per_sec'], 0)
+        self.assertLessEqual(results['min_ms'], results['median_ms'])
+        self.assertLessEqual(results['median_ms'], results['max_ms'])
+        self.assertGreaterEqual(results['peak_memory_mb'], 1.)
+
+        with self.assertRaisesRegex(ValueError, '`repeat`'):
+            benchmark_func(lambda: None, repeat=0)
+
+    def test_benchmark_codec(self):
+        cfgs = get_codec_benchmark_cfgs(input_size=(64, 64), num_keypoints=5)
+        for name, cfg in cfgs.items():
+            results = benchmark_codec(
+                cfg,
+                num_instances=3,
+                num_keypoints=5,
+                input_size=(64, 64),
+                repeat=1,
+                warmup=0)
+            for op in ('encode', 'decode'):
+                self.assertGreater(results[op]['ops_per_sec'], 0, msg=name)
+
+            # the top-down codecs encode a single instance
+            if name in ('MSRAHeatmap', 'SimCCLabel', 'ImagePoseLifting'):
+                self.assertEqual(results['num_instances'], 1)
+            elif name in ('AssociativeEmbedding', 'VideoPoseLifting'):
+                self.assertEqual(results['num_instances'], 3)
+
+    def test_run_codec_benchmarks(self):
+        report = run_codec_benchmarks(
+            codecs=['MSRAHeatmap', 'SimCCLabel'], repeat=2, warmup=0)
+        self.assertListEqual(
+            list(report['results'].keys()), ['MSRAHeatmap', 'SimCCLabel'])
+        self.assertEqual(report['settings']['repeat'], 2)
+        self.assertIn('numpy', report['env'])
+        # the report is json serializable
+        json.dumps(report)
+        # a header and a line per op
+        self.assertEqual(len(format_codec_benchmarks(report)), 5)
+
+        with self.assertRaisesRegex(ValueError, 'Unknown codecs'):
+            run_codec_benchmarks(codecs=['Unknown'])
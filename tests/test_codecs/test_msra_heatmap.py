@@ -2,6 +2,7 @@
 from unittest import TestCase
 
 import numpy as np
+import torch
 
 from mmpose.codecs import MSRAHeatmap
 from mmpose.registry import KEYPOINT_CODECS
@@ -68,6 +69,37 @@ class TestMSRAHeatmap(TestCase):
                              f'Failed case: "{name}"')
             self.assertEqual(scores.shape, (1, 17), f'Failed case: "{name}"')
 
+    def test_batch_decode(self):
+        keypoints = self.data['keypoints']
+        keypoints_visible = self.data['keypoints_visible']
+
+        for name, cfg in self.configs:
+            codec = KEYPOINT_CODECS.build(cfg)
+            self.assertFalse(codec.support_batch_decoding)
+            codec = KEYPOINT_CODECS.build(dict(cfg, decode_on_device=True))
+            self.assertTrue(codec.support_batch_decoding)
+
+            batch_heatmaps = np.stack([
+                codec.encode(keypoints + np.random.randn(*keypoints.shape),
+                             keypoints_visible)['heatmaps'] for _ in range(4)
+            ])
+
+            batch_keypoints, batch_scores = codec.batch_decode(
+                torch.from_numpy(batch_heatmaps))
+
+            self.assertEqual(len(batch_keypoints), 4)
+            for heatmaps, keypoints, scores in zip(batch_heatmaps,
+                                                   batch_keypoints,
+                                                   batch_scores):
+                _keypoints, _scores = codec.decode(heatmaps)
+                self.assertEqual(keypoints.shape, (1, 17, 2),
+                                 f'Failed case: "{name}"')
+                self.assertTrue(
+                    np.allclose(keypoints, _keypoints, atol=1e-3),
+                    f'Failed case: "{name}"')
+                self.assertTrue(
+                    np.allclose(scores, _scores), f'Failed case: "{name}"')
+
     def test_cicular_verification(self):
         keypoints = self.data['keypoints']
         keypoints_visible = self.data['keypoints_visible']
@@ -2,6 +2,7 @@
 from unittest import TestCase
 
 import numpy as np
+import torch
 
 from mmpose.codecs import SimCCLabel  # noqa: F401
 from mmpose.registry import KEYPOINT_CODECS
@@ -117,6 +118,60 @@ class TestSimCCLabel(TestCase):
         self.assertGreaterEqual(scores[1].min(), 0.0)
         self.assertLessEqual(scores[1].max(), 1.0)
 
+    def test_batch_decode(self):
+        keypoints = self.data['keypoints']
+        keypoints_visible = self.data['keypoints_visible']
+
+        for name, cfg in self.configs:
+            for decode_visibility in (False, True):
+                codec = KEYPOINT_CODECS.build(
+                    dict(
+                        cfg,
+                        decode_visibility=decode_visibility,
+                        decode_on_device=True))
+                self.assertTrue(codec.support_batch_decoding)
+
+                if codec.smoothing_type == 'gaussian':
+                    encoded = [
+                        codec.encode(
+                            keypoints + np.random.randn(*keypoints.shape),
+                            keypoints_visible) for _ in range(4)
+                    ]
+                    simcc_x = np.concatenate(
+                        [e['keypoint_x_labels'] for e in encoded])
+                    simcc_y = np.concatenate(
+                        [e['keypoint_y_labels'] for e in encoded])
+                else:
+                    simcc_x = np.random.rand(4, 17, 192 * 3)
+                    simcc_y = np.random.rand(4, 17, 256 * 3)
+                simcc_x = simcc_x.astype(np.float32)
+                simcc_y = simcc_y.astype(np.float32)
+
+                batch_keypoints, batch_scores = codec.batch_decode(
+                    torch.from_numpy(simcc_x), torch.from_numpy(simcc_y))
+                if decode_visibility:
+                    batch_scores, batch_visibility = batch_scores
+
+                self.assertEqual(len(batch_keypoints), 4)
+                for i in range(4):
+                    _keypoints, _scores = codec.decode(simcc_x[i:i + 1].copy(),
+                                                       simcc_y[i:i + 1].copy())
+                    if decode_visibility:
+                        _scores, _visibility = _scores
+                        self.assertTrue(
+                            np.allclose(
+                                batch_visibility[i], _visibility, atol=1e-4),
+                            f'Failed case: "{name}"')
+
+                    self.assertEqual(batch_keypoints[i].shape, (1, 17, 2),
+                                     f'Failed case: "{name}"')
+                    self.assertTrue(
+                        np.allclose(batch_keypoints[i], _keypoints, atol=1e-2),
+                        f'Failed case: "{name}"')
+                    self.assertTrue(
+                        np.allclose(batch_scores[i], _scores),
+                        f'Failed case: "{name}"')
+
     def test_cicular_verification(self):
         keypoints = self.data['keypoints']
         keypoints_visible = self.data['keypoints_visible']
@@ -2,6 +2,7 @@
 from unittest import TestCase
 
 import numpy as np
+import torch
 
 from mmpose.codecs import UDPHeatmap
 from mmpose.registry import KEYPOINT_CODECS
@@ -77,6 +78,33 @@ class TestUDPHeatmap(TestCase):
                              f'Failed case: "{name}"')
             self.assertEqual(scores.shape, (1, 17), f'Failed case: "{name}"')
 
+    def test_batch_decode(self):
+        keypoints = self.data['keypoints']
+        keypoints_visible = self.data['keypoints_visible']
+
+        codec = UDPHeatmap(input_size=(192, 256), heatmap_size=(48, 64))
+        self.assertFalse(codec.support_batch_decoding)
+        codec = UDPHeatmap(
+            input_size=(192, 256),
+            heatmap_size=(48, 64),
+            decode_on_device=True)
+        self.assertTrue(codec.support_batch_decoding)
+
+        batch_heatmaps = np.stack([
+            codec.encode(keypoints + np.random.randn(*keypoints.shape),
+                         keypoints_visible)['heatmaps'] for _ in range(4)
+        ])
+        batch_keypoints, batch_scores = codec.batch_decode(
+            torch.from_numpy(batch_heatmaps))
+
+        self.assertEqual(len(batch_keypoints), 4)
+        for heatmaps, keypoints, scores in zip(batch_heatmaps, batch_keypoints,
+                                               batch_scores):
+            _keypoints, _scores = codec.decode(heatmaps)
+            self.assertEqual(keypoints.shape, (1, 17, 2))
+            self.assertTrue(np.allclose(keypoints, _keypoints, atol=1e-3))
+            self.assertTrue(np.allclose(scores, _scores))
+
     def test_cicular_verification(self):
         keypoints = self.data['keypoints']
         keypoints_visible = self.data['keypoints_visible']
@@ -107,3 +135,11 @@ class TestUDPHeatmap(TestCase):
         with self.assertRaisesRegex(AssertionError,
                                     'only support single-instance'):
             codec.encode(keypoints, keypoints_visible)
+
+        # decoding on device with combined heatmaps
+        with self.assertRaisesRegex(ValueError, '`decode_on_device`'):
+            _ = UDPHeatmap(
+                input_size=(192, 256),
+                heatmap_size=(48, 64),
+                heatmap_type='combined',
+                decode_on_device=True)
@@ -0,0 +1,117 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest import TestCase
+
+import numpy as np
+import torch
+
+from mmpose.codecs.utils import (generate_gaussian_heatmaps,
+                                 generate_udp_gaussian_heatmaps,
+                                 get_heatmap_maximum, get_simcc_maximum,
+                                 refine_keypoints, refine_keypoints_dark,
+                                 refine_keypoints_dark_torch,
+                                 refine_keypoints_dark_udp,
+                                 refine_keypoints_dark_udp_torch,
+                                 refine_keypoints_torch, refine_simcc_dark,
+                                 refine_simcc_dark_torch)
+
+
+class TestRefinement(TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.heatmap_size = (48, 64)
+
+        keypoints = rng.random((4, 17, 2)) * self.heatmap_size
+        # keypoints near the border
+        keypoints[0, :3] = [[0.2, 10], [47.6, 20], [10, 63.8]]
+        self.keypoints = keypoints
+        self.keypoints_visible = np.ones((4, 17), dtype=np.float32)
+
+        self.simcc_x = rng.random((4, 17, 96)).astype(np.float32)**4
+        self.simcc_y = rng.random((4, 17, 128)).astype(np.float32)**4
+
+    def _get_heatmaps(self, use_udp=False):
+        # one top-down heatmap for each instance
+        generate = (
+            generate_udp_gaussian_heatmaps
+            if use_udp else generate_gaussian_heatmaps)
+        heatmaps = np.stack([
+            generate(self.heatmap_size, self.keypoints[i:i + 1],
+                     self.keypoints_visible[i:i + 1], 2.0)[0]
+            for i in range(len(self.keypoints))
+        ])
+        return heatmaps
+
+    def test_refine_keypoints(self):
+        heatmaps = self._get_heatmaps()
+        locs, _ = get_heatmap_maximum(heatmaps)
+
+        expected = np.stack([
+            refine_keypoints(locs[i:i + 1].copy(), heatmaps[i])[0]
+            for i in range(len(heatmaps))
+        ])
+        self.assertTrue(np.allclose(expected, self.keypoints, atol=1.))
+
+        # multiple instances on the same heatmaps
+        keypoints = refine_keypoints(locs.copy(), heatmaps[0])
+        self.assertTrue(np.array_equal(keypoints[0], expected[0]))
+
+        # torch version
+        keypoints = refine_keypoints_torch(
+            torch.from_numpy(locs), torch.from_numpy(heatmaps))
+        self.assertTrue(np.allclose(keypoints.numpy(), expected))
+
+    def test_refine_keypoints_dark(self):
+        heatmaps = self._get_heatmaps()
+        locs, _ = get_heatmap_maximum(heatmaps)
+
+        expected = np.stack([
+            refine_keypoints_dark(locs[i:i + 1].copy(), heatmaps[i].copy(),
+                                  11)[0] for i in range(len(heatmaps))
+        ])
+        self.assertTrue(np.allclose(expected, self.keypoints, atol=1.))
+
+        keypoints = refine_keypoints_dark(locs.copy(), heatmaps[0].copy(), 11)
+        self.assertTrue(np.array_equal(keypoints[0], expected[0]))
+
+        keypoints = refine_keypoints_dark_torch(
+            torch.from_numpy(locs), torch.from_numpy(heatmaps), 11)
+        self.assertTrue(np.allclose(keypoints.numpy(), expected, atol=1e-4))
+
+    def test_refine_keypoints_dark_udp(self):
+        heatmaps = self._get_heatmaps(use_udp=True)
+        locs, _ = get_heatmap_maximum(heatmaps)
+
+        expected = np.stack([
+            refine_keypoints_dark_udp(locs[i:i + 1].copy(), heatmaps[i].copy(),
+                                      11)[0] for i in range(len(heatmaps))
+        ])
+        self.assertTrue(np.allclose(expected, self.keypoints, atol=1.))
+
+        keypoints = refine_keypoints_dark_udp(locs.copy(), heatmaps[0].copy(),
+                                              11)
+        self.assertTrue(np.array_equal(keypoints[0], expected[0]))
+
+        keypoints = refine_keypoints_dark_udp_torch(
+            torch.from_numpy(locs), torch.from_numpy(heatmaps), 11)
+        self.assertTrue(np.allclose(keypoints.numpy(), expected, atol=1e-4))
+
+    def test_refine_simcc_dark(self):
+        locs, _ = get_simcc_maximum(self.simcc_x, self.simcc_y)
+
+        for i, simcc in enumerate((self.simcc_x, self.simcc_y)):
+            expected = np.stack([
+                refine_simcc_dark(locs[n:n + 1, :, i].copy(),
+                                  simcc[n:n + 1].copy(), 11)[0]
+                for n in range(len(simcc))
+            ])
+
+            keypoints = refine_simcc_dark(locs[..., i].copy(), simcc.copy(),
+                                          11)
+            self.assertTrue(np.array_equal(keypoints, expected))
+
+            keypoints = refine_simcc_dark_torch(
+                torch.from_numpy(locs[..., i].copy()), torch.from_numpy(simcc),
+                11)
+            self.assertTrue(
+                np.allclose(keypoints.numpy(), expected, atol=1e-3))
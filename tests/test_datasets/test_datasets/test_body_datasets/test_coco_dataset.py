@@ -1,8 +1,13 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import tempfile
+from copy import deepcopy
 from unittest import TestCase
 
 import numpy as np
 
+from mmpose.datasets.datasets.base import ColumnarDataList
 from mmpose.datasets.datasets.body import CocoDataset
 
 
@@ -130,6 +135,164 @@ class TestCocoDataset(TestCase):
         self.assertEqual(len(dataset), 4)
         self.check_data_info_keys(dataset[0], data_mode='bottomup')
 
+    def test_readonly_metainfo(self):
+        dataset = self.build_coco_dataset(data_mode='topdown')
+        data_info = dataset.get_data_info(0)
+        _data_info = dataset.get_data_info(1)
+
+        # the metainfo is shared by the samples without copying
+        for key in ('flip_indices', 'flip_pairs', 'skeleton_links',
+                    'upper_body_ids', 'lower_body_ids'):
+            self.assertIsInstance(data_info[key], list)
+            self.assertIs(data_info[key], _data_info[key])
+            self.assertEqual(data_info[key], dataset.metainfo[key])
+        self.assertTrue(
+            np.array_equal(data_info['dataset_keypoint_weights'],
+                           dataset.metainfo['dataset_keypoint_weights']))
+
+        # the shared metainfo can not be modified in place
+        with self.assertRaisesRegex(TypeError, 'is read-only'):
+            data_info['flip_indices'][0] = 1
+        with self.assertRaisesRegex(TypeError, 'is read-only'):
+            data_info['flip_indices'].append(1)
+        with self.assertRaises(ValueError):
+            data_info['dataset_keypoint_weights'][0] = 0
+
+        # the copies can be modified
+        flip_indices = deepcopy(data_info['flip_indices'])
+        flip_indices[0] = 1
+        self.assertEqual(dataset.metainfo['flip_indices'][0], 0)
+        self.assertEqual(data_info['flip_indices'] + [17],
+                         dataset.metainfo['flip_indices'] + [17])
+
+    def test_columnar_data(self):
+        for data_mode, kwargs in [
+            ('topdown', dict()),
+            ('topdown',
+             dict(
+                 test_mode=True,
+                 bbox_file='tests/data/coco/test_coco_det_AP_H_56.json')),
+            ('bottomup', dict()),
+        ]:
+            dataset = self.build_coco_dataset(data_mode=data_mode, **kwargs)
+            columnar_dataset = self.build_coco_dataset(
+                data_mode=data_mode, columnar_data=True, **kwargs)
+            self.assertIsInstance(columnar_dataset.data_list, ColumnarDataList)
+            self.assertIsNone(columnar_dataset.coco)
+            self.assertEqual(len(columnar_dataset), len(dataset))
+
+            for idx in (0, len(dataset) - 1, -1):
+                data_info = dataset.get_data_info(idx)
+                _data_info = columnar_dataset.get_data_info(idx)
+                self.check_data_info_keys(_data_info, data_mode=data_mode)
+                self.assertEqual(data_info.keys(), _data_info.keys())
+                for key, value in data_info.items():
+                    if isinstance(value, np.ndarray):
+                        self.assertTrue(
+                            np.array_equal(value, _data_info[key]), key)
+                    else:
+                        self.assertEqual(value, _data_info[key], key)
+
+            # the data infos can be modified freely
+            _data_info = columnar_dataset.get_data_info(0)
+            _data_info['keypoints'][:] = -1
+            _data_info['id'] = -1
+            _data_info = columnar_dataset.get_data_info(0)
+            self.assertTrue((_data_info['keypoints'] >= 0).all())
+            self.assertNotEqual(_data_info['id'], -1)
+
+    def test_cache_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for data_mode, columnar_data in [('topdown', False),
+                                             ('bottomup', True)]:
+                dataset = self.build_coco_dataset(data_mode=data_mode)
+                cached_dataset = self.build_coco_dataset(
+                    data_mode=data_mode,
+                    columnar_data=columnar_data,
+                    cache_dir=tmpdir)
+                cache_file = cached_dataset._get_cache_file()
+                self.assertTrue(osp.isfile(cache_file))
+
+                # load from the cache file
+                cached_dataset = self.build_coco_dataset(
+                    data_mode=data_mode,
+                    columnar_data=columnar_data,
+                    cache_dir=tmpdir,
+                    indices=2)
+                self.assertIsNone(getattr(cached_dataset, 'coco', None))
+                self.assertEqual(cached_dataset.metainfo['CLASSES'],
+                                 dataset.metainfo['CLASSES'])
+                self.assertEqual(len(cached_dataset), 2)
+                for idx in range(2):
+                    data_info = dataset.get_data_info(idx)
+                    _data_info = cached_dataset.get_data_info(idx)
+                    self.assertEqual(data_info.keys(), _data_info.keys())
+                    self.assertTrue(
+                        np.array_equal(data_info['keypoints'],
+                                       _data_info['keypoints']))
+                    self.assertEqual(data_info['img_path'],
+                                     _data_info['img_path'])
+
+            # the cache file changes with the settings
+            self.assertEqual(len(os.listdir(tmpdir)), 2)
+            _ = self.build_coco_dataset(
+                cache_dir=tmpdir, filter_cfg=dict(bbox_score_thr=0.3))
+            self.assertEqual(len(os.listdir(tmpdir)), 3)
+
+    def test_columnar_data_list(self):
+        data_list = [
+            dict(
+                img_path='a.jpg',
+                bbox=np.random.rand(1, 4).astype(np.float32),
+                num_keypoints=3,
+                score=0.5,
+                category_id=np.array(1),
+                segmentation=[[0, 0, 1, 1]]),
+            dict(
+                img_path='b.jpg',
+                bbox=np.random.rand(2, 4).astype(np.float32),
+                num_keypoints=2**70,
+                score=1.0,
+                category_id=np.array(2)),
+        ]
+        columnar_data_list = ColumnarDataList.from_data_list(data_list)
+        kinds = {
+            key: column['kind']
+            for key, column in columnar_data_list.columns.items()
+        }
+        self.assertDictEqual(
+            kinds,
+            dict(
+                img_path='str',
+                bbox='array',
+                num_keypoints='object',
+                score='scalar',
+                category_id='array',
+                segmentation='object'))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file = osp.join(tmpdir, 'data_list.bin')
+            columnar_data_list.dump(file)
+
+            for mmap in (True, False):
+                loaded = ColumnarDataList.load(file, mmap=mmap)
+                self.assertEqual(len(loaded), len(data_list))
+                self.assertEqual(loaded.nbytes, columnar_data_list.nbytes)
+                for data_info, _data_info in zip(data_list, loaded[:]):
+                    self.assertEqual(data_info.keys(), _data_info.keys())
+                    for key, value in data_info.items():
+                        if isinstance(value, np.ndarray):
+                            self.assertEqual(value.dtype,
+                                             _data_info[key].dtype)
+                            self.assertTrue(
+                                np.array_equal(value, _data_info[key]))
+                        else:
+                            self.assertEqual(value, _data_info[key])
+                del loaded
+
+        with self.assertRaises(IndexError):
+            _ = columnar_data_list[2]
+
     def test_exceptions_and_warnings(self):
 
         with self.assertRaisesRegex(ValueError, 'got invalid data_mode'):
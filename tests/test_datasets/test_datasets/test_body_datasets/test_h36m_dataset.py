@@ -162,6 +162,50 @@ class TestH36MDataset(TestCase):
         self.assertEqual(len(dataset), 4)
         self.check_data_info_keys(dataset[0], data_mode='bottomup')
 
+    def test_lazy_window(self):
+        for cfg in [
+                dict(),
+                dict(
+                    seq_len=27,
+                    causal=False,
+                    pad_video_seq=True,
+                    camera_param_file='cameras.pkl'),
+                dict(
+                    seq_len=27,
+                    causal=False,
+                    pad_video_seq=True,
+                    keypoint_2d_src='detection',
+                    keypoint_2d_det_file='test_h36m_2d_detection.npy'),
+        ]:
+            dataset = self.build_h36m_dataset(**cfg)
+            dataset_lazy = self.build_h36m_dataset(
+                lazy_window=True, mmap_ann_file=True, **cfg)
+            self.assertIsInstance(dataset_lazy.frame_data['keypoints_3d'],
+                                  np.memmap)
+            # the data list only stores the frame indices of the sequences
+            self.assertLess(
+                len(dataset_lazy.data_bytes), len(dataset.data_bytes))
+
+            self.assertEqual(len(dataset_lazy), len(dataset))
+            for i in range(len(dataset)):
+                data_info = dataset.get_data_info(i)
+                data_info_lazy = dataset_lazy.get_data_info(i)
+                self.check_data_info_keys(data_info_lazy)
+                self.assertSetEqual(
+                    set(data_info_lazy.keys()), set(data_info.keys()))
+                for key in ('keypoints', 'keypoints_visible', 'keypoints_3d',
+                            'lifting_target', 'factor', 'target_img_path'):
+                    self.assertTrue(
+                        np.array_equal(data_info_lazy[key], data_info[key]),
+                        key)
+                self.assertListEqual(data_info_lazy['img_ids'],
+                                     data_info['img_ids'])
+                self.assertListEqual(data_info_lazy['img_paths'],
+                                     data_info['img_paths'])
+
+        with self.assertRaisesRegex(ValueError, '`lazy_window`'):
+            self.build_h36m_dataset(data_mode='bottomup', lazy_window=True)
+
     def test_exceptions_and_warnings(self):
 
         with self.assertRaisesRegex(ValueError, 'got invalid data_mode'):
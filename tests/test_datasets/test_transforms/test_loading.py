@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 import numpy as np
@@ -29,3 +31,36 @@ class TestLoadImage(TestCase):
 
         self.assertIsInstance(results['img'], np.ndarray)
         self.assertTrue(results['img'].dtype, np.float32)
+
+    def test_load_image_with_cache(self):
+        transform = LoadImage(use_cache=True)
+        img_path = 'tests/data/coco/000000000785.jpg'
+
+        results1 = transform(dict(img_path=img_path))
+        results2 = transform(dict(img_path=img_path))
+        self.assertIs(results1['img'], results2['img'])
+        self.assertEqual(results1['img_shape'], results1['img'].shape[:2])
+
+        results = LoadImage()(dict(img_path=img_path))
+        np.testing.assert_array_equal(results['img'], results1['img'])
+
+    def test_load_invalid_image_with_cache(self):
+        with TemporaryDirectory() as tmp_dir:
+            missing_path = osp.join(tmp_dir, 'missing.jpg')
+            corrupt_path = osp.join(tmp_dir, 'corrupt.jpg')
+            with open(corrupt_path, 'wb') as f:
+                f.write(b'not an image')
+
+            for use_cache in (False, True):
+                # the file does not exist
+                transform = LoadImage(use_cache=use_cache)
+                with self.assertRaises(FileNotFoundError):
+                    transform(dict(img_path=missing_path))
+                transform = LoadImage(use_cache=use_cache, ignore_empty=True)
+                self.assertIsNone(transform(dict(img_path=missing_path)))
+
+                # the file can not be decoded
+                transform = LoadImage(use_cache=use_cache)
+                with self.assertRaisesRegex(AssertionError,
+                                            'failed to load image'):
+                    transform(dict(img_path=corrupt_path))
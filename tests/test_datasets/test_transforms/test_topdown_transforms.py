@@ -2,6 +2,8 @@
 from copy import deepcopy
 from unittest import TestCase
 
+import numpy as np
+
 from mmpose.datasets.transforms import TopdownAffine
 from mmpose.testing import get_coco_sample
 
@@ -27,6 +29,34 @@ class TestTopdownAffine(TestCase):
         self.assertEqual(results['img'].shape, (256, 192, 3))
         self.assertIn('transformed_keypoints', results)
 
+    def test_transform_instances(self):
+        data_info = get_coco_sample(num_instances=3, with_bbox_cs=True)
+
+        for use_udp in (False, True):
+            transform = TopdownAffine(input_size=(192, 256), use_udp=use_udp)
+            results_list = transform.transform_instances(deepcopy(data_info))
+            self.assertEqual(len(results_list), 3)
+
+            for i, results in enumerate(results_list):
+                # compare with transforming each instance separately
+                inst = deepcopy(data_info)
+                for key in ('bbox', 'bbox_center', 'bbox_scale', 'keypoints',
+                            'keypoints_visible'):
+                    inst[key] = inst[key][i:i + 1]
+                expected = transform(inst)
+
+                self.assertEqual(results['input_size'], (192, 256))
+                self.assertEqual(results['img'].shape, (256, 192, 3))
+                self.assertEqual(results['bbox'].shape, (1, 4))
+                np.testing.assert_array_equal(results['input_center'],
+                                              expected['input_center'])
+                np.testing.assert_array_equal(results['input_scale'],
+                                              expected['input_scale'])
+                np.testing.assert_array_equal(
+                    results['transformed_keypoints'],
+                    expected['transformed_keypoints'])
+                np.testing.assert_array_equal(results['img'], expected['img'])
+
     def test_repr(self):
         transform = TopdownAffine(input_size=(192, 256), use_udp=False)
         self.assertEqual(
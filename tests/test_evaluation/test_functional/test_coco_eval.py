@@ -0,0 +1,263 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os.path as osp
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from xtcocotools.coco import COCO
+from xtcocotools.cocoeval import COCOeval
+
+from mmpose.evaluation.functional import (coco_keypoint_eval,
+                                          coco_keypoint_match,
+                                          coco_keypoint_summarize,
+                                          merge_coco_keypoint_matches)
+
+SIGMAS = np.array([
+    .26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07, .87,
+    .87, .89, .89
+]) / 10.0
+
+
+class TestCocoKeypointEval(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _make_data(self, seed, num_imgs=40, with_bbox=False):
+        rng = np.random.RandomState(seed)
+        K = len(SIGMAS)
+        images, anns, results = [], [], []
+        for img_id in range(num_imgs):
+            images.append(
+                dict(id=img_id, width=640, height=480, crowdIndex=rng.rand()))
+            dets = []
+            for _ in range(rng.randint(0, 5)):
+                center = rng.rand(2) * 300
+                scale = float(rng.choice([10, 40, 120]))
+                kpts = np.concatenate([
+                    center + rng.randn(K, 2) * scale,
+                    rng.randint(0, 3, (K, 1))
+                ],
+                                      axis=1)
+                if rng.rand() < 0.2:
+                    kpts[:, 2] = 0
+                ann = dict(
+                    id=len(anns),
+                    image_id=img_id,
+                    category_id=1,
+                    keypoints=kpts.reshape(-1).tolist(),
+                    bbox=[
+                        center[0] - scale, center[1] - scale, 2. * scale,
+                        2. * scale
+                    ],
+                    area=scale * rng.uniform(1, 4) * scale,
+                    iscrowd=int(rng.rand() < 0.1),
+                    num_keypoints=int((kpts[:, 2] > 0).sum()))
+                anns.append(ann)
+                for _ in range(rng.randint(0, 4)):
+                    noise = scale * rng.choice([0.05, 0.2, 1.0])
+                    dets.append(kpts[:, :2] + rng.randn(K, 2) * noise)
+            for _ in range(rng.randint(0, 25 if img_id % 7 == 0 else 3)):
+                dets.append(rng.rand(1, 2) * 300 + rng.randn(K, 2) * 40)
+
+            for det in dets:
+                scores = rng.rand(K, 1)
+                result = dict(
+                    image_id=img_id,
+                    category_id=1,
+                    keypoints=np.concatenate([det, scores],
+                                             axis=1).reshape(-1).tolist(),
+                    score=rng.rand())
+                if with_bbox:
+                    result['bbox'] = (rng.rand(4) * 200).tolist()
+                results.append(result)
+
+        gt_file = osp.join(self.tmp_dir.name, f'gt_{seed}.json')
+        res_file = osp.join(self.tmp_dir.name, f'res_{seed}.json')
+        with open(gt_file, 'w') as f:
+            json.dump(
+                dict(
+                    images=images,
+                    annotations=anns,
+                    categories=[dict(id=1, name='person')]), f)
+        with open(res_file, 'w') as f:
+            json.dump(results, f)
+        return gt_file, res_file
+
+    def _load_arrays(self, coco, res_file):
+        img_ids = coco.getImgIds()
+        anns = [
+            coco.anns[ann['id']] for img_id in img_ids
+            for ann in coco.imgToAnns[img_id]
+        ]
+        gts = dict(
+            img_ids=[ann['image_id'] for ann in anns],
+            category_ids=[ann['category_id'] for ann in anns],
+            keypoints=[ann['keypoints'] for ann in anns],
+            bboxes=[ann['bbox'] for ann in anns],
+            areas=[ann['area'] for ann in anns],
+            iscrowd=[ann['iscrowd'] for ann in anns],
+            num_keypoints=[ann['num_keypoints'] for ann in anns])
+
+        with open(res_file) as f:
+            results = json.load(f)
+        kpts = np.array([res['keypoints']
+                         for res in results]).reshape(-1, len(SIGMAS), 3)
+        if 'bbox' in results[0]:
+            bboxes = np.array([res['bbox'] for res in results])
+            areas = bboxes[:, 2] * bboxes[:, 3]
+        else:
+            areas = np.ptp(kpts[..., 0], axis=1) * np.ptp(kpts[..., 1], axis=1)
+        preds = dict(
+            img_ids=[res['image_id'] for res in results],
+            category_ids=[res['category_id'] for res in results],
+            keypoints=kpts,
+            scores=[res['score'] for res in results],
+            areas=areas)
+        return gts, preds
+
+    def _evaluate(self, gt_file, res_file, iou_type, use_area, nproc=0):
+        coco = COCO(gt_file)
+        coco_det = coco.loadRes(res_file)
+        coco_eval = COCOeval(coco, coco_det, iou_type, SIGMAS, use_area)
+        coco_eval.params.useSegm = None
+        coco_eval.evaluate()
+        coco_eval.accumulate()
+        coco_eval.summarize()
+
+        img_ids = coco.getImgIds()
+        gts, preds = self._load_arrays(coco, res_file)
+        native = coco_keypoint_eval(
+            gts,
+            preds,
+            img_ids,
+            coco.getCatIds(),
+            SIGMAS,
+            use_area=use_area,
+            iou_type=iou_type,
+            crowd_indices=[coco.imgs[i]['crowdIndex'] for i in img_ids],
+            nproc=nproc)
+        return coco_eval, native
+
+    def test_keypoints(self):
+        for seed, use_area in zip(range(4), (True, False, True, False)):
+            gt_file, res_file = self._make_data(seed, with_bbox=seed % 2)
+            coco_eval, native = self._evaluate(gt_file, res_file, 'keypoints',
+                                               use_area)
+            np.testing.assert_array_equal(native['stats'], coco_eval.stats)
+            np.testing.assert_array_equal(native['precision'],
+                                          coco_eval.eval['precision'])
+            np.testing.assert_array_equal(native['recall'],
+                                          coco_eval.eval['recall'])
+
+    def test_keypoints_crowd(self):
+        for seed in range(2):
+            gt_file, res_file = self._make_data(seed)
+            coco_eval, native = self._evaluate(gt_file, res_file,
+                                               'keypoints_crowd', True)
+            np.testing.assert_array_equal(native['stats'], coco_eval.stats)
+
+    def test_chunks(self):
+        gt_file, res_file = self._make_data(0)
+        # evaluate the images in many small chunks
+        with patch('mmpose.evaluation.functional.coco_eval._CHUNK_ELEMENTS',
+                   1 << 12):
+            coco_eval, native = self._evaluate(gt_file, res_file, 'keypoints',
+                                               True)
+            np.testing.assert_array_equal(native['stats'], coco_eval.stats)
+
+            _, native_mp = self._evaluate(
+                gt_file, res_file, 'keypoints', True, nproc=2)
+            np.testing.assert_array_equal(native_mp['stats'], coco_eval.stats)
+
+    def test_no_ground_truth(self):
+        gt_file, res_file = self._make_data(0)
+        with open(gt_file) as f:
+            gt = json.load(f)
+        # remove the ground truths of some images with detections
+        gt['annotations'] = [
+            ann for ann in gt['annotations'] if ann['image_id'] % 3
+        ]
+        with open(gt_file, 'w') as f:
+            json.dump(gt, f)
+
+        # evaluate the images in small chunks, some of which have no
+        # ground truth at all
+        with patch('mmpose.evaluation.functional.coco_eval._CHUNK_ELEMENTS',
+                   1 << 8):
+            coco_eval, native = self._evaluate(gt_file, res_file, 'keypoints',
+                                               True)
+        np.testing.assert_array_equal(native['stats'], coco_eval.stats)
+        np.testing.assert_array_equal(native['precision'],
+                                      coco_eval.eval['precision'])
+
+        # an image with detections and no ground truth
+        gt['images'] = [img for img in gt['images'] if img['id'] == 0]
+        with open(gt_file, 'w') as f:
+            json.dump(gt, f)
+        with open(res_file) as f:
+            results = [res for res in json.load(f) if res['image_id'] == 0]
+        self.assertGreater(len(results), 0)
+        with open(res_file, 'w') as f:
+            json.dump(results, f)
+        coco_eval, native = self._evaluate(gt_file, res_file, 'keypoints',
+                                           True)
+        np.testing.assert_array_equal(native['stats'], coco_eval.stats)
+        np.testing.assert_array_equal(native['stats'], -1)
+
+    def test_merge_matches(self):
+        gt_file, res_file = self._make_data(1)
+        coco = COCO(gt_file)
+        img_ids = coco.getImgIds()
+        gts, preds = self._load_arrays(coco, res_file)
+        native = coco_keypoint_eval(gts, preds, img_ids, [1], SIGMAS)
+
+        # match the images in two interleaved subsets, like in sharded
+        # evaluation, and merge the matches in a different order
+        matches_list = []
+        for subset in (img_ids[1::2], img_ids[::2]):
+            gt_inds = np.flatnonzero(np.isin(gts['img_ids'], subset))
+            pred_inds = np.flatnonzero(np.isin(preds['img_ids'], subset))
+            sub_gts = {k: [v[i] for i in gt_inds] for k, v in gts.items()}
+            sub_preds = {
+                k: [v[i] for i in pred_inds]
+                for k, v in preds.items()
+            }
+            sub_preds['keypoints'] = preds['keypoints'][pred_inds]
+            matches_list.append(
+                coco_keypoint_match(sub_gts, sub_preds, subset, [1], SIGMAS))
+        merged = coco_keypoint_summarize(
+            merge_coco_keypoint_matches(matches_list), img_ids)
+
+        for key in ('stats', 'precision', 'recall'):
+            np.testing.assert_array_equal(merged[key], native[key])
+
+    def test_invalid_args(self):
+        gts = dict(
+            img_ids=[],
+            category_ids=[],
+            keypoints=np.zeros((0, 17, 3)),
+            bboxes=np.zeros((0, 4)),
+            areas=[],
+            iscrowd=[])
+        preds = dict(
+            img_ids=[1],
+            category_ids=[1],
+            keypoints=np.ones((1, 17, 3)),
+            scores=[1.],
+            areas=[1.])
+
+        with self.assertRaisesRegex(ValueError, '`iou_type` should be'):
+            coco_keypoint_eval(gts, preds, [1], [1], SIGMAS, iou_type='bbox')
+
+        with self.assertRaisesRegex(ValueError, '`crowd_indices`'):
+            coco_keypoint_eval(
+                gts, preds, [1], [1], SIGMAS, iou_type='keypoints_crowd')
+
+        with self.assertRaisesRegex(ValueError, 'do not correspond'):
+            coco_keypoint_eval(gts, preds, [0], [1], SIGMAS)
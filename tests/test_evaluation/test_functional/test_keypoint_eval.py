@@ -4,11 +4,15 @@ from unittest import TestCase
 import numpy as np
 from numpy.testing import assert_array_almost_equal
 
-from mmpose.evaluation.functional import (keypoint_auc, keypoint_epe,
-                                          keypoint_mpjpe, keypoint_nme,
-                                          keypoint_pck_accuracy,
+from mmpose.evaluation.functional import (batch_compute_similarity_transform,
+                                          keypoint_auc, keypoint_distance_sum,
+                                          keypoint_epe, keypoint_mpjpe,
+                                          keypoint_nme, keypoint_pck_accuracy,
+                                          keypoint_pck_counts,
                                           multilabel_classification_accuracy,
+                                          pck_accuracy_from_counts,
                                           pose_pck_accuracy)
+from mmpose.evaluation.functional.mesh_eval import compute_similarity_transform
 
 
 class TestKeypointEval(TestCase):
@@ -58,6 +62,40 @@ class TestKeypointEval(TestCase):
         self.assertAlmostEqual(avg_acc, 1, delta=1e-4)
         self.assertAlmostEqual(cnt, 4, delta=1e-4)
 
+    def test_keypoint_pck_counts(self):
+        rng = np.random.RandomState(0)
+        output = rng.rand(6, 5, 2) * 20
+        target = rng.rand(6, 5, 2) * 20
+        mask = rng.rand(6, 5) > 0.3
+        norm_factor = np.full((6, 2), 10, dtype=np.float32)
+        norm_factor[0] = 0
+
+        # the counts of two subsets sum to the counts of all instances
+        counts = [
+            keypoint_pck_counts(output[s], target[s], mask[s], 0.5,
+                                norm_factor[s].copy())
+            for s in (slice(0, 4), slice(4, 6))
+        ]
+        correct = counts[0][0] + counts[1][0]
+        valid = counts[0][1] + counts[1][1]
+        acc, avg_acc, cnt = pck_accuracy_from_counts(correct, valid)
+        target_acc, target_avg_acc, target_cnt = keypoint_pck_accuracy(
+            output, target, mask, 0.5, norm_factor.copy())
+        assert_array_almost_equal(acc, target_acc)
+        self.assertAlmostEqual(avg_acc, target_avg_acc)
+        self.assertEqual(cnt, target_cnt)
+
+        # counts at multiple thresholds
+        thrs = [0.1, 0.5, 1.0]
+        correct, valid = keypoint_pck_counts(output, target, mask, thrs,
+                                             norm_factor.copy())
+        self.assertEqual(correct.shape, (5, 3))
+        for i, thr in enumerate(thrs):
+            target_acc, _, _ = keypoint_pck_accuracy(output, target, mask, thr,
+                                                     norm_factor.copy())
+            acc, _, _ = pck_accuracy_from_counts(correct[:, i], valid)
+            assert_array_almost_equal(acc, target_acc)
+
     def test_keypoint_auc(self):
         output = np.zeros((1, 5, 2))
         target = np.zeros((1, 5, 2))
@@ -104,6 +142,21 @@ class TestKeypointEval(TestCase):
         epe = keypoint_epe(output, target, mask)
         self.assertAlmostEqual(epe, 11.5355339, delta=1e-4)
 
+    def test_keypoint_distance_sum(self):
+        rng = np.random.RandomState(0)
+        output = rng.rand(4, 5, 2) * 20
+        target = rng.rand(4, 5, 2) * 20
+        mask = rng.rand(4, 5) > 0.3
+        norm_factor = rng.rand(4, 2) * 10 + 1
+
+        distance_sum, num_valid = keypoint_distance_sum(
+            output, target, mask, norm_factor)
+        self.assertEqual(num_valid, mask.sum())
+        self.assertAlmostEqual(
+            distance_sum / num_valid,
+            keypoint_nme(output, target, mask, norm_factor),
+            delta=1e-6)
+
     def test_keypoint_nme(self):
         output = np.zeros((1, 5, 2))
         target = np.zeros((1, 5, 2))
@@ -208,5 +261,25 @@ class TestKeypointEval(TestCase):
         s_mpjpe = keypoint_mpjpe(output, target, mask, 'scale')
         self.assertAlmostEqual(s_mpjpe, 1.0277129678465953, delta=1e-4)
 
+        p_mpjpe = keypoint_mpjpe(
+            output, target, mask, 'procrustes', chunk_size=1)
+        self.assertAlmostEqual(p_mpjpe, 1.0047897634604497, delta=1e-4)
+
         with self.assertRaises(ValueError):
             _ = keypoint_mpjpe(output, target, mask, 'alignment')
+
+    def test_batch_compute_similarity_transform(self):
+        rng = np.random.RandomState(0)
+        source = rng.randn(10, 17, 3)
+        target = rng.randn(10, 17, 3)
+        # include a reflection
+        source[0] = target[0] * [-2, 2, 2] + 1
+
+        expected = np.stack([
+            compute_similarity_transform(source_i, target_i)
+            for source_i, target_i in zip(source, target)
+        ])
+        for chunk_size in (None, 3, 10):
+            transformed = batch_compute_similarity_transform(
+                source, target, chunk_size=chunk_size)
+            assert_array_almost_equal(transformed, expected, decimal=10)
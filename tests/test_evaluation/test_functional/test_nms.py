@@ -4,7 +4,10 @@ from unittest import TestCase
 import numpy as np
 import torch
 
-from mmpose.evaluation.functional.nms import nearby_joints_nms, nms_torch
+from mmpose.evaluation.functional.nms import (batched_oks_nms,
+                                              nearby_joints_nms, nms_torch,
+                                              oks_iou, oks_iou_matrix, oks_nms,
+                                              soft_oks_nms)
 
 
 class TestNearbyJointsNMS(TestCase):
@@ -57,3 +60,81 @@ class TestNMSTorch(TestCase):
         result = nms_torch(bboxes, scores, threshold=0.5, return_group=True)
         for res_out, res_expected in zip(result, expected_result):
             self.assertTrue(torch.equal(res_out, res_expected))
+
+
+class TestOKSNMS(TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.RandomState(0)
+        keypoints = rng.rand(8, 17, 3) * np.array([100., 100., 1.])
+        # make the first half of the instances heavily overlapped
+        keypoints[:4, :, :2] = keypoints[0, :, :2] + rng.rand(4, 17, 2)
+        self.keypoints = keypoints
+        self.scores = rng.rand(8)
+        self.areas = rng.rand(8) * 1000 + 100
+        self.kpts_db = [
+            dict(keypoints=k, score=s, area=a)
+            for k, s, a in zip(self.keypoints, self.scores, self.areas)
+        ]
+
+    def test_oks_iou_matrix(self):
+        for vis_thr in (None, 0.5):
+            ious = oks_iou_matrix(
+                self.keypoints,
+                self.keypoints,
+                self.areas,
+                self.areas,
+                vis_thr=vis_thr)
+            self.assertEqual(ious.shape, (8, 8))
+            for i in range(8):
+                ious_i = oks_iou(
+                    self.keypoints[i].flatten(),
+                    self.keypoints.reshape(8, -1),
+                    self.areas[i],
+                    self.areas,
+                    vis_thr=vis_thr)
+                np.testing.assert_allclose(ious[i], ious_i)
+
+        # flattened inputs and empty sets
+        ious = oks_iou_matrix(
+            self.keypoints.reshape(8, -1), self.keypoints[:0], self.areas,
+            self.areas[:0])
+        self.assertEqual(ious.shape, (8, 0))
+
+    def test_oks_nms(self):
+        keep = oks_nms(self.kpts_db, 0.9)
+        self.assertEqual(len(set(keep.tolist()) & {0, 1, 2, 3}), 1)
+        self.assertTrue({4, 5, 6, 7}.issubset(keep.tolist()))
+
+        keep = soft_oks_nms(self.kpts_db, 0.9, max_dets=5)
+        self.assertEqual(len(keep), 5)
+        self.assertEqual(keep[0], np.argmax(self.scores))
+
+        self.assertEqual(len(oks_nms([], 0.9)), 0)
+        self.assertEqual(len(soft_oks_nms([], 0.9)), 0)
+
+    def test_batched_oks_nms(self):
+        # groups of the same size, and groups of different sizes including
+        # a single instance
+        for group_ids in ([3, 3, 1, 1, 3, 1, 3, 1], [3, 3, 1, 0, 3, 1, 3, 2]):
+            group_ids = np.array(group_ids)
+            for soft in (False, True):
+                nms = soft_oks_nms if soft else oks_nms
+                keep = batched_oks_nms(
+                    self.keypoints,
+                    self.scores,
+                    self.areas,
+                    group_ids,
+                    0.9,
+                    soft=soft)
+
+                expected = []
+                for group_id in dict.fromkeys(group_ids.tolist()):
+                    inds = np.where(group_ids == group_id)[0]
+                    group_keep = nms([self.kpts_db[i] for i in inds], 0.9)
+                    expected.extend(inds[group_keep].tolist())
+                self.assertListEqual(keep.tolist(), expected)
+
+        keep = batched_oks_nms(self.keypoints[:0], self.scores[:0],
+                               self.areas[:0], group_ids[:0], 0.9)
+        self.assertEqual(len(keep), 0)
@@ -631,6 +631,84 @@ class TestCocoMetric(TestCase):
         self.assertTrue(
             osp.isfile(osp.join(self.tmp_dir.name, 'test8.keypoints.json')))
 
+    def test_native_eval(self):
+        """test whether the native evaluation gives the same results as
+        COCOeval."""
+        rng = np.random.RandomState(0)
+        cases = [
+            (self.ann_file_coco, self.dataset_meta_coco,
+             self.topdown_data_coco, dict()),
+            (self.ann_file_crowdpose, self.dataset_meta_crowdpose,
+             self.topdown_data_crowdpose,
+             dict(use_area=False, iou_type='keypoints_crowd')),
+        ]
+        for ann_file, dataset_meta, topdown_data, kwargs in cases:
+            # perturb the predictions to get imperfect results
+            topdown_data = copy.deepcopy(topdown_data)
+            for _, data_samples in topdown_data:
+                pred_instances = data_samples[0]['pred_instances']
+                keypoints = pred_instances['keypoints']
+                pred_instances['keypoints'] = keypoints + rng.randn(
+                    *keypoints.shape) * 10
+                pred_instances['keypoint_scores'] = rng.rand(
+                    *pred_instances['keypoint_scores'].shape)
+
+            eval_results = []
+            for use_native_eval in (True, False):
+                metric = CocoMetric(
+                    ann_file=ann_file,
+                    use_native_eval=use_native_eval,
+                    eval_nproc=2,
+                    **kwargs)
+                metric.dataset_meta = dataset_meta
+                for data_batch, data_samples in topdown_data:
+                    metric.process(data_batch, data_samples)
+                eval_results.append(metric.evaluate(size=len(topdown_data)))
+
+            self.assertLess(eval_results[0][f'{metric.prefix}/AP'], 1.0)
+            self.assertDictEqual(eval_results[0], eval_results[1])
+
+    def test_sharded(self):
+        """test whether the sharded mode gives the same results."""
+        rng = np.random.RandomState(0)
+        cases = [
+            (self.ann_file_coco, self.dataset_meta_coco,
+             self.topdown_data_coco, dict()),
+            (self.ann_file_crowdpose, self.dataset_meta_crowdpose,
+             self.topdown_data_crowdpose,
+             dict(use_area=False, iou_type='keypoints_crowd')),
+        ]
+        for ann_file, dataset_meta, topdown_data, kwargs in cases:
+            topdown_data = copy.deepcopy(topdown_data)
+            for _, data_samples in topdown_data:
+                pred_instances = data_samples[0]['pred_instances']
+                keypoints = pred_instances['keypoints']
+                pred_instances['keypoints'] = keypoints + rng.randn(
+                    *keypoints.shape) * 10
+
+            eval_results = []
+            for sharded in (True, False):
+                metric = CocoMetric(
+                    ann_file=ann_file,
+                    use_native_eval=True,
+                    sharded=sharded,
+                    **kwargs)
+                metric.dataset_meta = dataset_meta
+                for data_batch, data_samples in topdown_data:
+                    metric.process(data_batch, data_samples)
+                eval_results.append(metric.evaluate(size=len(topdown_data)))
+                self.assertEqual(len(metric.results), 0)
+
+            self.assertDictEqual(eval_results[0], eval_results[1])
+
+        # fall back to gathering the results when dumping the predictions
+        metric = CocoMetric(
+            ann_file=self.ann_file_coco,
+            use_native_eval=True,
+            sharded=True,
+            outfile_prefix=f'{self.tmp_dir.name}/test')
+        self.assertFalse(metric._can_shard())
+
     def test_gt_converter(self):
 
         crowdpose_to_coco_converter = dict(
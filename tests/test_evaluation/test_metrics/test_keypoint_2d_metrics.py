@@ -1,10 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 from mmengine.structures import InstanceData
 
 from mmpose.datasets.datasets.utils import parse_pose_metainfo
+from mmpose.evaluation.functional import keypoint_pck_accuracy
 from mmpose.evaluation.metrics import (AUC, EPE, NME, JhmdbPCKAccuracy,
                                        MpiiPCKAccuracy, PCKAccuracy)
 
@@ -441,3 +443,125 @@ class TestNME(TestCase):
             nme_metric.process(data_batch, data_samples)
             # raise AssertionError here
             _ = nme_metric.evaluate(1)
+
+
+class TestShardedMetrics(TestCase):
+
+    def setUp(self):
+        """Setup some variables which are used in every test method.
+
+        TestCase calls functions in this order: setUp() -> testMethod() ->
+        tearDown() -> cleanUp()
+        """
+        rng = np.random.RandomState(0)
+        self.batch_size = 16
+        num_keypoints = 16
+        self.data_batch = []
+        self.data_samples = []
+
+        for i in range(self.batch_size):
+            gt_instances = InstanceData()
+            keypoints = rng.rand(1, num_keypoints, 2) * 50
+            gt_instances.keypoints = keypoints
+            gt_instances.keypoints_visible = rng.rand(1, num_keypoints,
+                                                      1) > 0.2
+            gt_instances.bboxes = np.array([[0., 0., 50., 50.]])
+            gt_instances.head_size = rng.rand(1, 1) * 20 + 5
+            gt_instances.box_size = rng.rand(1, 1) * 50 + 10
+
+            pred_instances = InstanceData()
+            pred_instances.keypoints = keypoints + rng.randn(
+                1, num_keypoints, 2) * 5
+
+            data = {'inputs': None}
+            data_sample = {
+                'gt_instances': gt_instances.to_dict(),
+                'pred_instances': pred_instances.to_dict(),
+            }
+
+            self.data_batch.append(data)
+            self.data_samples.append(data_sample)
+
+    def _evaluate(self, metric_type, kwargs, sharded):
+        metric = metric_type(sharded=sharded, **kwargs)
+        metric.dataset_meta = parse_pose_metainfo(
+            dict(from_file='configs/_base_/datasets/mpii.py'))
+        metric.process(self.data_batch, self.data_samples)
+        return metric.evaluate(self.batch_size)
+
+    def test_evaluate(self):
+        """test whether the sharded mode gives the same results."""
+        nme_kwargs = dict(
+            norm_mode='keypoint_distance', keypoint_indices=[0, 1])
+        cases = [
+            (PCKAccuracy, dict(thr=0.1, norm_item=['bbox', 'head'])),
+            (MpiiPCKAccuracy, dict(thr=0.5, norm_item='head')),
+            (JhmdbPCKAccuracy, dict(thr=0.1, norm_item='bbox')),
+            (AUC, dict(norm_factor=20, num_thrs=4)),
+            (EPE, dict()),
+            (NME, dict(norm_mode='use_norm_item', norm_item='box_size')),
+            (NME, nme_kwargs),
+        ]
+        for metric_type, kwargs in cases:
+            results = self._evaluate(metric_type, kwargs, False)
+            sharded_results = self._evaluate(metric_type, kwargs, True)
+            self.assertEqual(results.keys(), sharded_results.keys())
+            for name, value in results.items():
+                np.testing.assert_allclose(
+                    sharded_results[name], value, rtol=1e-6)
+
+    def test_jhmdb_norm_items(self):
+        """test JhmdbPCKAccuracy normalized by both the bbox and the torso
+        against the PCK of all the keypoints."""
+        names = ['Head', 'Sho', 'Elb', 'Wri', 'Hip', 'Knee', 'Ank']
+        inds = [(2, 2), (3, 4), (7, 8), (11, 12), (5, 6), (9, 10), (13, 14)]
+        for sharded in (False, True):
+            metric = JhmdbPCKAccuracy(
+                thr=0.2, norm_item=['bbox', 'torso'], sharded=sharded)
+            metric.process(self.data_batch, self.data_samples)
+            results = list(metric.results)
+            pck_results = metric.evaluate(self.batch_size)
+
+            pred_coords = np.concatenate([r['pred_coords'] for r in results])
+            gt_coords = np.concatenate([r['gt_coords'] for r in results])
+            mask = np.concatenate([r['mask'] for r in results])
+            target = dict()
+            for norm_item, suffix in (('bbox', 'PCK'), ('torso', 'tPCK')):
+                norm_size = np.concatenate(
+                    [r[f'{norm_item}_size'] for r in results])
+                pck_p, pck, _ = keypoint_pck_accuracy(pred_coords, gt_coords,
+                                                      mask, 0.2, norm_size)
+                for name, (i, j) in zip(names, inds):
+                    target[f'{name} {suffix}'] = 0.5 * pck_p[i] + \
+                        0.5 * pck_p[j]
+                target[suffix] = pck
+
+            self.assertEqual(pck_results.keys(), target.keys())
+            for name, value in target.items():
+                np.testing.assert_allclose(
+                    pck_results[name], value, rtol=1e-6, err_msg=name)
+
+    def test_padded_results(self):
+        """test whether the results padded by the sampler are dropped."""
+        metric = PCKAccuracy(thr=0.1, norm_item='bbox', sharded=True)
+        metric.process(self.data_batch[:4], self.data_samples[:4])
+        results = metric.evaluate(4)
+
+        # the samples on rank 1 of 3 are 1, 4, 7 and 10, where the last two
+        # are padded for a dataset of size 6
+        metric.process(self.data_batch, self.data_samples)
+        with patch(
+                'mmpose.evaluation.metrics.sharded_metric.get_dist_info',
+                return_value=(1, 3)):
+            local_results, sample_inds = metric._get_local_results(6)
+        self.assertEqual(len(local_results), 2)
+        self.assertListEqual(sample_inds.tolist(), [1, 4])
+
+        # the last sample on rank 0 of 4 is padded for a dataset of size 16
+        metric.results.clear()
+        with patch(
+                'mmpose.evaluation.metrics.sharded_metric.get_dist_info',
+                return_value=(0, 4)):
+            metric.process(self.data_batch[:5], self.data_samples[:5])
+            padded_results = metric.evaluate(16)
+        self.assertDictEqual(padded_results, results)
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 from mmengine.structures import InstanceData
@@ -65,9 +66,58 @@ class TestMPJPE(TestCase):
         self.assertIn('P-MPJPE', p_mpjpe)
         self.assertTrue(p_mpjpe['P-MPJPE'] >= 0)
 
+        # aligning the samples in chunks gives the same results
+        p_mpjpe_metric = MPJPE(mode='p-mpjpe', chunk_size=3)
+        p_mpjpe_metric.process(self.data_batch, self.data_samples)
+        self.assertAlmostEqual(
+            p_mpjpe_metric.evaluate(self.batch_size)['P-MPJPE'],
+            p_mpjpe['P-MPJPE'])
+
         n_mpjpe_metric = MPJPE(mode='n-mpjpe')
         n_mpjpe_metric.process(self.data_batch, self.data_samples)
         n_mpjpe = n_mpjpe_metric.evaluate(self.batch_size)
         self.assertIsInstance(n_mpjpe, dict)
         self.assertIn('N-MPJPE', n_mpjpe)
         self.assertTrue(n_mpjpe['N-MPJPE'] >= 0)
+
+    def test_online(self):
+        """Test the online mode of MPJPE."""
+        # the samples of two action categories
+        for i, data_sample in enumerate(self.data_samples):
+            action = 'Greeting' if i % 3 else 'Walking_1'
+            data_sample['target_img_path'] = [
+                f'tests/data/h36m/S7/S7_{action}.55011271_000396.jpg'
+            ]
+
+        for mode in MPJPE.ALIGNMENT:
+            metric = MPJPE(mode=mode)
+            metric.process(self.data_batch, self.data_samples)
+            results = metric.evaluate(self.batch_size)
+
+            online_metric = MPJPE(mode=mode, online=True)
+            for i in range(0, self.batch_size, 3):
+                online_metric.process(self.data_batch[i:i + 3],
+                                      self.data_samples[i:i + 3])
+            self.assertListEqual(online_metric.results, [])
+            online_results = online_metric.evaluate(self.batch_size)
+
+            self.assertEqual(results.keys(), online_results.keys())
+            self.assertIn(f'{mode.upper()}_Walking', results)
+            for name, value in results.items():
+                np.testing.assert_allclose(
+                    online_results[name], value, rtol=1e-6)
+
+        # the samples on rank 0 of 4 are 0, 4 and 8, where the last one is
+        # padded for a dataset of size 6
+        metric = MPJPE(mode='p-mpjpe', online=True)
+        metric.process(self.data_batch[:2], self.data_samples[:2])
+        results = metric.evaluate(2)
+        with patch(
+                'mmpose.evaluation.metrics.keypoint_3d_metrics.get_dist_info',
+                return_value=(0, 4)):
+            metric.process(self.data_batch[:1], self.data_samples[:1])
+            metric.process(self.data_batch[:0], self.data_samples[:0])
+            metric.process(self.data_batch[1:3], self.data_samples[1:3])
+            padded_results = metric.evaluate(6)
+        np.testing.assert_allclose(padded_results['P-MPJPE'],
+                                   results['P-MPJPE'])
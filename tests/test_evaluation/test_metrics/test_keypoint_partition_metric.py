@@ -4,6 +4,7 @@ import os.path as osp
 import tempfile
 from collections import defaultdict
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 from mmengine.fileio import load
@@ -278,6 +279,32 @@ class TestKeypointPartitionMetricWrappingCocoMetric(TestCase):
                 eval_results[key], self.target_bbox_none[key], places=3)
         self._assert_outfiles('test_topdown1')
 
+    def test_sharded_evaluate(self):
+        """The results of CocoMetric are gathered even if ``sharded`` is set,
+        since the ``ann_file`` is not supported."""
+        metric = KeypointPartitionMetric(
+            metric=dict(
+                type='CocoMetric',
+                score_mode='bbox',
+                nms_mode='none',
+                sharded=True),
+            partitions=dict(
+                body=range(17),
+                foot=range(17, 23),
+                face=range(23, 91),
+                left_hand=range(91, 112),
+                right_hand=range(112, 133),
+                all=range(133)))
+        metric.dataset_meta = self.dataset_meta_coco
+        self.assertFalse(metric._can_shard())
+
+        for data_batch, data_samples in self.topdown_data_coco:
+            metric.process(data_batch, data_samples)
+        eval_results = metric.evaluate(size=len(self.topdown_data_coco))
+        for key in self.target_bbox_none.keys():
+            self.assertAlmostEqual(
+                eval_results[key], self.target_bbox_none[key], places=3)
+
 
 class TestKeypointPartitionMetricWrappingPCKAccuracy(TestCase):
 
@@ -379,6 +406,39 @@ class TestKeypointPartitionMetricWrappingPCKAccuracy(TestCase):
         }
         self.assertDictEqual(tpck, target)
 
+    def test_sharded_evaluate(self):
+        partitions = dict(p1=range(10), p2=range(10, 24), all=range(24))
+        for metric_cfg in [
+                dict(type='PCKAccuracy', thr=0.5, norm_item='bbox'),
+                dict(type='PCKAccuracy', thr=0.3, norm_item='head'),
+                dict(
+                    type='PCKAccuracy', thr=0.05, norm_item=['bbox', 'torso'])
+        ]:
+            metric = KeypointPartitionMetric(
+                metric=metric_cfg, partitions=partitions)
+            metric.process(self.data_batch, self.data_samples)
+            target = metric.evaluate(self.batch_size)
+
+            sharded_metric = KeypointPartitionMetric(
+                metric=dict(metric_cfg, sharded=True), partitions=partitions)
+            self.assertTrue(sharded_metric._can_shard())
+            # the padded data samples are dropped
+            sharded_metric.process(self.data_batch,
+                                   self.data_samples + self.data_samples[:2])
+            compute_stats = patch.object(
+                type(sharded_metric.metrics['p1']),
+                'compute_stats',
+                autospec=True,
+                side_effect=type(sharded_metric.metrics['p1']).compute_stats)
+            with compute_stats as mock_compute_stats:
+                results = sharded_metric.evaluate(self.batch_size)
+            self.assertEqual(mock_compute_stats.call_count, 3)
+            self.assertEqual(list(results.keys()), list(target.keys()))
+            for key, value in target.items():
+                self.assertAlmostEqual(results[key], value)
+            for partition_metric in sharded_metric.metrics.values():
+                self.assertEqual(len(partition_metric.results), 0)
+
 
 class TestKeypointPartitionMetricWrappingAUCandEPE(TestCase):
 
@@ -5,7 +5,7 @@ import numpy as np
 
 from mmpose.structures.bbox import (bbox_clip_border, bbox_corner2xyxy,
                                     bbox_xyxy2corner, get_pers_warp_matrix,
-                                    get_warp_matrix)
+                                    get_warp_matrices, get_warp_matrix)
 
 
 class TestBBoxClipBorder(TestCase):
@@ -183,3 +183,28 @@ class TestGetWarpMatrix(TestCase):
             center, scale, rot, output_size, fix_aspect_ratio=False)
         expected_matrix = np.array([[4, 0, -300], [0, 10, -900]])
         np.testing.assert_array_almost_equal(warp_matrix, expected_matrix)
+
+    def test_get_warp_matrices(self):
+        rng = np.random.RandomState(0)
+        center = rng.rand(10, 2) * 500
+        scale = rng.rand(10, 2) * 200 + 10
+        rot = rng.rand(10) * 60 - 30
+        output_size = (192, 256)
+
+        # the batched matrices are exactly the same as the single ones
+        for inv, fix_aspect_ratio in [(False, True), (True, True),
+                                      (False, False)]:
+            kwargs = dict(
+                shift=(0.1, -0.2), inv=inv, fix_aspect_ratio=fix_aspect_ratio)
+            warp_matrices = get_warp_matrices(center, scale, rot, output_size,
+                                              **kwargs)
+            self.assertEqual(warp_matrices.shape, (10, 2, 3))
+            for i in range(10):
+                np.testing.assert_array_equal(
+                    warp_matrices[i],
+                    get_warp_matrix(center[i], scale[i], rot[i], output_size,
+                                    **kwargs))
+
+        warp_matrices = get_warp_matrices(
+            np.zeros((0, 2)), np.zeros((0, 2)), 0., output_size)
+        self.assertEqual(warp_matrices.shape, (0, 2, 3))
@@ -0,0 +1,68 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+import shutil
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from mmpose.utils import ImageCache
+
+
+class TestImageCache(TestCase):
+
+    def setUp(self) -> None:
+        self.img_path = 'tests/data/coco/000000000785.jpg'
+
+    def test_load(self):
+        cache = ImageCache.get_instance('test_load')
+
+        img = cache.load(self.img_path)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.nbytes, img.nbytes)
+        self.assertFalse(img.flags.writeable)
+
+        # load from the cache
+        self.assertIs(cache.load(self.img_path), img)
+        self.assertEqual(len(cache), 1)
+
+        # different decoding arguments are cached separately
+        img_gray = cache.load(self.img_path, color_type='grayscale')
+        self.assertEqual(img_gray.ndim, 2)
+        self.assertEqual(len(cache), 2)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.nbytes, 0)
+
+    def test_modified_file(self):
+        cache = ImageCache.get_instance('test_modified_file')
+
+        with TemporaryDirectory() as tmp_dir:
+            img_path = osp.join(tmp_dir, 'img.jpg')
+            shutil.copy(self.img_path, img_path)
+            img = cache.load(img_path)
+
+            shutil.copy('tests/data/coco/000000040083.jpg', img_path)
+            img_new = cache.load(img_path)
+            self.assertIsNot(img_new, img)
+
+    def test_lru(self):
+        cache = ImageCache.get_instance('test_lru', max_bytes=100)
+
+        cache.put('a', np.zeros(40, dtype=np.uint8))
+        cache.put('b', np.zeros(40, dtype=np.uint8))
+        # mark 'a' as recently used
+        self.assertIsNotNone(cache.get('a'))
+        cache.put('c', np.zeros(40, dtype=np.uint8))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.nbytes, 80)
+
+        # too large to cache
+        cache.put('d', np.zeros(200, dtype=np.uint8))
+        self.assertIsNone(cache.get('d'))
+
+        # non-local files are not cached
+        self.assertIsNone(ImageCache.make_key('http://a.jpg'))
@@ -0,0 +1,79 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os.path as osp
+import threading
+import time
+from contextlib import nullcontext
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from mmpose.utils import LatencyProfiler, profile_stage
+
+
+class TestLatencyProfiler(TestCase):
+
+    def test_record(self):
+        # nothing is recorded without an active profiler
+        self.assertIsInstance(profile_stage('backbone'), nullcontext)
+
+        profiler = LatencyProfiler(cuda_sync=False)
+        with profiler:
+            self.assertIs(LatencyProfiler.get_active(), profiler)
+            for _ in range(4):
+                with profile_stage('head'):
+                    with profile_stage('codec_decode'):
+                        time.sleep(0.001)
+
+            # the stages in other threads are recorded too
+            def _worker():
+                with profile_stage('decode'):
+                    pass
+
+            thread = threading.Thread(target=_worker)
+            thread.start()
+            thread.join()
+        self.assertIsNone(LatencyProfiler.get_active())
+
+        summary = profiler.summary(percentiles=(50, 99.9))
+        self.assertSetEqual(
+            set(summary.keys()), {'head', 'codec_decode', 'decode'})
+        self.assertEqual(summary['head']['count'], 4)
+        self.assertEqual(summary['decode']['count'], 1)
+        self.assertIn('p50', summary['head'])
+        self.assertIn('p99.9', summary['head'])
+        self.assertGreaterEqual(summary['codec_decode']['mean'], 1.)
+        self.assertGreaterEqual(summary['head']['total'],
+                                summary['codec_decode']['total'])
+        self.assertEqual(len(profiler.report_strings()), 3)
+
+        profiler.reset()
+        self.assertDictEqual(profiler.summary(), {})
+
+    def test_dump(self):
+        profiler = LatencyProfiler(cuda_sync=False)
+        with profiler:
+            with profile_stage('backbone'):
+                pass
+
+        with TemporaryDirectory() as tmp_dir:
+            json_file = osp.join(tmp_dir, 'summary.json')
+            profiler.dump(json_file)
+            with open(json_file) as f:
+                self.assertEqual(json.load(f)['backbone']['count'], 1)
+
+            trace_file = osp.join(tmp_dir, 'trace.json')
+            profiler.dump(trace_file, file_format='chrome')
+            with open(trace_file) as f:
+                events = json.load(f)['traceEvents']
+            self.assertEqual(len(events), 1)
+            self.assertEqual(events[0]['name'], 'backbone')
+            self.assertEqual(events[0]['ph'], 'X')
+
+            with self.assertRaisesRegex(ValueError, '`file_format`'):
+                profiler.dump(trace_file, file_format='csv')
+
+    def test_nested_profilers(self):
+        with LatencyProfiler():
+            with self.assertRaisesRegex(RuntimeError, 'already active'):
+                with LatencyProfiler():
+                    pass
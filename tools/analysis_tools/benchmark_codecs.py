@@ -0,0 +1,75 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+
+import mmengine
+from mmengine.logging import MMLogger
+
+from mmpose.testing import (format_codec_benchmarks, get_codec_benchmark_cfgs,
+                            run_codec_benchmarks)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the encoding and decoding of the codecs')
+    parser.add_argument(
+        '--codecs',
+        nargs='+',
+        default=None,
+        choices=list(get_codec_benchmark_cfgs().keys()),
+        help='The codecs to benchmark. All codecs are benchmarked by '
+        'default.')
+    parser.add_argument(
+        '--num-instances',
+        type=int,
+        default=1,
+        help='The number of instances in an image for the bottom-up codecs, '
+        'or the number of frames in a sequence for the pose-lifting codecs')
+    parser.add_argument(
+        '--num-keypoints',
+        type=int,
+        default=17,
+        help='The number of keypoints of an instance')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        nargs=2,
+        default=[192, 256],
+        help='The input image size in [w, h]. The heatmaps are 4 times '
+        'smaller.')
+    parser.add_argument(
+        '--repeat', type=int, default=50, help='The number of timed calls')
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=5,
+        help='The number of calls before timing')
+    parser.add_argument('--seed', type=int, default=0, help='The random seed')
+    parser.add_argument(
+        '--out', help='The json file to save the benchmark report')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+    logger = MMLogger.get_instance(name='MMLogger')
+
+    report = run_codec_benchmarks(
+        codecs=args.codecs,
+        num_instances=args.num_instances,
+        num_keypoints=args.num_keypoints,
+        input_size=tuple(args.input_size),
+        repeat=args.repeat,
+        warmup=args.warmup,
+        seed=args.seed)
+
+    for line in format_codec_benchmarks(report):
+        logger.info(line)
+
+    if args.out:
+        mmengine.dump(report, args.out, indent=4)
+        logger.info(f'The benchmark report is saved to {args.out}')
+
+
+if __name__ == '__main__':
+    main()